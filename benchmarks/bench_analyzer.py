@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyzer Microbenchmark - SysCRED
+==================================
+Tokens/sec of the legacy IREngine.preprocess (word_tokenize + stem every
+token) versus the TextAnalyzer pipeline (frozenset stopwords, memoized
+stems, optional compiled regex tokenizer).
+
+Usage:
+    python benchmarks/bench_analyzer.py --corpus /path/to/ap_corpus.jsonl --docs 5000
+
+Without --corpus a built-in AP-style newswire sample is repeated.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import os
+import sys
+import re
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from syscred.ir_engine import IREngine, TextAnalyzer, HAS_NLTK
+
+if HAS_NLTK:
+    from nltk.tokenize import word_tokenize
+
+AP_SAMPLE = [
+    "The Federal Reserve raised its discount rate by half a percentage point "
+    "today, citing inflationary pressures in the economy, officials said.",
+    "Airbus Industrie won a major order from a U.S. carrier despite complaints "
+    "that European governments subsidize the aircraft consortium.",
+    "Scientists reported that greenhouse gas emissions from burning fossil "
+    "fuels are warming the atmosphere faster than previously estimated.",
+    "Japanese automakers increased their share of the U.S. car market last "
+    "month as domestic manufacturers struggled with falling sales.",
+    "Federal prosecutors charged three brokers with insider trading in the "
+    "shares of companies involved in leveraged buyouts, the Justice Department said.",
+]
+
+
+def load_texts(corpus_path, max_docs):
+    """Load document texts from an AP JSONL corpus, or repeat the sample."""
+    if corpus_path and os.path.exists(corpus_path):
+        texts = []
+        with open(corpus_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                doc = json.loads(line)
+                texts.append(doc.get('contents', doc.get('text', '')))
+                if len(texts) >= max_docs:
+                    break
+        return texts
+    return [AP_SAMPLE[i % len(AP_SAMPLE)] for i in range(max_docs)]
+
+
+def legacy_preprocess(engine, text):
+    """The pre-analyzer IREngine.preprocess (no memoization)."""
+    text = text.lower()
+    if HAS_NLTK:
+        try:
+            tokens = word_tokenize(text)
+        except LookupError:
+            tokens = re.findall(r'\b[a-z]+\b', text)
+    else:
+        tokens = re.findall(r'\b[a-z]+\b', text)
+    filtered = [t for t in tokens if t.isalpha() and t not in engine.stopwords]
+    if engine.stemmer:
+        filtered = [engine.stemmer.stem(t) for t in filtered]
+    return ' '.join(filtered)
+
+
+def run(label, func, texts):
+    """Time func over all texts, return raw tokens/sec."""
+    raw_tokens = sum(len(t.split()) for t in texts)
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    elapsed = time.perf_counter() - start
+    rate = raw_tokens / elapsed if elapsed else float('inf')
+    print(f"  {label:<32} {elapsed:8.3f} s   {rate:12,.0f} tokens/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyzer microbenchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus (convert_trec.py output)")
+    parser.add_argument('--docs', type=int, default=5000)
+    args = parser.parse_args()
+
+    texts = load_texts(args.corpus, args.docs)
+    engine = IREngine(use_stemming=True)
+    print(f"Documents: {len(texts)}  NLTK: {HAS_NLTK}  stemmer: {engine.stemmer is not None}")
+    print("=" * 70)
+
+    baseline = run("legacy preprocess", lambda t: legacy_preprocess(engine, t), texts)
+
+    for tokenizer in ('nltk', 'regex'):
+        analyzer = TextAnalyzer(engine.stopwords, engine.stemmer, tokenizer=tokenizer)
+        rate = run(f"TextAnalyzer ({analyzer.tokenizer})", analyzer.analyze, texts)
+        info = analyzer.cache_info()
+        hit_rate = info.hits / max(1, info.hits + info.misses)
+        print(f"    speedup x{rate / baseline:.2f}, stem cache {info.currsize} entries, hit rate {hit_rate:.1%}")
+
+
+if __name__ == '__main__':
+    main()
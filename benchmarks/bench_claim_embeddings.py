@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claim Embeddings Benchmark - SysCRED
+=====================================
+Semantic similar-claim search as the evaluation history grows
+(1k -> 1M stored claims, 384-d like all-MiniLM-L6-v2):
+- exact: blocked float16 matrix multiply over every claim
+- int8: int8 first pass (per-row scales), exact rescoring
+- binary: sign-bit Hamming first pass, exact rescoring
+
+Claims are clustered random embeddings; a query is a stored claim plus
+noise (a paraphrase). Recall@3 is measured against the exact search.
+
+Usage:
+    python benchmarks/bench_claim_embeddings.py --sizes 1000 10000 100000 1000000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bench_utils import timed
+from syscred.claim_embeddings import ClaimEmbeddingIndex
+from syscred.dense_index import DenseIndex
+
+
+class ChunkEncoder:
+    """Returns the rows of the chunk being added (texts are row numbers)."""
+
+    def __init__(self):
+        self.chunk = None
+
+    def encode(self, texts):
+        return self.chunk[np.array([int(t) for t in texts])]
+
+
+def clustered_vectors(n, centres, rng):
+    labels = rng.integers(0, len(centres), n)
+    noise = rng.standard_normal((n, centres.shape[1])).astype(np.float32)
+    return DenseIndex.normalize(centres[labels] + 0.9 * noise)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Claim embeddings benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--chunk', type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(13)
+    centres = rng.standard_normal((200, args.dim)).astype(np.float32)
+    encoder = ChunkEncoder()
+    indexes = {
+        name: ClaimEmbeddingIndex(encoder, first_pass=name, first_pass_min_rows=0)
+        for name in ClaimEmbeddingIndex.FIRST_PASSES
+    }
+    kept = []  # a few stored claims per chunk, to build queries from
+
+    print("=" * 84)
+    print(f"  {'claims':>8} {'add us':>7} {'exact ms':>9} {'int8 ms':>8} {'recall':>7} "
+          f"{'binary ms':>10} {'recall':>7} {'MB exact/int8/binary':>22}")
+    count = 0
+    for size in sorted(args.sizes):
+        start = time.perf_counter()
+        added = size - count
+        while count < size:
+            encoder.chunk = clustered_vectors(min(args.chunk, size - count), centres, rng)
+            reports = [f"urn:report:{count + i}" for i in range(len(encoder.chunk))]
+            for index in indexes.values():
+                index.add_many(reports, [str(i) for i in range(len(reports))], batch_size=len(reports))
+            kept.extend(encoder.chunk[:max(1, args.queries // 4)])
+            count += len(reports)
+        add_us = (time.perf_counter() - start) * 1e6 / max(added, 1) / len(indexes)
+
+        picks = rng.choice(len(kept), args.queries)
+        queries = [kept[i] + 0.05 * rng.standard_normal(args.dim).astype(np.float32) for i in picks]
+        truth, exact_ms = [], 0.0
+        for query in queries:
+            hits, ms = timed(indexes['none'].search, query, 3)
+            truth.append({report for report, _ in hits})
+            exact_ms += ms
+        row = [f"  {size:8d} {add_us:7.1f} {exact_ms / len(queries):9.2f}"]
+        for name, width in (('int8', 8), ('binary', 10)):
+            total_ms, found = 0.0, 0
+            for query, expected in zip(queries, truth):
+                hits, ms = timed(indexes[name].search, query, 3)
+                total_ms += ms
+                found += len(expected & {report for report, _ in hits})
+            row.append(f"{total_ms / len(queries):{width}.2f} {found / (3 * len(queries)):7.3f}")
+        megabytes = "/".join(f"{indexes[n].get_statistics()['bytes'] / 1e6:.0f}" for n in ClaimEmbeddingIndex.FIRST_PASSES)
+        print(" ".join(row) + f" {megabytes:>22}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claim Index Scaling Benchmark - SysCRED
+========================================
+GraphRAG similar-claim lookup as the evaluation history grows
+(1k -> 1M stored claims):
+- regex: OR-regex of the keywords over every stored claim, the 3 most
+  recent matches (the previous FILTER(REGEX(...)) behaviour, run in
+  plain Python so it stays measurable at 1M)
+- index: ClaimIndex.search (inverted index + MinHash-LSH), top 3 by
+  estimated Jaccard
+
+Each query is built like verify_information does: the words of more
+than four letters among the first ten of a stored claim. Recall is the
+fraction of queries whose source claim is returned.
+
+Usage:
+    python benchmarks/bench_claim_index.py --sizes 1000 10000 100000 1000000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import itertools
+import random
+import re
+import time
+
+from bench_utils import FILLER_WORDS, TOPIC_WORDS, _pseudo_vocabulary, timed
+from syscred.claim_index import ClaimIndex
+
+
+def claim_generator(seed: int = 13):
+    """Endless synthetic claims: Zipf background words plus topic words."""
+    rng = random.Random(seed)
+    background = FILLER_WORDS + _pseudo_vocabulary(8000, rng)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(background))))
+    topics = [words.split() for words in TOPIC_WORDS]
+    while True:
+        words = rng.choices(background, cum_weights=cum_weights, k=rng.randint(12, 25))
+        topic = rng.choice(topics)
+        for j in range(0, len(words), rng.randint(4, 8)):
+            words[j] = rng.choice(topic)
+        yield ' '.join(words)
+
+
+def regex_search(contents, keywords, k=3):
+    pattern = re.compile("|".join(re.escape(w) for w in keywords), re.IGNORECASE)
+    matches = [i for i, text in enumerate(contents) if pattern.search(text)]
+    return matches[::-1][:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Claim index scaling benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--regex-queries', type=int, default=20, help="Baseline queries (linear scan)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    claims = claim_generator()
+    index = ClaimIndex()
+    contents = []
+
+    print("=" * 88)
+    print(f"  {'claims':>8} {'add us':>7} {'MB':>7} {'regex ms':>9} {'index ms':>9} "
+          f"{'speedup':>8} {'regex recall':>13} {'index recall':>13}")
+    for size in sorted(args.sizes):
+        start = time.perf_counter()
+        added = size - len(contents)
+        while len(contents) < size:
+            text = next(claims)
+            index.add(f"urn:report:{len(contents)}", text)
+            contents.append(text)
+        add_us = (time.perf_counter() - start) * 1e6 / max(added, 1)
+
+        queries = []
+        for claim_id in rng.sample(range(len(contents)), min(args.queries, len(contents))):
+            keywords = [w for w in contents[claim_id].split()[:10] if len(w) > 4]
+            if keywords:
+                queries.append((claim_id, keywords))
+
+        index_ms, index_hits = 0.0, 0
+        for claim_id, keywords in queries:
+            hits, ms = timed(index.search, keywords, 3)
+            index_ms += ms
+            index_hits += f"urn:report:{claim_id}" in {report for report, _ in hits}
+        regex_ms, regex_hits = 0.0, 0
+        for claim_id, keywords in queries[:args.regex_queries]:
+            hits, ms = timed(regex_search, contents, keywords)
+            regex_ms += ms
+            regex_hits += claim_id in hits
+
+        index_ms /= len(queries)
+        regex_n = min(len(queries), args.regex_queries)
+        regex_ms /= regex_n
+        megabytes = index.get_statistics()['bytes'] / 1e6
+        print(f"  {size:8d} {add_us:7.1f} {megabytes:7.1f} {regex_ms:9.2f} {index_ms:9.3f} "
+              f"{regex_ms / index_ms:7.0f}x {regex_hits / regex_n:13.2f} {index_hits / len(queries):13.2f}")
+
+
+if __name__ == '__main__':
+    main()
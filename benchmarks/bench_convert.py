@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TREC Converter Throughput Benchmark - SysCRED
+==============================================
+Docs/second of the AP gz -> JSONL conversion:
+- serial convert_trec_to_jsonl (baseline)
+- convert_trec_parallel at 1..N workers, single file and zstd shards
+- convert_trec_parallel with the in-memory index built in the same pass
+
+Without --trec-dir, synthetic AP-style gz files are written to a
+temporary directory (--files x --docs-per-file documents).
+
+Usage:
+    python benchmarks/bench_convert.py --trec-dir trec_ap88_90/ --workers 1 4 8
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import gzip
+import os
+import tempfile
+import time
+
+from bench_utils import synthetic_corpus
+from syscred.convert_trec import convert_trec_parallel, convert_trec_to_jsonl, HAS_ZSTD
+from syscred.trec_retriever import TRECRetriever
+
+
+def write_synthetic_trec(directory: str, files: int, docs_per_file: int):
+    corpus = list(synthetic_corpus(files * docs_per_file).values())
+    for f in range(files):
+        with gzip.open(os.path.join(directory, f"ap{f:04d}.gz"), 'wt', encoding='latin-1') as out:
+            for i in range(f * docs_per_file, (f + 1) * docs_per_file):
+                out.write(f"<DOC>\n<DOCNO> AP{i:08d} </DOCNO>\n<TEXT>\n{corpus[i]['text']}\n</TEXT>\n</DOC>\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TREC converter throughput benchmark")
+    parser.add_argument('--trec-dir', help="Directory of AP gz files")
+    parser.add_argument('--files', type=int, default=16)
+    parser.add_argument('--docs-per-file', type=int, default=1000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trec_dir = args.trec_dir
+        if not trec_dir:
+            trec_dir = os.path.join(tmp, "trec")
+            os.mkdir(trec_dir)
+            write_synthetic_trec(trec_dir, args.files, args.docs_per_file)
+
+        start = time.perf_counter()
+        docs = convert_trec_to_jsonl(trec_dir, os.path.join(tmp, "serial.jsonl"))
+        serial = docs / (time.perf_counter() - start)
+
+        rows = []
+        for workers in sorted(set(args.workers)):
+            single = convert_trec_parallel(trec_dir, os.path.join(tmp, "out.jsonl"), workers=workers)
+            shards = convert_trec_parallel(
+                trec_dir, os.path.join(tmp, f"shards{workers}"), workers=workers, shards=True, compress=True
+            )
+            retriever = TRECRetriever(tokenizer='regex', enable_prf=False)
+            indexed = convert_trec_parallel(
+                trec_dir, os.path.join(tmp, "indexed.jsonl"), workers=workers, retriever=retriever
+            )
+            rows.append((workers, single, shards, indexed))
+
+    print(f"\n{docs} documents, serial baseline {serial:.0f} docs/s, cpus={os.cpu_count()}")
+    print("=" * 72)
+    shard_label = "zstd shards" if HAS_ZSTD else "shards"
+    print(f"  {'workers':>7} {'jsonl docs/s':>13} {shard_label + ' docs/s':>19} {'+index docs/s':>14} {'index s':>8}")
+    for workers, single, shards, indexed in rows:
+        print(f"  {workers:7d} {single['docs_per_sec']:13.0f} {shards['docs_per_sec']:19.0f} "
+              f"{indexed['docs_per_sec']:14.0f} {indexed['index_seconds']:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
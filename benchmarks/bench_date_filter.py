@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Date-Range Filtering Benchmark - SysCRED
+=========================================
+Query latency of the in-memory index for unrestricted queries vs
+date-restricted ones (one month, one quarter, one year of AP88-90):
+- range skipping: postings read between two bisected doc numbers
+- post-filtering: full ranking, then dated results kept (the
+  baseline the range skipping replaces; needs a deeper top-k)
+
+Without --corpus a synthetic AP-style collection is used.
+
+Usage:
+    python benchmarks/bench_date_filter.py --corpus ap_corpus.jsonl --topics topics/ --qrels qrels/
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+from collections import Counter
+
+from bench_utils import load_corpus, synthetic_topics, load_topics_qrels, timed
+from syscred.trec_retriever import TRECRetriever
+from syscred.inverted_index import doc_date
+
+WINDOWS = [
+    ("1 month", (19880401, 19880430)),
+    ("1 quarter", (19890101, 19890331)),
+    ("1 year", (19900101, 19901231)),
+]
+
+
+def post_filter(snapshot, weights, k, date_range):
+    lo, hi = date_range
+    hits = snapshot.search_bm25(weights, snapshot.num_docs, 0.9, 0.4)
+    return [(d, s) for d, s in hits if lo <= doc_date(d) <= hi][:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Date-range filtering benchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--topics', help="TREC topics file/directory")
+    parser.add_argument('--qrels', help="TREC qrels file/directory")
+    parser.add_argument('--k', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.docs)
+    queries, _ = load_topics_qrels(args.topics, args.qrels)
+    queries = queries or synthetic_topics()
+
+    retriever = TRECRetriever(tokenizer='regex', enable_prf=False, query_cache_size=0)
+    retriever.corpus = corpus
+    snapshot = retriever.index.snapshot()
+    weights = [Counter(retriever.ir_engine.analyze(q)) for q in queries.values()]
+
+    def mean_ms(func):
+        return sum(timed(func, w, repeat=args.repeat)[1] for w in weights) / len(weights)
+
+    full_ms = mean_ms(lambda w: snapshot.search_bm25(w, args.k, 0.9, 0.4))
+    print(f"Corpus: {len(corpus)} docs, {len(queries)} queries, k={args.k}")
+    print("=" * 66)
+    print(f"  {'window':<10} {'docs':>7} {'range skip ms':>14} {'post-filter ms':>15} {'vs full':>9}")
+    print(f"  {'none':<10} {len(corpus):7d} {full_ms:14.2f} {'-':>15} {'1.00x':>9}")
+    for label, date_range in WINDOWS:
+        in_window = sum(1 for d in corpus if date_range[0] <= doc_date(d) <= date_range[1])
+        skip_ms = mean_ms(lambda w: snapshot.search_bm25(w, args.k, 0.9, 0.4, date_range=date_range))
+        post_ms = mean_ms(lambda w: post_filter(snapshot, w, args.k, date_range))
+        print(f"  {label:<10} {in_window:7d} {skip_ms:14.2f} {post_ms:15.2f} {full_ms / skip_ms:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dense Index Benchmark - SysCRED
+================================
+Query latency and recall@10 of the dense evidence index:
+float16 / int8 storage, exact blocked search vs. IVF probing.
+
+MiniLM is not needed: vectors are clustered random 384-d embeddings
+(same shape as all-MiniLM-L6-v2), ground truth is exact float32 search.
+With sentence-transformers installed, --corpus embeds real AP documents.
+
+Usage:
+    python benchmarks/bench_dense.py --docs 200000 --nlist 1024
+    python benchmarks/bench_dense.py --corpus ap_corpus.jsonl --docs 20000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import tempfile
+
+import numpy as np
+
+from bench_utils import load_corpus, synthetic_topics, timed
+from syscred.dense_index import DenseIndex
+
+
+def clustered_vectors(n, dim=384, clusters=200, seed=13):
+    """Embeddings grouped around topic centres, like sentence embeddings."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    return DenseIndex.normalize(centres[labels] + 0.9 * rng.standard_normal((n, dim)).astype(np.float32))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dense index benchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus (needs sentence-transformers)")
+    parser.add_argument('--docs', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--nlist', type=int, default=1024)
+    args = parser.parse_args()
+
+    if args.corpus:
+        from sentence_transformers import SentenceTransformer
+        encoder = SentenceTransformer('all-MiniLM-L6-v2')
+        corpus = load_corpus(args.corpus, args.docs)
+        doc_ids = list(corpus)
+        vectors = DenseIndex.normalize(encoder.encode([corpus[d]['text'] for d in doc_ids], batch_size=256))
+        queries = DenseIndex.normalize(encoder.encode(list(synthetic_topics().values())))
+    else:
+        vectors = clustered_vectors(args.docs)
+        doc_ids = [f"D{i}" for i in range(len(vectors))]
+        queries = clustered_vectors(args.queries, seed=29)
+
+    truth = [set(np.argsort(-(vectors @ q))[:10]) for q in queries]
+    truth = [{doc_ids[i] for i in t} for t in truth]
+    print(f"Vectors: {vectors.shape[0]} x {vectors.shape[1]}, {len(queries)} queries")
+    print("=" * 72)
+    print(f"  {'configuration':<28} {'MB':>8} {'ms/query':>10} {'recall@10':>10}")
+
+    configurations = [("float16 exact", 'float16', 0, None), ("int8 exact", 'int8', 0, None)]
+    for nprobe in (8, 32):
+        configurations.append((f"int8 IVF{args.nlist} nprobe={nprobe}", 'int8', args.nlist, nprobe))
+
+    built = {}
+    for label, dtype, nlist, nprobe in configurations:
+        if (dtype, nlist) not in built:
+            index = DenseIndex.from_vectors(doc_ids, vectors, dtype=dtype, nlist=nlist)
+            directory = tempfile.mkdtemp(prefix="dense_")
+            index.save(directory)
+            built[(dtype, nlist)] = DenseIndex.load(directory)
+        index = built[(dtype, nlist)]
+        size_mb = index.embeddings.nbytes / 1e6
+        total_ms = 0.0
+        recall = 0.0
+        for q, expected in zip(queries, truth):
+            hits, ms = timed(index.search, q, 10, nprobe=nprobe)
+            total_ms += ms
+            recall += len(expected & {d for d, _ in hits}) / 10
+        print(f"  {label:<28} {size_mb:8.1f} {total_ms / len(queries):10.2f} {recall / len(queries):10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Document Store Benchmark - SysCRED
+===================================
+Python heap held by the corpus as a dict of strings versus the
+block-compressed DocumentStore, for growing corpus sizes, plus random
+lookup latency (cold blocks and hot LRU hits) and on-disk size.
+
+Usage:
+    python benchmarks/bench_doc_store.py --corpus ap_corpus.jsonl --sizes 10000 50000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from bench_utils import load_corpus
+from syscred.doc_store import DocumentStore
+
+
+def heap_mb(build):
+    """Build an object and return (object, MB of Python heap it keeps)."""
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current / 1e6
+
+
+def lookup_us(store, doc_ids, repeat=2000, seed=3):
+    rng = random.Random(seed)
+    sample = [rng.choice(doc_ids) for _ in range(repeat)]
+    start = time.perf_counter()
+    for doc_id in sample:
+        store[doc_id]['text']
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Document store benchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000])
+    parser.add_argument('--cache', type=int, default=DocumentStore.DEFAULT_CACHE_SIZE)
+    args = parser.parse_args()
+
+    print(f"{'docs':>8} {'dict MB':>9} {'store MB':>9} {'disk MB':>8} {'cold us':>8} {'hot us':>8} {'codec':>6}")
+    for size in args.sizes:
+        source = load_corpus(args.corpus, size)
+        doc_ids = list(source)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'store')
+            DocumentStore.build(path, source.items(), cache_size=args.cache).close()
+            records = list(source.items())
+            del source
+
+            # The dict copies every string, as _load_corpus does
+            corpus, dict_mb = heap_mb(lambda: {d: {'text': ''.join(doc['text']), 'title': doc['title']} for d, doc in records})
+            del corpus, records
+            store, store_mb = heap_mb(lambda: DocumentStore.open(path, cache_size=args.cache))
+
+            cold = lookup_us(DocumentStore.open(path, cache_size=0), doc_ids)
+            hot_ids = doc_ids[:min(len(doc_ids), args.cache)]
+            lookup_us(store, hot_ids)
+            hot = lookup_us(store, hot_ids)
+            disk = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 1e6
+            print(f"{size:8d} {dict_mb:9.1f} {store_mb:9.1f} {disk:8.1f} {cold:8.1f} {hot:8.2f} {store.codec:>6}")
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Domain History Benchmark - SysCRED
+===================================
+Latency of a source-history lookup as the data graph grows:
+- sparql: prepared FILTER(CONTAINS(STR(?url), ?domain)) query over the
+  union graph (scans every informationURL literal)
+- index: OntologyManager.domain_history (dict lookup)
+plus the one-off cost of rebuilding the index from the graph.
+
+Usage:
+    python benchmarks/bench_domain_history.py --evaluations 100 1000 5000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+
+from rdflib import Literal
+
+from bench_utils import timed
+from syscred.ontology_manager import OntologyManager, SOURCE_HISTORY_QUERY
+
+BASE_ONTOLOGY = os.path.join(os.path.dirname(__file__), '..', 'ontology', 'sysCRED_onto26avrtil.ttl')
+DOMAINS = ["lemonde.fr", "bbc.co.uk", "reuters.com", "infowars.com", "apnews.com", "example.org"]
+
+
+def sparql_history(om, domain, limit):
+    rows = om.union_graph.query(SOURCE_HISTORY_QUERY, initBindings={'domain': Literal(domain)})
+    return [float(row.score) for row in rows][:limit]
+
+
+def index_history(om, domain, limit):
+    return [entry.score for entry in om.domain_history.recent(domain, limit)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Domain history index benchmark")
+    parser.add_argument('--evaluations', type=int, nargs='+', default=[100, 500, 1000, 2000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    om = OntologyManager(base_ontology_path=BASE_ONTOLOGY)
+
+    print("=" * 66)
+    print(f"  {'evaluations':>11} {'triples':>8} {'sparql ms':>10} {'index ms':>10} {'speedup':>9} {'rebuild ms':>11}")
+    added = 0
+    for target in sorted(args.evaluations):
+        with contextlib.redirect_stdout(io.StringIO()):
+            while added < target:
+                domain = rng.choice(DOMAINS)
+                om.add_evaluation_triplets({
+                    'scoreCredibilite': rng.random(),
+                    'informationEntree': f"https://www.{domain}/article/{added}",
+                    'resumeAnalyse': "synthetic evaluation",
+                })
+                added += 1
+        expected = sparql_history(om, "lemonde.fr", 10)
+        assert index_history(om, "lemonde.fr", 10) == expected[:om.domain_history.size]
+        sparql_ms = timed(sparql_history, om, "lemonde.fr", 10, repeat=args.repeat)[1]
+        index_ms = timed(index_history, om, "lemonde.fr", 10, repeat=args.repeat)[1]
+        start = time.perf_counter()
+        om.rebuild_domain_index()
+        rebuild_ms = (time.perf_counter() - start) * 1000
+        print(f"  {added:11d} {len(om.union_graph):8d} {sparql_ms:10.2f} {index_ms:10.4f} "
+              f"{sparql_ms / index_ms:8.0f}x {rebuild_ms:11.1f}")
+
+
+if __name__ == '__main__':
+    main()
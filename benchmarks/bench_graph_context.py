@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphRAG Context Benchmark - SysCRED
+=====================================
+Graph context cost of one verify_information request as the history
+grows:
+- two-pass: get_context() then compute_context_score(), each running
+  its own history lookup and similar-claims search (previous behaviour,
+  reproduced by clearing the memo between the calls)
+- single-pass: GraphRAG.analyze(), one set of lookups for the text
+  context, the similar URIs and the scores
+
+Usage:
+    python benchmarks/bench_graph_context.py --evaluations 100 1000 5000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+
+from bench_utils import FILLER_WORDS, TOPIC_WORDS, timed
+from syscred.graph_rag import GraphRAG
+from syscred.ontology_manager import OntologyManager
+
+BASE_ONTOLOGY = os.path.join(os.path.dirname(__file__), '..', 'ontology', 'sysCRED_onto26avrtil.ttl')
+DOMAINS = ["lemonde.fr", "bbc.co.uk", "reuters.com", "infowars.com", "apnews.com", "example.org"]
+
+
+def synthetic_claim(rng):
+    words = rng.choices(FILLER_WORDS, k=8) + rng.choice(TOPIC_WORDS).split()
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def two_pass(rag, domain, keywords, claim):
+    rag._memo = None
+    rag.get_context(domain, keywords, claim)
+    rag._memo = None
+    return rag.compute_context_score(domain, keywords, claim)
+
+
+def single_pass(rag, domain, keywords, claim):
+    rag._memo = None
+    return rag.analyze(domain, keywords, claim)["context_score"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphRAG single-pass context benchmark")
+    parser.add_argument('--evaluations', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    om = OntologyManager(base_ontology_path=BASE_ONTOLOGY)
+    rag = GraphRAG(om)
+
+    print("=" * 56)
+    print(f"  {'evaluations':>11} {'two-pass ms':>12} {'single ms':>10} {'speedup':>8}")
+    added = 0
+    for target in sorted(args.evaluations):
+        with contextlib.redirect_stdout(io.StringIO()):
+            while added < target:
+                claim = synthetic_claim(rng)
+                entry = claim if rng.random() < 0.5 else f"https://www.{rng.choice(DOMAINS)}/{claim.replace(' ', '-')}"
+                om.add_evaluation_triplets({'scoreCredibilite': rng.random(), 'informationEntree': entry})
+                added += 1
+        claim = synthetic_claim(rng)
+        keywords = [w for w in claim.split()[:10] if len(w) > 4]
+        assert two_pass(rag, "lemonde.fr", keywords, claim) == single_pass(rag, "lemonde.fr", keywords, claim)
+        two_ms = timed(two_pass, rag, "lemonde.fr", keywords, claim, repeat=args.repeat)[1]
+        single_ms = timed(single_pass, rag, "lemonde.fr", keywords, claim, repeat=args.repeat)[1]
+        print(f"  {added:11d} {two_ms:12.3f} {single_ms:10.3f} {two_ms / single_ms:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Graph Snapshot Benchmark - SysCRED
+===================================
+OntologyManager cold start (base ontology + data graph) as the
+evaluation history grows:
+- ttl: rdflib Turtle parser on both files
+- snapshot: GraphSnapshotCache hit (term table + int32 triples)
+plus the size of the data file in each format. The first row is the
+repository's own ontology files.
+
+Usage:
+    python benchmarks/bench_graph_snapshot.py --evaluations 1000 5000 20000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+
+from bench_utils import timed
+from syscred.graph_snapshot import file_hash
+from syscred.ontology_manager import OntologyManager
+
+ONTOLOGY_DIR = os.path.join(os.path.dirname(__file__), '..', 'ontology')
+BASE_ONTOLOGY = os.path.join(ONTOLOGY_DIR, 'sysCRED_onto26avrtil.ttl')
+REPO_DATA = os.path.join(ONTOLOGY_DIR, 'sysCRED_data.ttl')
+DOMAINS = ["lemonde.fr", "bbc.co.uk", "reuters.com", "infowars.com", "apnews.com", "example.org"]
+
+
+def cold_start(data_path, snapshot_dir=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return timed(OntologyManager, BASE_ONTOLOGY, data_path, snapshot_dir=snapshot_dir)
+
+
+def report(label, data_path, snapshot_dir):
+    om, ttl_ms = cold_start(data_path)
+    cold_start(data_path, snapshot_dir)  # writes the snapshots
+    cached, snapshot_ms = cold_start(data_path, snapshot_dir)
+    assert cached.snapshots.stats["hits"] == 2 and len(cached.data_graph) == len(om.data_graph)
+    snapshot_kb = os.path.getsize(cached.snapshots.path_for(data_path, file_hash(data_path))) / 1024
+    print(f"  {label:>11} {len(om.data_graph):8d} {ttl_ms:9.0f} {snapshot_ms:12.0f} "
+          f"{ttl_ms / snapshot_ms:7.1f}x {os.path.getsize(data_path) / 1024:8.0f} {snapshot_kb:12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ontology snapshot cache benchmark")
+    parser.add_argument('--evaluations', type=int, nargs='+', default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    print("=" * 78)
+    print(f"  {'evaluations':>11} {'triples':>8} {'ttl ms':>9} {'snapshot ms':>12} {'speedup':>8} "
+          f"{'ttl KB':>8} {'snapshot KB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_copy = os.path.join(tmp, "repo_data.ttl")
+        shutil.copy(REPO_DATA, repo_copy)
+        report("repo", repo_copy, os.path.join(tmp, "cache"))
+
+        data_path = os.path.join(tmp, "data.ttl")
+        om = OntologyManager(data_path=data_path)
+        added = 0
+        for target in sorted(args.evaluations):
+            with contextlib.redirect_stdout(io.StringIO()):
+                while added < target:
+                    om.add_evaluation_triplets({
+                        'scoreCredibilite': rng.random(),
+                        'informationEntree': f"https://www.{rng.choice(DOMAINS)}/article/{added}",
+                        'resumeAnalyse': "synthetic evaluation",
+                    })
+                    added += 1
+                om.save_data()
+            report(str(added), data_path, os.path.join(tmp, "cache"))
+
+
+if __name__ == '__main__':
+    main()
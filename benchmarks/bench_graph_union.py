@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Knowledge Graph Union Benchmark - SysCRED
+==========================================
+Latency of a GraphRAG source-history query as the data graph grows:
+- copy: base_graph + data_graph merged into a new graph per query
+  (the previous behaviour, O(total triples) before the query starts)
+- view: the OntologyManager read-only union (no copy)
+
+The data graph is filled with synthetic evaluations
+(add_evaluation_triplets), about 15 triples each, on top of the
+base ontology in ontology/.
+
+Usage:
+    python benchmarks/bench_graph_union.py --evaluations 100 1000 5000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+
+from bench_utils import timed
+from syscred.ontology_manager import OntologyManager
+
+BASE_ONTOLOGY = os.path.join(os.path.dirname(__file__), '..', 'ontology', 'sysCRED_onto26avrtil.ttl')
+DOMAINS = ["lemonde.fr", "bbc.com", "reuters.com", "infowars.com", "apnews.com", "example.org"]
+
+
+def history_query(domain):
+    return """
+    PREFIX cred: <https://syscred.uqam.ca/ontology#>
+    SELECT ?score ?timestamp WHERE {
+        ?info cred:informationURL ?url .
+        ?request cred:concernsInformation ?info .
+        ?report cred:isReportOf ?request .
+        ?report cred:credibilityScoreValue ?score .
+        ?report cred:completionTimestamp ?timestamp .
+        FILTER(CONTAINS(STR(?url), "%s"))
+    }
+    ORDER BY DESC(?timestamp)
+    LIMIT 10
+    """ % domain
+
+
+def copy_history(om, domain):
+    """Previous behaviour: query a merged copy of both graphs."""
+    combined = om.base_graph + om.data_graph
+    return list(combined.query(history_query(domain)))
+
+
+def view_history(om, domain):
+    return list(om.union_graph.query(history_query(domain)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge graph union benchmark")
+    parser.add_argument('--evaluations', type=int, nargs='+', default=[100, 500, 1000, 2000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    om = OntologyManager(base_ontology_path=BASE_ONTOLOGY)
+
+    print(f"Base ontology: {len(om.base_graph)} triples")
+    print("=" * 62)
+    print(f"  {'evaluations':>11} {'data triples':>13} {'copy ms':>10} {'view ms':>10} {'speedup':>9}")
+    added = 0
+    for target in sorted(args.evaluations):
+        with contextlib.redirect_stdout(io.StringIO()):
+            while added < target:
+                domain = rng.choice(DOMAINS)
+                om.add_evaluation_triplets({
+                    'scoreCredibilite': rng.random(),
+                    'informationEntree': f"https://www.{domain}/article/{added}",
+                    'resumeAnalyse': "synthetic evaluation",
+                })
+                added += 1
+        copy_ms = timed(copy_history, om, "bbc.com", repeat=args.repeat)[1]
+        view_ms = timed(view_history, om, "bbc.com", repeat=args.repeat)[1]
+        print(f"  {added:11d} {len(om.data_graph):13d} {copy_ms:10.2f} {view_ms:10.2f} {copy_ms / view_ms:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
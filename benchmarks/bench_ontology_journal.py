@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ontology Journal Benchmark - SysCRED
+=====================================
+Cost of saving one evaluation as the data graph grows:
+- ttl: save_data() re-serializes the whole data graph to Turtle
+  (previous behaviour, journal disabled)
+- journal: save_data() appends the new triples as one N-Triples batch
+  (fsync every 8 batches)
+plus the startup cost of each layout (Turtle parse vs. snapshot +
+journal replay) and of one compaction.
+
+Usage:
+    python benchmarks/bench_ontology_journal.py --evaluations 100 1000 5000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from bench_utils import timed
+from syscred.ontology_manager import OntologyManager
+
+DOMAINS = ["lemonde.fr", "bbc.co.uk", "reuters.com", "infowars.com", "apnews.com", "example.org"]
+
+
+def evaluation(rng, i):
+    return {
+        'scoreCredibilite': rng.random(),
+        'informationEntree': f"https://www.{rng.choice(DOMAINS)}/article/{i}",
+        'resumeAnalyse': "synthetic evaluation",
+    }
+
+
+def save_one(om, rng, i):
+    om.add_evaluation_triplets(evaluation(rng, i))
+    return om.save_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ontology journal benchmark")
+    parser.add_argument('--evaluations', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--saves', type=int, default=20, help="Timed saves per size")
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    with tempfile.TemporaryDirectory() as tmp:
+        ttl_path, journal_path = os.path.join(tmp, "ttl.ttl"), os.path.join(tmp, "journal.ttl")
+        managers = {
+            'ttl': OntologyManager(data_path=ttl_path),
+            'journal': OntologyManager(data_path=journal_path, journal=True, journal_compact_bytes=10 ** 12),
+        }
+
+        print("=" * 92)
+        print(f"  {'evaluations':>11} {'triples':>8} {'ttl save ms':>12} {'journal save ms':>16} {'speedup':>8} "
+              f"{'ttl load ms':>12} {'replay ms':>10} {'compact ms':>11}")
+        added = 0
+        for target in sorted(args.evaluations):
+            with contextlib.redirect_stdout(io.StringIO()):
+                while added < target:
+                    item = evaluation(rng, added)
+                    for om in managers.values():
+                        om.add_evaluation_triplets(item)
+                    added += 1
+                for om in managers.values():
+                    om.save_data()
+                save_ms = {}
+                for name, om in managers.items():
+                    save_ms[name] = timed(save_one, om, rng, added, repeat=args.saves)[1]
+                added += args.saves
+                managers['journal'].close()
+
+                load_ms = {}
+                for name, path in (('ttl', ttl_path), ('journal', journal_path)):
+                    start = time.perf_counter()
+                    OntologyManager(data_path=path, journal=name == 'journal')
+                    load_ms[name] = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                managers['journal'].compact_journal(wait=True)
+                compact_ms = (time.perf_counter() - start) * 1000
+            print(f"  {added:11d} {len(managers['ttl'].data_graph):8d} {save_ms['ttl']:12.2f} "
+                  f"{save_ms['journal']:16.3f} {save_ms['ttl'] / save_ms['journal']:7.0f}x "
+                  f"{load_ms['ttl']:12.1f} {load_ms['journal']:10.1f} {compact_ms:11.1f}")
+
+
+if __name__ == '__main__':
+    main()
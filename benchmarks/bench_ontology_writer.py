@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ontology Writer Benchmark - SysCRED
+====================================
+Latency seen by request threads for add_evaluation_triplets() +
+save_data() while other threads query the graph:
+- sync: the request thread adds the triples and saves (TTL rewrite, or
+  journal append)
+- background: the request is queued for the single writer thread
+plus the time the writer needs to drain the queue afterwards.
+
+Usage:
+    python benchmarks/bench_ontology_writer.py --evaluations 1000 5000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from bench_utils import timed
+from syscred.ontology_manager import OntologyManager
+
+DOMAINS = ["lemonde.fr", "bbc.co.uk", "reuters.com", "infowars.com", "apnews.com", "example.org"]
+
+
+def evaluation(rng, i):
+    return {
+        'scoreCredibilite': rng.random(),
+        'informationEntree': f"https://www.{rng.choice(DOMAINS)}/article/{i}",
+        'resumeAnalyse': "synthetic evaluation",
+    }
+
+
+def run(om, threads, requests):
+    """Per-request latencies (ms) of concurrent writers, with one reader running."""
+    latencies, done = [], threading.Event()
+
+    def request(worker):
+        rng = random.Random(worker)
+        for i in range(requests):
+            start = time.perf_counter()
+            om.add_evaluation_triplets(evaluation(rng, f"{worker}-{i}"))
+            om.save_data()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    def read():
+        while not done.is_set():
+            om.query_source_history("lemonde.fr")
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    writers = [threading.Thread(target=request, args=(w,)) for w in range(threads)]
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    _, drain_ms = timed(om.flush)
+    done.set()
+    reader.join()
+    return sorted(latencies), drain_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ontology writer benchmark")
+    parser.add_argument('--evaluations', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=10, help="Requests per thread")
+    args = parser.parse_args()
+
+    print("=" * 84)
+    print(f"  {'evaluations':>11} {'persistence':>11} {'mode':>10} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'max ms':>9} {'drain ms':>9}")
+    rng = random.Random(13)
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_path = os.path.join(tmp, "seed.ttl")
+        seed = OntologyManager(data_path=seed_path)
+        added = 0
+        for target in sorted(args.evaluations):
+            with contextlib.redirect_stdout(io.StringIO()):
+                while added < target:
+                    seed.add_evaluation_triplets(evaluation(rng, added))
+                    added += 1
+                seed.save_data()
+            for journal in (False, True):
+                for background in (False, True):
+                    data_path = os.path.join(tmp, f"run_{journal}_{background}.ttl")
+                    shutil.copy(seed_path, data_path)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        om = OntologyManager(data_path=data_path, journal=journal, background_writes=background)
+                        latencies, drain_ms = run(om, args.threads, args.requests)
+                        om.close()
+                    print(f"  {added:11d} {'journal' if journal else 'ttl':>11} "
+                          f"{'background' if background else 'sync':>10} {statistics.median(latencies):9.2f} "
+                          f"{latencies[int(0.95 * (len(latencies) - 1))]:9.2f} {latencies[-1]:9.2f} {drain_ms:9.0f}")
+
+
+if __name__ == '__main__':
+    main()
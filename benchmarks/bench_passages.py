@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Passage Mode Benchmark - SysCRED
+=================================
+Compares document-level retrieval with passage mode (MaxP ranking,
+best passage as evidence text): evidence characters handed to the
+downstream stages (SBERT, ontology, JSON), query latency, and MAP.
+
+Without --corpus/--topics/--qrels a synthetic AP-style collection is used.
+
+Usage:
+    python benchmarks/bench_passages.py --corpus ap_corpus.jsonl --topics topics/ --qrels qrels/
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import time
+
+from bench_utils import load_corpus, synthetic_topics, synthetic_qrels, load_topics_qrels, timed
+from syscred.trec_retriever import TRECRetriever
+from syscred.passage_index import PassageIndex
+from syscred.eval_metrics import EvaluationMetrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Passage mode benchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--topics', help="TREC topics file/directory")
+    parser.add_argument('--qrels', help="TREC qrels file/directory")
+    parser.add_argument('--k', type=int, default=10, help="Evidence per query")
+    parser.add_argument('--eval-k', type=int, default=1000, help="Depth of the MAP runs")
+    parser.add_argument('--size', type=int, default=PassageIndex.DEFAULT_SIZE)
+    parser.add_argument('--stride', type=int, default=PassageIndex.DEFAULT_STRIDE)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.docs)
+    queries, qrels = load_topics_qrels(args.topics, args.qrels)
+    if not queries:
+        queries, qrels = synthetic_topics(), synthetic_qrels(corpus)
+
+    metrics = EvaluationMetrics()
+    rows = []
+    for label, passage_mode in [("documents", False), ("passages", True)]:
+        retriever = TRECRetriever(
+            tokenizer='regex', enable_prf=False, passage_mode=passage_mode, query_cache_size=0,
+            passage_size=args.size, passage_stride=args.stride
+        )
+        start = time.perf_counter()
+        retriever.corpus = corpus
+        index_s = time.perf_counter() - start
+
+        chars = 0
+        total_ms = 0.0
+        for query in queries.values():
+            result, ms = timed(retriever.retrieve_evidence, query, k=args.k)
+            chars += sum(len(e.text) for e in result.evidences)
+            total_ms += ms
+        run = {
+            qid: [(e.doc_id, e.score) for e in retriever.retrieve_evidence(query, k=args.eval_k).evidences]
+            for qid, query in queries.items()
+        }
+        scores = metrics.compute_aggregate(metrics.evaluate_run(run, qrels, ['map', 'P_10']))
+        rows.append((label, index_s, total_ms / len(queries), chars / len(queries), scores.get('map', 0.0), scores.get('P_10', 0.0)))
+
+    print(f"Corpus: {len(corpus)} docs, {len(queries)} queries, k={args.k}, passages {args.size}/{args.stride} words")
+    print("=" * 72)
+    print(f"  {'mode':<10} {'index s':>8} {'ms/query':>10} {'chars/query':>12} {'MAP':>8} {'P@10':>8}")
+    for label, index_s, ms, chars, map_score, p10 in rows:
+        print(f"  {label:<10} {index_s:8.2f} {ms:10.2f} {chars:12.0f} {map_score:8.4f} {p10:8.4f}")
+    print(f"\n  Evidence text reduction: {1 - rows[1][3] / max(rows[0][3], 1):.1%}")
+
+
+if __name__ == '__main__':
+    main()
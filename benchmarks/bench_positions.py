@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Positional Index Benchmark - SysCRED
+=====================================
+Cost of the optional positional layer relative to the plain index:
+- build time and memory (postings, term vectors, delta-varint positions)
+- query latency: plain BM25, exact phrase queries (the first two words
+  of each topic, quoted) and the proximity boost
+- MAP/P@10 of the proximity boost vs plain BM25
+
+Without --corpus/--topics/--qrels a synthetic AP-style collection is used.
+
+Usage:
+    python benchmarks/bench_positions.py --corpus ap_corpus.jsonl --topics topics/ --qrels qrels/
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import time
+
+from bench_utils import load_corpus, synthetic_topics, synthetic_qrels, load_topics_qrels, timed
+from syscred.trec_retriever import TRECRetriever
+from syscred.eval_metrics import EvaluationMetrics
+
+
+def build(corpus, **kwargs):
+    retriever = TRECRetriever(tokenizer='regex', enable_prf=False, query_cache_size=0, **kwargs)
+    start = time.perf_counter()
+    retriever.corpus = corpus
+    return retriever, time.perf_counter() - start
+
+
+def run_queries(retriever, queries, k):
+    run, total_ms = {}, 0.0
+    for qid, query in queries.items():
+        result, ms = timed(retriever.retrieve_evidence, query, k=k)
+        run[qid] = [(e.doc_id, e.score) for e in result.evidences]
+        total_ms += ms
+    return run, total_ms / max(len(queries), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Positional index benchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--topics', help="TREC topics file/directory")
+    parser.add_argument('--qrels', help="TREC qrels file/directory")
+    parser.add_argument('--k', type=int, default=1000, help="Depth of the runs")
+    parser.add_argument('--proximity-weight', type=float, default=1.0)
+    parser.add_argument('--window', type=int, default=8)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.docs)
+    queries, qrels = load_topics_qrels(args.topics, args.qrels)
+    if not queries:
+        queries, qrels = synthetic_topics(), synthetic_qrels(corpus)
+    phrase_queries = {
+        qid: f'"{" ".join(query.split()[:2])}" {" ".join(query.split()[2:])}'
+        for qid, query in queries.items() if len(query.split()) >= 2
+    }
+
+    plain, plain_build = build(corpus)
+    positional, positional_build = build(
+        corpus, positions=True, proximity_window=args.window
+    )
+    plain_size = plain.index.size_bytes()
+    positional_size = positional.index.size_bytes()
+    base = plain_size["postings"] + plain_size["term_vectors"]
+
+    metrics = EvaluationMetrics()
+    rows = []
+    plain_run, ms = run_queries(plain, queries, args.k)
+    rows.append(("BM25 (plain index)", ms, plain_run))
+    run, ms = run_queries(positional, queries, args.k)
+    rows.append(("BM25 (positional)", ms, run))
+    positional.proximity_weight = args.proximity_weight
+    run, ms = run_queries(positional, queries, args.k)
+    rows.append((f"proximity w={args.proximity_weight:g}", ms, run))
+    positional.proximity_weight = 0.0
+    run, ms = run_queries(positional, phrase_queries, args.k)
+    rows.append(("quoted phrase", ms, None))
+
+    print(f"Corpus: {len(corpus)} docs, {len(queries)} queries, k={args.k}")
+    print("=" * 64)
+    print(f"  build s      plain {plain_build:8.2f}   positional {positional_build:8.2f}")
+    print(f"  postings+tv  {base / 1e6:8.1f} MB   positions {positional_size['positions'] / 1e6:8.1f} MB"
+          f" (+{positional_size['positions'] / max(base, 1):.0%})")
+    print(f"\n  {'query':<22} {'ms/query':>10} {'MAP':>8} {'P@10':>8}")
+    for label, ms, run in rows:
+        if run is None:
+            print(f"  {label:<22} {ms:10.2f} {'-':>8} {'-':>8}")
+            continue
+        scores = metrics.compute_aggregate(metrics.evaluate_run(run, qrels, ['map', 'P_10']))
+        print(f"  {label:<22} {ms:10.2f} {scores.get('map', 0.0):8.4f} {scores.get('P_10', 0.0):8.4f}")
+
+
+if __name__ == '__main__':
+    main()
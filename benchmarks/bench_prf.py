@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PRF Round-Trip Benchmark - SysCRED
+===================================
+Cost of the feedback step relative to the first BM25 pass:
+- legacy: re-analyze the full text of the top docs, append terms to the
+  query string, re-analyze the expanded query
+- RM3: read stored term vectors, build weights, search postings directly
+
+Usage:
+    python benchmarks/bench_prf.py --corpus /path/to/ap_corpus.jsonl --docs 20000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+
+from bench_utils import load_corpus, synthetic_topics, load_topics_qrels, timed
+from syscred.trec_retriever import TRECRetriever
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PRF round-trip benchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--topics', help="TREC topics file/directory")
+    parser.add_argument('--qrels', help="TREC qrels file/directory")
+    args = parser.parse_args()
+
+    retriever = TRECRetriever(use_stemming=True, enable_prf=False)
+    retriever.corpus = load_corpus(args.corpus, args.docs)
+    queries, _ = load_topics_qrels(args.topics, args.qrels)
+    queries = queries or synthetic_topics()
+    top = retriever.prf_top_docs
+
+    first_ms = legacy_ms = rm3_ms = 0.0
+    for query in queries.values():
+        terms = retriever.ir_engine.analyze(query)
+        processed = ' '.join(terms)
+        snapshot = retriever.index.snapshot()
+        response, ms = timed(retriever._search_in_memory, processed, 10, snapshot=snapshot)
+        first_ms += ms
+        top_results = response.results[:top]
+
+        def legacy():
+            expanded = retriever._apply_prf(query, top_results)
+            return retriever.ir_engine.preprocess(expanded)
+
+        def rm3():
+            return retriever._rm3_weights(terms, top_results, snapshot)
+
+        expanded, ms = timed(legacy)
+        legacy_ms += ms
+        _, ms_second = timed(retriever._search_in_memory, expanded, 10, snapshot=snapshot)
+        legacy_ms += ms_second
+
+        weights, ms = timed(rm3)
+        rm3_ms += ms
+        _, ms_second = timed(retriever._search_in_memory, processed, 10, query_weights=weights, snapshot=snapshot)
+        rm3_ms += ms_second
+
+    n = len(queries)
+    print(f"Corpus: {len(retriever.corpus)} docs, {n} queries, feedback docs: {top}")
+    print("=" * 60)
+    print(f"  first pass            {first_ms / n:9.2f} ms/query")
+    print(f"  legacy PRF round trip {legacy_ms / n:9.2f} ms/query  ({legacy_ms / first_ms:.2f}x first pass)")
+    print(f"  RM3 round trip        {rm3_ms / n:9.2f} ms/query  ({rm3_ms / first_ms:.2f}x first pass)")
+
+
+if __name__ == '__main__':
+    main()
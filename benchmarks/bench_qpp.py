@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+QPP-Gated PRF Benchmark - SysCRED
+==================================
+Runs every topic with PRF always on, PRF off, and PRF gated by the
+query performance predictor; reports the fraction of second passes
+avoided and the MAP of each run.
+
+Without --corpus/--topics/--qrels a synthetic AP-style collection is used
+(topic words plus generic news words, so some queries are hard).
+
+Usage:
+    python benchmarks/bench_qpp.py --corpus ap_corpus.jsonl --topics topics/ --qrels qrels/
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import random
+
+from bench_utils import (
+    load_corpus, synthetic_qrels, load_topics_qrels, timed,
+    TOPIC_WORDS, FILLER_WORDS
+)
+from syscred.trec_retriever import TRECRetriever
+from syscred.qpp import QueryPerformancePredictor
+from syscred.eval_metrics import EvaluationMetrics
+
+
+def synthetic_queries(num_queries: int, seed: int = 5):
+    """Queries of 1-3 topic words plus 0-3 generic words, with their topic id."""
+    rng = random.Random(seed)
+    queries = {}
+    for n in range(num_queries):
+        topic = n % len(TOPIC_WORDS)
+        words = rng.sample(TOPIC_WORDS[topic].split(), rng.randint(1, 3))
+        words += rng.sample(FILLER_WORDS, rng.randint(0, 3))
+        queries[f"{51 + topic}.{n}"] = ' '.join(words)
+    return queries
+
+
+def run(retriever, queries, k, use_prf):
+    """Return ({qid: [(doc_id, score)]}, ms/query)."""
+    results = {}
+    total_ms = 0.0
+    for qid, query in queries.items():
+        result, ms = timed(retriever.retrieve_evidence, query, k=k, use_prf=use_prf)
+        results[qid] = [(e.doc_id, e.score) for e in result.evidences]
+        total_ms += ms
+    return results, total_ms / max(len(queries), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QPP-gated PRF benchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--topics', help="TREC topics file/directory")
+    parser.add_argument('--qrels', help="TREC qrels file/directory")
+    parser.add_argument('--queries', type=int, default=80, help="Synthetic queries")
+    parser.add_argument('--k', type=int, default=1000)
+    args = parser.parse_args()
+
+    retriever = TRECRetriever(use_stemming=True, enable_prf=True, query_cache_size=0)
+    retriever.corpus = load_corpus(args.corpus, args.docs)
+    queries, qrels = load_topics_qrels(args.topics, args.qrels)
+    if not queries:
+        queries = synthetic_queries(args.queries)
+        topic_qrels = synthetic_qrels(retriever.corpus)
+        qrels = {qid: topic_qrels[qid.split('.')[0]] for qid in queries}
+
+    metrics = EvaluationMetrics()
+    rows = []
+    for label, predictor, use_prf in [
+        ("no PRF", None, False),
+        ("PRF always", None, True),
+        ("PRF + QPP", QueryPerformancePredictor(), True),
+    ]:
+        retriever.prf_predictor = predictor
+        retriever.stats["prf_passes"] = retriever.stats["prf_skipped"] = 0
+        results, ms = run(retriever, queries, args.k, use_prf)
+        scores = metrics.compute_aggregate(metrics.evaluate_run(results, qrels, ['map', 'P_10']))
+        passes, skipped = retriever.stats["prf_passes"], retriever.stats["prf_skipped"]
+        avoided = skipped / (passes + skipped) if passes + skipped else 0.0
+        rows.append((label, scores.get('map', 0.0), scores.get('P_10', 0.0), ms, avoided))
+
+    print(f"Corpus: {len(retriever.corpus)} docs, {len(queries)} queries, k={args.k}")
+    print("=" * 64)
+    print(f"  {'run':<12} {'MAP':>8} {'P@10':>8} {'ms/query':>10} {'PRF avoided':>12}")
+    for label, map_score, p10, ms, avoided in rows:
+        print(f"  {label:<12} {map_score:8.4f} {p10:8.4f} {ms:10.2f} {avoided:11.1%}")
+
+
+if __name__ == '__main__':
+    main()
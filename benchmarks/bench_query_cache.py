@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Query Cache Benchmark - SysCRED
+================================
+Replays a skewed query stream (a few viral claims asked over and over,
+a long tail of one-off queries) with and without the query cache, and
+reports hit rate and mean latency. Live documents are ingested along
+the way, so part of the cache is invalidated as in production.
+
+Usage:
+    python benchmarks/bench_query_cache.py --docs 20000 --stream 2000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import random
+import time
+
+from bench_utils import load_corpus, TOPIC_WORDS, FILLER_WORDS
+from syscred.trec_retriever import TRECRetriever
+
+
+def query_stream(length: int, distinct: int, seed: int = 11):
+    """Zipf-distributed picks among `distinct` synthetic claims."""
+    rng = random.Random(seed)
+    claims = []
+    for n in range(distinct):
+        words = rng.sample(TOPIC_WORDS[n % len(TOPIC_WORDS)].split(), 3) + rng.sample(FILLER_WORDS, 2)
+        claims.append(' '.join(words))
+    weights = [1.0 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(claims, weights=weights, k=length)
+
+
+def replay(retriever, stream, ingest_every: int):
+    start = time.perf_counter()
+    for i, claim in enumerate(stream):
+        retriever.retrieve_evidence(claim, k=10)
+        if ingest_every and i and i % ingest_every == 0:
+            retriever.add_document(f"web-{i}", claim + " reported by a live source")
+    return (time.perf_counter() - start) * 1000 / len(stream)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query cache benchmark")
+    parser.add_argument('--corpus', help="AP JSONL corpus")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--stream', type=int, default=2000, help="Queries replayed")
+    parser.add_argument('--distinct', type=int, default=300, help="Distinct claims in the stream")
+    parser.add_argument('--ingest-every', type=int, default=500, help="Queries between live documents (0 = none)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.docs)
+    stream = query_stream(args.stream, args.distinct)
+
+    print(f"Corpus: {len(corpus)} docs, {len(stream)} queries ({args.distinct} distinct)")
+    print("=" * 60)
+    for label, cache_size in [("no cache", 0), ("query cache", 1024)]:
+        retriever = TRECRetriever(tokenizer='regex', enable_prf=True, query_cache_size=cache_size)
+        retriever.corpus = dict(corpus)
+        ms = replay(retriever, stream, args.ingest_every)
+        cache = retriever.get_statistics()["query_cache"]
+        hit_rate = f"{cache['hit_rate']:.1%}" if cache else "-"
+        print(f"  {label:<12} {ms:8.3f} ms/query   hit rate {hit_rate}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Searcher Pool Throughput Benchmark - SysCRED
+=============================================
+Queries/second at 1, 4 and 8 threads:
+- concurrent retrieve_evidence calls (per-thread Lucene searchers)
+- batch_retrieve (Pyserini native batch_search with N Lucene threads)
+
+Needs pyserini and a Lucene index (--index). Without them, the
+concurrent run uses the in-memory index instead, which shows the
+GIL-bound ceiling of the pure-Python path.
+
+Usage:
+    python benchmarks/bench_searcher_pool.py --index indexes/ap88-90 --topics topics/ --qrels qrels/
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_utils import load_corpus, load_topics_qrels, TOPIC_WORDS, FILLER_WORDS
+from syscred.trec_retriever import TRECRetriever
+from syscred.searcher_pool import HAS_PYSERINI
+
+
+def synthetic_claims(n: int):
+    claims = []
+    for i in range(n):
+        topic = TOPIC_WORDS[i % len(TOPIC_WORDS)].split()
+        claims.append(' '.join(topic[i % 3:i % 3 + 3] + FILLER_WORDS[i % 7:i % 7 + 2]) + f" {i}")
+    return claims
+
+
+def concurrent_qps(retriever, claims, threads, k):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda claim: retriever.retrieve_evidence(claim, k=k), claims))
+    return len(claims) / (time.perf_counter() - start)
+
+
+def batch_qps(retriever, claims, threads, k):
+    start = time.perf_counter()
+    retriever.batch_retrieve(claims, k=k, threads=threads)
+    return len(claims) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Searcher pool throughput benchmark")
+    parser.add_argument('--index', help="Lucene index (Pyserini)")
+    parser.add_argument('--corpus', help="AP JSONL corpus (in-memory fallback)")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--topics', help="TREC topics file/directory")
+    parser.add_argument('--qrels', help="TREC qrels file/directory")
+    parser.add_argument('--queries', type=int, default=400)
+    parser.add_argument('--k', type=int, default=100)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+
+    lucene = bool(args.index) and HAS_PYSERINI
+    if args.index and not HAS_PYSERINI:
+        print("pyserini not installed: measuring the in-memory index instead")
+    retriever = TRECRetriever(
+        index_path=args.index if lucene else None,
+        tokenizer='regex', enable_prf=False, query_cache_size=0
+    )
+    if not lucene:
+        retriever.corpus = load_corpus(args.corpus, args.docs)
+    queries, _ = load_topics_qrels(args.topics, args.qrels)
+    claims = list(queries.values()) if queries else synthetic_claims(args.queries)
+
+    print(f"{'Lucene' if lucene else 'In-memory'} index, {len(claims)} queries, k={args.k}")
+    print("=" * 56)
+    print(f"  {'threads':>7} {'concurrent q/s':>16} {'batch_search q/s':>18}")
+    for threads in args.threads:
+        concurrent = concurrent_qps(retriever, claims, threads, args.k)
+        batch = f"{batch_qps(retriever, claims, threads, args.k):18.1f}" if lucene else f"{'-':>18}"
+        print(f"  {threads:7d} {concurrent:16.1f} {batch}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prepared SPARQL Benchmark - SysCRED
+====================================
+Per-call cost of the recurring OntologyManager queries (source history):
+- formatted: parameter %-formatted into the text, parsed and
+  translated by rdflib on every call (the previous behaviour)
+- prepared: compiled once with prepareQuery, parameter bound with
+  initBindings
+- parse: prepareQuery alone, i.e. the overhead saved per call
+
+The data graph is filled with --evaluations synthetic evaluations on
+top of the base ontology in ontology/.
+
+Usage:
+    python benchmarks/bench_sparql_prepared.py --evaluations 200 --repeat 50
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+
+from rdflib import Literal
+from rdflib.plugins.sparql import prepareQuery
+
+from bench_utils import timed
+from syscred import ontology_manager
+from syscred.ontology_manager import OntologyManager
+
+BASE_ONTOLOGY = os.path.join(os.path.dirname(__file__), '..', 'ontology', 'sysCRED_onto26avrtil.ttl')
+DOMAINS = ["lemonde.fr", "bbc.com", "reuters.com", "infowars.com", "apnews.com", "example.org"]
+
+# (label, query text, prepared query, parameter name, value)
+QUERIES = [
+    ("source history", ontology_manager.SOURCE_HISTORY_SPARQL, ontology_manager.SOURCE_HISTORY_QUERY,
+     'domain', "bbc.com"),
+]
+
+
+def formatted(graph, text, name, value):
+    """Previous behaviour: value quoted into the query text."""
+    return list(graph.query(text.replace('?' + name, '"%s"' % value)))
+
+
+def prepared(graph, query, name, value):
+    return list(graph.query(query, initBindings={name: Literal(value)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prepared SPARQL benchmark")
+    parser.add_argument('--evaluations', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    om = OntologyManager(base_ontology_path=BASE_ONTOLOGY)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(args.evaluations):
+            domain = rng.choice(DOMAINS)
+            om.add_evaluation_triplets({
+                'scoreCredibilite': rng.random(),
+                'informationEntree': f"https://www.{domain}/article/{i}",
+                'resumeAnalyse': "synthetic evaluation",
+            })
+
+    print(f"Union graph: {len(om.union_graph)} triples, repeat={args.repeat}")
+    print("=" * 64)
+    print(f"  {'query':<18} {'formatted ms':>13} {'prepared ms':>12} {'parse ms':>9} {'saved':>7}")
+    for label, text, query, name, value in QUERIES:
+        assert formatted(om.union_graph, text, name, value) == prepared(om.union_graph, query, name, value)
+        formatted_ms = timed(formatted, om.union_graph, text, name, value, repeat=args.repeat)[1]
+        prepared_ms = timed(prepared, om.union_graph, query, name, value, repeat=args.repeat)[1]
+        parse_ms = timed(prepareQuery, text, repeat=args.repeat)[1]
+        saved = 1 - prepared_ms / formatted_ms
+        print(f"  {label:<18} {formatted_ms:13.2f} {prepared_ms:12.2f} {parse_ms:9.2f} {saved:7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite Triple Store Benchmark - SysCRED
+========================================
+Data graph backends as the evaluation history grows, each measured in
+a fresh process:
+- memory: rdflib Memory store loaded from the TTL file
+- sqlite: SQLiteTripleStore (SPO/POS/OSP indexes on disk)
+Reports startup time, peak RSS, and the latency of a source-history
+SPARQL query and of get_statistics().
+
+Usage:
+    python benchmarks/bench_sqlite_store.py --evaluations 1000 5000 20000
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+
+from bench_utils import timed
+from syscred.ontology_manager import OntologyManager
+
+DOMAINS = ["lemonde.fr", "bbc.co.uk", "reuters.com", "infowars.com", "apnews.com", "example.org"]
+
+
+def peak_rss_mb():
+    # ru_maxrss survives fork + exec (it would include this benchmark's
+    # parent process): read the peak of the current address space
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(backend, data_path):
+    """Measure one backend (run in its own process)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        om, start_ms = timed(OntologyManager, data_path=data_path, store=backend)
+        history, query_ms = timed(om.query_source_history, "lemonde.fr", repeat=3)
+        _, stats_ms = timed(om.get_statistics, repeat=3)
+    print(json.dumps({
+        "triples": len(om.data_graph), "history": len(history), "start_ms": start_ms,
+        "rss_mb": peak_rss_mb(),
+        "query_ms": query_ms, "stats_ms": stats_ms,
+    }))
+
+
+def measure(backend, data_path):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", backend, data_path],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite triple store benchmark")
+    parser.add_argument('--evaluations', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    rng = random.Random(13)
+    print("=" * 96)
+    print(f"  {'evaluations':>11} {'backend':>8} {'triples':>8} {'start ms':>9} {'RSS MB':>7} "
+          f"{'history query ms':>17} {'stats ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data.ttl")
+        om = OntologyManager(data_path=data_path)
+        added = 0
+        for target in sorted(args.evaluations):
+            with contextlib.redirect_stdout(io.StringIO()):
+                while added < target:
+                    om.add_evaluation_triplets({
+                        'scoreCredibilite': rng.random(),
+                        'informationEntree': f"https://www.{rng.choice(DOMAINS)}/article/{added}",
+                        'resumeAnalyse': "synthetic evaluation",
+                    })
+                    added += 1
+                om.save_data()
+            for suffix in (".sqlite3", ".sqlite3-wal", ".sqlite3-shm", ".domains.json"):
+                if os.path.exists(data_path + suffix):
+                    os.remove(data_path + suffix)
+            measure('sqlite', data_path)  # first start imports the TTL file
+            for backend in ('memory', 'sqlite'):
+                r = measure(backend, data_path)
+                print(f"  {added:11d} {backend:>8} {r['triples']:8d} {r['start_ms']:9.0f} {r['rss_mb']:7.0f} "
+                      f"{r['query_ms']:17.1f} {r['stats_ms']:9.1f}")
+
+
+if __name__ == '__main__':
+    main()
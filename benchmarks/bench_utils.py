@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for the SysCRED benchmarks.
+
+- AP JSONL corpus loading (convert_trec.py output), with a synthetic
+  AP-style fallback so every benchmark also runs without the collection
+- TREC topics/qrels loading through TRECDataset
+- timing helper
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import os
+import sys
+import json
+import time
+import random
+from typing import Dict, List, Tuple, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from syscred.trec_dataset import TRECDataset
+
+# Topic vocabularies for the synthetic corpus (AP88-90 flavoured)
+TOPIC_WORDS = [
+    "airbus subsidies aircraft government consortium europe boeing",
+    "japanese auto sales cars toyota honda market share dealers",
+    "leveraged buyout takeover debt junk bonds merger shareholders",
+    "satellite launch rocket orbit commercial space shuttle payload",
+    "insider trading securities exchange commission broker shares",
+    "federal reserve interest rates inflation dollar economy bank",
+    "greenhouse gas emissions climate warming atmosphere carbon",
+    "presidential election campaign candidate votes primary poll",
+]
+FILLER_WORDS = (
+    "said officials report today week year government people city state "
+    "country percent million company group president police court"
+).split()
+
+
+def load_corpus(path: Optional[str], max_docs: int = 10000, seed: int = 13) -> Dict[str, Dict[str, str]]:
+    """Load an AP JSONL corpus, or build a synthetic one of max_docs documents."""
+    if path and os.path.exists(path):
+        corpus = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                doc = json.loads(line)
+                corpus[doc['id']] = {
+                    'text': doc.get('contents', doc.get('text', '')),
+                    'title': doc.get('title', '')
+                }
+                if len(corpus) >= max_docs:
+                    break
+        return corpus
+    return synthetic_corpus(max_docs, seed)
+
+
+def _pseudo_vocabulary(size: int, rng: random.Random) -> List[str]:
+    """Pronounceable alphabetic pseudo-words (survive the analyzer)."""
+    syllables = ["ka", "lo", "mi", "ne", "ru", "ta", "vo", "si", "pe", "dra", "ton", "mel"]
+    vocab = set()
+    while len(vocab) < size:
+        vocab.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(vocab)
+
+
+def synthetic_corpus(num_docs: int, seed: int = 13) -> Dict[str, Dict[str, str]]:
+    """
+    AP-style documents: one topic vocabulary mixed with Zipf-distributed
+    background words, so postings lengths look like a real collection.
+    Topic density varies and a third of the documents also mention a
+    second topic, so rankings are not trivially perfect.
+    """
+    rng = random.Random(seed)
+    background = FILLER_WORDS + _pseudo_vocabulary(20000, rng)
+    zipf_weights = [1.0 / (rank + 1) for rank in range(len(background))]
+    corpus = {}
+    for i in range(num_docs):
+        topic = TOPIC_WORDS[i % len(TOPIC_WORDS)].split()
+        length = rng.randint(80, 400)
+        words = rng.choices(background, weights=zipf_weights, k=length)
+        for j in range(0, length, rng.randint(5, 30)):
+            words[j] = rng.choice(topic)
+        if rng.random() < 0.33:
+            other = rng.choice(TOPIC_WORDS).split()
+            for j in range(3, length, rng.randint(8, 20)):
+                words[j] = rng.choice(other)
+        year = 88 + (i % 3)
+        doc_id = f"AP{year}{(i % 12) + 1:02d}{(i % 28) + 1:02d}-{i:04d}"
+        corpus[doc_id] = {'text': ' '.join(words), 'title': ' '.join(words[:8])}
+    return corpus
+
+
+def synthetic_topics() -> Dict[str, str]:
+    """Short queries matching the synthetic topic vocabularies."""
+    return {str(51 + i): ' '.join(words.split()[:3]) for i, words in enumerate(TOPIC_WORDS)}
+
+
+def synthetic_qrels(corpus: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, int]]:
+    """Qrels of synthetic_topics(): a document is relevant to its main topic."""
+    qrels: Dict[str, Dict[str, int]] = {str(51 + t): {} for t in range(len(TOPIC_WORDS))}
+    for doc_id in corpus:
+        i = int(doc_id.rsplit('-', 1)[1])
+        qrels[str(51 + i % len(TOPIC_WORDS))][doc_id] = 1
+    return qrels
+
+
+def load_topics_qrels(topics_path: Optional[str], qrels_path: Optional[str]) -> Tuple[Dict[str, str], Dict[str, Dict[str, int]]]:
+    """Load TREC topics (short queries) and qrels; empty dicts if unavailable."""
+    if not topics_path or not qrels_path:
+        return {}, {}
+    dataset = TRECDataset()
+    dataset.load_topics(topics_path)
+    dataset.load_qrels(qrels_path)
+    return dataset.get_topic_queries("short"), dataset.qrels
+
+
+def timed(func, *args, repeat: int = 1, **kwargs):
+    """Run func `repeat` times; return (last result, mean milliseconds)."""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000 / repeat
@@ -10,6 +10,15 @@ Modules:
 - api_clients: Web scraping, WHOIS, Fact Check APIs
 - ir_engine: BM25, QLD, TF-IDF, PRF (from TREC)
 - trec_retriever: Evidence retrieval for fact-checking (v2.3)
+- inverted_index: Segmented inverted index, live ingestion (v2.5)
+- qpp: Query performance prediction, PRF gating (v2.5)
+- dense_index: MiniLM embedding index, hybrid retrieval (v2.5)
+- embedding_store: Doc-id-keyed evidence embeddings, mmap (v2.5)
+- reranker: Budgeted cross-encoder reranking (v2.5)
+- passage_index: Passage-level index, query-biased snippets (v2.5)
+- doc_store: Block-compressed mmap document store (v2.5)
+- query_cache: LRU/TTL cache of retrieval results (v2.5)
+- searcher_pool: Pooled Pyserini searchers, batch search (v2.5)
 - trec_dataset: TREC AP88-90 data loader (v2.3)
 - liar_dataset: LIAR benchmark dataset loader (v2.3)
 - seo_analyzer: SEO analysis, PageRank estimation
@@ -17,6 +26,13 @@ Modules:
 - ontology_manager: RDFLib integration
 - verification_system: Main credibility pipeline
 - graph_rag: GraphRAG for contextual memory (v2.3)
+- domain_history: Per-domain evaluation history index (v2.5)
+- claim_index: Inverted + MinHash-LSH similar-claim index (v2.5)
+- claim_embeddings: SBERT similar-claim search, quantized first pass (v2.5)
+- ontology_journal: Append-only N-Triples journal of the data graph (v2.5)
+- graph_snapshot: Binary snapshot cache of parsed TTL files (v2.5)
+- sqlite_store: Disk-backed SQLite triple store for the data graph (v2.5)
+- ontology_writer: Single background writer, reader-writer lock (v2.5)
 - ner_analyzer: Named Entity Recognition with spaCy (v2.4)
 - eeat_calculator: Google E-E-A-T metrics (v2.4)
 """
@@ -33,6 +49,13 @@ from syscred.seo_analyzer import SEOAnalyzer
 from syscred.ir_engine import IREngine
 from syscred.eval_metrics import EvaluationMetrics
 from syscred.graph_rag import GraphRAG
+from syscred.domain_history import DomainHistoryIndex
+from syscred.claim_index import ClaimIndex
+from syscred.claim_embeddings import ClaimEmbeddingIndex
+from syscred.ontology_journal import OntologyJournal
+from syscred.graph_snapshot import GraphSnapshotCache
+from syscred.sqlite_store import SQLiteTripleStore
+from syscred.ontology_writer import OntologyWriter, ReadWriteLock
 
 # NER and E-E-A-T (NEW - v2.4)
 from syscred.ner_analyzer import NERAnalyzer
@@ -41,6 +64,15 @@ from syscred.eeat_calculator import EEATCalculator, EEATScore
 # TREC Integration (v2.3)
 from syscred.trec_retriever import TRECRetriever, Evidence, RetrievalResult
 from syscred.trec_dataset import TRECDataset, TRECTopic
+from syscred.inverted_index import SegmentedIndex
+from syscred.qpp import QueryPerformancePredictor
+from syscred.dense_index import DenseIndex
+from syscred.embedding_store import EmbeddingStore
+from syscred.reranker import CrossEncoderReranker
+from syscred.passage_index import PassageIndex
+from syscred.doc_store import DocumentStore
+from syscred.query_cache import QueryCache
+from syscred.searcher_pool import SearcherPool
 
 # LIAR Benchmark (v2.3)
 from syscred.liar_dataset import LIARDataset, LiarStatement, LiarLabel
@@ -58,6 +90,14 @@ __all__ = [
     'IREngine',
     'EvaluationMetrics',
     'GraphRAG',
+    'DomainHistoryIndex',
+    'ClaimIndex',
+    'ClaimEmbeddingIndex',
+    'OntologyJournal',
+    'GraphSnapshotCache',
+    'SQLiteTripleStore',
+    'OntologyWriter',
+    'ReadWriteLock',
     # NER & E-E-A-T (NEW v2.4)
     'NERAnalyzer',
     'EEATCalculator',
@@ -68,6 +108,15 @@ __all__ = [
     'TRECTopic',
     'Evidence',
     'RetrievalResult',
+    'SegmentedIndex',
+    'QueryPerformancePredictor',
+    'DenseIndex',
+    'EmbeddingStore',
+    'CrossEncoderReranker',
+    'PassageIndex',
+    'DocumentStore',
+    'QueryCache',
+    'SearcherPool',
     # LIAR Benchmark (v2.3)
     'LIARDataset',
     'LiarStatement',
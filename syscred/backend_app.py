@@ -80,6 +80,7 @@ except ImportError as e:
 # TREC modules (optional)
 try:
     from syscred.trec_retriever import TRECRetriever, Evidence, RetrievalResult
+    from syscred.doc_store import DocumentStore
     from syscred.eval_metrics import EvaluationMetrics
     TREC_AVAILABLE = True
     print("[SysCRED Backend] TREC modules loaded")
@@ -144,7 +145,7 @@ TREC_DEMO_CORPUS = {
     },
 }
 
-# Full TREC corpus - loaded from HF Hub on demand
+# Full TREC corpus - loaded from HF Hub on demand (compressed DocumentStore)
 TREC_CORPUS = {}
 TREC_CORPUS_LOADED = False
 TREC_CORPUS_LIMIT = 10000  # Limit to 10k docs for faster startup
@@ -224,18 +225,13 @@ def load_trec_corpus(limit=None):
             print(f"[SysCRED] File size: {size/1024/1024:.1f} MB")
             
             if size > 1000:  # Real file, not LFS pointer
-                count = 0
-                with open(local_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if count >= limit:
-                            break
-                        doc = json.loads(line.strip())
-                        doc_id = doc.get('id', '')
-                        text = doc.get('contents', doc.get('text', ''))
-                        title = doc.get('title', '')
-                        if doc_id:
-                            TREC_CORPUS[doc_id] = {'text': text, 'title': title}
-                            count += 1
+                # Compressed blocks on disk + hot-document LRU, not a dict of strings.
+                # Own store next to the download (the snapshot directory names the
+                # revision), not TREC_DOC_STORE_PATH, which holds TREC_CORPUS_PATH;
+                # rebuilt if the downloaded file or the limit changes
+                store_path = os.path.join(os.path.dirname(local_path), f"trec_docstore_{limit or 'all'}")
+                cache_size = getattr(Config, 'TREC_DOC_STORE_CACHE', DocumentStore.DEFAULT_CACHE_SIZE)
+                TREC_CORPUS = DocumentStore.open_or_build(store_path, local_path, limit, cache_size=cache_size)
                 print(f"[SysCRED] Loaded {len(TREC_CORPUS)} documents from HF Hub")
                 TREC_CORPUS_LOADED = True
                 return True
@@ -571,19 +567,26 @@ def trec_search():
     
     k = data.get('k', 10)
     model = data.get('model', 'bm25')
+    date_from = data.get('date_from')
+    date_to = data.get('date_to')
     
     try:
         import time
         start_time = time.time()
         
-        # Retrieve evidence
-        result = trec_retriever.retrieve_evidence(query, k=k, model=model)
+        # Retrieve evidence (optional publication window, 'YYYY-MM-DD')
+        try:
+            result = trec_retriever.retrieve_evidence(
+                query, k=k, model=model, date_from=date_from, date_to=date_to
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         search_time_ms = (time.time() - start_time) * 1000
         
         # Format results
         results = []
         for ev in result.evidences:
-            doc_info = trec_retriever.corpus.get(ev.doc_id, {})
+            doc_info = trec_retriever.get_document(ev.doc_id) or {}
             results.append({
                 'doc_id': ev.doc_id,
                 'score': round(ev.score, 4),
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Claim Embeddings Module - SysCRED
+==================================
+Semantic similar-claim lookup over the evaluation history (GraphRAG).
+
+The claim index (claim_index) only finds past claims sharing words
+with the new one; this index compares SBERT MiniLM embeddings (the
+coherence model), so paraphrases are found as well.
+
+- One L2-normalized float16 vector per report URI, persisted in an
+  EmbeddingStore next to the data graph and appended as evaluations
+  are added
+- Exact search: blocked matrix multiply over every stored claim
+- Large histories: an optional quantized first pass (int8 codes with
+  per-row scales, or sign bits compared by Hamming distance) selects
+  candidates that are then rescored exactly
+
+Scores are cosine similarities.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from syscred.dense_index import DenseIndex
+from syscred.embedding_store import EmbeddingStore
+
+
+def _popcount_rows(words: Any) -> Any:
+    """Set bits per row of a (n, w) uint64 array."""
+    if hasattr(np, 'bitwise_count'):  # numpy >= 2.0
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int32)
+    return np.unpackbits(words.view(np.uint8), axis=1).sum(axis=1, dtype=np.int32)
+
+
+class ClaimEmbeddingIndex:
+    """
+    Report URI -> claim embedding, searched by cosine similarity.
+
+    Usage:
+        index = ClaimEmbeddingIndex.open("/path/data.ttl.claims", encoder)
+        index.add(report_uri, "Le vaccin contient une puce 5G")
+        index.search("Les vaccins cachent des puces", k=3)  # [(report_uri, cosine), ...]
+    """
+
+    FIRST_PASSES = ('none', 'int8', 'binary')
+    DEFAULT_BLOCK_ROWS = 65536
+    DEFAULT_FIRST_PASS_MIN_ROWS = 20000
+    DEFAULT_FIRST_PASS_DEPTH = 1024
+
+    def __init__(
+        self,
+        encoder: Any,
+        store: Optional[EmbeddingStore] = None,
+        first_pass: str = 'binary',
+        first_pass_min_rows: int = DEFAULT_FIRST_PASS_MIN_ROWS,
+        first_pass_depth: int = DEFAULT_FIRST_PASS_DEPTH,
+        block_rows: int = DEFAULT_BLOCK_ROWS
+    ):
+        """
+        Args:
+            encoder: Object with a SentenceTransformer-style encode(list) method
+            store: Persistent float16 store (None: in-memory only)
+            first_pass: 'none' (always exact), 'int8' or 'binary'
+            first_pass_min_rows: Claims below which the search stays exact
+            first_pass_depth: Candidates kept by the first pass (at least k)
+            block_rows: Rows per matrix multiply in the exact scan
+        """
+        if not HAS_NUMPY:
+            raise ImportError("ClaimEmbeddingIndex requires numpy")
+        if first_pass not in self.FIRST_PASSES:
+            raise ValueError(f"Unsupported first pass '{first_pass}', use one of {self.FIRST_PASSES}")
+        self.encoder = encoder
+        self.store = store
+        self.first_pass = first_pass
+        self.first_pass_min_rows = first_pass_min_rows
+        self.first_pass_depth = first_pass_depth
+        self.block_rows = block_rows
+
+        self._lock = threading.Lock()
+        self.reports: List[str] = []
+        self._report_ids: Dict[str, int] = {}
+        self._count = 0
+        self.dim = 0
+        # Row buffers (capacity doubles); rows [0, _count) are valid
+        self._vectors = None  # float16, exact scores
+        self._codes = None  # int8 + per-row scales ('int8' first pass)
+        self._scales = None
+        self._bits = None  # packed sign bits as uint64 words ('binary' first pass)
+
+        if store is not None:
+            reports, rows = store.items()
+            if reports:
+                self._append(reports, DenseIndex.normalize(rows))
+
+    @classmethod
+    def open(cls, path: str, encoder: Any, **kwargs) -> 'ClaimEmbeddingIndex':
+        """Open (or create) the index persisted in a store directory."""
+        return cls(encoder, EmbeddingStore.open(path, dtype='float16'), **kwargs)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, report: str) -> bool:
+        return report in self._report_ids
+
+    # --- Updates ---
+
+    def encode(self, texts: Sequence[str]) -> Any:
+        """Normalized (n, dim) float32 embeddings of texts."""
+        return DenseIndex.normalize(self.encoder.encode(list(texts)))
+
+    def add(self, report: str, text: str) -> bool:
+        """Embed and store a claim; False if empty or already stored."""
+        return self.add_many([report], [text]) == 1
+
+    def add_many(self, reports: Sequence[str], texts: Sequence[str], batch_size: int = 256) -> int:
+        """Embed and store claims in batches; returns the number added."""
+        pending = {}
+        for report, text in zip(reports, texts):
+            if text and report not in self._report_ids and report not in pending:
+                pending[report] = text
+        new_reports = list(pending)
+        for start in range(0, len(new_reports), batch_size):
+            batch = new_reports[start:start + batch_size]
+            vectors = self.encode([pending[report] for report in batch])
+            if self.store is not None:
+                self.store.put(batch, vectors)
+            with self._lock:
+                self._append(batch, vectors)
+        return len(new_reports)
+
+    def _append(self, reports: List[str], vectors: Any):
+        """Copy normalized float32 rows into the buffers (caller holds the lock or owns the index)."""
+        count = len(reports)
+        if not self.dim:
+            self.dim = vectors.shape[1]
+        if self._vectors is None or self._count + count > len(self._vectors):
+            self._grow(max(2 * self._count, self._count + count, 1024))
+        start, end = self._count, self._count + count
+        self._vectors[start:end] = vectors
+        if self._codes is not None:
+            self._codes[start:end], self._scales[start:end] = DenseIndex.quantize(vectors, 'int8')
+        if self._bits is not None:
+            self._bits[start:end] = self._sign_bits(vectors)
+        for offset, report in enumerate(reports):
+            self._report_ids[report] = start + offset
+        self.reports.extend(reports)
+        self._count = end
+
+    def _grow(self, capacity: int):
+        def grown(old, shape, dtype):
+            array = np.zeros(shape, dtype=dtype)
+            if old is not None:
+                array[:self._count] = old[:self._count]
+            return array
+
+        self._vectors = grown(self._vectors, (capacity, self.dim), np.float16)
+        if self.first_pass == 'int8':
+            self._codes = grown(self._codes, (capacity, self.dim), np.int8)
+            self._scales = grown(self._scales, (capacity,), np.float32)
+        elif self.first_pass == 'binary':
+            self._bits = grown(self._bits, (capacity, (self.dim + 63) // 64), np.uint64)
+
+    def _sign_bits(self, vectors: Any) -> Any:
+        words = (self.dim + 63) // 64
+        packed = np.packbits(vectors > 0, axis=1)
+        padded = np.zeros((len(vectors), words * 8), dtype=np.uint8)
+        padded[:, :packed.shape[1]] = packed
+        return padded.view(np.uint64)
+
+    # --- Search ---
+
+    def _scan(self, query: Any, vectors: Any, rows: Any, k: int) -> Tuple[Any, Any]:
+        """Exact scores of stored rows (all rows if `rows` is None); top-k per block."""
+        if rows is not None:
+            scores = np.asarray(vectors[rows], dtype=np.float32) @ query
+            return scores, rows
+        found_scores, found_rows = [], []
+        for start in range(0, len(vectors), self.block_rows):
+            scores = np.asarray(vectors[start:start + self.block_rows], dtype=np.float32) @ query
+            top = np.argpartition(scores, -k)[-k:] if len(scores) > k else np.arange(len(scores))
+            found_scores.append(scores[top])
+            found_rows.append(top + start)
+        return np.concatenate(found_scores), np.concatenate(found_rows)
+
+    def _first_pass_rows(self, query: Any, count: int, depth: int) -> Any:
+        """Candidate rows by quantized score (int8 dot product or Hamming distance)."""
+        found_scores, found_rows = [], []
+        if self.first_pass == 'int8':
+            codes, scales = self._codes, self._scales
+        else:
+            bits = self._bits
+            query_bits = self._sign_bits(query[None, :])
+        for start in range(0, count, self.block_rows):
+            end = min(start + self.block_rows, count)
+            if self.first_pass == 'int8':
+                scores = (codes[start:end].astype(np.float32) @ query) * scales[start:end]
+            else:
+                scores = -_popcount_rows(bits[start:end] ^ query_bits)
+            top = np.argpartition(scores, -depth)[-depth:] if len(scores) > depth else np.arange(len(scores))
+            found_scores.append(scores[top])
+            found_rows.append(top + start)
+        scores, rows = np.concatenate(found_scores), np.concatenate(found_rows)
+        if len(rows) > depth:
+            rows = rows[np.argpartition(scores, -depth)[-depth:]]
+        return np.sort(rows)
+
+    def search(self, query: Any, k: int = 3, min_score: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Most similar stored claims.
+
+        Args:
+            query: Claim text or its embedding
+            k: Number of results
+            min_score: Drop results below this cosine similarity
+
+        Returns:
+            [(report, cosine)], best first
+        """
+        with self._lock:
+            count = self._count
+            vectors = self._vectors
+        if not count or k <= 0:
+            return []
+        query = self.encode([query])[0] if isinstance(query, str) else DenseIndex.normalize(query)[0]
+        vectors = vectors[:count]
+        rows = None
+        if self.first_pass != 'none' and count >= self.first_pass_min_rows:
+            rows = self._first_pass_rows(query, count, max(self.first_pass_depth, k))
+        scores, rows = self._scan(query, vectors, rows, k)
+        order = np.argsort(-scores, kind='stable')[:k]
+        return [
+            (self.reports[rows[i]], float(scores[i])) for i in order
+            if min_score is None or scores[i] >= min_score
+        ]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        buffers = (self._vectors, self._codes, self._scales, self._bits)
+        return {
+            "claims": self._count,
+            "dim": self.dim,
+            "first_pass": self.first_pass,
+            "bytes": sum(b[:self._count].nbytes for b in buffers if b is not None),
+        }
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Claim Index Module - SysCRED
+=============================
+Similar-claim lookup over the evaluation history (GraphRAG).
+
+- Claims are normalized to term sets (lowercase words of more than
+  three letters, stopwords removed)
+- Inverted index: term -> claim ids (array('I'), append-only)
+- MinHash signatures (num_perm 32-bit minima, one flat array('I')),
+  banded for LSH: near-duplicate claims share at least one band key
+- A query collects candidates from its LSH buckets and from the
+  postings of its rarest terms (bounded by max_candidates), then ranks
+  them by estimated Jaccard similarity, shared terms, and recency
+
+Claim ids follow insertion order, so a larger id is a more recent claim.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import re
+import random
+import hashlib
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from syscred.ir_engine import FALLBACK_STOPWORDS
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+MIN_TERM_LENGTH = 4  # GraphRAG skips words of three letters or less
+MERSENNE_PRIME = (1 << 31) - 1
+MASK_64 = (1 << 64) - 1
+
+
+def claim_terms(text: str) -> Set[str]:
+    """Normalized term set of a claim or query."""
+    if not isinstance(text, str):
+        return set()
+    return {
+        word for word in WORD_PATTERN.findall(text.lower())
+        if len(word) >= MIN_TERM_LENGTH and word not in FALLBACK_STOPWORDS
+    }
+
+
+@lru_cache(maxsize=200_000)
+def _term_hash(term: str) -> int:
+    """Stable 32-bit hash (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class _BandTable:
+    """
+    One LSH band: band key -> claim ids.
+
+    Keys/ids live in sorted arrays (bisect lookup); recent additions go
+    to a dict that is merged in once it holds a fraction of the table,
+    so the total merge cost stays O(n log n).
+    """
+
+    MIN_MERGE = 4096
+
+    def __init__(self):
+        self.keys = array('Q')
+        self.ids = array('I')
+        self.recent: Dict[int, List[int]] = {}
+        self.recent_count = 0
+
+    def add(self, key: int, claim_id: int):
+        self.recent.setdefault(key, []).append(claim_id)
+        self.recent_count += 1
+        if self.recent_count >= max(self.MIN_MERGE, len(self.keys) // 2):
+            self.merge()
+
+    def get(self, key: int) -> List[int]:
+        lo = bisect_left(self.keys, key)
+        hi = bisect_right(self.keys, key, lo)
+        found = list(self.ids[lo:hi])
+        found.extend(self.recent.get(key, ()))
+        return found
+
+    def merge(self):
+        if not self.recent:
+            return
+        new_keys = [key for key, ids in self.recent.items() for _ in ids]
+        new_ids = [claim_id for ids in self.recent.values() for claim_id in ids]
+        if HAS_NUMPY:
+            keys = np.concatenate([np.frombuffer(self.keys, dtype=np.uint64), np.array(new_keys, dtype=np.uint64)])
+            ids = np.concatenate([np.frombuffer(self.ids, dtype=np.uint32), np.array(new_ids, dtype=np.uint32)])
+            order = np.argsort(keys, kind='stable')
+            self.keys, self.ids = array('Q'), array('I')
+            self.keys.frombytes(keys[order].tobytes())
+            self.ids.frombytes(ids[order].tobytes())
+        else:
+            pairs = sorted(zip(list(self.keys) + new_keys, list(self.ids) + new_ids))
+            self.keys = array('Q', (key for key, _ in pairs))
+            self.ids = array('I', (claim_id for _, claim_id in pairs))
+        self.recent = {}
+        self.recent_count = 0
+
+
+class ClaimIndex:
+    """
+    Inverted + MinHash-LSH index of evaluated claims.
+
+    Usage:
+        index = ClaimIndex()
+        index.add(report_uri, "Le vaccin contient une puce 5G")
+        index.search(["vaccin", "puce"], k=3)  # [(report_uri, jaccard), ...]
+    """
+
+    DEFAULT_NUM_PERM = 32
+    DEFAULT_BANDS = 8
+    DEFAULT_MAX_CANDIDATES = 2000
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        max_candidates: int = DEFAULT_MAX_CANDIDATES,
+        seed: int = 1
+    ):
+        """
+        Args:
+            num_perm: MinHash functions per signature
+            bands: LSH bands (num_perm // bands rows each)
+            max_candidates: Postings read per query (rarest terms first)
+            seed: Seed of the hash functions (signatures depend on it)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_candidates = max_candidates
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)]
+        if HAS_NUMPY:
+            self._a_np = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_np = np.array(self._b, dtype=np.uint64)[:, None]
+
+        self._lock = threading.Lock()
+        self.reports: List[str] = []
+        self._report_ids: Dict[str, int] = {}
+        self._postings: Dict[str, array] = {}
+        self._signatures = array('I')
+        self._tables = [_BandTable() for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.reports)
+
+    def __contains__(self, report: str) -> bool:
+        return report in self._report_ids
+
+    def clear(self):
+        with self._lock:
+            self.reports = []
+            self._report_ids = {}
+            self._postings = {}
+            self._signatures = array('I')
+            self._tables = [_BandTable() for _ in range(self.bands)]
+
+    # --- MinHash ---
+
+    def signature(self, terms: Iterable[str]) -> List[int]:
+        """MinHash signature: min over terms of (a * h + b) mod p, per function."""
+        hashes = [_term_hash(term) for term in terms]
+        if HAS_NUMPY:
+            values = (self._a_np * np.array(hashes, dtype=np.uint64)[None, :] + self._b_np) % MERSENNE_PRIME
+            return values.min(axis=1).tolist()
+        return [
+            min((a * h + b) % MERSENNE_PRIME for h in hashes)
+            for a, b in zip(self._a, self._b)
+        ]
+
+    def _band_keys(self, signature: List[int]) -> List[int]:
+        rows = self.rows
+        return [hash(tuple(signature[i * rows:(i + 1) * rows])) & MASK_64 for i in range(self.bands)]
+
+    # --- Updates ---
+
+    def add(self, report: str, text: str) -> bool:
+        """Index a claim; False if it has no terms or is already indexed."""
+        terms = claim_terms(text)
+        if not terms or report in self._report_ids:
+            return False
+        signature = self.signature(terms)
+        with self._lock:
+            claim_id = len(self.reports)
+            self.reports.append(report)
+            self._report_ids[report] = claim_id
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = array('I')
+                postings.append(claim_id)
+            self._signatures.extend(signature)
+            for table, key in zip(self._tables, self._band_keys(signature)):
+                table.add(key, claim_id)
+        return True
+
+    # --- Search ---
+
+    def _candidates(self, terms: Set[str], signature: List[int]) -> Counter:
+        """Candidate claim id -> number of shared query terms (LSH hits count 0)."""
+        shared: Counter = Counter()
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            for claim_id in table.get(key):
+                shared[claim_id] += 0
+        budget = self.max_candidates
+        for posting in sorted((self._postings[t] for t in terms if t in self._postings), key=len):
+            if budget <= 0:
+                break
+            if len(posting) > budget:
+                posting = posting[-budget:]  # frequent term: its most recent claims only
+            shared.update(posting)
+            budget -= len(posting)
+        return shared
+
+    def _estimated_jaccard(self, signature: List[int], claim_ids: List[int]) -> List[float]:
+        n = self.num_perm
+        if HAS_NUMPY:
+            matrix = np.frombuffer(self._signatures, dtype=np.uint32).reshape(-1, n)
+            query = np.array(signature, dtype=np.uint32)
+            return (matrix[np.array(claim_ids, dtype=np.int64)] == query).mean(axis=1).tolist()
+        sigs = self._signatures
+        return [
+            sum(1 for j in range(n) if sigs[c * n + j] == signature[j]) / n
+            for c in claim_ids
+        ]
+
+    def search(self, query, k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Most similar claims.
+
+        Args:
+            query: Claim text or list of keywords
+            k: Number of results
+
+        Returns:
+            [(report, estimated Jaccard)], best first; ties go to the
+            claim sharing more query terms, then to the most recent
+        """
+        terms = claim_terms(query if isinstance(query, str) else " ".join(query))
+        if not terms or not self.reports:
+            return []
+        signature = self.signature(terms)
+        with self._lock:
+            shared = self._candidates(terms, signature)
+            if not shared:
+                return []
+            claim_ids = list(shared)
+            jaccard = self._estimated_jaccard(signature, claim_ids)
+            ranked = sorted(
+                zip(jaccard, (shared[c] for c in claim_ids), claim_ids),
+                reverse=True
+            )
+            return [(self.reports[c], score) for score, _, c in ranked[:k]]
+
+    def get_statistics(self) -> Dict[str, int]:
+        return {
+            "claims": len(self.reports),
+            "terms": len(self._postings),
+            "postings": sum(len(p) for p in self._postings.values()),
+            "bytes": (
+                self._signatures.itemsize * len(self._signatures)
+                + sum(p.itemsize * len(p) for p in self._postings.values())
+                + sum(12 * len(t.keys) for t in self._tables)
+            ),
+        }
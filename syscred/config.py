@@ -56,6 +56,21 @@ class Config:
     BASE_DIR = Path(__file__).parent.parent
     ONTOLOGY_BASE_PATH = BASE_DIR / "ontology" / "sysCRED_onto26avrtil.ttl"
     ONTOLOGY_DATA_PATH = BASE_DIR / "ontology" / "sysCRED_data.ttl"
+    ONTOLOGY_HISTORY_SIZE = int(os.getenv("SYSCRED_ONTOLOGY_HISTORY_SIZE", "10"))  # Recent evaluations kept per domain
+    # Append-only N-Triples journal next to the data graph (save = append, not a full TTL rewrite)
+    ONTOLOGY_JOURNAL = os.getenv("SYSCRED_ONTOLOGY_JOURNAL", "true").lower() == "true"
+    ONTOLOGY_JOURNAL_SYNC_EVERY = int(os.getenv("SYSCRED_ONTOLOGY_JOURNAL_SYNC_EVERY", "8"))  # Batches per fsync
+    ONTOLOGY_JOURNAL_COMPACT_BYTES = int(os.getenv("SYSCRED_ONTOLOGY_JOURNAL_COMPACT_BYTES", "2000000"))  # Background compaction threshold
+    # Binary snapshots of the parsed TTL files, keyed by file hash ('' disables)
+    ONTOLOGY_SNAPSHOT_DIR = os.getenv("SYSCRED_ONTOLOGY_SNAPSHOT_DIR", str(BASE_DIR / ".cache" / "ontology"))
+    # Data graph backend: 'memory' (rdflib graph + TTL/journal) or 'sqlite' (disk-backed SPO/POS/OSP store)
+    ONTOLOGY_STORE = os.getenv("SYSCRED_ONTOLOGY_STORE", "memory")
+    ONTOLOGY_STORE_PATH = os.getenv("SYSCRED_ONTOLOGY_STORE_PATH", "")  # '' = data path + .sqlite3
+    # Ontology writes queued for one background writer thread (requests never wait on saves)
+    ONTOLOGY_BACKGROUND_WRITES = os.getenv("SYSCRED_ONTOLOGY_BACKGROUND_WRITES", "true").lower() == "true"
+    # Semantic similar-claim search (SBERT embeddings of past claims, next to the data graph)
+    CLAIM_EMBEDDINGS_FIRST_PASS = os.getenv("SYSCRED_CLAIM_EMBEDDINGS_FIRST_PASS", "binary")  # 'none', 'int8' or 'binary'
+    CLAIM_SIMILARITY_THRESHOLD = float(os.getenv("SYSCRED_CLAIM_SIMILARITY_THRESHOLD", "0.6"))  # Min cosine of a similar claim
     
     # === Serveur Flask ===
     HOST = os.getenv("SYSCRED_HOST", "0.0.0.0")
@@ -80,15 +95,70 @@ class Config:
     TREC_CORPUS_PATH = os.getenv("SYSCRED_TREC_CORPUS", None)  # JSONL corpus
     TREC_TOPICS_PATH = os.getenv("SYSCRED_TREC_TOPICS", None)  # Topics directory
     TREC_QRELS_PATH = os.getenv("SYSCRED_TREC_QRELS", None)  # Qrels directory
+    TREC_DOC_STORE_PATH = os.getenv("SYSCRED_TREC_DOC_STORE", None)  # Compressed document store (built from the corpus)
+    TREC_DOC_STORE_CACHE = int(os.getenv("SYSCRED_TREC_DOC_STORE_CACHE", "1024"))  # Hot documents kept decoded
+    TREC_QUERY_CACHE_SIZE = int(os.getenv("SYSCRED_TREC_QUERY_CACHE", "1024"))  # Cached retrieval results, 0 = off
+    TREC_QUERY_CACHE_TTL = float(os.getenv("SYSCRED_TREC_QUERY_CACHE_TTL", "300"))  # Seconds, 0 = until the index changes
+    TREC_SEARCH_THREADS = int(os.getenv("SYSCRED_TREC_SEARCH_THREADS", "4"))  # Lucene batch_search threads
     
     # BM25 Parameters (optimized on AP88-90)
     BM25_K1 = float(os.getenv("SYSCRED_BM25_K1", "0.9"))
     BM25_B = float(os.getenv("SYSCRED_BM25_B", "0.4"))
+    TREC_TOKENIZER = os.getenv("SYSCRED_TREC_TOKENIZER", "nltk")  # 'nltk' or 'regex' (faster)
     
     # PRF (Pseudo-Relevance Feedback) settings
     ENABLE_PRF = os.getenv("SYSCRED_ENABLE_PRF", "true").lower() == "true"
     PRF_TOP_DOCS = int(os.getenv("SYSCRED_PRF_TOP_DOCS", "3"))
     PRF_EXPANSION_TERMS = int(os.getenv("SYSCRED_PRF_TERMS", "10"))
+    PRF_ORIGINAL_WEIGHT = float(os.getenv("SYSCRED_PRF_ORIG_WEIGHT", "0.5"))  # RM3 lambda
+    PRF_MAX_DF_RATIO = float(os.getenv("SYSCRED_PRF_MAX_DF", "0.1"))  # skip near-stopword expansion terms
+    # Query performance prediction: run the PRF pass only when predicted to help
+    PRF_QPP_ENABLED = os.getenv("SYSCRED_PRF_QPP", "true").lower() == "true"
+    QPP_MIN_MAX_IDF = float(os.getenv("SYSCRED_QPP_MIN_MAX_IDF", "1.5"))
+    QPP_MAX_IDF_RATIO = float(os.getenv("SYSCRED_QPP_MAX_IDF_RATIO", "0.9"))
+    QPP_MIN_CLARITY = float(os.getenv("SYSCRED_QPP_MIN_CLARITY", "2.0"))
+    QPP_MAX_DISPERSION = float(os.getenv("SYSCRED_QPP_MAX_DISPERSION", "0.25"))
+    
+    # Cross-encoder reranking (second stage over the top-N candidates)
+    ENABLE_RERANK = os.getenv("SYSCRED_ENABLE_RERANK", "false").lower() == "true"
+    RERANK_MODEL = os.getenv("SYSCRED_RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    RERANK_TOP_N = int(os.getenv("SYSCRED_RERANK_TOP_N", "50"))
+    RERANK_BATCH_SIZE = int(os.getenv("SYSCRED_RERANK_BATCH", "16"))
+    RERANK_BUDGET_MS = float(os.getenv("SYSCRED_RERANK_BUDGET_MS", "200"))  # Per query; N shrinks to fit
+    RERANK_MAX_CHARS = int(os.getenv("SYSCRED_RERANK_MAX_CHARS", "1000"))
+    
+    # Segmented index (live evidence ingestion)
+    TREC_SEGMENT_BUFFER_DOCS = int(os.getenv("SYSCRED_TREC_SEGMENT_BUFFER", "1000"))
+    TREC_MERGE_FACTOR = int(os.getenv("SYSCRED_TREC_MERGE_FACTOR", "8"))
+    TREC_LIVE_INGEST = os.getenv("SYSCRED_TREC_LIVE_INGEST", "false").lower() == "true"  # Index fetched (unverified) pages
+    TREC_LIVE_MAX_DOCS = int(os.getenv("SYSCRED_TREC_LIVE_MAX_DOCS", "1000"))  # Oldest live pages are evicted
+    # BM25F field weights, e.g. "text:1.0,title:2.0" (empty = plain BM25 over the text)
+    TREC_FIELD_WEIGHTS = {
+        name.strip(): float(weight)
+        for name, weight in (
+            item.split(':') for item in os.getenv("SYSCRED_TREC_FIELD_WEIGHTS", "").split(',') if ':' in item
+        )
+    } or None
+    # Positional index: "quoted" claim phrases are exact phrase queries, optional proximity boost
+    TREC_POSITIONS = os.getenv("SYSCRED_TREC_POSITIONS", "false").lower() == "true"
+    TREC_PROXIMITY_WEIGHT = float(os.getenv("SYSCRED_TREC_PROXIMITY_WEIGHT", "0"))  # 0 = off
+    TREC_PROXIMITY_WINDOW = int(os.getenv("SYSCRED_TREC_PROXIMITY_WINDOW", "8"))  # Max term distance
+    
+    # Passage mode: rank documents by their best passage, return that passage as evidence text
+    TREC_PASSAGE_MODE = os.getenv("SYSCRED_TREC_PASSAGE_MODE", "false").lower() == "true"
+    TREC_PASSAGE_SIZE = int(os.getenv("SYSCRED_TREC_PASSAGE_SIZE", "100"))  # Words per passage
+    TREC_PASSAGE_STRIDE = int(os.getenv("SYSCRED_TREC_PASSAGE_STRIDE", "50"))  # Words between passage starts
+    
+    # Dense evidence index (MiniLM embeddings, model='dense' / 'hybrid')
+    TREC_DENSE_INDEX_PATH = os.getenv("SYSCRED_TREC_DENSE_INDEX", None)  # Built on first load if missing
+    TREC_DENSE_DTYPE = os.getenv("SYSCRED_TREC_DENSE_DTYPE", "int8")  # 'int8' (faster scan) or 'float16'
+    TREC_DENSE_NLIST = int(os.getenv("SYSCRED_TREC_DENSE_NLIST", "0"))  # IVF lists, 0 = exact search
+    TREC_DENSE_NPROBE = int(os.getenv("SYSCRED_TREC_DENSE_NPROBE", "8"))
+    TREC_HYBRID_DEPTH = int(os.getenv("SYSCRED_TREC_HYBRID_DEPTH", "100"))  # Results fused per list
+    TREC_RRF_K = int(os.getenv("SYSCRED_TREC_RRF_K", "60"))
+    # Evidence embeddings for verify_with_evidence (doc-id keyed, mmap)
+    EMBEDDING_STORE_PATH = os.getenv("SYSCRED_EMBEDDING_STORE", None)
+    EMBEDDING_STORE_LAZY = os.getenv("SYSCRED_EMBEDDING_STORE_LAZY", "true").lower() == "true"  # Encode missing docs on demand
     
     # === Pondération des scores ===
     # Note: Weights should sum to 1.0 for proper normalization
@@ -230,6 +300,7 @@ class Config:
             'known_sources_count': len(cls.SOURCE_REPUTATIONS),
             'ontology_base': str(cls.ONTOLOGY_BASE_PATH),
             'ontology_data': str(cls.ONTOLOGY_DATA_PATH),
+            'ontology_store': cls.ONTOLOGY_STORE,
         }
     
     @classmethod
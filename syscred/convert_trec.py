@@ -2,25 +2,52 @@
 """
 TREC AP88-90 to JSONL Converter
 Converts TREC AP88-90 gz files to JSONL format for IR engine.
+
+The gz files are parsed in a process pool, one file per task. Each
+worker serializes its documents (orjson when installed) and, with
+--zstd, compresses them, so decompression, parsing, encoding and
+compression all scale with the number of cores. Output is either one
+JSONL file written in input order, or one shard per gz file (--shards).
+
+With --index the workers also analyze the documents and the parent
+bulk-loads the term vectors into a TRECRetriever in the same pass.
+
+Usage:
+    python syscred/convert_trec.py trec_ap88_90/ trec_corpus.jsonl
+    python syscred/convert_trec.py trec_ap88_90/ corpus_shards/ --shards --zstd --workers 8 --index
 """
 
 import os
 import gzip
 import json
 import glob
+import time
+import multiprocessing
 from pathlib import Path
 
-def extract_ap_documents(gz_path):
-    """Extract documents from AP gz file."""
-    documents = []
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+def iter_ap_documents(gz_path):
+    """Stream documents from AP gz file."""
     doc_id = None
     doc_text = []
     in_text = False
-    
+
     with gzip.open(gz_path, 'rt', encoding='latin-1') as f:
         for line in f:
             line = line.strip()
-            
+
             if line.startswith('<DOC>'):
                 doc_id = None
                 doc_text = []
@@ -33,53 +60,225 @@ def extract_ap_documents(gz_path):
                 in_text = False
             elif line.startswith('</DOC>'):
                 if doc_id and doc_text:
-                    documents.append({
+                    yield {
                         'id': doc_id,
                         'contents': ' '.join(doc_text),
                         'title': doc_text[0][:100] if doc_text else ''
-                    })
+                    }
             elif in_text and line:
                 doc_text.append(line)
-    
-    return documents
+
+
+def extract_ap_documents(gz_path):
+    """Extract documents from AP gz file."""
+    return list(iter_ap_documents(gz_path))
+
+
+def dumps_line(doc):
+    """One JSONL line as UTF-8 bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(doc) + b'\n'
+    return (json.dumps(doc, ensure_ascii=False) + '\n').encode('utf-8')
+
 
 def convert_trec_to_jsonl(trec_dir, output_path, max_docs=None):
     """Convert all TREC AP88-90 files to JSONL."""
     gz_files = sorted(glob.glob(os.path.join(trec_dir, '*.gz')))
     print(f"Found {len(gz_files)} TREC AP files")
-    
+
     total_docs = 0
     with open(output_path, 'w', encoding='utf-8') as outfile:
         for gz_file in gz_files:
             print(f"Processing: {os.path.basename(gz_file)}")
             docs = extract_ap_documents(gz_file)
-            
+
             for doc in docs:
                 outfile.write(json.dumps(doc, ensure_ascii=False) + '\n')
                 total_docs += 1
-                
+
                 if max_docs and total_docs >= max_docs:
                     print(f"Reached max docs: {max_docs}")
                     return total_docs
-    
+
     print(f"Total documents: {total_docs}")
     return total_docs
 
+
+# Per-process analyzer, built once by _init_worker
+_analyzer = None
+_positions = None  # token_positions() when the index stores positions
+
+
+def _init_worker(analyzer_settings):
+    global _analyzer, _positions
+    _analyzer = _positions = None
+    if analyzer_settings is not None:
+        from syscred.ir_engine import TextAnalyzer
+        from syscred.inverted_index import token_positions
+        stopwords, stemmer, tokenizer, positions = analyzer_settings
+        _positions = token_positions if positions else None
+        _analyzer = TextAnalyzer(stopwords=stopwords, stemmer=stemmer, tokenizer=tokenizer)
+
+
+def _term_vector(tokens):
+    vector = {}
+    for term in tokens:
+        vector[term] = vector.get(term, 0) + 1
+    return vector
+
+
+def _convert_file(task):
+    """
+    Parse one gz file, serialize (and compress) its documents.
+
+    Writes the payload to shard_path if given, otherwise returns it.
+    With an analyzer, also returns
+    [(doc_id, {'text', 'title'}, text {term: tf}, title {term: tf}, positions)],
+    positions being the text {term: [positions]} for a positional index.
+    """
+    gz_path, shard_path, compress, level = task
+    lines = []
+    indexed = [] if _analyzer is not None else None
+    for doc in iter_ap_documents(gz_path):
+        lines.append(dumps_line(doc))
+        if indexed is not None:
+            tokens = _analyzer.analyze(doc['contents'])
+            indexed.append((
+                doc['id'],
+                {'text': doc['contents'], 'title': doc['title']},
+                _term_vector(tokens),
+                _term_vector(_analyzer.analyze(doc['title'])),
+                _positions(tokens) if _positions else None
+            ))
+    payload = b''.join(lines)
+    if compress:
+        payload = zstandard.ZstdCompressor(level=level).compress(payload)
+    if shard_path:
+        with open(shard_path, 'wb') as f:
+            f.write(payload)
+        size, payload = len(payload), None
+    else:
+        size = len(payload)
+    return os.path.basename(gz_path), len(lines), size, payload, indexed
+
+
+def convert_trec_parallel(
+    trec_dir,
+    output_path,
+    workers=None,
+    shards=False,
+    compress=False,
+    level=3,
+    retriever=None
+):
+    """
+    Convert all TREC AP88-90 files with a process pool.
+
+    Args:
+        trec_dir: Directory of AP gz files
+        output_path: JSONL file, or shard directory when shards=True
+        workers: Processes (default: CPU count; 1 runs in-process)
+        shards: One <name>.jsonl[.zst] per gz file, written by the workers
+        compress: zstd-compress the output (frames are concatenated in
+            single-file mode, which zstd readers decode as one stream)
+        level: zstd compression level
+        retriever: TRECRetriever to index in the same pass (load_prebuilt)
+
+    Returns:
+        Stats dict (files, documents, bytes, seconds, docs_per_sec, index_seconds)
+    """
+    if compress and not HAS_ZSTD:
+        print("[Converter] zstandard not installed, writing uncompressed JSONL")
+        compress = False
+    gz_files = sorted(glob.glob(os.path.join(trec_dir, '*.gz')))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(gz_files) or 1))
+    print(f"Found {len(gz_files)} TREC AP files, {workers} workers")
+
+    suffix = '.jsonl.zst' if compress else '.jsonl'
+    if shards:
+        Path(output_path).mkdir(parents=True, exist_ok=True)
+        tasks = [
+            (gz, os.path.join(output_path, Path(gz).name[:-len('.gz')] + suffix), compress, level)
+            for gz in gz_files
+        ]
+    else:
+        tasks = [(gz, None, compress, level) for gz in gz_files]
+
+    analyzer_settings = None
+    if retriever is not None:
+        analyzer = retriever.ir_engine.analyzer
+        analyzer_settings = (analyzer.stopwords, analyzer.stemmer, analyzer.tokenizer, retriever.index.positions)
+
+    stats = {"files": len(gz_files), "documents": 0, "bytes": 0, "workers": workers}
+    corpus, vectors = {}, []
+    start = time.perf_counter()
+    outfile = None if shards else open(output_path, 'wb')
+    try:
+        if workers == 1:
+            _init_worker(analyzer_settings)
+            results = map(_convert_file, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(analyzer_settings,))
+            results = pool.imap(_convert_file, tasks)
+        for name, count, size, payload, indexed in results:
+            if outfile is not None:
+                outfile.write(payload)
+            if indexed is not None:
+                for doc_id, doc, vector, title_vector, positions in indexed:
+                    corpus[doc_id] = doc
+                    vectors.append((doc_id, vector, title_vector, positions))
+            stats["documents"] += count
+            stats["bytes"] += size
+            print(f"Processed: {name} ({count} docs)")
+        if pool is not None:
+            pool.close()
+            pool.join()
+    finally:
+        if outfile is not None:
+            outfile.close()
+        _init_worker(None)
+
+    stats["seconds"] = time.perf_counter() - start
+    if retriever is not None:
+        index_start = time.perf_counter()
+        retriever.load_prebuilt(corpus, vectors)
+        stats["index_seconds"] = time.perf_counter() - index_start
+    total = stats["seconds"] + stats.get("index_seconds", 0.0)
+    stats["docs_per_sec"] = stats["documents"] / total if total > 0 else 0.0
+    print(f"Total documents: {stats['documents']} ({stats['docs_per_sec']:.0f} docs/sec)")
+    return stats
+
+
 if __name__ == '__main__':
-    import sys
-    
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TREC AP88-90 to JSONL converter")
     # Default paths
-    trec_dir = '/app/trec_ap88_90'
-    output_path = '/app/trec_corpus.jsonl'
-    
-    # Override with command line args
-    if len(sys.argv) > 1:
-        trec_dir = sys.argv[1]
-    if len(sys.argv) > 2:
-        output_path = sys.argv[2]
-    
-    print(f"Converting TREC files from {trec_dir}")
-    print(f"Output: {output_path}")
-    
-    count = convert_trec_to_jsonl(trec_dir, output_path)
+    parser.add_argument('trec_dir', nargs='?', default='/app/trec_ap88_90')
+    parser.add_argument('output_path', nargs='?', default='/app/trec_corpus.jsonl')
+    parser.add_argument('--workers', type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument('--shards', action='store_true', help="Write one shard per gz file into output_path/")
+    parser.add_argument('--zstd', action='store_true', help="zstd-compress the output")
+    parser.add_argument('--index', action='store_true', help="Also build the in-memory index in the same pass")
+    parser.add_argument('--max-docs', type=int, default=None, help="Serial conversion of the first N documents")
+    args = parser.parse_args()
+
+    print(f"Converting TREC files from {args.trec_dir}")
+    print(f"Output: {args.output_path}")
+
+    if args.max_docs:
+        count = convert_trec_to_jsonl(args.trec_dir, args.output_path, args.max_docs)
+    else:
+        retriever = None
+        if args.index:
+            from syscred.trec_retriever import TRECRetriever
+            retriever = TRECRetriever(enable_prf=False)
+        stats = convert_trec_parallel(
+            args.trec_dir, args.output_path, workers=args.workers,
+            shards=args.shards, compress=args.zstd, retriever=retriever
+        )
+        count = stats["documents"]
+        if retriever is not None:
+            print(f"Index built in {stats['index_seconds']:.1f}s: {retriever.index.get_statistics()}")
     print(f"Done! Converted {count} documents")
@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""
+Dense Index Module - SysCRED
+=============================
+Embedding index for dense evidence retrieval.
+
+- Corpus embeddings (MiniLM, the coherence model) stored as a float16
+  or int8 numpy array, loaded through mmap
+- Exact top-k by blocked matrix multiply (bounded memory per block)
+- Optional IVF partitioning (spherical k-means): rows are stored list by
+  list, so probing a list scans one contiguous range
+- Live documents kept in a small float32 buffer, folded into the stored
+  arrays (and their IVF lists) once it fills up or on save
+
+Embeddings are L2-normalized, scores are cosine similarities.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class DenseIndex:
+    """
+    Dense vector index over corpus documents.
+
+    On-disk layout (directory):
+        meta.json        dtype, dim, IVF settings
+        doc_ids.json     doc id of each row
+        embeddings.npy   (N, dim) float16 or int8
+        scales.npy       (N,) float32 per-row scale (int8 only)
+        centroids.npy    (nlist, dim) float32 (IVF only)
+        offsets.npy      (nlist + 1,) int64 row range of each list (IVF only)
+
+    Usage:
+        index = DenseIndex.build(encoder, doc_ids, texts, dtype='int8')
+        index.save("/path/to/dense")
+        index = DenseIndex.load("/path/to/dense")
+        hits = index.search(encoder.encode(query), k=10)
+    """
+
+    DTYPES = ('float16', 'int8')
+    DEFAULT_BLOCK_ROWS = 4096
+    DEFAULT_NPROBE = 8
+    DEFAULT_MAX_PENDING = 1024
+
+    def __init__(
+        self,
+        doc_ids: Sequence[str],
+        embeddings: Any,
+        scales: Any = None,
+        centroids: Any = None,
+        offsets: Any = None,
+        block_rows: int = DEFAULT_BLOCK_ROWS,
+        nprobe: int = DEFAULT_NPROBE,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        if not HAS_NUMPY:
+            raise ImportError("DenseIndex requires numpy")
+        self.doc_ids = list(doc_ids)
+        self.embeddings = embeddings
+        self.scales = scales
+        self.centroids = centroids
+        self.offsets = offsets
+        self.block_rows = block_rows
+        self.nprobe = nprobe
+        self.max_pending = max(1, max_pending)
+        self.dim = embeddings.shape[1] if len(embeddings.shape) == 2 else 0
+
+        # Live documents: rows of a preallocated float32 block, searched
+        # exhaustively; stored rows they replace, and deleted stored rows,
+        # are skipped until the next compaction drops them
+        self._lock = threading.Lock()
+        self._pending_ids: List[str] = []
+        self._pending_slots: Dict[str, int] = {}
+        self._pending: Optional[Any] = None
+        self._superseded: set = set()
+        self._deleted: set = set()
+        self._stored_rows: Optional[Dict[str, int]] = None  # built on the first live add
+
+    # --- Construction ---
+
+    @staticmethod
+    def normalize(vectors: Any) -> Any:
+        """L2-normalize rows (float32)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @staticmethod
+    def quantize(vectors: Any, dtype: str) -> Tuple[Any, Any]:
+        """Store normalized float32 rows as float16, or int8 with per-row scales."""
+        if dtype == 'float16':
+            return vectors.astype(np.float16), None
+        if dtype == 'int8':
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+            return codes, scales.astype(np.float32)
+        raise ValueError(f"Unsupported dtype '{dtype}', use one of {DenseIndex.DTYPES}")
+
+    @classmethod
+    def from_vectors(
+        cls,
+        doc_ids: Sequence[str],
+        vectors: Any,
+        dtype: str = 'float16',
+        nlist: int = 0,
+        **kwargs
+    ) -> 'DenseIndex':
+        """
+        Build an index from raw vectors.
+
+        Args:
+            doc_ids: Doc id of each vector
+            vectors: (N, dim) array-like
+            dtype: 'float16' or 'int8'
+            nlist: Number of IVF lists (0 = exact search only)
+        """
+        vectors = cls.normalize(vectors) if len(doc_ids) else np.zeros((0, 0), dtype=np.float32)
+        doc_ids = list(doc_ids)
+        centroids = offsets = None
+        if nlist and len(doc_ids) > nlist:
+            centroids, assignments = cls._train_ivf(vectors, nlist)
+            order = np.argsort(assignments, kind='stable')
+            vectors = vectors[order]
+            doc_ids = [doc_ids[i] for i in order]
+            offsets = np.searchsorted(assignments[order], np.arange(nlist + 1)).astype(np.int64)
+        embeddings, scales = cls.quantize(vectors, dtype)
+        return cls(doc_ids, embeddings, scales, centroids, offsets, **kwargs)
+
+    @classmethod
+    def build(
+        cls,
+        encoder: Any,
+        doc_ids: Sequence[str],
+        texts: Sequence[str],
+        dtype: str = 'float16',
+        nlist: int = 0,
+        batch_size: int = 256,
+        **kwargs
+    ) -> 'DenseIndex':
+        """
+        Encode the corpus and build the index.
+
+        Args:
+            encoder: Object with a SentenceTransformer-style encode(list) method
+            doc_ids, texts: Corpus documents
+            dtype, nlist: See from_vectors
+            batch_size: Texts per encoder call
+        """
+        vectors = cls.encode_texts(encoder, texts, batch_size)
+        return cls.from_vectors(doc_ids, vectors, dtype=dtype, nlist=nlist, **kwargs)
+
+    @staticmethod
+    def encode_texts(encoder: Any, texts: Sequence[str], batch_size: int = 256) -> Any:
+        """Encode texts in batches into a (N, dim) float32 array."""
+        batches = [
+            np.asarray(encoder.encode(list(texts[i:i + batch_size])), dtype=np.float32)
+            for i in range(0, len(texts), batch_size)
+        ]
+        return np.vstack(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+
+    @staticmethod
+    def _train_ivf(vectors: Any, nlist: int, iterations: int = 10, sample: int = 100000, seed: int = 13) -> Tuple[Any, Any]:
+        """Spherical k-means; returns (centroids, list of every row)."""
+        rng = np.random.default_rng(seed)
+        train = vectors
+        if len(vectors) > sample:
+            train = vectors[rng.choice(len(vectors), sample, replace=False)]
+        centroids = train[rng.choice(len(train), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(train @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = train[assign == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = DenseIndex.normalize(centroids)
+        assignments = np.concatenate([
+            np.argmax(vectors[i:i + 65536] @ centroids.T, axis=1)
+            for i in range(0, len(vectors), 65536)
+        ])
+        return centroids, assignments
+
+    # --- Persistence ---
+
+    def save(self, path: str):
+        """Write the index (pending live documents included) to a directory."""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        dtype = 'int8' if self.embeddings.dtype == np.int8 else 'float16'
+        np.save(os.path.join(path, 'embeddings.npy'), np.asarray(self.embeddings))
+        if self.scales is not None:
+            np.save(os.path.join(path, 'scales.npy'), np.asarray(self.scales))
+        if self.centroids is not None:
+            np.save(os.path.join(path, 'centroids.npy'), self.centroids)
+            np.save(os.path.join(path, 'offsets.npy'), self.offsets)
+        with open(os.path.join(path, 'doc_ids.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.doc_ids, f)
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'dtype': dtype,
+                'dim': self.dim,
+                'num_docs': len(self.doc_ids),
+                'nlist': len(self.centroids) if self.centroids is not None else 0
+            }, f)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'DenseIndex':
+        """Open a saved index; embeddings are memory-mapped, not read."""
+        if not HAS_NUMPY:
+            raise ImportError("DenseIndex requires numpy")
+        with open(os.path.join(path, 'doc_ids.json'), 'r', encoding='utf-8') as f:
+            doc_ids = json.load(f)
+        embeddings = np.load(os.path.join(path, 'embeddings.npy'), mmap_mode='r')
+
+        def optional(name, mmap_mode=None):
+            file_path = os.path.join(path, name)
+            return np.load(file_path, mmap_mode=mmap_mode) if os.path.exists(file_path) else None
+
+        return cls(
+            doc_ids, embeddings,
+            scales=optional('scales.npy', mmap_mode='r'),
+            centroids=optional('centroids.npy'),
+            offsets=optional('offsets.npy'),
+            **kwargs
+        )
+
+    @staticmethod
+    def exists(path: Optional[str]) -> bool:
+        return bool(path) and os.path.exists(os.path.join(path, 'meta.json'))
+
+    # --- Live documents ---
+
+    def add(self, doc_id: str, vector: Any):
+        """Add or replace one document; searchable immediately."""
+        vector = self.normalize(vector)[0]
+        with self._lock:
+            slot = self._pending_slots.get(doc_id)
+            if slot is None:
+                slot = len(self._pending_ids)
+                if self._pending is None:
+                    self._pending = np.empty((self.max_pending, len(vector)), dtype=np.float32)
+                self._pending_ids.append(doc_id)
+                self._pending_slots[doc_id] = slot
+                if doc_id in self._stored():
+                    self._superseded.add(doc_id)
+            self._pending[slot] = vector
+            self._compact_if_full()
+
+    def remove(self, doc_id: str) -> bool:
+        """Delete a document, pending or stored (tombstoned until the next compaction)."""
+        with self._lock:
+            removed = False
+            slot = self._pending_slots.pop(doc_id, None)
+            if slot is not None:
+                last_id = self._pending_ids.pop()
+                if last_id != doc_id:
+                    # Move the last row into the freed slot
+                    self._pending[slot] = self._pending[len(self._pending_ids)]
+                    self._pending_ids[slot] = last_id
+                    self._pending_slots[last_id] = slot
+                removed = True
+            if doc_id in self._stored() and doc_id not in self._deleted:
+                self._superseded.discard(doc_id)
+                self._deleted.add(doc_id)
+                removed = True
+            self._compact_if_full()
+            return removed
+
+    def _compact_if_full(self):
+        # Tombstones count too: they deepen every search until compacted
+        if len(self._pending_ids) + len(self._deleted) >= self.max_pending:
+            self._compact_locked()
+
+    def compact(self):
+        """Fold pending live documents into the stored arrays."""
+        with self._lock:
+            self._compact_locked()
+
+    def _stored(self) -> Dict[str, int]:
+        if self._stored_rows is None:
+            self._stored_rows = {doc_id: row for row, doc_id in enumerate(self.doc_ids)}
+        return self._stored_rows
+
+    def _compact_locked(self):
+        """
+        Append the pending rows (quantized like the stored ones) and drop
+        the rows they replace or that were deleted. With IVF, each new row
+        joins the list of its nearest centroid and rows are reordered list
+        by list.
+        """
+        count = len(self._pending_ids)
+        if not count and not self._deleted:
+            return
+        pending = self._pending[:count] if count else np.zeros((0, self.dim), dtype=np.float32)
+        keep = np.ones(len(self.doc_ids), dtype=bool)
+        stored = self._stored()
+        for doc_id in self._superseded | self._deleted:
+            keep[stored[doc_id]] = False
+        keep = np.flatnonzero(keep)
+        dtype = 'int8' if self.embeddings.dtype == np.int8 else 'float16'
+        codes, scales = self.quantize(pending, dtype)
+        doc_ids = [self.doc_ids[i] for i in keep] + self._pending_ids
+        if len(keep):
+            embeddings = np.concatenate([np.asarray(self.embeddings[keep]), codes])
+            if scales is not None:
+                scales = np.concatenate([np.asarray(self.scales[keep]), scales])
+        else:
+            embeddings = codes
+        if self.centroids is not None:
+            nlist = len(self.centroids)
+            lists = np.repeat(np.arange(nlist), np.diff(self.offsets))[keep]
+            assignments = np.concatenate([lists, np.argmax(pending @ self.centroids.T, axis=1)])
+            order = np.argsort(assignments, kind='stable')
+            embeddings = embeddings[order]
+            if scales is not None:
+                scales = scales[order]
+            doc_ids = [doc_ids[i] for i in order]
+            self.offsets = np.searchsorted(assignments[order], np.arange(nlist + 1)).astype(np.int64)
+        self.doc_ids = doc_ids
+        self.embeddings, self.scales = embeddings, scales
+        self.dim = embeddings.shape[1]
+        self._pending_ids, self._pending_slots, self._superseded, self._deleted = [], {}, set(), set()
+        self._stored_rows = None
+
+    # --- Search ---
+
+    def _scan(
+        self,
+        embeddings: Any,
+        scales: Any,
+        query: Any,
+        start: int,
+        end: int,
+        k: int,
+        candidates: List[Tuple[Any, Any]]
+    ):
+        """Blocked matmul over rows [start, end); keep the top-k of each block."""
+        for block_start in range(start, end, self.block_rows):
+            block_end = min(block_start + self.block_rows, end)
+            block = np.asarray(embeddings[block_start:block_end], dtype=np.float32)
+            scores = block @ query
+            if scales is not None:
+                scores *= scales[block_start:block_end]
+            if len(scores) > k:
+                top = np.argpartition(scores, -k)[-k:]
+            else:
+                top = np.arange(len(scores))
+            candidates.append((scores[top], top + block_start))
+
+    def search(self, query_vector: Any, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k documents by cosine similarity.
+
+        Args:
+            query_vector: Query embedding (normalized here)
+            k: Number of results
+            nprobe: IVF lists to scan (default: self.nprobe); ignored
+                without IVF, where the search is exact
+
+        Returns:
+            List of (doc_id, score) sorted by decreasing score
+        """
+        query = self.normalize(query_vector)[0]
+        # Compaction swaps the stored arrays: read them with the pending rows
+        with self._lock:
+            doc_ids, embeddings, scales = self.doc_ids, self.embeddings, self.scales
+            centroids, offsets = self.centroids, self.offsets
+            pending_ids = list(self._pending_ids)
+            hidden = self._superseded | self._deleted
+            pending_scores = self._pending[:len(pending_ids)] @ query if pending_ids else None
+
+        # Over-fetch so hidden rows can be dropped (at most max_pending): each
+        # block keeps this many rows, hidden ones cannot push out the top k
+        depth = k + len(hidden)
+        candidates: List[Tuple[Any, Any]] = []
+        num_rows = len(doc_ids)
+        if num_rows and embeddings.ndim == 2 and embeddings.shape[1]:
+            if centroids is not None:
+                probes = min(nprobe or self.nprobe, len(centroids))
+                lists = np.argpartition(centroids @ query, -probes)[-probes:]
+                for c in lists:
+                    self._scan(embeddings, scales, query, int(offsets[c]), int(offsets[c + 1]), depth, candidates)
+            else:
+                self._scan(embeddings, scales, query, 0, num_rows, depth, candidates)
+
+        ranked: List[Tuple[float, str]] = []
+        if candidates:
+            scores = np.concatenate([c[0] for c in candidates])
+            rows = np.concatenate([c[1] for c in candidates])
+            depth = min(len(scores), depth)
+            top = np.argpartition(scores, -depth)[-depth:]
+            ranked.extend(
+                (float(scores[i]), doc_ids[rows[i]])
+                for i in top if doc_ids[rows[i]] not in hidden
+            )
+        if pending_scores is not None:
+            ranked.extend(zip(pending_scores.tolist(), pending_ids))
+        ranked.sort(key=lambda x: x[0], reverse=True)
+        return [(doc_id, score) for score, doc_id in ranked[:k]]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "num_docs": len(self.doc_ids),
+            "pending_docs": len(self._pending_ids),
+            "deleted_docs": len(self._deleted),
+            "dim": self.dim,
+            "dtype": str(self.embeddings.dtype),
+            "ivf_lists": len(self.centroids) if self.centroids is not None else 0,
+            "nprobe": self.nprobe
+        }
@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+Document Store Module - SysCRED
+================================
+Block-compressed, random-access store of corpus documents.
+
+A plain dict of 50k AP articles costs hundreds of MB per worker. The
+store keeps the documents compressed on disk and only holds ids, a
+small offset table and a hot-document LRU in memory:
+
+- Documents are packed into ~64 KB blocks, each compressed with zstd
+  (zlib when the zstandard package is not installed)
+- blocks.bin is memory-mapped; a lookup decompresses one block
+- Behaves like the corpus dict (doc_id -> {'text', 'title', ...}), so
+  TRECRetriever and the API use it unchanged
+- Live documents are buffered and appended as a new block
+- meta.json records the source corpus (file stats, limit): a store built
+  from another corpus is rebuilt instead of reopened
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import io
+import os
+import json
+import mmap
+import zlib
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+def _jsonl_files(path: str) -> List[str]:
+    """A JSONL file, or the sorted shards of a directory (convert_trec.py --shards)."""
+    if os.path.isdir(path):
+        return sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.endswith('.jsonl') or name.endswith('.jsonl.zst')
+        )
+    return [path]
+
+
+def _open_jsonl(path: str):
+    """Text stream over a JSONL file, zstd-decompressed for .zst files."""
+    if path.endswith('.zst'):
+        if not HAS_ZSTD:
+            raise ImportError("zstandard is required to read " + path)
+        raw = open(path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def corpus_signature(path: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Identity of a JSONL corpus as stored in meta.json: (path, size, mtime) of each file, and the limit."""
+    files = []
+    for file_path in _jsonl_files(path):
+        stat = os.stat(file_path)
+        files.append([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns])
+    return {'files': files, 'limit': limit}
+
+
+def iter_jsonl_documents(path: str, limit: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Stream (doc_id, {'text', 'title'}) from a JSONL corpus (convert_trec.py format)."""
+    count = 0
+    for file_path in _jsonl_files(path):
+        with _open_jsonl(file_path) as f:
+            for line in f:
+                if limit is not None and count >= limit:
+                    return
+                line = line.strip()
+                if not line:
+                    continue
+                doc = json.loads(line)
+                doc_id = doc.get('id')
+                if not doc_id:
+                    continue
+                yield doc_id, {
+                    'text': doc.get('contents', doc.get('text', '')),
+                    'title': doc.get('title', '')
+                }
+                count += 1
+
+
+class DocumentStore(Mapping):
+    """
+    doc_id -> document dict, persisted in a directory:
+        meta.json    codec, block size
+        blocks.bin   compressed blocks, appended
+        blocks.idx   end offset of each block (uint64)
+        docs.idx     (block, start, length) of each record (uint32 x 3)
+        ids.txt      one doc id per line, record order
+
+    A re-stored doc_id points to its newest record. Records and blocks
+    left without an id by a crash are dropped when the store is opened.
+
+    Usage:
+        store = DocumentStore.build("/path/to/store", iter_jsonl_documents("ap.jsonl"))
+        retriever.corpus = DocumentStore.open("/path/to/store")
+    """
+
+    DEFAULT_BLOCK_SIZE = 64 * 1024
+    DEFAULT_CACHE_SIZE = 1024
+
+    def __init__(
+        self,
+        path: str,
+        codec: str = 'zstd',
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        level: int = 3
+    ):
+        """
+        Args:
+            path: Store directory
+            codec: 'zstd' or 'zlib' for new stores ('zstd' falls back to
+                zlib without the zstandard package)
+            block_size: Uncompressed bytes per block
+            cache_size: Decoded documents kept in the hot LRU (0 = none)
+            level: Compression level
+        """
+        if codec == 'zstd' and not HAS_ZSTD:
+            codec = 'zlib'
+        self.path = path
+        self.codec = codec
+        self.block_size = block_size
+        self.cache_size = cache_size
+        self.level = level
+        self.source: Optional[Dict[str, Any]] = None  # corpus_signature() of the build input
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._records = array('I')  # block, start, length per record
+        self._block_ends = array('Q')
+        self._map: Optional[mmap.mmap] = None
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_bytes = 0
+        self._cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._compressor = None
+        self._decompressors = threading.local()  # ZstdDecompressor is not thread-safe
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "blocks_read": 0}
+
+    # --- Opening / building ---
+
+    @classmethod
+    def open(cls, path: str, cache_size: int = DEFAULT_CACHE_SIZE, codec: str = 'zstd') -> 'DocumentStore':
+        """Open (or create) a store directory; blocks are memory-mapped."""
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            store = cls(path, codec=codec, cache_size=cache_size)
+            store._write_meta()
+            return store
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['codec'] == 'zstd' and not HAS_ZSTD:
+            raise ImportError("zstandard is required to read this document store")
+        store = cls(path, codec=meta['codec'], block_size=meta['block_size'], cache_size=cache_size)
+        store.source = meta.get('source')
+        store._load_tables()
+        return store
+
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        documents: Iterable[Tuple[str, Dict[str, Any]]],
+        codec: str = 'zstd',
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        source: Optional[Dict[str, Any]] = None
+    ) -> 'DocumentStore':
+        """Create a store from streamed (doc_id, document) pairs (source: see corpus_signature)."""
+        os.makedirs(path, exist_ok=True)
+        for name in ('meta.json', 'blocks.bin', 'blocks.idx', 'docs.idx', 'ids.txt'):
+            if os.path.exists(os.path.join(path, name)):
+                os.remove(os.path.join(path, name))
+        store = cls(path, codec=codec, block_size=block_size, cache_size=cache_size)
+        store._write_meta()
+        for doc_id, doc in documents:
+            store[doc_id] = doc
+        store.flush()
+        # Source last: a build cut short is rebuilt on the next start
+        store.source = source
+        store._write_meta()
+        return store
+
+    @classmethod
+    def open_or_build(
+        cls,
+        path: str,
+        corpus_path: str,
+        limit: Optional[int] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE
+    ) -> 'DocumentStore':
+        """
+        Open the store if it was built from this corpus (same files, sizes,
+        mtimes and limit), otherwise rebuild it from the JSONL corpus.
+        """
+        source = corpus_signature(corpus_path, limit)
+        if cls.exists(path):
+            store = cls.open(path, cache_size=cache_size)
+            if store.source == source:
+                return store
+            store.close()
+            print(f"[DocumentStore] {path} was built from another corpus, rebuilding")
+        return cls.build(path, iter_jsonl_documents(corpus_path, limit), cache_size=cache_size, source=source)
+
+    @staticmethod
+    def exists(path: Optional[str]) -> bool:
+        return bool(path) and os.path.exists(os.path.join(path, 'meta.json'))
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'codec': self.codec, 'block_size': self.block_size, 'source': self.source}, f)
+
+    def _load_tables(self):
+        """Read the offset tables and ids, dropping a torn tail."""
+        if not os.path.exists(os.path.join(self.path, 'ids.txt')):
+            return
+        with open(os.path.join(self.path, 'blocks.idx'), 'rb') as f:
+            data = f.read()
+        self._block_ends.frombytes(data[:len(data) - len(data) % self._block_ends.itemsize])
+        with open(os.path.join(self.path, 'docs.idx'), 'rb') as f:
+            data = f.read()
+        record_bytes = 3 * self._records.itemsize
+        self._records.frombytes(data[:len(data) - len(data) % record_bytes])
+        with open(os.path.join(self.path, 'ids.txt'), 'r', encoding='utf-8') as f:
+            ids = [line.rstrip('\n') for line in f]
+
+        # Records must point to a complete block and have an id
+        num_records = min(len(self._records) // 3, len(ids))
+        while num_records and self._records[3 * (num_records - 1)] >= len(self._block_ends):
+            num_records -= 1
+        del self._records[3 * num_records:]
+        self._ids = ids[:num_records]
+        if len(ids) > num_records or len(data) > num_records * record_bytes:
+            # Torn append: cut the tables back so later appends stay aligned
+            with open(os.path.join(self.path, 'docs.idx'), 'r+b') as f:
+                f.truncate(num_records * record_bytes)
+            with open(os.path.join(self.path, 'ids.txt'), 'w', encoding='utf-8') as f:
+                f.write(''.join(f"{doc_id}\n" for doc_id in self._ids))
+        with open(os.path.join(self.path, 'blocks.idx'), 'r+b') as f:
+            f.truncate(len(self._block_ends) * self._block_ends.itemsize)
+        for row, doc_id in enumerate(self._ids):
+            self._rows[doc_id] = row
+        self._remap()
+
+    def _remap(self):
+        """
+        Map blocks.bin (re-run after appends). The previous map is left to
+        the readers still decoding from it: blocks are only appended.
+        """
+        self._map = None
+        blocks_path = os.path.join(self.path, 'blocks.bin')
+        if self._block_ends and os.path.getsize(blocks_path):
+            with open(blocks_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # --- Codec ---
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            if self._compressor is None:
+                self._compressor = zstandard.ZstdCompressor(level=self.level)
+            return self._compressor.compress(data)
+        return zlib.compress(data, self.level)
+
+    def _decompress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            decompressor = getattr(self._decompressors, 'zstd', None)
+            if decompressor is None:
+                decompressor = self._decompressors.zstd = zstandard.ZstdDecompressor()
+            return decompressor.decompress(data)
+        return zlib.decompress(data)
+
+    # --- Writes ---
+
+    def __setitem__(self, doc_id: str, doc: Dict[str, Any]):
+        """Store a document (buffered; a block is appended once full)."""
+        with self._lock:
+            self._pending[doc_id] = doc
+            self._cache.pop(doc_id, None)
+            self._pending_bytes += sum(len(v) for v in doc.values() if isinstance(v, str))
+            if self._pending_bytes >= self.block_size:
+                self.flush()
+
+    def flush(self):
+        """Append the buffered documents as one compressed block."""
+        with self._lock:
+            if not self._pending:
+                return
+            block = len(self._block_ends)
+            payload = bytearray()
+            records = array('I')
+            for doc in self._pending.values():
+                data = json.dumps(doc, ensure_ascii=False).encode('utf-8')
+                records.extend((block, len(payload), len(data)))
+                payload += data
+            compressed = self._compress(bytes(payload))
+            start = self._block_ends[-1] if self._block_ends else 0
+
+            # Block before its offset, records before their ids
+            with open(os.path.join(self.path, 'blocks.bin'), 'r+b' if start else 'wb') as f:
+                f.seek(start)
+                f.write(compressed)
+                f.truncate()
+            with open(os.path.join(self.path, 'blocks.idx'), 'ab') as f:
+                f.write(array('Q', [start + len(compressed)]).tobytes())
+            with open(os.path.join(self.path, 'docs.idx'), 'ab') as f:
+                f.write(records.tobytes())
+            with open(os.path.join(self.path, 'ids.txt'), 'a', encoding='utf-8') as f:
+                f.write(''.join(f"{doc_id}\n" for doc_id in self._pending))
+
+            self._block_ends.append(start + len(compressed))
+            self._records.extend(records)
+            for doc_id in self._pending:
+                self._rows[doc_id] = len(self._ids)
+                self._ids.append(doc_id)
+            self._pending = {}
+            self._pending_bytes = 0
+            self._remap()
+
+    # --- Reads ---
+
+    def _block_span(self, block: int) -> Tuple[int, int]:
+        return (self._block_ends[block - 1] if block else 0), self._block_ends[block]
+
+    def _read_block(self, block: int) -> bytes:
+        start, end = self._block_span(block)
+        self.stats["blocks_read"] += 1
+        return self._decompress(self._map[start:end])
+
+    def _decode(self, payload: bytes, row: int) -> Dict[str, Any]:
+        _, start, length = self._records[3 * row:3 * row + 3]
+        return json.loads(payload[start:start + length])
+
+    def __getitem__(self, doc_id: str) -> Dict[str, Any]:
+        with self._lock:
+            doc = self._pending.get(doc_id)
+            if doc is not None:
+                return doc
+            doc = self._cache.get(doc_id)
+            if doc is not None:
+                self._cache.move_to_end(doc_id)
+                self.stats["cache_hits"] += 1
+                return doc
+            row = self._rows[doc_id]
+            self.stats["cache_misses"] += 1
+            self.stats["blocks_read"] += 1
+            block, start, length = self._records[3 * row:3 * row + 3]
+            mapping = self._map
+            block_start, block_end = self._block_span(block)
+        # Read, decompress and decode without the lock
+        payload = self._decompress(mapping[block_start:block_end])
+        doc = json.loads(payload[start:start + length])
+        if self.cache_size:
+            with self._lock:
+                # Skip the insert if the document was stored again meanwhile
+                if self._rows.get(doc_id) == row and doc_id not in self._pending:
+                    self._cache[doc_id] = doc
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        return doc
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._rows or doc_id in self._pending
+
+    def __len__(self) -> int:
+        return len(self._rows) + sum(1 for doc_id in self._pending if doc_id not in self._rows)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._rows
+        for doc_id in list(self._pending):
+            if doc_id not in self._rows:
+                yield doc_id
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream every document, one block decompressed at a time (the hot
+        LRU is left untouched). Documents buffered or re-stored later are
+        yielded in their newest version.
+        """
+        pending = dict(self._pending)
+        payload, current = b'', -1
+        for row, doc_id in enumerate(self._ids):
+            if self._rows.get(doc_id) != row or doc_id in pending:
+                continue
+            block = self._records[3 * row]
+            if block != current:
+                payload, current = self._read_block(block), block
+            yield doc_id, self._decode(payload, row)
+        yield from pending.items()
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        return (doc for _, doc in self.items())
+
+    def close(self):
+        """Flush buffered documents and unmap the blocks."""
+        self.flush()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self),
+            "blocks": len(self._block_ends),
+            "compressed_bytes": self._block_ends[-1] if self._block_ends else 0,
+            "codec": self.codec,
+            "cached_docs": len(self._cache),
+            "pending_docs": len(self._pending),
+            **self.stats
+        }
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Domain History Module - SysCRED
+================================
+Secondary index of past evaluations per source domain.
+
+GraphRAG asks "how was this domain rated before?" twice per
+verification. Answering with a SPARQL FILTER(CONTAINS(...)) scans every
+informationURL literal; this index keeps, for each registrable domain
+(lemonde.fr, bbc.co.uk), the most recent (timestamp, score, level)
+entries in timestamp order, so the lookup is a dict access.
+
+The index is maintained by OntologyManager.add_evaluation_triplets,
+rebuilt from the graph whenever a graph is loaded, and persisted next
+to the data graph with a fingerprint of the files it was built from.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import os
+import json
+import bisect
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+# Public suffixes with more than one label (registrable domain = one
+# more label). Single-label TLDs (.com, .fr, .ca, ...) are implicit.
+MULTI_LABEL_SUFFIXES = frozenset([
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk", "me.uk", "net.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "co.nz", "org.nz", "govt.nz", "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp",
+    "co.in", "gov.in", "com.br", "gov.br", "com.cn", "gov.cn", "com.mx", "gob.mx",
+    "co.za", "gov.za", "com.ar", "com.tr", "co.kr", "com.sg", "com.hk",
+    "gc.ca", "qc.ca", "on.ca", "bc.ca", "gouv.fr", "gouv.qc.ca", "asso.fr",
+])
+
+
+def registrable_domain(url_or_domain: str) -> str:
+    """
+    Registrable domain of a URL or host name.
+
+    'https://www.lemonde.fr/article' -> 'lemonde.fr',
+    'news.bbc.co.uk' -> 'bbc.co.uk'. IP addresses and single-label
+    hosts are returned unchanged; '' if no host can be found.
+    """
+    value = (url_or_domain or "").strip().lower()
+    if not value:
+        return ""
+    if "//" not in value:
+        value = "//" + value
+    try:
+        host = urlparse(value).hostname or ""
+    except ValueError:
+        return ""
+    host = host.rstrip(".")
+    labels = host.split(".")
+    if len(labels) < 2 or labels[-1].isdigit():
+        return host
+    for size in (3, 2):
+        if len(labels) > size and ".".join(labels[-size:]) in MULTI_LABEL_SUFFIXES:
+            return ".".join(labels[-size - 1:])
+    return ".".join(labels[-2:])
+
+
+@dataclass
+class HistoryEntry:
+    """One past evaluation of a domain."""
+    timestamp: str  # ISO 8601 (sorts chronologically as a string)
+    score: float
+    level: str  # Local name, e.g. 'Niveau_Haut'
+    report: str  # RapportEvaluation URI
+
+
+class DomainHistoryIndex:
+    """
+    Registrable domain -> most recent evaluations (bounded, oldest dropped).
+
+    Usage:
+        index = DomainHistoryIndex(size=10)
+        index.add("https://www.lemonde.fr/a", "2026-01-05T10:00:00", 0.8, "Niveau_Haut", report_uri)
+        index.recent("lemonde.fr", 5)  # newest first
+    """
+
+    VERSION = 1
+
+    def __init__(self, size: int = 10):
+        self.size = max(1, int(size))
+        self._domains: Dict[str, List[HistoryEntry]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._domains.values())
+
+    def clear(self):
+        self._domains = {}
+
+    def add(self, url: str, timestamp: str, score: float, level: str, report: str) -> bool:
+        """Record an evaluation; False if the URL has no domain."""
+        domain = registrable_domain(url)
+        if not domain:
+            return False
+        entries = self._domains.setdefault(domain, [])
+        keys = [(e.timestamp, e.report) for e in entries]
+        entries.insert(bisect.bisect_right(keys, (timestamp, report)), HistoryEntry(timestamp, score, level, report))
+        if len(entries) > self.size:
+            del entries[:len(entries) - self.size]
+        return True
+
+    def recent(self, domain: str, limit: Optional[int] = None) -> List[HistoryEntry]:
+        """Most recent evaluations of a domain (or URL), newest first."""
+        entries = self._domains.get(registrable_domain(domain), [])
+        newest = entries[::-1]
+        return newest[:limit] if limit is not None else newest
+
+    def domains(self) -> List[str]:
+        return sorted(self._domains)
+
+    def rebuild(self, evaluations: Iterable[Tuple[str, str, float, str, str]]):
+        """Rebuild from (url, timestamp, score, level, report) tuples."""
+        self.clear()
+        for url, timestamp, score, level, report in evaluations:
+            self.add(url, timestamp, score, level, report)
+
+    # --- Persistence ---
+
+    @staticmethod
+    def fingerprint(triple_counts: Sequence[int], *paths: Optional[str]) -> List:
+        """Triple counts plus size/mtime of the data files the index reflects."""
+        values = list(triple_counts)
+        for path in paths:
+            stat = os.stat(path) if path and os.path.exists(path) else None
+            values += [stat.st_size, stat.st_mtime_ns] if stat else [None, None]
+        return values
+
+    def save(self, path: str, fingerprint: List) -> bool:
+        payload = {
+            "version": self.VERSION,
+            "size": self.size,
+            "fingerprint": fingerprint,
+            "domains": {
+                domain: [[e.timestamp, e.score, e.level, e.report] for e in entries]
+                for domain, entries in self._domains.items()
+            },
+        }
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"[DomainHistory] Save error: {e}")
+            return False
+
+    def load(self, path: str, fingerprint: List) -> bool:
+        """Load a saved index; False (index untouched) if missing or stale."""
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[DomainHistory] Load error: {e}")
+            return False
+        if (payload.get("version") != self.VERSION or payload.get("size") != self.size
+                or payload.get("fingerprint") != fingerprint):
+            return False
+        self._domains = {
+            domain: [HistoryEntry(ts, float(score), level, report) for ts, score, level, report in entries]
+            for domain, entries in payload.get("domains", {}).items()
+        }
+        return True
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Embedding Store Module - SysCRED
+=================================
+Persistent doc-id-keyed store of evidence embeddings (SBERT MiniLM).
+
+verify_with_evidence only has to encode the claim: the vectors of the
+retrieved documents are gathered from the store instead of re-encoding
+their text on every call.
+
+- Append-only files, vectors opened through mmap
+- Built at index time from the same vectors as the dense index
+- Lazy mode: missing vectors are computed on demand and written back
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class EmbeddingStore:
+    """
+    doc_id -> embedding, persisted in a directory:
+        meta.json     dim, dtype
+        ids.txt       one doc id per line, row order
+        vectors.bin   raw (N, dim) rows, appended
+
+    Vectors are written before their ids; rows left without an id by a
+    crash are truncated when the store is opened.
+
+    Usage:
+        store = EmbeddingStore.open("/path/to/store", lazy=True)
+        vectors = store.gather(doc_ids, texts_by_id, encoder)
+    """
+
+    def __init__(self, path: Optional[str] = None, dim: int = 0, dtype: str = 'float16', lazy: bool = False):
+        """
+        Args:
+            path: Store directory (None: in-memory only)
+            dim: Embedding dimension (taken from meta.json or the first vectors)
+            dtype: Storage dtype of new stores ('float16' or 'float32')
+            lazy: Compute missing vectors in gather() and write them back
+        """
+        if not HAS_NUMPY:
+            raise ImportError("EmbeddingStore requires numpy")
+        self.path = path
+        self.dim = dim
+        self.dtype = dtype
+        self.lazy = lazy
+        self._rows: Dict[str, int] = {}
+        self._next_row = 0
+        self._vectors = None
+        self._memory: List[Any] = []
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "computed": 0}
+
+    @classmethod
+    def open(cls, path: str, lazy: bool = False, dtype: str = 'float16') -> 'EmbeddingStore':
+        """Open (or create) a store directory; vectors are memory-mapped."""
+        store = cls(path, dtype=dtype, lazy=lazy)
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            store.dim = meta['dim']
+            store.dtype = meta['dtype']
+            ids_path = os.path.join(path, 'ids.txt')
+            if os.path.exists(ids_path):
+                with open(ids_path, 'r', encoding='utf-8') as f:
+                    for row, doc_id in enumerate(line.rstrip('\n') for line in f):
+                        store._rows[doc_id] = row
+                        store._next_row = row + 1
+            vectors_path = os.path.join(path, 'vectors.bin')
+            row_bytes = np.dtype(store.dtype).itemsize * store.dim
+            if os.path.exists(vectors_path) and os.path.getsize(vectors_path) > store._next_row * row_bytes:
+                with open(vectors_path, 'r+b') as f:
+                    f.truncate(store._next_row * row_bytes)
+            store._remap()
+        return store
+
+    @staticmethod
+    def exists(path: Optional[str]) -> bool:
+        return bool(path) and os.path.exists(os.path.join(path, 'meta.json'))
+
+    def _remap(self):
+        """Map the rows that have an id (re-run after appends)."""
+        vectors_path = os.path.join(self.path, 'vectors.bin')
+        if not self.dim or not os.path.exists(vectors_path):
+            self._vectors = None
+            return
+        row_bytes = np.dtype(self.dtype).itemsize * self.dim
+        num_rows = min(os.path.getsize(vectors_path) // row_bytes, self._next_row)
+        self._vectors = np.memmap(vectors_path, dtype=self.dtype, mode='r', shape=(num_rows, self.dim)) if num_rows else None
+
+    # --- Writes ---
+
+    def put(self, doc_ids: Sequence[str], vectors: Any):
+        """Store vectors (appended; a re-put doc_id points to its new row)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        if not len(doc_ids):
+            return
+        with self._lock:
+            if not self.dim:
+                self.dim = vectors.shape[1]
+            rows = vectors.astype(self.dtype)
+            first_row = self._next_row
+            if self.path:
+                if not os.path.exists(os.path.join(self.path, 'meta.json')):
+                    with open(os.path.join(self.path, 'meta.json'), 'w', encoding='utf-8') as f:
+                        json.dump({'dim': self.dim, 'dtype': self.dtype}, f)
+                with open(os.path.join(self.path, 'vectors.bin'), 'ab') as f:
+                    f.write(rows.tobytes())
+                with open(os.path.join(self.path, 'ids.txt'), 'a', encoding='utf-8') as f:
+                    f.write(''.join(f"{doc_id}\n" for doc_id in doc_ids))
+            else:
+                self._memory.extend(rows)
+            for offset, doc_id in enumerate(doc_ids):
+                self._rows[doc_id] = first_row + offset
+            self._next_row = first_row + len(doc_ids)
+            if self.path:
+                self._remap()
+
+    # --- Reads ---
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, doc_ids: Sequence[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """Return ({doc_id: float32 vector} for stored ids, missing ids)."""
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        vectors = self._vectors
+        for doc_id in doc_ids:
+            row = self._rows.get(doc_id)
+            if row is None or (self.path and (vectors is None or row >= len(vectors))):
+                missing.append(doc_id)
+            else:
+                source = vectors if self.path else self._memory
+                found[doc_id] = np.asarray(source[row], dtype=np.float32)
+        return found, missing
+
+    def items(self) -> Tuple[List[str], Any]:
+        """All stored (doc ids, (n, dim) rows in the storage dtype), in row order."""
+        doc_ids = sorted(self._rows, key=self._rows.get)
+        if not doc_ids or not self.dim:
+            return [], np.zeros((0, self.dim), dtype=self.dtype)
+        rows = np.fromiter((self._rows[doc_id] for doc_id in doc_ids), dtype=np.int64, count=len(doc_ids))
+        source = self._vectors if self.path else np.vstack(self._memory)
+        if source is None or len(source) <= rows[-1]:
+            return [], np.zeros((0, self.dim), dtype=self.dtype)
+        return doc_ids, np.asarray(source[rows])
+
+    def gather(
+        self,
+        doc_ids: Sequence[str],
+        texts: Optional[Dict[str, str]] = None,
+        encoder: Any = None,
+        overrides: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], Any]:
+        """
+        Embeddings of the given documents, in order.
+
+        In lazy mode, missing vectors are encoded from `texts` and written
+        back; otherwise documents without a stored vector are left out.
+        `overrides` ({doc_id: vector}, e.g. live documents) take precedence
+        and are never written to the store.
+
+        Returns:
+            (doc ids that have a vector, (n, dim) float32 matrix)
+        """
+        overrides = overrides or {}
+        found, missing = self.get([doc_id for doc_id in doc_ids if doc_id not in overrides])
+        found.update(
+            (doc_id, np.asarray(overrides[doc_id], dtype=np.float32))
+            for doc_id in doc_ids if doc_id in overrides
+        )
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(missing)
+        if missing and self.lazy and encoder is not None and texts:
+            to_encode = [doc_id for doc_id in missing if texts.get(doc_id)]
+            if to_encode:
+                vectors = np.asarray(encoder.encode([texts[d] for d in to_encode]), dtype=np.float32)
+                self.put(to_encode, vectors)
+                found.update(zip(to_encode, vectors))
+                self.stats["computed"] += len(to_encode)
+        present = [doc_id for doc_id in doc_ids if doc_id in found]
+        if not present:
+            return [], np.zeros((0, self.dim), dtype=np.float32)
+        return present, np.vstack([found[doc_id] for doc_id in present])
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "num_docs": len(self._rows),
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "lazy": self.lazy,
+            **self.stats
+        }
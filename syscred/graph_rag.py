@@ -8,91 +8,119 @@ Transforms "Passive" Graph into "Active" Context.
 (c) Dominique S. Loyer - PhD Thesis Prototype
 """
 
+import copy
 from typing import List, Dict, Any, Optional
 from syscred.ontology_manager import OntologyManager
 
+
 class GraphRAG:
     """
     Retrieval Augmented Generation using the Semantic Knowledge Graph.
     """
     
-    def __init__(self, ontology_manager: OntologyManager):
+    def __init__(self, ontology_manager: OntologyManager, similarity_threshold: float = 0.6):
+        """
+        Args:
+            ontology_manager: Graph and its evaluation indexes
+            similarity_threshold: Min cosine of a semantically similar claim
+        """
         self.om = ontology_manager
+        self.similarity_threshold = similarity_threshold
+        self._memo = None  # (key, analyze() result) of the last request
         
-    def get_context(self, domain: str, keywords: List[str] = []) -> Dict[str, str]:
+    def analyze(self, domain: str, keywords: List[str] = [], claim: Optional[str] = None) -> Dict[str, Any]:
         """
-        Retrieve context for a specific verification task.
+        Text context and numerical scores of one verification task, from
+        a single domain history lookup and a single similar-claims search.
+        
+        The last result is memoized (keyed by the arguments and the
+        ontology's write generation), so get_context() and
+        compute_context_score() on the same request share one set of
+        lookups; callers get a copy of it.
         
         Args:
             domain: The domain being analyzed (e.g., 'lemonde.fr')
-            keywords: List of keywords from the claim (not yet used in V1)
+            keywords: List of keywords from the claim
+            claim: Claim text, for semantic search when claim embeddings are available
             
         Returns:
-            Dictionary with natural language context strings.
+            Dictionary with 'full_text', 'source_history', 'similar_uris'
+            (see get_context) and 'context_score' (see compute_context_score)
         """
         if not self.om:
-            return {"graph_context": "No ontology manager available."}
+            return {
+                "full_text": "No ontology manager available.",
+                "source_history": "",
+                "similar_uris": [],
+                "context_score": self._context_score({'count': 0}, {"scores": []})
+            }
+        
+        # Graphs and indexes are read together (the ontology writer
+        # applies each batch of evaluations atomically)
+        with self.om.graph_lock.read():
+            key = (domain, tuple(keywords or ()), claim, self.om.write_generation)
+            memo = self._memo
+            if memo is not None and memo[0] == key:
+                return copy.deepcopy(memo[1])
             
-        context_parts = []
+            # One lookup each: newest evaluations of the domain, similar claims
+            entries = self.om.domain_history.recent(domain, 10) if domain else []
+            similar_result = {"text": "", "uris": [], "scores": []}
+            if keywords or claim:
+                similar_result = self._find_similar_claims(keywords or [], claim)
         
-        # 1. Source History
-        source_history = self._get_source_history(domain)
+        context_parts = []
+        source_history = self._get_source_history(domain, entries[:5])
         if source_history:
             context_parts.append(source_history)
-            
-        # 2. Pattern Matching (Similar Claims)
-        similar_uris = []
-        if keywords:
-            similar_result = self._find_similar_claims(keywords)
-            if similar_result["text"]:
-                context_parts.append(similar_result["text"])
-                similar_uris = similar_result["uris"]
+        if similar_result["text"]:
+            context_parts.append(similar_result["text"])
         
-        full_context = "\n\n".join(context_parts) if context_parts else "No prior knowledge found in the graph."
+        result = {
+            "full_text": "\n\n".join(context_parts) if context_parts else "No prior knowledge found in the graph.",
+            "source_history": source_history,
+            "similar_uris": similar_result["uris"],  # [NEW] Return URIs for linking
+            "context_score": self._context_score(self._get_source_history_data(domain, entries), similar_result)
+        }
+        self._memo = (key, result)
+        return copy.deepcopy(result)
         
+    def get_context(self, domain: str, keywords: List[str] = [], claim: Optional[str] = None) -> Dict[str, str]:
+        """
+        Retrieve context for a specific verification task.
+        
+        Args:
+            domain: The domain being analyzed (e.g., 'lemonde.fr')
+            keywords: List of keywords from the claim
+            claim: Claim text, for semantic search when claim embeddings are available
+            
+        Returns:
+            Dictionary with natural language context strings.
+        """
+        if not self.om:
+            return {"graph_context": "No ontology manager available."}
+        
+        result = self.analyze(domain, keywords, claim)
         return {
-            "full_text": full_context,
-            "source_history": source_history,
-            "similar_uris": similar_uris  # [NEW] Return URIs for linking
+            "full_text": result["full_text"],
+            "source_history": result["source_history"],
+            "similar_uris": list(result["similar_uris"])
         }
 
-    def _get_source_history(self, domain: str) -> str:
+    def _get_source_history(self, domain: str, entries: Optional[List] = None) -> str:
         """
-        Query the graph for all previous evaluations of this domain.
+        Summarize the previous evaluations of this domain (domain history
+        index, or the given entries, newest first).
         """
         if not domain:
             return ""
+        if entries is None:
+            entries = self.om.domain_history.recent(domain, 5)
             
-        # We reuse the specific query logic but tailored for retrieval
-        query = """
-        PREFIX cred: <https://github.com/DominiqueLoyer/systemFactChecking#>
-        
-        SELECT ?score ?level ?timestamp
-        WHERE {
-            ?info cred:informationURL ?url .
-            ?request cred:concernsInformation ?info .
-            ?report cred:isReportOf ?request .
-            ?report cred:credibilityScoreValue ?score .
-            ?report cred:assignsCredibilityLevel ?level .
-            ?report cred:completionTimestamp ?timestamp .
-            FILTER(CONTAINS(STR(?url), "%s"))
-        }
-        ORDER BY DESC(?timestamp)
-        LIMIT 5
-        """ % domain
-        
-        results = []
-        try:
-            combined = self.om.base_graph + self.om.data_graph
-            for row in combined.query(query):
-                results.append({
-                    "score": float(row.score),
-                    "level": str(row.level).split('#')[-1],
-                    "date": str(row.timestamp).split('T')[0]
-                })
-        except Exception as e:
-            print(f"[GraphRAG] Query error: {e}")
-            return ""
+        results = [
+            {"score": entry.score, "level": entry.level, "date": entry.timestamp.split('T')[0]}
+            for entry in entries
+        ]
             
         if not results:
             return f"The graph contains no previous evaluations for {domain}."
@@ -111,52 +139,37 @@ class GraphRAG:
         
         return summary
 
-    def _find_similar_claims(self, keywords: List[str]) -> Dict[str, Any]:
+    def _find_similar_claims(self, keywords: List[str], claim: Optional[str] = None, k: int = 3) -> Dict[str, Any]:
         """
-        Find evaluation history for content containing specific keywords.
+        Find past evaluations of similar claims: semantically close ones
+        first (claim embeddings, cosine above the threshold), then claims
+        sharing terms with the keywords (claim index, estimated Jaccard).
         Returns dict with 'text' (for LLM) and 'uris' (for Graph linking).
         """
-        if not keywords:
-            return {"text": "", "uris": [], "scores": []}
-            
-        # Build REGEX filter for keywords (OR logic)
-        # e.g., (fake|hoax|conspiracy)
-        clean_kws = [k for k in keywords if len(k) > 3] # Skip short words
-        if not clean_kws:
+        clean_kws = [kw for kw in keywords if len(kw) > 3] # Skip short words
+        embeddings = self.om.claim_embeddings
+        if not clean_kws and not (claim and embeddings is not None):
             return {"text": "", "uris": [], "scores": []}
-            
-        regex_pattern = "|".join(clean_kws)
         
-        query = """
-        PREFIX cred: <https://github.com/DominiqueLoyer/systemFactChecking#>
-        
-        SELECT ?report ?content ?score ?level ?timestamp
-        WHERE {
-            ?info cred:informationContent ?content .
-            ?request cred:concernsInformation ?info .
-            ?report cred:isReportOf ?request .
-            ?report cred:credibilityScoreValue ?score .
-            ?report cred:assignsCredibilityLevel ?level .
-            ?report cred:completionTimestamp ?timestamp .
-            FILTER(REGEX(?content, "%s", "i"))
-        }
-        ORDER BY DESC(?timestamp)
-        LIMIT 3
-        """ % regex_pattern
+        hits = []
+        if claim and embeddings is not None:
+            hits = embeddings.search(claim[:500], k=k, min_score=self.similarity_threshold)
+        if len(hits) < k and clean_kws:
+            found = {report for report, _ in hits}
+            hits += [hit for hit in self.om.claim_index.search(clean_kws, k=k) if hit[0] not in found]
         
         results = []
-        try:
-            combined = self.om.base_graph + self.om.data_graph
-            for row in combined.query(query):
-                results.append({
-                    "uri": str(row.report),
-                    "content": str(row.content)[:100] + "...",
-                    "score": float(row.score),
-                    "verdict": str(row.level).split('#')[-1]
-                })
-        except Exception as e:
-            print(f"[GraphRAG] Similar claims error: {e}")
-            return {"text": "", "uris": [], "scores": []}
+        for report, similarity in hits[:k]:
+            summary = self.om.get_report_summary(report)
+            if summary is None:
+                continue
+            results.append({
+                "uri": report,
+                "content": summary['content'][:100] + "...",
+                "score": summary['score'],
+                "verdict": summary['level'],
+                "similarity": similarity
+            })
             
         if not results:
             return {"text": "", "uris": [], "scores": []}
@@ -171,7 +184,7 @@ class GraphRAG:
             "scores": [r['score'] for r in results]
         }
     
-    def compute_context_score(self, domain: str, keywords: List[str] = []) -> Dict[str, float]:
+    def compute_context_score(self, domain: str, keywords: List[str] = [], claim: Optional[str] = None) -> Dict[str, float]:
         """
         Compute numerical context scores for integration into credibility scoring.
         
@@ -181,6 +194,7 @@ class GraphRAG:
         Args:
             domain: The domain being analyzed (e.g., 'lemonde.fr')
             keywords: List of keywords from the claim
+            claim: Claim text, for semantic search when claim embeddings are available
             
         Returns:
             Dictionary with:
@@ -190,6 +204,12 @@ class GraphRAG:
             - 'confidence': How confident we are (based on amount of data)
             - 'has_history': Boolean if domain has prior evaluations
         """
+        if not self.om:
+            return self._context_score({'count': 0}, {"scores": []})
+        return dict(self.analyze(domain, keywords, claim)["context_score"])
+    
+    def _context_score(self, history_data: Dict[str, Any], similar_result: Dict[str, Any]) -> Dict[str, float]:
+        """Scores of compute_context_score() from the history statistics and similar claims."""
         result = {
             'history_score': 0.5,  # Neutral default
             'pattern_score': 0.5,
@@ -200,11 +220,7 @@ class GraphRAG:
             'similar_count': 0
         }
         
-        if not self.om:
-            return result
-        
-        # 1. Get source history score
-        history_data = self._get_source_history_data(domain)
+        # 1. Source history score
         if history_data['count'] > 0:
             result['history_score'] = history_data['avg_score']
             result['has_history'] = True
@@ -214,16 +230,12 @@ class GraphRAG:
         else:
             history_confidence = 0.0
         
-        # 2. Get pattern score from similar claims
-        if keywords:
-            similar_result = self._find_similar_claims(keywords)
-            scores = similar_result.get('scores', [])
-            if scores:
-                result['pattern_score'] = sum(scores) / len(scores)
-                result['similar_count'] = len(scores)
-                pattern_confidence = min(1.0, len(scores) / 3)
-            else:
-                pattern_confidence = 0.0
+        # 2. Pattern score from similar claims
+        scores = similar_result.get('scores', [])
+        if scores:
+            result['pattern_score'] = sum(scores) / len(scores)
+            result['similar_count'] = len(scores)
+            pattern_confidence = min(1.0, len(scores) / 3)
         else:
             pattern_confidence = 0.0
         
@@ -245,45 +257,20 @@ class GraphRAG:
         
         return result
     
-    def _get_source_history_data(self, domain: str) -> Dict[str, Any]:
+    def _get_source_history_data(self, domain: str, entries: Optional[List] = None) -> Dict[str, Any]:
         """
-        Query the graph for evaluation statistics of this domain.
+        Evaluation statistics of this domain (domain history index, or
+        the given entries, newest first).
         
         Returns:
             Dictionary with 'count', 'avg_score', 'last_verdict', 'scores'
         """
         if not domain:
             return {'count': 0, 'avg_score': 0.5, 'scores': []}
-            
-        query = """
-        PREFIX cred: <https://github.com/DominiqueLoyer/systemFactChecking#>
-        
-        SELECT ?score ?level ?timestamp
-        WHERE {
-            ?info cred:informationURL ?url .
-            ?request cred:concernsInformation ?info .
-            ?report cred:isReportOf ?request .
-            ?report cred:credibilityScoreValue ?score .
-            ?report cred:assignsCredibilityLevel ?level .
-            ?report cred:completionTimestamp ?timestamp .
-            FILTER(CONTAINS(STR(?url), "%s"))
-        }
-        ORDER BY DESC(?timestamp)
-        LIMIT 10
-        """ % domain
-        
-        scores = []
-        last_verdict = None
-        
-        try:
-            combined = self.om.base_graph + self.om.data_graph
-            for i, row in enumerate(combined.query(query)):
-                scores.append(float(row.score))
-                if i == 0:
-                    last_verdict = str(row.level).split('#')[-1]
-        except Exception as e:
-            print(f"[GraphRAG] History data query error: {e}")
-            return {'count': 0, 'avg_score': 0.5, 'scores': []}
+        if entries is None:
+            entries = self.om.domain_history.recent(domain, 10)
+        scores = [entry.score for entry in entries]
+        last_verdict = entries[0].level if entries else None
         
         if not scores:
             return {'count': 0, 'avg_score': 0.5, 'scores': []}
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Graph Snapshot Module - SysCRED
+================================
+Binary snapshot cache of parsed Turtle files (fast start).
+
+Parsing the ontology and the data graph with rdflib's pure-Python
+Turtle parser dominates cold start as the history grows. A snapshot
+stores the parsed triples as an interned term table plus an int32
+(n, 3) triple array; loading it skips tokenizing and parsing.
+
+- One .npz per source file, named after the SHA-256 of its contents:
+  an edited file simply misses the cache and is parsed again
+- Snapshots also record the rdflib version (term normalization may
+  change between versions) and the file's prefixes
+- Older snapshots of the same file are removed when a new one is written
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import os
+import io
+import gc
+import json
+import hashlib
+import zipfile
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import rdflib
+    from rdflib import Graph, Literal, URIRef, BNode
+    HAS_RDFLIB = True
+except ImportError:
+    HAS_RDFLIB = False
+
+SNAPSHOT_VERSION = 1
+KIND_URI, KIND_LITERAL, KIND_BNODE = 0, 1, 2
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's contents (hex)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GraphSnapshotCache:
+    """
+    Directory of binary snapshots of parsed Turtle files.
+
+    Snapshot layout (.npz):
+        triples    (n, 3) int32 term ids
+        kinds      (t,) uint8: 0 URIRef, 1 Literal, 2 BNode
+        datatypes  (t,) int32 index in the datatype table (-1: none)
+        langs      (t,) int32 index in the language table (-1: none)
+        meta       UTF-8 JSON: versions, source hash, term values,
+                   datatype and language tables, prefixes
+
+    Usage:
+        cache = GraphSnapshotCache("/path/to/cache")
+        cache.parse(graph, "ontology/sysCRED_data.ttl")  # snapshot or TTL
+    """
+
+    def __init__(self, directory: str):
+        if not HAS_NUMPY or not HAS_RDFLIB:
+            raise ImportError("GraphSnapshotCache requires numpy and rdflib")
+        self.directory = directory
+        self.stats = {"hits": 0, "misses": 0}
+
+    def path_for(self, source_path: str, source_hash: str) -> str:
+        return os.path.join(self.directory, f"{os.path.basename(source_path)}.{source_hash[:16]}.npz")
+
+    # --- Load ---
+
+    def parse(self, graph: 'Graph', source_path: str) -> bool:
+        """
+        Add the triples of a Turtle file to a graph, from its snapshot if
+        one matches the file hash; otherwise parse the file and write the
+        snapshot. Returns True on a snapshot hit.
+        """
+        source_hash = file_hash(source_path)
+        if self.load(graph, source_path, source_hash):
+            self.stats["hits"] += 1
+            return True
+        self.stats["misses"] += 1
+        if len(graph):
+            parsed = Graph()
+            parsed.parse(source_path, format='turtle')
+            graph += parsed
+            for prefix, namespace in parsed.namespaces():
+                graph.bind(prefix, namespace, override=False)
+        else:
+            parsed = graph.parse(source_path, format='turtle')
+        self.save(parsed, source_path, source_hash)
+        return False
+
+    def load(self, graph: 'Graph', source_path: str, source_hash: str) -> bool:
+        """Add the snapshot's triples to a graph; False if missing or stale."""
+        path = self.path_for(source_path, source_hash)
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+                if (meta.get("version") != SNAPSHOT_VERSION or meta.get("rdflib") != rdflib.__version__
+                        or meta.get("source_hash") != source_hash):
+                    return False
+                kinds = data['kinds'].tolist()
+                datatypes = data['datatypes'].tolist()
+                langs = data['langs'].tolist()
+                triples = data['triples'].tolist()
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            print(f"[GraphSnapshot] Unreadable snapshot {path}: {e}")
+            return False
+
+        datatype_table = [URIRef(d) for d in meta["datatypes"]]
+        lang_table = meta["langs"]
+        terms: List = []
+        for value, kind, datatype, lang in zip(meta["values"], kinds, datatypes, langs):
+            if kind == KIND_URI:
+                terms.append(URIRef(value))
+            elif kind == KIND_LITERAL:
+                terms.append(Literal(
+                    value,
+                    datatype=datatype_table[datatype] if datatype >= 0 else None,
+                    lang=lang_table[lang] if lang >= 0 else None
+                ))
+            else:
+                terms.append(BNode(value))
+
+        # Bulk insert: the store creates many small dicts, pause the
+        # cyclic GC meanwhile
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            graph.addN((terms[s], terms[p], terms[o], graph) for s, p, o in triples)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        for prefix, namespace in meta["namespaces"]:
+            graph.bind(prefix, namespace, override=False)
+        return True
+
+    # --- Save ---
+
+    def save(self, graph: 'Graph', source_path: str, source_hash: Optional[str] = None) -> bool:
+        """Write the snapshot of a graph parsed from source_path."""
+        source_hash = source_hash or file_hash(source_path)
+        ids: Dict = {}
+        kinds: List[int] = []
+        datatypes: List[int] = []
+        langs: List[int] = []
+        datatype_ids: Dict[str, int] = {}
+        lang_ids: Dict[str, int] = {}
+        try:
+            for term in (term for triple in graph for term in triple):
+                if term in ids:
+                    continue
+                ids[term] = len(ids)
+                if isinstance(term, Literal):
+                    kinds.append(KIND_LITERAL)
+                    datatypes.append(datatype_ids.setdefault(str(term.datatype), len(datatype_ids)) if term.datatype else -1)
+                    langs.append(lang_ids.setdefault(term.language, len(lang_ids)) if term.language else -1)
+                else:
+                    if not isinstance(term, (URIRef, BNode)):
+                        raise ValueError(f"unsupported term type {type(term).__name__}")
+                    kinds.append(KIND_URI if isinstance(term, URIRef) else KIND_BNODE)
+                    datatypes.append(-1)
+                    langs.append(-1)
+            triples = np.fromiter(
+                (ids[term] for triple in graph for term in triple), dtype=np.int32, count=3 * len(graph)
+            ).reshape(-1, 3)
+            meta = {
+                "version": SNAPSHOT_VERSION,
+                "rdflib": rdflib.__version__,
+                "source_hash": source_hash,
+                "values": [str(term) for term in ids],
+                "datatypes": list(datatype_ids),
+                "langs": list(lang_ids),
+                "namespaces": [[prefix, str(namespace)] for prefix, namespace in graph.namespaces()],
+            }
+            buffer = io.BytesIO()
+            np.savez(
+                buffer,
+                triples=triples,
+                kinds=np.array(kinds, dtype=np.uint8),
+                datatypes=np.array(datatypes, dtype=np.int32),
+                langs=np.array(langs, dtype=np.int32),
+                meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+            )
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path_for(source_path, source_hash)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(buffer.getbuffer())
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as e:
+            print(f"[GraphSnapshot] Save error for {source_path}: {e}")
+            return False
+        self._remove_older(source_path, path)
+        return True
+
+    def _remove_older(self, source_path: str, keep: str):
+        prefix = os.path.basename(source_path) + "."
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            # <source name>.<16 hex digits>.npz
+            if name.startswith(prefix) and name.endswith(".npz") and len(name) == len(prefix) + 20 and path != keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
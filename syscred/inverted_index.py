@@ -0,0 +1,1147 @@
+# -*- coding: utf-8 -*-
+"""
+Inverted Index Module - SysCRED
+================================
+Segmented (LSM-style) inverted index for live evidence ingestion.
+
+New documents are written to a small in-memory buffer. When the buffer
+is full it is sealed into an immutable segment, and segments are merged
+by a background thread. Queries run on a snapshot of all segments with
+global statistics (N, avgdl, df), so searches never wait on a merge.
+
+Layout of a sealed segment:
+- documents sorted by (date, doc_id): the publication date is parsed
+  from TREC ids (AP880101-0001 -> 19880101), undated documents first
+- sorted doc-date array; a date range maps to a contiguous range of
+  doc numbers, skipped to by bisection in each postings list
+- per-term postings as packed arrays (doc numbers, body term
+  frequencies, title term frequencies)
+- per-document body and title lengths
+- per-document term vectors (term ids, frequencies) for merges and PRF
+- deletions recorded as tombstones until the next merge
+
+Title frequencies ride along in the body postings (0 when the term is
+not in the title), so fielded BM25F scoring reads the same postings
+as plain BM25, in the same pass.
+
+Optional positional layer (positions=True): the body positions of
+every posting, delta + varint encoded in one byte array per term, with
+an offset per posting. It serves exact phrase queries and a term
+proximity boost; plain BM25 never touches it.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+Citation Key: loyerEvaluationModelesRecherche2025
+"""
+
+import re
+import math
+import heapq
+import bisect
+import datetime
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple, Optional, Any, Iterable
+
+
+DOC_DATE_PATTERN = re.compile(r'^[A-Z]{2,4}(\d{2})(\d{2})(\d{2})-\d')
+
+
+def doc_date(doc_id: str) -> int:
+    """Publication date YYYYMMDD encoded in a TREC doc id (AP880101-0001), 0 if none."""
+    match = DOC_DATE_PATTERN.match(doc_id)
+    if match is None:
+        return 0
+    yy, mm, dd = (int(g) for g in match.groups())
+    if not (1 <= mm <= 12 and 1 <= dd <= 31):
+        return 0
+    return ((1900 if yy >= 50 else 2000) + yy) * 10000 + mm * 100 + dd
+
+
+def parse_date_bound(value: Any) -> Optional[int]:
+    """
+    Date range bound as YYYYMMDD.
+
+    Accepts None, a date/datetime, an int YYYYMMDD or a string
+    'YYYY-MM-DD' / 'YYYYMMDD'. Raises ValueError otherwise.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.year * 10000 + value.month * 100 + value.day
+    if isinstance(value, int):
+        return value
+    digits = str(value).strip().replace('-', '')
+    if len(digits) != 8 or not digits.isdigit():
+        raise ValueError(f"Invalid date: {value!r} (expected YYYY-MM-DD)")
+    return int(digits)
+
+
+def token_positions(tokens: List[str]) -> Dict[str, List[int]]:
+    """{term: increasing positions} of an analyzed token list."""
+    positions: Dict[str, List[int]] = {}
+    for i, term in enumerate(tokens):
+        entry = positions.get(term)
+        if entry is None:
+            positions[term] = [i]
+        else:
+            entry.append(i)
+    return positions
+
+
+def encode_positions(positions: List[int], out: bytearray):
+    """Append increasing positions to out as varint-encoded gaps."""
+    previous = 0
+    for position in positions:
+        gap = position - previous
+        previous = position
+        while gap >= 0x80:
+            out.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        out.append(gap)
+
+
+def decode_positions(data: bytearray, start: int, end: int) -> List[int]:
+    """Decode the varint gaps in data[start:end] back to positions."""
+    positions = []
+    position = value = shift = 0
+    for i in range(start, end):
+        byte = data[i]
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        position += value
+        positions.append(position)
+        value = shift = 0
+    return positions
+
+
+def min_distance(a: List[int], b: List[int]) -> int:
+    """Smallest |i - j| over two sorted position lists."""
+    i = j = 0
+    best = None
+    while i < len(a) and j < len(b):
+        d = abs(a[i] - b[j])
+        if best is None or d < best:
+            best = d
+        if a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return best if best is not None else 0
+
+
+class IndexSegment:
+    """
+    Immutable index segment.
+
+    Only the tombstone set changes after construction; postings, lengths
+    and term vectors are never modified, so readers need no locking.
+    """
+
+    def __init__(
+        self,
+        doc_ids: List[str],
+        doc_lengths: array,
+        terms: List[str],
+        postings_docs: List[array],
+        postings_tfs: List[array],
+        tv_offsets: array,
+        tv_terms: array,
+        tv_freqs: array,
+        title_lengths: array,
+        postings_title_tfs: List[array],
+        title_tv_offsets: array,
+        title_tv_terms: array,
+        title_tv_freqs: array,
+        positions: Optional[List[bytearray]] = None,
+        position_offsets: Optional[List[array]] = None
+    ):
+        self.doc_ids = doc_ids
+        self.doc_lengths = doc_lengths
+        self.terms = terms
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.postings_docs = postings_docs
+        self.postings_tfs = postings_tfs
+        self.tv_offsets = tv_offsets
+        self.tv_terms = tv_terms
+        self.tv_freqs = tv_freqs
+        self.title_lengths = title_lengths
+        self.postings_title_tfs = postings_title_tfs
+        self.title_tv_offsets = title_tv_offsets
+        self.title_tv_terms = title_tv_terms
+        self.title_tv_freqs = title_tv_freqs
+        self.positions = positions
+        self.position_offsets = position_offsets
+        self.doc_dates = array('I', (doc_date(doc_id) for doc_id in doc_ids))
+        self.docnums = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        # Title-only postings have a body frequency of 0
+        self.body_dfs = array('I', (len(tfs) - tfs.count(0) for tfs in postings_tfs))
+
+        # Tombstones
+        self.deleted: set = set()
+        self._deleted_df: Counter = Counter()
+        self._deleted_body_df: Counter = Counter()
+        self._deleted_length = 0
+        self._deleted_title_length = 0
+        self._total_length = sum(doc_lengths)
+        self._total_title_length = sum(title_lengths)
+
+    # Title frequencies are stored as bytes (saturated at 255)
+    MAX_TITLE_TF = 255
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple], with_positions: bool = False) -> 'IndexSegment':
+        """
+        Build a segment from (doc_id, term_vector[, title_vector[, positions]])
+        tuples, positions being the body {term: [positions]}.
+
+        Documents are sorted by (date, doc_id) before numbering. A term
+        found only in the title gets a posting with a body frequency of 0.
+        """
+        docs = sorted(documents, key=lambda d: (doc_date(d[0]), d[0]))
+
+        term_ids: Dict[str, int] = {}
+        terms: List[str] = []
+        postings_docs: List[array] = []
+        postings_tfs: List[array] = []
+        postings_title_tfs: List[array] = []
+        doc_ids: List[str] = []
+        doc_lengths = array('I')
+        tv_offsets = array('Q', [0])
+        tv_terms = array('I')
+        tv_freqs = array('I')
+        title_lengths = array('I')
+        title_tv_offsets = array('Q', [0])
+        title_tv_terms = array('I')
+        title_tv_freqs = array('I')
+        max_title_tf = cls.MAX_TITLE_TF
+        positions: Optional[List[bytearray]] = [] if with_positions else None
+        position_offsets: Optional[List[array]] = [] if with_positions else None
+
+        def term_id(term: str) -> int:
+            tid = term_ids.get(term)
+            if tid is None:
+                tid = len(terms)
+                term_ids[term] = tid
+                terms.append(term)
+                postings_docs.append(array('I'))
+                postings_tfs.append(array('I'))
+                postings_title_tfs.append(array('B'))
+                if with_positions:
+                    positions.append(bytearray())
+                    position_offsets.append(array('I', [0]))
+            return tid
+
+        for docnum, doc in enumerate(docs):
+            doc_id, term_vector = doc[0], doc[1]
+            title_vector = doc[2] if len(doc) > 2 else None
+            doc_positions = (doc[3] if len(doc) > 3 else None) or {}
+            doc_ids.append(doc_id)
+            length = 0
+            for term, tf in term_vector.items():
+                tid = term_id(term)
+                postings_docs[tid].append(docnum)
+                postings_tfs[tid].append(tf)
+                postings_title_tfs[tid].append(
+                    min(title_vector.get(term, 0), max_title_tf) if title_vector else 0
+                )
+                if with_positions:
+                    encode_positions(doc_positions.get(term, ()), positions[tid])
+                    position_offsets[tid].append(len(positions[tid]))
+                tv_terms.append(tid)
+                tv_freqs.append(tf)
+                length += tf
+            doc_lengths.append(length)
+            tv_offsets.append(len(tv_terms))
+
+            title_length = 0
+            if title_vector:
+                for term, tf in title_vector.items():
+                    tid = term_id(term)
+                    if term not in term_vector:
+                        postings_docs[tid].append(docnum)
+                        postings_tfs[tid].append(0)
+                        postings_title_tfs[tid].append(min(tf, max_title_tf))
+                        if with_positions:
+                            position_offsets[tid].append(len(positions[tid]))
+                    title_tv_terms.append(tid)
+                    title_tv_freqs.append(tf)
+                    title_length += tf
+            title_lengths.append(title_length)
+            title_tv_offsets.append(len(title_tv_terms))
+
+        return cls(doc_ids, doc_lengths, terms, postings_docs, postings_tfs,
+                   tv_offsets, tv_terms, tv_freqs,
+                   title_lengths, postings_title_tfs,
+                   title_tv_offsets, title_tv_terms, title_tv_freqs,
+                   positions, position_offsets)
+
+    # --- Statistics (live documents only) ---
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.doc_ids) - len(self.deleted)
+
+    @property
+    def total_length(self) -> int:
+        return self._total_length - self._deleted_length
+
+    @property
+    def total_title_length(self) -> int:
+        return self._total_title_length - self._deleted_title_length
+
+    def doc_freq(self, term: str, body_only: bool = False) -> int:
+        """Live documents containing the term in any field (or in the body)."""
+        tid = self.term_ids.get(term)
+        if tid is None:
+            return 0
+        if body_only:
+            return self.body_dfs[tid] - self._deleted_body_df[term]
+        return len(self.postings_docs[tid]) - self._deleted_df[term]
+
+    # --- Access ---
+
+    def postings(self, term: str) -> Optional[Tuple[array, array, array]]:
+        """Return (doc numbers, body tfs, title tfs) for a term, or None."""
+        tid = self.term_ids.get(term)
+        if tid is None:
+            return None
+        return self.postings_docs[tid], self.postings_tfs[tid], self.postings_title_tfs[tid]
+
+    def term_vector(self, docnum: int) -> Dict[str, int]:
+        """Return the body {term: tf} vector of a document."""
+        start, end = self.tv_offsets[docnum], self.tv_offsets[docnum + 1]
+        terms = self.terms
+        return {
+            terms[tid]: tf
+            for tid, tf in zip(self.tv_terms[start:end], self.tv_freqs[start:end])
+        }
+
+    def title_vector(self, docnum: int) -> Dict[str, int]:
+        """Return the title {term: tf} vector of a document."""
+        start, end = self.title_tv_offsets[docnum], self.title_tv_offsets[docnum + 1]
+        terms = self.terms
+        return {
+            terms[tid]: tf
+            for tid, tf in zip(self.title_tv_terms[start:end], self.title_tv_freqs[start:end])
+        }
+
+    @property
+    def has_positions(self) -> bool:
+        return self.positions is not None
+
+    def docnum_range(self, date_range: Tuple[Optional[int], Optional[int]]) -> Tuple[int, int]:
+        """[lo, hi) doc numbers published within (date_from, date_to), bounds included."""
+        date_from, date_to = date_range
+        dates = self.doc_dates
+        lo = bisect.bisect_left(dates, max(date_from or 1, 1))
+        hi = bisect.bisect_right(dates, date_to) if date_to is not None else len(dates)
+        return lo, max(lo, hi)
+
+    def term_positions(self, term: str, docnum: int) -> List[int]:
+        """Body positions of a term in a document ([] if absent or not stored)."""
+        tid = self.term_ids.get(term)
+        if tid is None or self.positions is None:
+            return []
+        docs = self.postings_docs[tid]
+        i = bisect.bisect_left(docs, docnum)
+        if i == len(docs) or docs[i] != docnum:
+            return []
+        offsets = self.position_offsets[tid]
+        return decode_positions(self.positions[tid], offsets[i], offsets[i + 1])
+
+    def position_map(self, docnum: int) -> Dict[str, List[int]]:
+        """Body {term: positions} of a document (for merges)."""
+        return {term: self.term_positions(term, docnum) for term in self.term_vector(docnum)}
+
+    def live_documents(self) -> Iterable[Tuple]:
+        """Iterate over (doc_id, term_vector, title_vector[, positions]) of non-deleted documents."""
+        deleted = set(self.deleted)
+        for docnum, doc_id in enumerate(self.doc_ids):
+            if docnum not in deleted:
+                if self.positions is not None:
+                    yield doc_id, self.term_vector(docnum), self.title_vector(docnum), self.position_map(docnum)
+                else:
+                    yield doc_id, self.term_vector(docnum), self.title_vector(docnum)
+
+    def size_bytes(self) -> Dict[str, int]:
+        """Approximate memory of the packed arrays."""
+        def total(arrays):
+            return sum(a.buffer_info()[1] * a.itemsize for a in arrays)
+        return {
+            "postings": total(self.postings_docs) + total(self.postings_tfs) + total(self.postings_title_tfs),
+            "term_vectors": total((self.tv_terms, self.tv_freqs, self.title_tv_terms, self.title_tv_freqs)),
+            "positions": (
+                sum(len(p) for p in self.positions) + total(self.position_offsets)
+                if self.positions is not None else 0
+            )
+        }
+
+    def delete(self, doc_id: str) -> bool:
+        """Add a tombstone for a document. Returns False if not present."""
+        docnum = self.docnums.get(doc_id)
+        if docnum is None or docnum in self.deleted:
+            return False
+        term_vector = self.term_vector(docnum)
+        self._deleted_body_df.update(term_vector.keys())
+        for term in term_vector.keys() | self.title_vector(docnum).keys():
+            self._deleted_df[term] += 1
+        self._deleted_length += self.doc_lengths[docnum]
+        self._deleted_title_length += self.title_lengths[docnum]
+        self.deleted.add(docnum)
+        return True
+
+    def __len__(self) -> int:
+        return self.num_docs
+
+
+class MemorySegment:
+    """
+    Mutable in-memory write buffer.
+
+    Exposes the same read interface as IndexSegment so queries can
+    search it alongside the sealed segments.
+    """
+
+    def __init__(self, with_positions: bool = False):
+        self.with_positions = with_positions
+        self.doc_ids: List[str] = []
+        self.doc_lengths: List[int] = []
+        self.title_lengths: List[int] = []
+        self.term_vectors: List[Dict[str, int]] = []
+        self.title_vectors: List[Dict[str, int]] = []
+        self.position_maps: List[Dict[str, List[int]]] = []
+        self.doc_dates: List[int] = []
+        self.docnums: Dict[str, int] = {}
+        self._postings: Dict[str, Tuple[List[int], List[int], List[int]]] = {}
+        self._body_df: Counter = Counter()
+        self.deleted: set = set()
+        self._deleted_df: Counter = Counter()
+        self._deleted_body_df: Counter = Counter()
+        self._deleted_length = 0
+        self._deleted_title_length = 0
+        self._total_length = 0
+        self._total_title_length = 0
+
+    def add(
+        self,
+        doc_id: str,
+        term_vector: Dict[str, int],
+        title_vector: Optional[Dict[str, int]] = None,
+        positions: Optional[Dict[str, List[int]]] = None
+    ):
+        """Append a document. Caller guarantees doc_id is not live here."""
+        title_vector = title_vector or {}
+        docnum = len(self.doc_ids)
+        length = sum(term_vector.values())
+        title_length = sum(title_vector.values())
+        # Document data first, postings last: a concurrent reader that
+        # sees a posting can always resolve its doc number.
+        self.term_vectors.append(term_vector)
+        self.title_vectors.append(title_vector)
+        if self.with_positions:
+            self.position_maps.append(positions or {})
+        self.doc_lengths.append(length)
+        self.title_lengths.append(title_length)
+        self.doc_dates.append(doc_date(doc_id))
+        self.doc_ids.append(doc_id)
+        self.docnums[doc_id] = docnum
+        self._total_length += length
+        self._total_title_length += title_length
+        self._body_df.update(term_vector.keys())
+        max_title_tf = IndexSegment.MAX_TITLE_TF
+        for term in term_vector.keys() | title_vector.keys():
+            entry = self._postings.get(term)
+            if entry is None:
+                entry = ([], [], [])
+                self._postings[term] = entry
+            entry[1].append(term_vector.get(term, 0))
+            # Saturated as in sealed segments, so scores do not change on seal
+            entry[2].append(min(title_vector.get(term, 0), max_title_tf))
+            entry[0].append(docnum)
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.doc_ids) - len(self.deleted)
+
+    @property
+    def total_length(self) -> int:
+        return self._total_length - self._deleted_length
+
+    @property
+    def total_title_length(self) -> int:
+        return self._total_title_length - self._deleted_title_length
+
+    def doc_freq(self, term: str, body_only: bool = False) -> int:
+        if body_only:
+            return self._body_df[term] - self._deleted_body_df[term]
+        entry = self._postings.get(term)
+        if entry is None:
+            return 0
+        return len(entry[0]) - self._deleted_df[term]
+
+    def postings(self, term: str) -> Optional[Tuple[List[int], List[int], List[int]]]:
+        return self._postings.get(term)
+
+    def term_vector(self, docnum: int) -> Dict[str, int]:
+        return self.term_vectors[docnum]
+
+    def title_vector(self, docnum: int) -> Dict[str, int]:
+        return self.title_vectors[docnum]
+
+    @property
+    def has_positions(self) -> bool:
+        return self.with_positions
+
+    def term_positions(self, term: str, docnum: int) -> List[int]:
+        if not self.with_positions:
+            return []
+        return self.position_maps[docnum].get(term, [])
+
+    def live_documents(self) -> Iterable[Tuple]:
+        deleted = set(self.deleted)
+        for docnum, doc_id in enumerate(self.doc_ids):
+            if docnum not in deleted:
+                if self.with_positions:
+                    yield doc_id, self.term_vectors[docnum], self.title_vectors[docnum], self.position_maps[docnum]
+                else:
+                    yield doc_id, self.term_vectors[docnum], self.title_vectors[docnum]
+
+    def delete(self, doc_id: str) -> bool:
+        docnum = self.docnums.get(doc_id)
+        if docnum is None or docnum in self.deleted:
+            return False
+        self._deleted_body_df.update(self.term_vectors[docnum].keys())
+        for term in self.term_vectors[docnum].keys() | self.title_vectors[docnum].keys():
+            self._deleted_df[term] += 1
+        self._deleted_length += self.doc_lengths[docnum]
+        self._deleted_title_length += self.title_lengths[docnum]
+        self.deleted.add(docnum)
+        return True
+
+    def seal(self) -> IndexSegment:
+        """Freeze the live documents into an immutable segment."""
+        return IndexSegment.build(self.live_documents(), self.with_positions)
+
+    def __len__(self) -> int:
+        return self.num_docs
+
+
+class IndexSnapshot:
+    """
+    Point-in-time view over a set of segments.
+
+    Global statistics are aggregated over all segments so that BM25
+    scores do not depend on how documents are split into segments.
+    """
+
+    def __init__(self, segments: Tuple[Any, ...], generation: int = 0):
+        self.segments = segments
+        self.generation = generation
+        self.num_docs = sum(seg.num_docs for seg in segments)
+        self.total_length = sum(seg.total_length for seg in segments)
+        self.avg_doc_length = (self.total_length / self.num_docs) if self.num_docs else 1.0
+        total_title_length = sum(seg.total_title_length for seg in segments)
+        self.avg_title_length = (total_title_length / self.num_docs) if total_title_length else 1.0
+
+    def doc_freq(self, term: str, body_only: bool = False) -> int:
+        return sum(seg.doc_freq(term, body_only) for seg in self.segments)
+
+    def idf(self, term: str, body_only: bool = False) -> float:
+        """
+        BM25 IDF, same formula as IREngine.calculate_bm25_score.
+
+        Plain BM25 only reads the body, so it uses the body df
+        (body_only=True): titles must not change its scores.
+        """
+        df = self.doc_freq(term, body_only) or 1
+        return math.log((self.num_docs - df + 0.5) / (df + 0.5) + 1)
+
+    def locate(self, doc_id: str) -> Optional[Tuple[Any, int]]:
+        """Return (segment, docnum) of the live copy of a document."""
+        for seg in self.segments:
+            docnum = seg.docnums.get(doc_id)
+            if docnum is not None and docnum not in seg.deleted:
+                return seg, docnum
+        return None
+
+    def term_vector(self, doc_id: str) -> Dict[str, int]:
+        """Stored {term: tf} vector of a document ({} if unknown)."""
+        location = self.locate(doc_id)
+        if location is None:
+            return {}
+        seg, docnum = location
+        return seg.term_vector(docnum)
+
+    def search_bm25(
+        self,
+        query_weights: Dict[str, float],
+        k: int = 10,
+        k1: float = 0.9,
+        b: float = 0.4,
+        field_weights: Optional[Dict[str, float]] = None,
+        field_b: Optional[Dict[str, float]] = None,
+        date_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Score all segments with BM25 by traversing postings.
+
+        With field weights the score is BM25F: per-field frequencies are
+        length-normalized, weighted and summed into one pseudo-frequency
+        before the k1 saturation. Title frequencies are stored in the
+        same postings, so this is still a single pass.
+
+        Args:
+            query_weights: {term: weight}; a plain query uses term counts
+            k: Number of results
+            k1, b: BM25 parameters (b is the default of every field)
+            field_weights: {'text': w, 'title': w} (None or no title weight = BM25)
+            field_b: Per-field length normalization, e.g. {'title': 0.3}
+            date_range: (date_from, date_to) YYYYMMDD bounds, inclusive, either
+                may be None. Sealed segments are sorted by date, so each
+                postings list is only read between two bisected offsets;
+                undated documents never match
+
+        Returns:
+            List of (doc_id, score) sorted by decreasing score
+        """
+        if not self.num_docs or not query_weights:
+            return []
+        if date_range is not None and date_range == (None, None):
+            date_range = None
+
+        avgdl = self.avg_doc_length
+        fields = self._field_params(field_weights, field_b, b)
+        fielded = fields is not None
+        idfs = {term: self.idf(term, body_only=not fielded) for term in query_weights}
+        candidates = []
+
+        if fielded:
+            w_text, w_title, b_text, b_title = fields
+            avgtl = self.avg_title_length
+
+        for seg in self.segments:
+            accumulator: Dict[int, float] = {}
+            lengths = seg.doc_lengths
+            deleted = seg.deleted
+            docnum_range = None
+            if date_range is not None:
+                if isinstance(seg, IndexSegment):
+                    docnum_range = seg.docnum_range(date_range)
+                    if docnum_range[0] == docnum_range[1]:
+                        continue
+                else:
+                    # Write buffer: arrival order, small; filter each posting
+                    allowed = self._dated_docnums(seg, date_range)
+                    if not allowed:
+                        continue
+            for term, weight in query_weights.items():
+                entry = seg.postings(term)
+                if entry is None:
+                    continue
+                if docnum_range is not None:
+                    docs = entry[0]
+                    start = bisect.bisect_left(docs, docnum_range[0])
+                    end = bisect.bisect_left(docs, docnum_range[1], start)
+                    if start == end:
+                        continue
+                    entry = (docs[start:end], entry[1][start:end], entry[2][start:end])
+                elif date_range is not None:
+                    kept = [i for i, docnum in enumerate(entry[0]) if docnum in allowed]
+                    entry = tuple([column[i] for i in kept] for column in entry[:3])
+                w = idfs[term] * weight
+                if fielded:
+                    title_lengths = seg.title_lengths
+                    for docnum, tf, title_tf in zip(entry[0], entry[1], entry[2]):
+                        pseudo_tf = w_text * tf / (1 - b_text + b_text * lengths[docnum] / avgdl)
+                        if title_tf:
+                            pseudo_tf += w_title * title_tf / (1 - b_title + b_title * title_lengths[docnum] / avgtl)
+                        accumulator[docnum] = accumulator.get(docnum, 0.0) + w * (pseudo_tf * (k1 + 1)) / (pseudo_tf + k1)
+                    continue
+                for docnum, tf in zip(entry[0], entry[1]):
+                    norm = k1 * (1 - b + b * lengths[docnum] / avgdl)
+                    accumulator[docnum] = accumulator.get(docnum, 0.0) + w * (tf * (k1 + 1)) / (tf + norm)
+            if deleted:
+                for docnum in tuple(deleted):
+                    accumulator.pop(docnum, None)
+            doc_ids = seg.doc_ids
+            candidates.extend(
+                (score, doc_ids[docnum])
+                for docnum, score in heapq.nlargest(k, accumulator.items(), key=lambda x: x[1])
+                if score > 0
+            )
+
+        top = heapq.nlargest(k, candidates, key=lambda x: x[0])
+        return [(doc_id, score) for score, doc_id in top]
+
+    @staticmethod
+    def _dated_docnums(seg: Any, date_range: Tuple[Optional[int], Optional[int]]) -> set:
+        """Doc numbers of a segment published within the range (linear scan)."""
+        date_from = max(date_range[0] or 1, 1)
+        date_to = date_range[1]
+        return {
+            docnum for docnum, date in enumerate(seg.doc_dates)
+            if date >= date_from and (date_to is None or date <= date_to)
+        }
+
+    @staticmethod
+    def _field_params(
+        field_weights: Optional[Dict[str, float]],
+        field_b: Optional[Dict[str, float]],
+        b: float
+    ) -> Optional[Tuple[float, float, float, float]]:
+        """(w_text, w_title, b_text, b_title), or None for plain BM25."""
+        if not field_weights or field_weights.get('title', 0.0) <= 0:
+            return None
+        field_b = field_b or {}
+        return (field_weights.get('text', 1.0), field_weights['title'],
+                field_b.get('text', b), field_b.get('title', b))
+
+    def _document_score(
+        self,
+        seg: Any,
+        docnum: int,
+        query_weights: Dict[str, float],
+        idfs: Dict[str, float],
+        k1: float,
+        b: float,
+        fields: Optional[Tuple[float, float, float, float]]
+    ) -> float:
+        """BM25/BM25F score of one document from its term vectors (same formula as search_bm25)."""
+        term_vector = seg.term_vector(docnum)
+        length_ratio = seg.doc_lengths[docnum] / self.avg_doc_length
+        score = 0.0
+        if fields is None:
+            norm = k1 * (1 - b + b * length_ratio)
+            for term, weight in query_weights.items():
+                tf = term_vector.get(term)
+                if tf:
+                    score += idfs[term] * weight * (tf * (k1 + 1)) / (tf + norm)
+            return score
+        w_text, w_title, b_text, b_title = fields
+        title_vector = seg.title_vector(docnum)
+        title_ratio = seg.title_lengths[docnum] / self.avg_title_length
+        for term, weight in query_weights.items():
+            tf = term_vector.get(term, 0)
+            title_tf = title_vector.get(term, 0)
+            if tf or title_tf:
+                pseudo_tf = w_text * tf / (1 - b_text + b_text * length_ratio)
+                pseudo_tf += w_title * title_tf / (1 - b_title + b_title * title_ratio)
+                score += idfs[term] * weight * (pseudo_tf * (k1 + 1)) / (pseudo_tf + k1)
+        return score
+
+    def phrase_matches(self, seg: Any, terms: List[str]) -> Dict[int, int]:
+        """
+        Exact phrase occurrences in one segment: {docnum: count}.
+
+        Candidates come from the rarest phrase term; the positions of
+        the other terms are looked up in their postings.
+        """
+        if not terms or not seg.has_positions:
+            return {}
+        entries = [seg.postings(term) for term in terms]
+        if any(entry is None for entry in entries):
+            return {}
+        rarest = min(range(len(terms)), key=lambda i: len(entries[i][0]))
+        deleted = seg.deleted
+        matches: Dict[int, int] = {}
+        for docnum in entries[rarest][0]:
+            if docnum in deleted:
+                continue
+            first = seg.term_positions(terms[0], docnum)
+            if not first:
+                continue
+            following = []
+            for term in terms[1:]:
+                positions = seg.term_positions(term, docnum)
+                if not positions:
+                    break
+                following.append(set(positions))
+            else:
+                count = sum(
+                    1 for p in first
+                    if all(p + i + 1 in positions for i, positions in enumerate(following))
+                )
+                if count:
+                    matches[docnum] = count
+        return matches
+
+    def proximity_score(
+        self,
+        seg: Any,
+        docnum: int,
+        terms: List[str],
+        idfs: Dict[str, float],
+        window: int
+    ) -> float:
+        """
+        Σ over consecutive query term pairs of min(idf) / d², d being
+        the closest distance of the pair in the document (≤ window).
+        """
+        positions = [seg.term_positions(term, docnum) for term in terms]
+        score = 0.0
+        for i in range(len(terms) - 1):
+            a, b = positions[i], positions[i + 1]
+            if a and b:
+                d = min_distance(a, b) or 1
+                if d <= window:
+                    score += min(idfs[terms[i]], idfs[terms[i + 1]]) / (d * d)
+        return score
+
+    def search_positional(
+        self,
+        query_weights: Dict[str, float],
+        k: int = 10,
+        k1: float = 0.9,
+        b: float = 0.4,
+        phrases: Iterable[List[str]] = (),
+        proximity_terms: Optional[List[str]] = None,
+        proximity_weight: float = 0.0,
+        proximity_window: int = 8,
+        depth: int = 100,
+        field_weights: Optional[Dict[str, float]] = None,
+        field_b: Optional[Dict[str, float]] = None,
+        date_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 with exact phrases and a term proximity boost (positional index).
+
+        Phrases are required: only documents containing every phrase are
+        ranked, each phrase adding a BM25 component with its own df and
+        frequency. The proximity boost rescores the top `depth` documents.
+
+        Args:
+            query_weights: {term: weight}
+            k: Number of results
+            k1, b: BM25 parameters
+            phrases: Analyzed phrases (lists of terms)
+            proximity_terms: Query terms in query order (default: query_weights order)
+            proximity_weight: Weight of proximity_score (0 = off)
+            proximity_window: Largest term distance that counts
+            depth: Documents rescored by the proximity boost
+            field_weights, field_b: BM25F parameters (see search_bm25)
+            date_range: Publication date bounds (see search_bm25)
+
+        Returns:
+            List of (doc_id, score) sorted by decreasing score
+        """
+        phrases = [list(phrase) for phrase in phrases if phrase]
+        if not self.num_docs:
+            return []
+        fields = self._field_params(field_weights, field_b, b)
+        idfs = {term: self.idf(term, body_only=fields is None) for term in query_weights}
+        scored: List[Tuple[float, Any, int]] = []
+
+        if phrases:
+            # Phrase "postings" per segment, then one df per phrase
+            per_segment = [[self.phrase_matches(seg, phrase) for phrase in phrases] for seg in self.segments]
+            phrase_idfs = []
+            for p in range(len(phrases)):
+                df = sum(len(matches[p]) for matches in per_segment) or 1
+                phrase_idfs.append(math.log((self.num_docs - df + 0.5) / (df + 0.5) + 1))
+            avgdl = self.avg_doc_length
+            for seg, matches in zip(self.segments, per_segment):
+                docnums = set(matches[0]).intersection(*matches[1:])
+                if date_range is not None and date_range != (None, None):
+                    date_from, date_to = max(date_range[0] or 1, 1), date_range[1]
+                    docnums = {
+                        docnum for docnum in docnums
+                        if seg.doc_dates[docnum] >= date_from and (date_to is None or seg.doc_dates[docnum] <= date_to)
+                    }
+                for docnum in docnums:
+                    score = self._document_score(seg, docnum, query_weights, idfs, k1, b, fields)
+                    norm = k1 * (1 - b + b * seg.doc_lengths[docnum] / avgdl)
+                    for p, phrase_idf in enumerate(phrase_idfs):
+                        pf = matches[p][docnum]
+                        score += phrase_idf * (pf * (k1 + 1)) / (pf + norm)
+                    scored.append((score, seg, docnum))
+        else:
+            if proximity_weight <= 0:
+                return self.search_bm25(query_weights, k, k1, b, field_weights, field_b, date_range)
+            hits = self.search_bm25(query_weights, max(k, depth), k1, b, field_weights, field_b, date_range)
+            for doc_id, score in hits:
+                location = self.locate(doc_id)
+                if location is not None:
+                    scored.append((score, location[0], location[1]))
+
+        terms = [term for term in (proximity_terms or list(query_weights)) if term in idfs]
+        if proximity_weight > 0 and len(terms) > 1:
+            scored.sort(key=lambda x: x[0], reverse=True)
+            scored[:depth] = [
+                (score + proximity_weight * self.proximity_score(seg, docnum, terms, idfs, proximity_window), seg, docnum)
+                for score, seg, docnum in scored[:depth]
+            ]
+
+        best = heapq.nlargest(k, scored, key=lambda x: x[0])
+        return [(seg.doc_ids[docnum], score) for score, seg, docnum in best if score > 0]
+
+
+class SegmentedIndex:
+    """
+    LSM-style inverted index with background segment merging.
+
+    Usage:
+        index = SegmentedIndex()
+        index.bulk_load((doc_id, tokens) for doc_id, tokens in corpus)
+        index.add_document("https://example.com/page", tokens)
+        results = index.search(query_tokens, k=10)
+    """
+
+    DEFAULT_BUFFER_DOCS = 1000
+    DEFAULT_MERGE_FACTOR = 8
+
+    def __init__(
+        self,
+        k1: float = 0.9,
+        b: float = 0.4,
+        max_buffer_docs: int = DEFAULT_BUFFER_DOCS,
+        merge_factor: int = DEFAULT_MERGE_FACTOR,
+        background_merge: bool = True,
+        positions: bool = False
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1, b: BM25 parameters
+            max_buffer_docs: Buffered documents before the buffer is sealed
+            merge_factor: Number of segments that triggers a merge
+            background_merge: Merge in a daemon thread (False = merge inline)
+            positions: Store body term positions (phrase and proximity search)
+        """
+        self.k1 = k1
+        self.b = b
+        self.positions = positions
+        self.max_buffer_docs = max(1, max_buffer_docs)
+        self.merge_factor = max(2, merge_factor)
+        self.background_merge = background_merge
+
+        # (sealed segments, write buffer), swapped atomically as one tuple
+        self._state: Tuple[Tuple[IndexSegment, ...], MemorySegment] = ((), MemorySegment(positions))
+        self._locations: Dict[str, Any] = {}  # doc_id -> segment holding the live copy
+        self._write_lock = threading.RLock()
+        self._merge_cond = threading.Condition(self._write_lock)
+        self._merge_thread: Optional[threading.Thread] = None
+        self._merging = False
+        self._closed = False
+        self.generation = 0
+        self._load_epoch = 0  # bumped by bulk loads (a running merge is then discarded)
+
+        self.stats = {
+            "flushes": 0,
+            "merges": 0,
+            "docs_added": 0,
+            "docs_deleted": 0
+        }
+
+    # --- Writes ---
+
+    def bulk_load(self, documents: Iterable[Tuple]):
+        """
+        Replace the whole index with one segment built from
+        (doc_id, tokens) or (doc_id, tokens, title_tokens).
+        """
+        self.bulk_load_vectors(
+            (doc[0], Counter(doc[1]), Counter(doc[2]) if len(doc) > 2 else {},
+             token_positions(doc[1]) if self.positions else None)
+            for doc in documents
+        )
+
+    def bulk_load_vectors(self, documents: Iterable[Tuple]):
+        """
+        Same as bulk_load() from precomputed {term: tf} vectors (parallel
+        analysis): (doc_id, term_vector[, title_vector[, positions]]).
+        A positional index needs the body {term: positions} as 4th item.
+        """
+        vectors: Dict[str, Tuple] = {}
+        for doc in documents:
+            vectors[doc[0]] = doc
+        segment = IndexSegment.build(vectors.values(), self.positions)
+        with self._write_lock:
+            self._state = ((segment,) if len(segment.doc_ids) else (), MemorySegment(self.positions))
+            self._locations = {doc_id: segment for doc_id in segment.doc_ids}
+            self.generation += 1
+            self._load_epoch += 1
+            self.stats["docs_added"] += len(vectors)
+
+    def add_document(self, doc_id: str, tokens: List[str], title_tokens: Optional[List[str]] = None):
+        """
+        Add (or replace) a document.
+
+        The document is searchable as soon as this returns. A previous
+        version with the same doc_id is tombstoned.
+        """
+        term_vector = Counter(tokens)
+        title_vector = Counter(title_tokens) if title_tokens else None
+        positions = token_positions(tokens) if self.positions else None
+        with self._write_lock:
+            self._delete_locked(doc_id)
+            segments, buffer = self._state
+            buffer.add(doc_id, term_vector, title_vector, positions)
+            self._locations[doc_id] = buffer
+            self.generation += 1
+            self.stats["docs_added"] += 1
+            if len(buffer.doc_ids) >= self.max_buffer_docs:
+                self._flush_locked()
+
+    def delete_document(self, doc_id: str) -> bool:
+        """Delete a document. Returns False if it was not indexed."""
+        with self._write_lock:
+            deleted = self._delete_locked(doc_id)
+            if deleted:
+                self.generation += 1
+            return deleted
+
+    def _delete_locked(self, doc_id: str) -> bool:
+        segment = self._locations.pop(doc_id, None)
+        if segment is None:
+            return False
+        segment.delete(doc_id)
+        self.stats["docs_deleted"] += 1
+        return True
+
+    def flush(self):
+        """Seal the write buffer into an immutable segment."""
+        with self._write_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        segments, buffer = self._state
+        if not buffer.num_docs:
+            return
+        segment = buffer.seal()
+        for doc_id in segment.doc_ids:
+            self._locations[doc_id] = segment
+        self._state = (segments + (segment,), MemorySegment(self.positions))
+        self.stats["flushes"] += 1
+        if len(self._state[0]) >= self.merge_factor:
+            self._schedule_merge()
+
+    # --- Merging ---
+
+    def _schedule_merge(self):
+        if not self.background_merge:
+            while len(self._state[0]) >= self.merge_factor:
+                self._merge_once(release_lock=False)
+            return
+        if self._merge_thread is None or not self._merge_thread.is_alive():
+            self._merge_thread = threading.Thread(
+                target=self._merge_loop, name="SegmentMerger", daemon=True
+            )
+            self._merge_thread.start()
+        self._merge_cond.notify()
+
+    def _merge_loop(self):
+        with self._merge_cond:
+            while not self._closed:
+                if len(self._state[0]) < self.merge_factor:
+                    self._merge_cond.wait()
+                    continue
+                self._merge_once(release_lock=True)
+
+    def _merge_once(self, release_lock: bool):
+        """
+        Merge the `merge_factor` smallest segments into one.
+
+        Must be called with the write lock held. In the merge thread the
+        lock is released while the merged segment is built, so writers
+        keep going; readers never take the lock. If a bulk load replaced
+        the index meanwhile, the merged segment is dropped.
+        """
+        segments = self._state[0]
+        inputs = sorted(segments, key=lambda s: s.num_docs)[:self.merge_factor]
+        tombstones = {id(seg): set(seg.deleted) for seg in inputs}
+        load_epoch = self._load_epoch
+        self._merging = True
+
+        if release_lock:
+            self._write_lock.release()
+        try:
+            merged = IndexSegment.build(
+                (doc for seg in inputs for doc in seg.live_documents()), self.positions
+            )
+        finally:
+            if release_lock:
+                self._write_lock.acquire()
+            self._merging = False
+
+        current = {id(seg) for seg in self._state[0]}
+        if self._load_epoch != load_epoch or any(id(seg) not in current for seg in inputs):
+            self._merge_cond.notify_all()
+            return
+
+        # Replay deletions that happened while merging
+        for seg in inputs:
+            for docnum in seg.deleted - tombstones[id(seg)]:
+                merged.delete(seg.doc_ids[docnum])
+
+        input_ids = {id(seg) for seg in inputs}
+        for docnum, doc_id in enumerate(merged.doc_ids):
+            if docnum not in merged.deleted and id(self._locations.get(doc_id)) in input_ids:
+                self._locations[doc_id] = merged
+
+        remaining = tuple(seg for seg in self._state[0] if id(seg) not in input_ids)
+        self._state = (remaining + (merged,), self._state[1])
+        self.stats["merges"] += 1
+        self._merge_cond.notify_all()
+
+    def wait_for_merges(self, timeout: float = 30.0) -> bool:
+        """Block until no merge is pending. Returns False on timeout."""
+        deadline = time.time() + timeout
+        with self._merge_cond:
+            while self._merging or len(self._state[0]) >= self.merge_factor:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._merge_cond.wait(remaining)
+        return True
+
+    def close(self):
+        """Stop the background merge thread."""
+        with self._merge_cond:
+            self._closed = True
+            self._merge_cond.notify_all()
+
+    # --- Reads ---
+
+    def snapshot(self) -> IndexSnapshot:
+        """Return a consistent view over all segments, including the buffer."""
+        segments, buffer = self._state
+        return IndexSnapshot(segments + (buffer,), self.generation)
+
+    def search(
+        self,
+        query_terms: List[str],
+        k: int = 10,
+        field_weights: Optional[Dict[str, float]] = None
+    ) -> List[Tuple[str, float]]:
+        """BM25 (BM25F with field weights) search. Repeated query terms count multiple times."""
+        return self.snapshot().search_bm25(Counter(query_terms), k, self.k1, self.b, field_weights)
+
+    def size_bytes(self) -> Dict[str, int]:
+        """Approximate memory of the sealed segments (postings, term vectors, positions)."""
+        sizes = {"postings": 0, "term_vectors": 0, "positions": 0}
+        for seg in self._state[0]:
+            for name, size in seg.size_bytes().items():
+                sizes[name] += size
+        return sizes
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._locations
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        segments, buffer = self._state
+        return {
+            "documents": len(self._locations),
+            "segments": len(segments),
+            "buffered_docs": buffer.num_docs,
+            "generation": self.generation,
+            "positions": self.positions,
+            **self.stats
+        }
@@ -10,6 +10,8 @@ Features:
 - Query Likelihood Dirichlet (QLD)
 - Pseudo-Relevance Feedback (PRF)
 - Porter Stemming integration
+- Reusable analyzer pipeline with memoized stemming
+- Per-thread Pyserini searchers and native batch search
 
 Based on: TREC_AP88-90_5juin2025.py
 (c) Dominique S. Loyer - PhD Thesis Prototype
@@ -18,7 +20,8 @@ Citation Key: loyerEvaluationModelesRecherche2025
 
 import re
 import math
-from typing import Dict, List, Tuple, Optional, Any
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from collections import Counter
 
@@ -38,6 +41,8 @@ try:
 except ImportError:
     HAS_PYSERINI = False
 
+from syscred.searcher_pool import SearcherPool
+
 
 # --- Data Classes ---
 
@@ -48,6 +53,7 @@ class SearchResult:
     score: float
     rank: int
     snippet: Optional[str] = None
+    passage_id: Optional[str] = None  # Best passage ("<doc_id>#<n>") in passage mode
 
 
 @dataclass
@@ -60,6 +66,87 @@ class SearchResponse:
     total_hits: int
     search_time_ms: float
 
+# Fallback stopwords (when NLTK or its corpora are unavailable)
+FALLBACK_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
+    'for', 'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are',
+    'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should', 'may', 'might',
+    'must', 'shall', 'can', 'need', 'this', 'that', 'these',
+    'those', 'it', 'its', 'they', 'them', 'he', 'she', 'him',
+    'her', 'his', 'we', 'you', 'i', 'my', 'your', 'our', 'their'
+})
+
+
+class TextAnalyzer:
+    """
+    Reusable analysis pipeline: tokenize -> stopwords -> stem.
+    
+    Stopwords are a frozenset, and the stopword check plus stemming of
+    each surface form is memoized in a bounded LRU cache, so a word is
+    stemmed once no matter how often it appears in the corpus, PRF
+    documents and queries.
+    
+    Usage:
+        analyzer = TextAnalyzer(stopwords, PorterStemmer(), tokenizer='regex')
+        terms = analyzer.analyze("Information Retrieval systems")
+    """
+    
+    TOKEN_PATTERN = re.compile(r'\b[a-z]+\b')
+    DEFAULT_STEM_CACHE_SIZE = 200_000
+    
+    def __init__(
+        self,
+        stopwords: Optional[set] = None,
+        stemmer: Any = None,
+        tokenizer: str = 'nltk',
+        stem_cache_size: int = DEFAULT_STEM_CACHE_SIZE
+    ):
+        """
+        Args:
+            stopwords: Words to drop (lowercase)
+            stemmer: Object with a stem(word) method, or None
+            tokenizer: 'nltk' (word_tokenize) or 'regex' (compiled [a-z]+ pattern)
+            stem_cache_size: Max number of surface forms kept in the cache
+        """
+        self.stopwords = frozenset(stopwords if stopwords is not None else FALLBACK_STOPWORDS)
+        self.stemmer = stemmer
+        self.tokenizer = tokenizer if (tokenizer == 'regex' or HAS_NLTK) else 'regex'
+        self._normalize = lru_cache(maxsize=stem_cache_size)(self._normalize_token)
+    
+    def _normalize_token(self, token: str) -> str:
+        """Map a surface form to its term ('' if it is dropped)."""
+        if not token.isalpha() or token in self.stopwords:
+            return ''
+        if self.stemmer:
+            return self.stemmer.stem(token)
+        return token
+    
+    def tokenize(self, text: str) -> List[str]:
+        """Split lowercase text into tokens."""
+        if self.tokenizer == 'nltk':
+            try:
+                return word_tokenize(text)
+            except LookupError:
+                # punkt missing: switch to the regex tokenizer once
+                print("[TextAnalyzer] NLTK punkt unavailable, using regex tokenizer")
+                self.tokenizer = 'regex'
+        return self.TOKEN_PATTERN.findall(text)
+    
+    def analyze(self, text: str) -> List[str]:
+        """Return the list of index terms for a text."""
+        if not isinstance(text, str):
+            return []
+        normalize = self._normalize
+        return [term for term in map(normalize, self.tokenize(text.lower())) if term]
+    
+    def __call__(self, text: str) -> str:
+        return ' '.join(self.analyze(text))
+    
+    def cache_info(self):
+        """Stem cache statistics (hits, misses, maxsize, currsize)."""
+        return self._normalize.cache_info()
+
 
 class IREngine:
     """
@@ -75,17 +162,26 @@ class IREngine:
     BM25_K1 = 0.9
     BM25_B = 0.4
     
-    def __init__(self, index_path: str = None, use_stemming: bool = True):
+    def __init__(
+        self,
+        index_path: str = None,
+        use_stemming: bool = True,
+        tokenizer: str = 'nltk',
+        stem_cache_size: int = None
+    ):
         """
         Initialize the IR engine.
         
         Args:
             index_path: Path to Lucene/Pyserini index (optional)
             use_stemming: Whether to apply Porter stemming
+            tokenizer: 'nltk' (word_tokenize, TREC pipeline) or 'regex' (faster)
+            stem_cache_size: Max surface forms kept in the stem cache
         """
         self.index_path = index_path
         self.use_stemming = use_stemming
         self.searcher = None
+        self.searcher_pool: Optional[SearcherPool] = None
         
         # Initialize NLTK components
         if HAS_NLTK:
@@ -97,25 +193,30 @@ class IREngine:
                 nltk.download('stopwords', quiet=True)
                 nltk.download('punkt', quiet=True)
                 nltk.download('punkt_tab', quiet=True)
-                self.stopwords = set(stopwords.words('english'))
+                try:
+                    self.stopwords = set(stopwords.words('english'))
+                except LookupError:
+                    print("[IREngine] NLTK stopwords unavailable, using fallback list")
+                    self.stopwords = set(FALLBACK_STOPWORDS)
                 self.stemmer = PorterStemmer() if use_stemming else None
         else:
-            # Fallback stopwords
-            self.stopwords = {
-                'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
-                'for', 'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are',
-                'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does',
-                'did', 'will', 'would', 'could', 'should', 'may', 'might',
-                'must', 'shall', 'can', 'need', 'this', 'that', 'these',
-                'those', 'it', 'its', 'they', 'them', 'he', 'she', 'him',
-                'her', 'his', 'we', 'you', 'i', 'my', 'your', 'our', 'their'
-            }
+            self.stopwords = set(FALLBACK_STOPWORDS)
             self.stemmer = None
         
+        # Reusable analysis pipeline (tokenize -> stopwords -> stem)
+        self.analyzer = TextAnalyzer(
+            stopwords=self.stopwords,
+            stemmer=self.stemmer,
+            tokenizer=tokenizer,
+            stem_cache_size=stem_cache_size or TextAnalyzer.DEFAULT_STEM_CACHE_SIZE
+        )
+        
         # Initialize Pyserini searcher if available
         if HAS_PYSERINI and index_path:
             try:
+                # Shared searcher for document lookups, per-thread ones for queries
                 self.searcher = LuceneSearcher(index_path)
+                self.searcher_pool = SearcherPool(index_path, k1=self.BM25_K1, b=self.BM25_B)
                 print(f"[IREngine] Pyserini searcher initialized with index: {index_path}")
             except Exception as e:
                 print(f"[IREngine] Failed to initialize Pyserini: {e}")
@@ -126,28 +227,11 @@ class IREngine:
         
         This matches the TREC preprocessing pipeline.
         """
-        if not isinstance(text, str):
-            return ""
-        
-        text = text.lower()
-        
-        if HAS_NLTK:
-            try:
-                tokens = word_tokenize(text)
-            except LookupError:
-                # Fallback tokenization
-                tokens = re.findall(r'\b[a-z]+\b', text)
-        else:
-            tokens = re.findall(r'\b[a-z]+\b', text)
-        
-        # Filter stopwords and non-alpha
-        filtered = [t for t in tokens if t.isalpha() and t not in self.stopwords]
-        
-        # Apply stemming if enabled
-        if self.stemmer:
-            filtered = [self.stemmer.stem(t) for t in filtered]
-        
-        return ' '.join(filtered)
+        return ' '.join(self.analyzer.analyze(text))
+    
+    def analyze(self, text: str) -> List[str]:
+        """Same as preprocess() but returns the list of terms."""
+        return self.analyzer.analyze(text)
     
     def calculate_tf(self, tokens: List[str]) -> Dict[str, float]:
         """Calculate term frequency."""
@@ -208,33 +292,61 @@ class IREngine:
         import time
         start = time.time()
         
-        if not self.searcher:
+        if not self.searcher_pool:
             raise RuntimeError("Pyserini searcher not initialized. Provide index_path.")
         
-        # Configure similarity
-        if model == 'bm25':
-            self.searcher.set_bm25(k1=self.BM25_K1, b=self.BM25_B)
-        elif model == 'qld':
-            self.searcher.set_qld()
-        else:
-            self.searcher.set_bm25()
-        
         # Preprocess query
         processed_query = self.preprocess(query)
         
-        # Search
-        hits = self.searcher.search(processed_query, k=k)
-        
-        results = []
-        for i, hit in enumerate(hits):
-            results.append(SearchResult(
-                doc_id=hit.docid,
-                score=hit.score,
-                rank=i + 1
-            ))
+        # Search with a pooled searcher, already configured for the model
+        with self.searcher_pool.checkout(model) as searcher:
+            hits = searcher.search(processed_query, k=k)
         
         elapsed = (time.time() - start) * 1000
+        return self._pyserini_response(query_id, query, model, hits, elapsed)
+    
+    def batch_search_pyserini(
+        self,
+        queries: Dict[str, str],
+        model: str = 'bm25',
+        k: int = 100,
+        threads: int = 4
+    ) -> Dict[str, SearchResponse]:
+        """
+        Search many queries with Pyserini's multi-threaded batch_search.
+        
+        Args:
+            queries: {query_id: query text}
+            model: 'bm25' or 'qld'
+            k: Number of results per query
+            threads: Lucene search threads
+            
+        Returns:
+            {query_id: SearchResponse}; search_time_ms is the batch time
+            divided by the number of queries
+        """
+        import time
+        start = time.time()
+        
+        if not self.searcher_pool:
+            raise RuntimeError("Pyserini searcher not initialized. Provide index_path.")
+        
+        qids = list(queries)
+        processed = [self.preprocess(queries[qid]) for qid in qids]
+        batch = self.searcher_pool.batch_search(processed, qids, k=k, model=model, threads=threads)
         
+        elapsed = (time.time() - start) * 1000 / max(len(qids), 1)
+        return {
+            qid: self._pyserini_response(qid, queries[qid], model, batch.get(qid, []), elapsed)
+            for qid in qids
+        }
+    
+    @staticmethod
+    def _pyserini_response(query_id: str, query: str, model: str, hits: List[Any], elapsed: float) -> SearchResponse:
+        results = [
+            SearchResult(doc_id=hit.docid, score=hit.score, rank=i + 1)
+            for i, hit in enumerate(hits)
+        ]
         return SearchResponse(
             query_id=query_id,
             query_text=query,
@@ -255,12 +367,12 @@ class IREngine:
         
         Uses top-k retrieved documents to find expansion terms.
         """
-        query_tokens = self.preprocess(query).split()
+        query_tokens = set(self.analyze(query))
         
         # Collect terms from top documents
         expansion_candidates = Counter()
         for doc_text in top_docs_texts:
-            doc_tokens = self.preprocess(doc_text).split()
+            doc_tokens = self.analyze(doc_text)
             # Count terms not in original query
             for token in doc_tokens:
                 if token not in query_tokens:
@@ -274,6 +386,76 @@ class IREngine:
         
         return expanded_query
     
+    @staticmethod
+    def relevance_model(feedback_docs: List[Tuple[Dict[str, int], float]]) -> Counter:
+        """
+        RM1 relevance model P(w|R) from (term_vector, retrieval_score) pairs.
+        
+        P(w|R) = Σ_d P(w|d) × P(d|q), with P(w|d) = tf / |d| and P(d|q)
+        the retrieval score normalized over the feedback documents.
+        """
+        total_score = sum(max(score, 0.0) for _, score in feedback_docs)
+        model: Counter = Counter()
+        if not total_score:
+            return model
+        for term_vector, score in feedback_docs:
+            doc_length = sum(term_vector.values())
+            if not doc_length or score <= 0:
+                continue
+            doc_weight = score / total_score
+            for term, tf in term_vector.items():
+                model[term] += doc_weight * tf / doc_length
+        return model
+    
+    def rm3_expansion(
+        self,
+        query_terms: List[str],
+        feedback_docs: List[Tuple[Dict[str, int], float]],
+        num_expansion_terms: int = 10,
+        original_query_weight: float = 0.5,
+        term_filter: Optional[Callable[[str], bool]] = None
+    ) -> Dict[str, float]:
+        """
+        Build an RM3 weighted query from feedback term vectors.
+        
+        RM3 interpolates the top RM1 terms (see relevance_model) with the
+        original query:
+        w = λ × P(w|q) + (1 - λ) × P(w|R)
+        
+        Args:
+            query_terms: Analyzed query terms
+            feedback_docs: (term_vector, retrieval_score) of the top documents
+            num_expansion_terms: Number of RM1 terms kept
+            original_query_weight: λ, weight of the original query
+            term_filter: Optional predicate, expansion candidates failing it are skipped
+            
+        Returns:
+            {term: weight} with weights summing to 1
+        """
+        query_model: Dict[str, float] = {}
+        if query_terms:
+            for term, count in Counter(query_terms).items():
+                query_model[term] = count / len(query_terms)
+        
+        relevance_model = self.relevance_model(feedback_docs)
+        
+        top_terms = []
+        for term, weight in relevance_model.most_common():
+            if len(top_terms) >= num_expansion_terms:
+                break
+            if term_filter is None or term in query_model or term_filter(term):
+                top_terms.append((term, weight))
+        norm = sum(weight for _, weight in top_terms)
+        if not norm:
+            return query_model
+        
+        weights: Dict[str, float] = {}
+        for term, weight in query_model.items():
+            weights[term] = original_query_weight * weight
+        for term, weight in top_terms:
+            weights[term] = weights.get(term, 0.0) + (1 - original_query_weight) * weight / norm
+        return weights
+    
     def format_trec_run(
         self,
         responses: List[SearchResponse],
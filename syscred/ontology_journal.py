@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Ontology Journal Module - SysCRED
+==================================
+Append-only N-Triples journal of the ontology data graph.
+
+Saving an evaluation used to re-serialize the whole data graph to
+Turtle (O(history) per request). With the journal, only the triples
+added since the last save are written:
+
+- One batch per save: N-Triples lines followed by a commit comment
+  (`# commit <n>`), so a batch torn by a crash is never replayed
+- Writes are flushed to the OS per batch; fsync is batched (every
+  sync_every batches or sync_interval seconds)
+- Startup replays snapshot (the data Turtle file) + journal
+- Compaction (OntologyManager.compact_journal) writes a new snapshot
+  and drops the journal prefix it covers
+
+Replay is idempotent (a graph is a set), so a crash between writing the
+snapshot and trimming the journal only replays triples twice.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import os
+import time
+import threading
+from typing import Iterable, Optional
+
+try:
+    from rdflib import Graph
+    HAS_RDFLIB = True
+except ImportError:
+    HAS_RDFLIB = False
+
+COMMIT_PREFIX = b"# commit "
+
+
+class OntologyJournal:
+    """
+    Append-only journal of data graph triples.
+
+    Usage:
+        journal = OntologyJournal("/path/sysCRED_data.ttl.journal.nt")
+        journal.replay(data_graph)  # before the first append
+        journal.append(new_triples)
+    """
+
+    DEFAULT_SYNC_EVERY = 8
+    DEFAULT_SYNC_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        path: str,
+        sync_every: int = DEFAULT_SYNC_EVERY,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL
+    ):
+        """
+        Args:
+            path: Journal file
+            sync_every: Batches between two fsyncs (1 = fsync every batch)
+            sync_interval: Max seconds between two fsyncs (checked on append)
+        """
+        if not HAS_RDFLIB:
+            raise ImportError("OntologyJournal requires rdflib")
+        self.path = path
+        self.sync_every = max(1, int(sync_every))
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._batches = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.stats = {"batches": 0, "triples": 0, "bytes": 0, "fsyncs": 0}
+
+    @staticmethod
+    def exists(path: Optional[str]) -> bool:
+        return bool(path) and os.path.exists(path) and os.path.getsize(path) > 0
+
+    def size(self) -> int:
+        """Committed bytes on disk."""
+        with self._lock:
+            if self._file is not None:
+                return self._file.tell()
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    # --- Replay ---
+
+    @staticmethod
+    def _committed_length(data: bytes) -> int:
+        """Length of the prefix of `data` that ends with a commit line."""
+        # N-Triples escapes newlines in literals: a line starting with
+        # the commit prefix is always a commit comment
+        start = data.rfind(b"\n" + COMMIT_PREFIX) + 1  # 0: only at the start, or none
+        if not data.startswith(COMMIT_PREFIX, start):
+            return 0
+        end = data.find(b"\n", start)
+        return end + 1 if end >= 0 else 0
+
+    def replay(self, graph: 'Graph') -> int:
+        """
+        Add the committed triples to a graph; an uncommitted tail (torn
+        batch) is truncated. Returns the number of committed batches.
+        """
+        with self._lock:
+            if not os.path.exists(self.path):
+                self._batches = 0
+                return 0
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            committed = data[:self._committed_length(data)] if data else b""
+            if len(committed) < len(data):
+                print(f"[OntologyJournal] Dropping {len(data) - len(committed)} uncommitted bytes")
+                with open(self.path, 'r+b') as f:
+                    f.truncate(len(committed))
+            if committed:
+                graph.parse(data=committed.decode('utf-8'), format='nt')
+            self._batches = committed.count(b"\n" + COMMIT_PREFIX) + committed.startswith(COMMIT_PREFIX)
+            return self._batches
+
+    # --- Writes ---
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+
+    def append(self, triples: Iterable) -> int:
+        """Write one committed batch; returns the number of triples."""
+        batch = Graph()
+        for triple in triples:
+            batch.add(triple)
+        if not len(batch):
+            return 0
+        data = batch.serialize(format='nt', encoding='utf-8')
+        with self._lock:
+            self._open()
+            self._batches += 1
+            payload = data + COMMIT_PREFIX + str(self._batches).encode('ascii') + b"\n"
+            self._file.write(payload)
+            self._file.flush()
+            self._unsynced += 1
+            self.stats["batches"] += 1
+            self.stats["triples"] += len(batch)
+            self.stats["bytes"] += len(payload)
+            if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync()
+        return len(batch)
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self.stats["fsyncs"] += 1
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        """fsync the batches written since the last sync."""
+        with self._lock:
+            self._sync()
+
+    def discard_prefix(self, offset: int):
+        """
+        Drop the first `offset` bytes (covered by a new snapshot); the
+        batches appended after them are kept.
+        """
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                tail = f.read()
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+    def close(self):
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_statistics(self):
+        return {"path": self.path, "size": self.size(), **self.stats}
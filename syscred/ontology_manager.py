@@ -9,21 +9,99 @@ Handles reading, writing, and querying of semantic triplets.
 Citation Key: loyerModelingHybridSystem2025
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
+import atexit
+import functools
+import itertools
+import threading
+
+from syscred.domain_history import DomainHistoryIndex
+from syscred.claim_index import ClaimIndex
+from syscred.claim_embeddings import ClaimEmbeddingIndex
+from syscred.ontology_journal import OntologyJournal
+from syscred.graph_snapshot import GraphSnapshotCache
+from syscred.sqlite_store import SQLiteTripleStore
+from syscred.ontology_writer import OntologyWriter, ReadWriteLock
 
 # RDFLib imports with fallback
 try:
     from rdflib import Graph, Namespace, Literal, URIRef, BNode
     from rdflib.namespace import RDF, RDFS, OWL, XSD
+    from rdflib.graph import ReadOnlyGraphAggregate
+    from rdflib.plugins.sparql import prepareQuery
+    from rdflib.store import TripleAddedEvent
     HAS_RDFLIB = True
 except ImportError:
     HAS_RDFLIB = False
     print("Warning: rdflib not installed. Run: pip install rdflib")
 
 
+# Recurring SPARQL queries, parsed and translated once.
+# Parameters (?domain, ?report, ?node) are passed with initBindings,
+# so caller input is never formatted into the query text.
+SOURCE_HISTORY_SPARQL = """
+PREFIX cred: <https://syscred.uqam.ca/ontology#>
+
+SELECT ?report ?score ?level ?timestamp ?content
+WHERE {
+    ?info cred:informationURL ?url .
+    ?request cred:concernsInformation ?info .
+    ?report cred:isReportOf ?request .
+    ?report cred:credibilityScoreValue ?score .
+    ?report cred:assignsCredibilityLevel ?level .
+    ?report cred:completionTimestamp ?timestamp .
+    ?info cred:informationContent ?content .
+    FILTER(CONTAINS(STR(?url), ?domain))
+}
+ORDER BY DESC(?timestamp)
+"""
+
+EVALUATION_COUNT_SPARQL = """
+PREFIX cred: <https://syscred.uqam.ca/ontology#>
+SELECT (COUNT(?report) as ?count) WHERE {
+    ?report a cred:RapportEvaluation .
+}
+"""
+
+LATEST_REPORT_SPARQL = """
+PREFIX cred: <https://syscred.uqam.ca/ontology#>
+SELECT ?report ?timestamp WHERE {
+    ?report a cred:RapportEvaluation .
+    ?report cred:completionTimestamp ?timestamp .
+}
+ORDER BY DESC(?timestamp)
+LIMIT 1
+"""
+
+REPORT_COMPONENTS_SPARQL = """
+PREFIX cred: <https://syscred.uqam.ca/ontology#>
+SELECT ?p ?o ?oType ?oLabel WHERE {
+    ?report ?p ?o .
+    OPTIONAL { ?o a ?oType } .
+    OPTIONAL { ?o cred:evidenceSnippet ?oLabel } .
+    OPTIONAL { ?o cred:sourceAnalyzedReputation ?oLabel } .
+}
+"""
+
+NODE_DETAILS_SPARQL = """
+SELECT ?p2 ?o2 ?o2Type WHERE {
+    ?node ?p2 ?o2 .
+    OPTIONAL { ?o2 a ?o2Type } .
+    FILTER(isURI(?o2))
+}
+"""
+
+if HAS_RDFLIB:
+    SOURCE_HISTORY_QUERY = prepareQuery(SOURCE_HISTORY_SPARQL)
+    EVALUATION_COUNT_QUERY = prepareQuery(EVALUATION_COUNT_SPARQL)
+    LATEST_REPORT_QUERY = prepareQuery(LATEST_REPORT_SPARQL)
+    REPORT_COMPONENTS_QUERY = prepareQuery(REPORT_COMPONENTS_SPARQL)
+    NODE_DETAILS_QUERY = prepareQuery(NODE_DETAILS_SPARQL)
+
+
 @dataclass
 class EvaluationRecord:
     """Represents a stored evaluation from the ontology."""
@@ -35,6 +113,27 @@ class EvaluationRecord:
     fact_checks: List[str]
 
 
+@dataclass
+class EvaluationWrite:
+    """Triples and index entries of one evaluation, built before the graph is locked."""
+    report: str
+    content: str
+    url: Optional[str]
+    timestamp: str
+    score: float
+    level: str
+    triples: List[Tuple] = field(default_factory=list)
+
+
+def _reads_graph(method):
+    """Run an OntologyManager method under the graph read lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.graph_lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class OntologyManager:
     """
     Manages the credibility ontology using RDFLib.
@@ -49,40 +148,122 @@ class OntologyManager:
     # Namespace for the credibility ontology
     CRED_NS = "https://syscred.uqam.ca/ontology#"
     
-    def __init__(self, base_ontology_path: Optional[str] = None, data_path: Optional[str] = None):
+    def __init__(
+        self,
+        base_ontology_path: Optional[str] = None,
+        data_path: Optional[str] = None,
+        history_size: int = 10,
+        journal: bool = False,
+        journal_sync_every: int = OntologyJournal.DEFAULT_SYNC_EVERY,
+        journal_compact_bytes: int = 2_000_000,
+        snapshot_dir: Optional[str] = None,
+        store: str = 'memory',
+        store_path: Optional[str] = None,
+        background_writes: bool = False
+    ):
         """
         Initialize the ontology manager.
         
         Args:
             base_ontology_path: Path to the base ontology TTL file
             data_path: Path to store/load accumulated data triplets
+            history_size: Recent evaluations kept per domain (domain_history)
+            journal: save_data appends new triples to a journal next to
+                data_path instead of rewriting the TTL file
+            journal_sync_every: Journal batches between two fsyncs
+            journal_compact_bytes: Journal size that triggers a background
+                compaction into a new TTL snapshot
+            snapshot_dir: Binary snapshot cache of the parsed TTL files,
+                keyed by file hash (None: always parse the TTL)
+            store: Data graph backend: 'memory' (rdflib graph saved to
+                data_path) or 'sqlite' (disk-backed indexed store; the
+                TTL file and its journal are imported on first start)
+            store_path: SQLite file (default: data_path + '.sqlite3')
+            background_writes: add_evaluation_triplets and save_data
+                queue their work for a single writer thread and return
+                (see flush); readers share the graphs under graph_lock
         """
         if not HAS_RDFLIB:
             raise ImportError("rdflib is required. Install with: pip install rdflib")
         
         self.base_path = base_ontology_path
         self.data_path = data_path
+        self.snapshots = GraphSnapshotCache(snapshot_dir) if snapshot_dir else None
         
         # Create namespace
         self.cred = Namespace(self.CRED_NS)
         
+        # Readers (queries, index lookups) share the graphs and their
+        # indexes; applying evaluations is exclusive
+        self.graph_lock = ReadWriteLock()
+        
         # Initialize graphs
         self.base_graph = Graph()
-        self.data_graph = Graph()
+        self.data_store: Optional[SQLiteTripleStore] = None
+        if store == 'sqlite' and (store_path or data_path):
+            self.store_path = store_path or data_path + ".sqlite3"
+            self.data_store = SQLiteTripleStore(self.store_path)
+            self.data_graph = Graph(store=self.data_store)
+        else:
+            if store != 'memory':
+                print(f"[OntologyManager] Store '{store}' unavailable without a path, using memory")
+            self.store_path = None
+            self.data_graph = Graph()
         
         # Bind prefixes for nicer serialization
         self._bind_prefixes(self.base_graph)
         self._bind_prefixes(self.data_graph)
         
+        # Read-only union of both graphs: queries see base + data
+        # triples without copying either graph
+        self.union_graph = ReadOnlyGraphAggregate([self.base_graph, self.data_graph])
+        self.union_graph.namespace_manager = self.data_graph.namespace_manager
+        
+        # Domain -> recent evaluations and claim text -> similar reports,
+        # both kept in sync with the graphs
+        self.domain_history = DomainHistoryIndex(history_size)
+        self.claim_index = ClaimIndex()
+        # Claim embeddings: set by attach_claim_encoder once SBERT is loaded
+        self.claim_embeddings: Optional[ClaimEmbeddingIndex] = None
+        # Bumped after every write to the graphs or their indexes (memo keys)
+        self._write_generations = itertools.count(1)
+        self.write_generation = 0
+        
+        # Append-only journal: triples added to the data graph are
+        # recorded (store events) and written by save_data
+        self.journal: Optional[OntologyJournal] = None
+        self.journal_compact_bytes = journal_compact_bytes
+        self._journal_pending: List = []
+        self._journal_recording = False
+        self._journal_count = 0  # Data triples covered by snapshot + journal
+        self._compaction: Optional[threading.Thread] = None
+        self._save_lock = threading.RLock()  # One save / compaction at a time
+        # (the SQLite store persists itself: no journal)
+        if journal and data_path and self.data_store is None:
+            self.journal = OntologyJournal(self.journal_path, sync_every=journal_sync_every)
+            self.data_graph.store.dispatcher.subscribe(TripleAddedEvent, self._record_added)
+        
         # Load ontology files if they exist
         if base_ontology_path and os.path.exists(base_ontology_path):
             self.load_base_ontology(base_ontology_path)
         
-        if data_path and os.path.exists(data_path):
+        if self.data_store is not None and len(self.data_store):
+            print(f"[OntologyManager] Opened data store: {len(self.data_graph)} triples in {self.store_path}")
+            self._refresh_domain_history()
+            self.rebuild_claim_index()
+        elif data_path and (os.path.exists(data_path) or OntologyJournal.exists(self.journal_path)):
             self.load_data_graph(data_path)
+        self._journal_count = len(self.data_graph)
+        self._journal_recording = True
         
-        # Counter for generating unique IDs
-        self._evaluation_counter = 0
+        # Counter for generating unique IDs (next() is atomic)
+        self._evaluation_ids = itertools.count(1)
+        
+        self.writer: Optional[OntologyWriter] = None
+        if background_writes:
+            self.writer = OntologyWriter(self._apply_evaluations, self._save_data)
+            # Daemon thread: apply and save what is queued at exit
+            atexit.register(self.writer.close)
     
     def _bind_prefixes(self, graph: Graph):
         """Bind common prefixes to a graph."""
@@ -95,22 +276,171 @@ class OntologyManager:
     def load_base_ontology(self, path: str) -> bool:
         """Load the base ontology from a TTL file."""
         try:
-            self.base_graph.parse(path, format='turtle')
+            self._parse_turtle(self.base_graph, path)
             print(f"[OntologyManager] Loaded base ontology: {len(self.base_graph)} triples")
+            self._refresh_domain_history()
+            self.rebuild_claim_index()
             return True
         except Exception as e:
             print(f"[OntologyManager] Error loading base ontology: {e}")
             return False
     
     def load_data_graph(self, path: str) -> bool:
-        """Load accumulated data triplets."""
+        """Load accumulated data triplets (TTL snapshot, then the journal of data_path)."""
+        recording, self._journal_recording = self._journal_recording, False
         try:
-            self.data_graph.parse(path, format='turtle')
+            journal = self.journal
+            if self.data_store is not None and path == self.data_path:
+                # Import into the store, journal included (read-only here)
+                journal = OntologyJournal(self.journal_path)
+            if journal is None or os.path.exists(path):
+                self._parse_turtle(self.data_graph, path)
+            if journal is not None and path == self.data_path:
+                batches = journal.replay(self.data_graph)
+                if batches:
+                    print(f"[OntologyManager] Replayed {batches} journal batches")
+            if self.data_store is not None:
+                self.data_graph.commit()
             print(f"[OntologyManager] Loaded data graph: {len(self.data_graph)} triples")
+            self._refresh_domain_history()
+            self.rebuild_claim_index()
             return True
         except Exception as e:
             print(f"[OntologyManager] Error loading data graph: {e}")
             return False
+        finally:
+            self._journal_recording = recording
+    
+    def _parse_turtle(self, graph: Graph, path: str):
+        """Parse a TTL file, from its binary snapshot when one matches the file hash."""
+        if self.snapshots is not None:
+            self.snapshots.parse(graph, path)
+        else:
+            graph.parse(path, format='turtle')
+    
+    @property
+    def domain_history_path(self) -> Optional[str]:
+        """Persisted domain history, next to the data graph."""
+        return self.data_path + ".domains.json" if self.data_path else None
+    
+    def _domain_history_fingerprint(self) -> List:
+        if self.data_store is not None:
+            # The SQLite file changes on checkpoints: triple counts only
+            return DomainHistoryIndex.fingerprint([len(self.base_graph), len(self.data_graph)])
+        paths = [self.data_path] + ([self.journal_path] if self.journal is not None else [])
+        return DomainHistoryIndex.fingerprint([len(self.base_graph), len(self.data_graph)], *paths)
+    
+    def _refresh_domain_history(self):
+        """Use the persisted domain history if it matches the graphs, else rebuild."""
+        path = self.domain_history_path
+        if path and self.domain_history.load(path, self._domain_history_fingerprint()):
+            return
+        self.rebuild_domain_index()
+    
+    def _bump_generation(self):
+        self.write_generation = next(self._write_generations)
+    
+    def rebuild_domain_index(self):
+        """Rebuild domain_history from the graphs (after writing triples directly)."""
+        with self.graph_lock.write():
+            self.domain_history.rebuild(self.iter_evaluations(self.cred.informationURL))
+            self._bump_generation()
+    
+    def rebuild_claim_index(self):
+        """Rebuild claim_index from the graphs, oldest evaluation first."""
+        with self.graph_lock.write():
+            self.claim_index.clear()
+            evaluations = sorted(self.iter_evaluations(self.cred.informationContent), key=lambda e: (e[1], e[4]))
+            for content, _, _, _, report in evaluations:
+                self.claim_index.add(report, content)
+            self._bump_generation()
+    
+    @property
+    def journal_path(self) -> Optional[str]:
+        """Append-only N-Triples journal, next to the data graph."""
+        return self.data_path + ".journal.nt" if self.data_path else None
+    
+    def _record_added(self, event):
+        # Dispatched before the store inserts: skip triples already present
+        if self._journal_recording and event.triple not in self.data_graph:
+            self._journal_pending.append(event.triple)
+    
+    @property
+    def _journal_covers_graph(self) -> bool:
+        """False if triples were removed (or loaded) outside the journal."""
+        with self.graph_lock.read():
+            return len(self.data_graph) == self._journal_count + len(self._journal_pending)
+    
+    @property
+    def claim_embeddings_path(self) -> Optional[str]:
+        """Persisted claim embeddings, next to the data graph."""
+        return self.data_path + ".claims" if self.data_path else None
+    
+    def attach_claim_encoder(self, encoder: Any, first_pass: str = 'binary') -> bool:
+        """
+        Enable semantic similar-claim search with a sentence encoder.
+        
+        Opens the persisted claim embeddings and encodes the evaluations
+        of the graphs that are not stored yet.
+        """
+        try:
+            path = self.claim_embeddings_path
+            if path:
+                index = ClaimEmbeddingIndex.open(path, encoder, first_pass=first_pass)
+            else:
+                index = ClaimEmbeddingIndex(encoder, first_pass=first_pass)
+            with self.graph_lock.read():
+                evaluations = sorted(self.iter_evaluations(self.cred.informationContent), key=lambda e: (e[1], e[4]))
+            missing = [(report, content) for content, _, _, _, report in evaluations if report not in index]
+            encoded = index.add_many([m[0] for m in missing], [m[1] for m in missing])
+            self.claim_embeddings = index
+            self._bump_generation()
+            print(f"[OntologyManager] Claim embeddings: {len(index)} claims ({encoded} encoded)")
+            return True
+        except Exception as e:
+            print(f"[OntologyManager] Claim embeddings disabled: {e}")
+            self.claim_embeddings = None
+            self._bump_generation()
+            return False
+    
+    def iter_evaluations(self, info_predicate):
+        """
+        Yield (value, timestamp, score, level, report) for every complete
+        evaluation: information <info_predicate> value, a request about
+        it and a report with score, level and completion timestamp.
+        """
+        graph, cred = self.union_graph, self.cred
+        for info, _, value in graph.triples((None, info_predicate, None)):
+            for request in graph.subjects(cred.concernsInformation, info):
+                for report in graph.subjects(cred.isReportOf, request):
+                    score = graph.value(report, cred.credibilityScoreValue)
+                    level = graph.value(report, cred.assignsCredibilityLevel)
+                    timestamp = graph.value(report, cred.completionTimestamp)
+                    if score is None or level is None or timestamp is None:
+                        continue
+                    try:
+                        score = float(score)
+                    except (TypeError, ValueError):
+                        continue
+                    yield str(value), str(timestamp), score, str(level).split('#')[-1], str(report)
+    
+    @_reads_graph
+    def get_report_summary(self, report_uri: str) -> Optional[Dict[str, Any]]:
+        """Content, score, level and timestamp of one evaluation report."""
+        graph, cred = self.union_graph, self.cred
+        report = URIRef(report_uri)
+        request = graph.value(report, cred.isReportOf)
+        info = graph.value(request, cred.concernsInformation) if request is not None else None
+        score = graph.value(report, cred.credibilityScoreValue)
+        if info is None or score is None:
+            return None
+        level = graph.value(report, cred.assignsCredibilityLevel)
+        return {
+            'content': str(graph.value(info, cred.informationContent) or ''),
+            'score': float(score),
+            'level': str(level).split('#')[-1] if level is not None else '',
+            'timestamp': str(graph.value(report, cred.completionTimestamp) or ''),
+        }
     
     def add_evaluation_triplets(self, report: Dict[str, Any]) -> str:
         """
@@ -120,16 +450,19 @@ class OntologyManager:
             report: The evaluation report dictionary from CredibilityVerificationSystem
             
         Returns:
-            The URI of the created RapportEvaluation individual
+            The URI of the created RapportEvaluation individual (with
+            background_writes, the triples are queued for the writer)
         """
         timestamp = datetime.now()
         timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S")
-        self._evaluation_counter += 1
+        counter = next(self._evaluation_ids)
+        
+        triples: List[Tuple] = []
         
         # Create URIs for new individuals
-        report_uri = self.cred[f"Report_{timestamp_str}_{self._evaluation_counter}"]
-        request_uri = self.cred[f"Request_{timestamp_str}_{self._evaluation_counter}"]
-        info_uri = self.cred[f"Info_{timestamp_str}_{self._evaluation_counter}"]
+        report_uri = self.cred[f"Report_{timestamp_str}_{counter}"]
+        request_uri = self.cred[f"Request_{timestamp_str}_{counter}"]
+        info_uri = self.cred[f"Info_{timestamp_str}_{counter}"]
         
         # Get data from report
         score = report.get('scoreCredibilite', 0.5)
@@ -148,98 +481,140 @@ class OntologyManager:
             info_class = self.cred.InformationFaibleCredibilite
         
         # Add Information triplets
-        self.data_graph.add((info_uri, RDF.type, self.cred.InformationSoumise))
-        self.data_graph.add((info_uri, RDF.type, info_class))
-        self.data_graph.add((info_uri, self.cred.informationContent, 
-                            Literal(input_data[:500], datatype=XSD.string)))
+        triples.append((info_uri, RDF.type, self.cred.InformationSoumise))
+        triples.append((info_uri, RDF.type, info_class))
+        triples.append((info_uri, self.cred.informationContent, 
+                       Literal(input_data[:500], datatype=XSD.string)))
         
         # Check if it's a URL
         if input_data.startswith('http'):
-            self.data_graph.add((info_uri, self.cred.informationURL, 
-                                Literal(input_data, datatype=XSD.anyURI)))
+            triples.append((info_uri, self.cred.informationURL, 
+                           Literal(input_data, datatype=XSD.anyURI)))
         
         # Add Request triplets
-        self.data_graph.add((request_uri, RDF.type, self.cred.RequeteEvaluation))
-        self.data_graph.add((request_uri, self.cred.concernsInformation, info_uri))
-        self.data_graph.add((request_uri, self.cred.submissionTimestamp, 
-                            Literal(timestamp.isoformat(), datatype=XSD.dateTime)))
-        self.data_graph.add((request_uri, self.cred.requestStatus, 
-                            Literal("Completed", datatype=XSD.string)))
+        triples.append((request_uri, RDF.type, self.cred.RequeteEvaluation))
+        triples.append((request_uri, self.cred.concernsInformation, info_uri))
+        triples.append((request_uri, self.cred.submissionTimestamp, 
+                       Literal(timestamp.isoformat(), datatype=XSD.dateTime)))
+        triples.append((request_uri, self.cred.requestStatus, 
+                       Literal("Completed", datatype=XSD.string)))
         
         # Add Report triplets
-        self.data_graph.add((report_uri, RDF.type, self.cred.RapportEvaluation))
-        self.data_graph.add((report_uri, self.cred.isReportOf, request_uri))
-        self.data_graph.add((report_uri, self.cred.credibilityScoreValue, 
-                            Literal(float(score), datatype=XSD.float)))
-        self.data_graph.add((report_uri, self.cred.assignsCredibilityLevel, level_uri))
-        self.data_graph.add((report_uri, self.cred.completionTimestamp, 
-                            Literal(timestamp.isoformat(), datatype=XSD.dateTime)))
-        self.data_graph.add((report_uri, self.cred.reportSummary, 
-                            Literal(summary, datatype=XSD.string)))
+        score_literal = Literal(float(score), datatype=XSD.float)
+        completion_literal = Literal(timestamp.isoformat(), datatype=XSD.dateTime)
+        triples.append((report_uri, RDF.type, self.cred.RapportEvaluation))
+        triples.append((report_uri, self.cred.isReportOf, request_uri))
+        triples.append((report_uri, self.cred.credibilityScoreValue, score_literal))
+        triples.append((report_uri, self.cred.assignsCredibilityLevel, level_uri))
+        triples.append((report_uri, self.cred.completionTimestamp, completion_literal))
+        triples.append((report_uri, self.cred.reportSummary, 
+                       Literal(summary, datatype=XSD.string)))
         
         # Add NLP results if available
         nlp_results = report.get('analyseNLP', {})
         if nlp_results:
-            nlp_result_uri = self.cred[f"NLPResult_{timestamp_str}_{self._evaluation_counter}"]
-            self.data_graph.add((nlp_result_uri, RDF.type, self.cred.ResultatNLP))
-            self.data_graph.add((report_uri, self.cred.includesNLPResult, nlp_result_uri))
+            nlp_result_uri = self.cred[f"NLPResult_{timestamp_str}_{counter}"]
+            triples.append((nlp_result_uri, RDF.type, self.cred.ResultatNLP))
+            triples.append((report_uri, self.cred.includesNLPResult, nlp_result_uri))
             
             sentiment = nlp_results.get('sentiment', {})
             if sentiment:
-                self.data_graph.add((nlp_result_uri, self.cred.sentimentScore, 
-                                    Literal(float(sentiment.get('score', 0.5)), datatype=XSD.float)))
+                triples.append((nlp_result_uri, self.cred.sentimentScore, 
+                               Literal(float(sentiment.get('score', 0.5)), datatype=XSD.float)))
             
             coherence = nlp_results.get('coherence_score')
             if coherence is not None:
-                self.data_graph.add((nlp_result_uri, self.cred.coherenceScore, 
-                                    Literal(float(coherence), datatype=XSD.float)))
+                triples.append((nlp_result_uri, self.cred.coherenceScore, 
+                               Literal(float(coherence), datatype=XSD.float)))
         
         # Add source analysis if available
         rules = report.get('reglesAppliquees', {})
         source_analysis = rules.get('source_analysis', {})
         if source_analysis:
-            source_uri = self.cred[f"SourceAnalysis_{timestamp_str}_{self._evaluation_counter}"]
-            self.data_graph.add((source_uri, RDF.type, self.cred.InfoSourceAnalyse))
-            self.data_graph.add((report_uri, self.cred.includesSourceAnalysis, source_uri))
+            source_uri = self.cred[f"SourceAnalysis_{timestamp_str}_{counter}"]
+            triples.append((source_uri, RDF.type, self.cred.InfoSourceAnalyse))
+            triples.append((report_uri, self.cred.includesSourceAnalysis, source_uri))
             
             reputation = source_analysis.get('reputation', 'Unknown')
-            self.data_graph.add((source_uri, self.cred.sourceAnalyzedReputation, 
-                                Literal(reputation, datatype=XSD.string)))
+            triples.append((source_uri, self.cred.sourceAnalyzedReputation, 
+                           Literal(reputation, datatype=XSD.string)))
             
             domain_age = source_analysis.get('domain_age_days')
             if domain_age is not None:
-                self.data_graph.add((source_uri, self.cred.sourceMentionsCount, 
-                                    Literal(int(domain_age), datatype=XSD.integer)))
+                triples.append((source_uri, self.cred.sourceMentionsCount, 
+                               Literal(int(domain_age), datatype=XSD.integer)))
         
         # Add fact check results
         fact_checks = rules.get('fact_checking', [])
         for i, fc in enumerate(fact_checks):
-            evidence_uri = self.cred[f"Evidence_{timestamp_str}_{self._evaluation_counter}_{i}"]
-            self.data_graph.add((evidence_uri, RDF.type, self.cred.PreuveFactuelle))
-            self.data_graph.add((report_uri, self.cred.basedOnEvidence, evidence_uri))
+            evidence_uri = self.cred[f"Evidence_{timestamp_str}_{counter}_{i}"]
+            triples.append((evidence_uri, RDF.type, self.cred.PreuveFactuelle))
+            triples.append((report_uri, self.cred.basedOnEvidence, evidence_uri))
             
-            self.data_graph.add((evidence_uri, self.cred.evidenceClaim, 
-                                Literal(fc.get('claim', ''), datatype=XSD.string)))
-            self.data_graph.add((evidence_uri, self.cred.evidenceVerdict, 
-                                Literal(fc.get('rating', ''), datatype=XSD.string)))
-            self.data_graph.add((evidence_uri, self.cred.evidenceSource, 
-                                Literal(fc.get('publisher', ''), datatype=XSD.string)))
+            triples.append((evidence_uri, self.cred.evidenceClaim, 
+                           Literal(fc.get('claim', ''), datatype=XSD.string)))
+            triples.append((evidence_uri, self.cred.evidenceVerdict, 
+                           Literal(fc.get('rating', ''), datatype=XSD.string)))
+            triples.append((evidence_uri, self.cred.evidenceSource, 
+                           Literal(fc.get('publisher', ''), datatype=XSD.string)))
             if fc.get('url'):
-                self.data_graph.add((evidence_uri, self.cred.evidenceURL, 
-                                    Literal(fc.get('url', ''), datatype=XSD.anyURI)))
+                triples.append((evidence_uri, self.cred.evidenceURL, 
+                               Literal(fc.get('url', ''), datatype=XSD.anyURI)))
                                     
         # [NEW] Link similar claims found by GraphRAG
         similar_uris = report.get('similar_claims_uris', [])
         for sim_uri_str in similar_uris:
             try:
                 sim_uri = URIRef(sim_uri_str)
-                self.data_graph.add((report_uri, RDFS.seeAlso, sim_uri))
+                triples.append((report_uri, RDFS.seeAlso, sim_uri))
             except Exception as e:
                 print(f"[Ontology] Error linking similar URI {sim_uri_str}: {e}")
+        
+        evaluation = EvaluationWrite(
+            report=str(report_uri),
+            content=input_data[:500],
+            url=input_data if input_data.startswith('http') else None,
+            timestamp=str(completion_literal),
+            score=float(score_literal),
+            level=str(level_uri).split('#')[-1],
+            triples=triples
+        )
+        if self.writer is None or not self.writer.submit(evaluation):
+            self._apply_evaluations([evaluation])
                 
         print(f"[OntologyManager] Added evaluation triplets. Report: {report_uri}")
         return str(report_uri)
     
+    def _apply_evaluations(self, evaluations: List[EvaluationWrite]):
+        """
+        Add evaluations to the data graph (one addN), the claim index
+        and, for URLs (the only inputs with an informationURL), the
+        domain history under the write lock; then to the claim
+        embeddings, if an encoder is attached (encoding needs no lock).
+        """
+        with self.graph_lock.write():
+            self.data_graph.addN(
+                (s, p, o, self.data_graph) for evaluation in evaluations for s, p, o in evaluation.triples
+            )
+            for evaluation in evaluations:
+                self.claim_index.add(evaluation.report, evaluation.content)
+                if evaluation.url:
+                    self.domain_history.add(
+                        evaluation.url, evaluation.timestamp, evaluation.score,
+                        evaluation.level, evaluation.report
+                    )
+            self._bump_generation()
+        if self.claim_embeddings is not None:
+            try:
+                self.claim_embeddings.add_many(
+                    [evaluation.report for evaluation in evaluations],
+                    [evaluation.content for evaluation in evaluations]
+                )
+                self._bump_generation()
+            except Exception as e:
+                print(f"[OntologyManager] Claim embedding error: {e}")
+    
+    @_reads_graph
     def query_source_history(self, url: str) -> List[EvaluationRecord]:
         """
         Query all previous evaluations for a URL/domain.
@@ -252,29 +627,10 @@ class OntologyManager:
         """
         results = []
         
-        # SPARQL query to find all evaluations for this URL
-        query = """
-        PREFIX cred: <https://syscred.uqam.ca/ontology#>
-        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-        
-        SELECT ?report ?score ?level ?timestamp ?content
-        WHERE {
-            ?info cred:informationURL ?url .
-            ?request cred:concernsInformation ?info .
-            ?report cred:isReportOf ?request .
-            ?report cred:credibilityScoreValue ?score .
-            ?report cred:assignsCredibilityLevel ?level .
-            ?report cred:completionTimestamp ?timestamp .
-            ?info cred:informationContent ?content .
-            FILTER(CONTAINS(STR(?url), "%s"))
-        }
-        ORDER BY DESC(?timestamp)
-        """ % url
-        
         try:
-            # Query combined graph (base + data)
-            combined = self.base_graph + self.data_graph
-            for row in combined.query(query):
+            # Query the union view (base + data)
+            bindings = {'domain': Literal(url)}
+            for row in self.union_graph.query(SOURCE_HISTORY_QUERY, initBindings=bindings):
                 results.append(EvaluationRecord(
                     evaluation_id=str(row.report),
                     url_or_text=str(row.content) if row.content else url,
@@ -288,6 +644,7 @@ class OntologyManager:
         
         return results
     
+    @_reads_graph
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about the ontology data."""
         stats = {
@@ -297,20 +654,15 @@ class OntologyManager:
         }
         
         # Count evaluations
-        query = """
-        PREFIX cred: <https://syscred.uqam.ca/ontology#>
-        SELECT (COUNT(?report) as ?count) WHERE {
-            ?report a cred:RapportEvaluation .
-        }
-        """
         try:
-            for row in self.data_graph.query(query):
-                stats['total_evaluations'] = int(row.count)
+            for row in self.data_graph.query(EVALUATION_COUNT_QUERY):
+                stats['total_evaluations'] = int(row['count'])  # row.count is tuple.count
         except:
             stats['total_evaluations'] = 0
         
         return stats
     
+    @_reads_graph
     def get_graph_json(self) -> Dict[str, List]:
         """
         Convert ontology data into D3.js JSON format (Nodes & Links).
@@ -320,18 +672,9 @@ class OntologyManager:
         added_nodes = set()
         
         # Get the latest report ID
-        latest_query = """
-        PREFIX cred: <https://syscred.uqam.ca/ontology#>
-        SELECT ?report ?timestamp WHERE {
-            ?report a cred:RapportEvaluation .
-            ?report cred:completionTimestamp ?timestamp .
-        }
-        ORDER BY DESC(?timestamp)
-        LIMIT 1
-        """
         latest_report = None
         try:
-            for row in self.data_graph.query(latest_query):
+            for row in self.data_graph.query(LATEST_REPORT_QUERY):
                 latest_report = row.report
         except:
             pass
@@ -353,20 +696,10 @@ class OntologyManager:
         # Add Central Node (Report)
         add_node(latest_report, "Latest Report", "cred:RapportEvaluation", 1)
         
-        # Query triples related to this report (Level 1)
-        related_query = """
-        PREFIX cred: <https://syscred.uqam.ca/ontology#>
-        SELECT ?p ?o ?oType ?oLabel WHERE {
-            <%s> ?p ?o .
-            OPTIONAL { ?o a ?oType } .
-            OPTIONAL { ?o cred:evidenceSnippet ?oLabel } .
-            OPTIONAL { ?o cred:sourceAnalyzedReputation ?oLabel } .
-        }
-        """ % str(latest_report)
-        
         try:
-            # Level 1: Report -> Components
-            for row in self.data_graph.query(related_query):
+            # Level 1: Report -> Components (triples related to this report)
+            related = self.data_graph.query(REPORT_COMPONENTS_QUERY, initBindings={'report': latest_report})
+            for row in related:
                 p = row.p
                 o = row.o
                 
@@ -401,14 +734,7 @@ class OntologyManager:
                 
                 # Level 2: Component -> Details (Recursive enrich)
                 # Specifically for SourceAnalysis and Evidence
-                l2_query = """
-                SELECT ?p2 ?o2 ?o2Type WHERE {
-                    <%s> ?p2 ?o2 .
-                    OPTIONAL { ?o2 a ?o2Type } .
-                    FILTER(isURI(?o2))
-                }""" % str(o)
-                
-                for row2 in self.data_graph.query(l2_query):
+                for row2 in self.data_graph.query(NODE_DETAILS_QUERY, initBindings={'node': o}):
                      o2 = row2.o2
                      if str(row2.p2) == str(RDF.type): continue
                      
@@ -427,6 +753,7 @@ class OntologyManager:
             
         return {'nodes': nodes, 'links': links}
     
+    @_reads_graph
     def export_to_ttl(self, output_path: str, include_base: bool = False) -> bool:
         """
         Export the ontology to a TTL file.
@@ -440,8 +767,7 @@ class OntologyManager:
         """
         try:
             if include_base:
-                combined = self.base_graph + self.data_graph
-                combined.serialize(destination=output_path, format='turtle')
+                self.union_graph.serialize(destination=output_path, format='turtle')
             else:
                 self.data_graph.serialize(destination=output_path, format='turtle')
             
@@ -452,10 +778,123 @@ class OntologyManager:
             return False
     
     def save_data(self) -> bool:
-        """Save the data graph to its configured path."""
-        if self.data_path:
-            return self.export_to_ttl(self.data_path, include_base=False)
-        return False
+        """
+        Save the data graph: commit the SQLite store, or, saving to
+        data_path, append the new triples to the journal if enabled
+        (compacting it once it is large), else rewrite the TTL file.
+        
+        With background_writes the save is queued (and coalesced with
+        the other saves of a batch); True means queued.
+        """
+        if self.writer is not None and self.writer.request_save():
+            return True
+        return self._save_data()
+    
+    def _save_data(self) -> bool:
+        with self._save_lock:
+            if self.data_store is not None:
+                try:
+                    # Readers share the store's connection
+                    with self.graph_lock.write():
+                        self.data_graph.commit()
+                except Exception as e:
+                    print(f"[OntologyManager] Store commit error: {e}")
+                    return False
+            elif not self.data_path:
+                return False
+            elif self.journal is not None:
+                # The journal only appends: anything else needs a full snapshot
+                covered = self._journal_covers_graph
+                if not self._flush_journal():
+                    return False
+                if not covered or self.journal.size() >= self.journal_compact_bytes:
+                    self.compact_journal(wait=not covered)
+            elif not self.export_to_ttl(self.data_path, include_base=False):
+                return False
+            if self.domain_history_path:
+                with self.graph_lock.read():
+                    self.domain_history.save(self.domain_history_path, self._domain_history_fingerprint())
+            return True
+    
+    def _flush_journal(self) -> bool:
+        """Write the triples added since the last save as one journal batch."""
+        with self.graph_lock.write():  # _record_added appends under it
+            pending, self._journal_pending = self._journal_pending, []
+        try:
+            self.journal.append(pending)
+            self._journal_count += len(pending)
+            return True
+        except OSError as e:
+            print(f"[OntologyManager] Journal write error: {e}")
+            self._journal_pending = pending + self._journal_pending
+            return False
+    
+    def compact_journal(self, wait: bool = False) -> bool:
+        """
+        Fold the journal into a new TTL snapshot of the data graph.
+        
+        The data graph is copied here; the snapshot is written and the
+        journal trimmed in a background thread (joined if `wait`).
+        Returns False without a journal, or if a compaction is running
+        and `wait` is False.
+        """
+        if self.journal is None:
+            return False
+        with self._save_lock:
+            running = self._compaction
+            if running is not None and running.is_alive():
+                if not wait:
+                    return False
+                running.join()
+            if not self._flush_journal():
+                return False
+            offset = self.journal.size()
+            snapshot = Graph()
+            self._bind_prefixes(snapshot)
+            with self.graph_lock.read():
+                snapshot += self.data_graph
+                # Triples added since the flush are in the snapshot and still pending
+                self._journal_count = len(snapshot) - len(self._journal_pending)
+            self._compaction = threading.Thread(
+                target=self._write_snapshot, args=(snapshot, offset),
+                name="ontology-compaction", daemon=True
+            )
+            self._compaction.start()
+            if wait:
+                self._compaction.join()
+            return True
+    
+    def _write_snapshot(self, snapshot: 'Graph', offset: int):
+        """Replace the TTL file atomically, then drop the journal bytes it covers."""
+        try:
+            tmp_path = self.data_path + ".tmp"
+            snapshot.serialize(destination=tmp_path, format='turtle')
+            os.replace(tmp_path, self.data_path)
+            self.journal.discard_prefix(offset)
+            if self.snapshots is not None:
+                self.snapshots.save(snapshot, self.data_path)
+            print(f"[OntologyManager] Journal compacted: {len(snapshot)} triples in {self.data_path}")
+        except Exception as e:
+            print(f"[OntologyManager] Journal compaction error: {e}")
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the queued writes (and saves) are done; False on timeout."""
+        return self.writer.flush(timeout) if self.writer is not None else True
+    
+    def close(self):
+        """
+        Apply and save the queued writes, wait for a running compaction
+        and fsync the journal; commit and close the store.
+        """
+        if self.writer is not None:
+            self.writer.close()
+        if self._compaction is not None:
+            self._compaction.join()
+        if self.journal is not None:
+            self._flush_journal()
+            self.journal.close()
+        if self.data_store is not None:
+            self.data_graph.close(commit_pending_transaction=True)
 
 
 # --- Testing ---
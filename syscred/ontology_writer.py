@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Ontology Writer Module - SysCRED
+=================================
+Single background writer for the ontology graphs.
+
+Under a threaded server, request threads added triples and saved the
+data graph while other requests ran SPARQL on it. Now:
+
+- ReadWriteLock: readers (SPARQL, index lookups) share the graphs; a
+  write (applying a batch of evaluations) is exclusive and preferred
+- OntologyWriter: request threads queue their writes and return; one
+  thread applies them in batches and runs the persistence (journal
+  append, TTL snapshot, SQLite commit) without holding the write lock,
+  being the only thread that mutates the graphs
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+WRITE, SAVE, FLUSH, STOP = range(4)
+
+
+class ReadWriteLock:
+    """
+    Many readers or one writer. Waiting writers block new readers, but
+    a thread that already reads (or writes) may read again.
+
+    Usage:
+        lock = ReadWriteLock()
+        with lock.read(): ...
+        with lock.write(): ...
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None  # ident of the writing thread
+        self._writer_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self):
+        depth = getattr(self._local, "depth", 0)
+        nested = depth > 0 or self._writer == threading.get_ident()
+        if not nested:
+            with self._cond:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if not nested:
+                with self._cond:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        ident = threading.get_ident()
+        with self._cond:
+            if self._writer != ident:
+                if getattr(self._local, "depth", 0):
+                    raise RuntimeError("cannot write while holding the read lock")
+                self._writers_waiting += 1
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+                self._writers_waiting -= 1
+                self._writer = ident
+            self._writer_depth += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._cond.notify_all()
+
+
+class OntologyWriter:
+    """
+    Background thread applying queued writes in batches.
+
+    `apply(items)` receives the items queued since the last batch (in
+    order, at most max_batch); `save()` runs once after a batch when a
+    save was requested. Errors are printed and counted, never raised in
+    request threads.
+
+    Usage:
+        writer = OntologyWriter(om._apply_evaluations, om._save_data)
+        writer.submit(evaluation)
+        writer.request_save()
+        writer.flush()  # wait until everything queued is applied
+        writer.close()
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[List[Any]], Any],
+        save: Callable[[], Any],
+        max_batch: int = 256,
+        name: str = "ontology-writer"
+    ):
+        self.apply = apply
+        self.save = save
+        self.max_batch = max(1, int(max_batch))
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self.stats: Dict[str, int] = {"batches": 0, "writes": 0, "saves": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Queued operations not picked up yet."""
+        return self._queue.qsize()
+
+    def submit(self, item: Any) -> bool:
+        """Queue a write; False once the writer is closed."""
+        if self._closed:
+            return False
+        self._queue.put((WRITE, item))
+        return True
+
+    def request_save(self) -> bool:
+        """Queue a save (coalesced with the other saves of the batch)."""
+        if self._closed:
+            return False
+        self._queue.put((SAVE, None))
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until the operations queued so far are done."""
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put((FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self):
+        """Apply and save what is queued, then stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((STOP, None))
+        self._thread.join()
+        if not self._queue.empty():
+            # Queued while stopping: apply them in the closing thread
+            self._queue.put((STOP, None))
+            self._run()
+
+    def _run(self):
+        while True:
+            operations = [self._queue.get()]
+            while len(operations) < self.max_batch:
+                try:
+                    operations.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            kinds = {kind for kind, _ in operations}
+            writes = [item for kind, item in operations if kind == WRITE]
+            if writes:
+                self._call(self.apply, writes)
+                self.stats["batches"] += 1
+                self.stats["writes"] += len(writes)
+            if SAVE in kinds:
+                self._call(self.save)
+                self.stats["saves"] += 1
+            for kind, item in operations:
+                if kind == FLUSH:
+                    item.set()
+            if STOP in kinds:
+                return
+
+    def _call(self, func: Callable, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[OntologyWriter] {getattr(func, '__name__', 'write')} failed: {e}")
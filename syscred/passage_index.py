@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Passage Index Module - SysCRED
+===============================
+Passage-level indexing of long evidence documents.
+
+AP articles run to hundreds of words while a claim is usually supported
+by a few sentences. Documents are split into overlapping word windows,
+indexed as their own units (own postings and length normalization) and
+mapped back to their document:
+
+- A document is scored by its best passage (MaxP)
+- Passage ids are "<doc_id>#<n>"; the character span of every passage
+  is stored at index time, so the best passage gives a query-biased
+  snippet without re-analyzing the document
+- best_passage() picks the snippet of a document retrieved by another
+  route (dense, hybrid, Pyserini) from the stored passage term vectors
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from syscred.inverted_index import SegmentedIndex, IndexSnapshot
+
+# (start, end) character offsets of a passage in its document
+Span = Tuple[int, int]
+
+
+class PassageIndex:
+    """
+    Overlapping passages of size `size` words, one every `stride` words.
+
+    Usage:
+        passages = PassageIndex(analyzer.analyze, size=100, stride=50)
+        passages.bulk_load(corpus_texts.items())
+        for doc_id, score, n in passages.search({"oil": 1, "price": 1}, k=10):
+            print(doc_id, passages.snippet(doc_id, n, corpus_texts[doc_id]))
+    """
+
+    SEPARATOR = '#'
+    DEFAULT_SIZE = 100
+    DEFAULT_STRIDE = 50
+    WORD_PATTERN = re.compile(r'\S+')
+
+    def __init__(
+        self,
+        analyze: Callable[[str], List[str]],
+        size: int = DEFAULT_SIZE,
+        stride: int = DEFAULT_STRIDE,
+        k1: float = 0.9,
+        b: float = 0.4,
+        max_buffer_docs: int = SegmentedIndex.DEFAULT_BUFFER_DOCS,
+        merge_factor: int = SegmentedIndex.DEFAULT_MERGE_FACTOR
+    ):
+        """
+        Args:
+            analyze: Text -> index terms (same analyzer as the document index)
+            size: Passage length in words
+            stride: Words between passage starts (< size: passages overlap)
+            k1, b: BM25 parameters of the passage index
+            max_buffer_docs: Live passages buffered before a segment flush
+            merge_factor: Number of segments that triggers a merge
+        """
+        if size <= 0 or not 0 < stride <= size:
+            raise ValueError("PassageIndex needs size > 0 and 0 < stride <= size")
+        self.analyze = analyze
+        self.size = size
+        self.stride = stride
+        self.index = SegmentedIndex(k1=k1, b=b, max_buffer_docs=max_buffer_docs, merge_factor=merge_factor)
+        self.spans: Dict[str, List[Span]] = {}
+
+    # --- Passage ids ---
+
+    @classmethod
+    def passage_id(cls, doc_id: str, n: int) -> str:
+        return f"{doc_id}{cls.SEPARATOR}{n}"
+
+    @classmethod
+    def parse_passage_id(cls, passage_id: str) -> Tuple[str, int]:
+        """Split "<doc_id>#<n>" (doc ids may contain '#', e.g. URLs)."""
+        doc_id, _, n = passage_id.rpartition(cls.SEPARATOR)
+        return doc_id, int(n)
+
+    # --- Splitting ---
+
+    def split(self, text: str) -> List[Span]:
+        """Character spans of the passages of a text (word boundaries)."""
+        if not isinstance(text, str):
+            return []
+        words = [m.span() for m in self.WORD_PATTERN.finditer(text)]
+        spans = []
+        for start in range(0, len(words), self.stride):
+            end = min(start + self.size, len(words))
+            spans.append((words[start][0], words[end - 1][1]))
+            if end == len(words):
+                break
+        return spans
+
+    def _passages(self, doc_id: str, text: str) -> List[Tuple[str, List[str]]]:
+        """Split a document, record its spans, return (passage_id, tokens)."""
+        spans = self.split(text)
+        self.spans[doc_id] = spans
+        analyze = self.analyze
+        return [
+            (self.passage_id(doc_id, n), analyze(text[start:end]))
+            for n, (start, end) in enumerate(spans)
+        ]
+
+    # --- Writes ---
+
+    def bulk_load(self, documents: Iterable[Tuple[str, str]]):
+        """Replace the index with the passages of (doc_id, text) pairs."""
+        self.spans = {}
+        self.index.bulk_load(
+            passage
+            for doc_id, text in documents
+            for passage in self._passages(doc_id, text)
+        )
+
+    def add_document(self, doc_id: str, text: str):
+        """Add (or replace) the passages of a live document."""
+        self.delete_document(doc_id)
+        for passage_id, tokens in self._passages(doc_id, text):
+            self.index.add_document(passage_id, tokens)
+
+    def delete_document(self, doc_id: str) -> bool:
+        """Delete every passage of a document. Returns False if unknown."""
+        spans = self.spans.pop(doc_id, None)
+        if spans is None:
+            return False
+        for n in range(len(spans)):
+            self.index.delete_document(self.passage_id(doc_id, n))
+        return True
+
+    # --- Reads ---
+
+    def snapshot(self) -> IndexSnapshot:
+        return self.index.snapshot()
+
+    def search(
+        self,
+        query_weights: Dict[str, float],
+        k: int = 10,
+        snapshot: Optional[IndexSnapshot] = None,
+        date_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+    ) -> List[Tuple[str, float, int]]:
+        """
+        MaxP document ranking over the passage postings.
+
+        Passages are fetched deep enough to cover k distinct documents
+        (the depth doubles while one document fills the list). Passage
+        ids keep the document id prefix, so date_range works as in
+        IndexSnapshot.search_bm25.
+
+        Returns:
+            List of (doc_id, best passage score, passage number), best first
+        """
+        snapshot = snapshot or self.index.snapshot()
+        depth = k * 4
+        while True:
+            hits = snapshot.search_bm25(query_weights, depth, self.index.k1, self.index.b, date_range=date_range)
+            best: Dict[str, Tuple[float, int]] = {}
+            for passage_id, score in hits:
+                doc_id, n = self.parse_passage_id(passage_id)
+                if doc_id not in best:
+                    best[doc_id] = (score, n)
+            if len(best) >= k or len(hits) < depth:
+                break
+            depth *= 2
+        return [(doc_id, score, n) for doc_id, (score, n) in list(best.items())[:k]]
+
+    def best_passage(
+        self,
+        doc_id: str,
+        query_weights: Dict[str, float],
+        snapshot: Optional[IndexSnapshot] = None
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Query-biased passage of one document, scored with BM25 on the
+        stored passage term vectors.
+
+        Returns:
+            (passage number, score), passage 0 if nothing matches, or None
+            if the document has no passages
+        """
+        spans = self.spans.get(doc_id)
+        if not spans:
+            return None
+        snapshot = snapshot or self.index.snapshot()
+        k1, b = self.index.k1, self.index.b
+        avgdl = snapshot.avg_doc_length
+        weights = {term: snapshot.idf(term) * weight for term, weight in query_weights.items()}
+        best_n, best_score = 0, 0.0
+        for n in range(len(spans)):
+            term_vector = snapshot.term_vector(self.passage_id(doc_id, n))
+            if not term_vector:
+                continue
+            norm = k1 * (1 - b + b * sum(term_vector.values()) / avgdl)
+            score = 0.0
+            for term, w in weights.items():
+                tf = term_vector.get(term)
+                if tf:
+                    score += w * (tf * (k1 + 1)) / (tf + norm)
+            if score > best_score:
+                best_n, best_score = n, score
+        return best_n, best_score
+
+    def span(self, doc_id: str, n: int) -> Optional[Span]:
+        spans = self.spans.get(doc_id)
+        if not spans or not 0 <= n < len(spans):
+            return None
+        return spans[n]
+
+    def snippet(self, doc_id: str, n: int, text: str) -> str:
+        """Text of passage n of a document (the whole text if unknown)."""
+        span = self.span(doc_id, n)
+        if span is None:
+            return text
+        return text[span[0]:span[1]]
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.spans
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        num_passages = sum(len(spans) for spans in self.spans.values())
+        return {
+            "documents": len(self.spans),
+            "passages": num_passages,
+            "avg_passages_per_doc": round(num_passages / len(self.spans), 2) if self.spans else 0.0,
+            "size": self.size,
+            "stride": self.stride,
+            "index": self.index.get_statistics()
+        }
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Query Performance Prediction Module - SysCRED
+==============================================
+Cheap predictors of retrieval quality, used to decide whether a
+pseudo-relevance feedback pass is worth running.
+
+Predictors:
+- Pre-retrieval: max / avg IDF of the query terms (index statistics only)
+- Post-retrieval: clarity of the feedback relevance model against the
+  collection, dispersion of the first-pass scores
+
+PRF helps when the first pass is focused enough for its top documents
+to be relevant but the query also carries weak terms. It is wasted when
+every query term is already selective, and causes topic drift when the
+query is made of common words or the feedback documents do not agree.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Any
+
+from syscred.inverted_index import IndexSnapshot
+
+
+@dataclass
+class QueryPrediction:
+    """Predictor values for one query."""
+    max_idf: float = 0.0
+    avg_idf: float = 0.0
+    clarity: Optional[float] = None
+    score_dispersion: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_idf": round(self.max_idf, 4),
+            "avg_idf": round(self.avg_idf, 4),
+            "clarity": round(self.clarity, 4) if self.clarity is not None else None,
+            "score_dispersion": round(self.score_dispersion, 4) if self.score_dispersion is not None else None
+        }
+
+
+class QueryPerformancePredictor:
+    """
+    Computes QPP predictors from an index snapshot and a first pass,
+    and decides whether PRF should run.
+
+    Usage:
+        predictor = QueryPerformancePredictor()
+        prediction = predictor.predict(query_terms, snapshot, scores, relevance_model)
+        if predictor.should_expand(prediction): ...
+    """
+
+    # Terms of the relevance model used for clarity
+    CLARITY_TERMS = 50
+
+    def __init__(
+        self,
+        min_max_idf: float = 1.5,
+        max_idf_ratio: float = 0.9,
+        min_clarity: float = 2.0,
+        max_dispersion: float = 0.25
+    ):
+        """
+        Args:
+            min_max_idf: Skip PRF when no query term is more selective than this
+            max_idf_ratio: Skip PRF when avg IDF >= this fraction of max IDF:
+                every term is selective, the first pass is already focused
+            min_clarity: Skip PRF when the feedback model is closer to the
+                collection than this (bits): feedback docs disagree, drift risk
+            max_dispersion: Skip PRF when the first-pass scores are more
+                dispersed than this: a few documents clearly dominate and
+                the first pass is already confident
+        """
+        self.min_max_idf = min_max_idf
+        self.max_idf_ratio = max_idf_ratio
+        self.min_clarity = min_clarity
+        self.max_dispersion = max_dispersion
+
+    # --- Pre-retrieval ---
+
+    @staticmethod
+    def idf_statistics(query_terms: List[str], snapshot: IndexSnapshot) -> Tuple[float, float]:
+        """(max IDF, avg IDF) of the distinct query terms, from body df like BM25."""
+        terms = set(query_terms)
+        if not terms or not snapshot.num_docs:
+            return 0.0, 0.0
+        idfs = [
+            snapshot.idf(term, body_only=True) if snapshot.doc_freq(term, body_only=True) else 0.0
+            for term in terms
+        ]
+        return max(idfs), sum(idfs) / len(idfs)
+
+    # --- Post-retrieval ---
+
+    def clarity(self, relevance_model: Dict[str, float], snapshot: IndexSnapshot) -> float:
+        """
+        Simplified clarity score: KL(P(w|R) || P(w|C)) in bits over the top
+        relevance model terms.
+
+        The collection model uses body document frequency as a proxy for
+        collection frequency, P(w|C) ≈ df / |C| (|C| counts body tokens),
+        so no extra statistics have to be stored in the segments.
+        """
+        if not relevance_model or not snapshot.total_length:
+            return 0.0
+        top_terms = sorted(relevance_model.items(), key=lambda x: x[1], reverse=True)[:self.CLARITY_TERMS]
+        norm = sum(weight for _, weight in top_terms)
+        total_length = snapshot.total_length
+        clarity = 0.0
+        for term, weight in top_terms:
+            p_r = weight / norm
+            p_c = (snapshot.doc_freq(term, body_only=True) + 0.5) / total_length
+            clarity += p_r * math.log2(p_r / p_c)
+        return clarity
+
+    @staticmethod
+    def score_dispersion(scores: List[float]) -> float:
+        """Coefficient of variation (std / mean) of the first-pass scores."""
+        if len(scores) < 2:
+            return 0.0
+        mean = sum(scores) / len(scores)
+        if mean <= 0:
+            return 0.0
+        variance = sum((s - mean) ** 2 for s in scores) / len(scores)
+        return math.sqrt(variance) / mean
+
+    def predict(
+        self,
+        query_terms: List[str],
+        snapshot: Optional[IndexSnapshot] = None,
+        scores: Optional[List[float]] = None,
+        relevance_model: Optional[Dict[str, float]] = None
+    ) -> QueryPrediction:
+        """
+        Compute all available predictors.
+
+        Args:
+            query_terms: Analyzed query terms
+            snapshot: Index snapshot (IDF and clarity need it)
+            scores: First-pass scores, best first
+            relevance_model: RM1 model of the feedback documents
+        """
+        prediction = QueryPrediction()
+        if snapshot is not None:
+            prediction.max_idf, prediction.avg_idf = self.idf_statistics(query_terms, snapshot)
+            if relevance_model is not None:
+                prediction.clarity = self.clarity(relevance_model, snapshot)
+        if scores is not None:
+            prediction.score_dispersion = self.score_dispersion(scores)
+        return prediction
+
+    def should_expand(self, prediction: QueryPrediction) -> bool:
+        """PRF policy: expand only when every available predictor allows it."""
+        if prediction.max_idf:
+            if prediction.max_idf < self.min_max_idf:
+                return False
+            if prediction.avg_idf >= self.max_idf_ratio * prediction.max_idf:
+                return False
+        if prediction.clarity is not None and prediction.clarity < self.min_clarity:
+            return False
+        if prediction.score_dispersion is not None and prediction.score_dispersion > self.max_dispersion:
+            return False
+        return True
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Query Cache Module - SysCRED
+=============================
+LRU + TTL cache of evidence retrieval results.
+
+Evidence queries repeat: the same viral claims, the same TREC topics
+across benchmark configurations, the same demo queries. The retriever
+keys results on the processed query and every setting that changes the
+ranking, including the index generation, so any document added or
+deleted makes older entries unreachable; they are dropped on the next
+lookup.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class QueryCache:
+    """
+    Bounded LRU cache whose entries also expire after ttl_seconds.
+
+    Usage:
+        cache = QueryCache(max_entries=1024, ttl_seconds=300)
+        cache.set_generation(index.generation)
+        result = cache.get(key)
+        if result is None:
+            result = run_query()
+            cache.put(key, result)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Entry lifetime (0 = no expiry)
+            clock: Monotonic time source (seconds)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._generation: Any = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def set_generation(self, generation: Any):
+        """Drop every entry when the index generation has moved on."""
+        with self._lock:
+            if generation != self._generation:
+                if self._entries:
+                    self.stats["invalidations"] += 1
+                self._entries.clear()
+                self._generation = generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            value, stored_at = entry
+            if self.ttl_seconds and self.clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            **self.stats
+        }
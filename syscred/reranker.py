@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Reranker Module - SysCRED
+==========================
+Budgeted cross-encoder reranking of first-stage evidence candidates.
+
+- Top-N candidates scored as (claim, passage) pairs in padded batches,
+  in first-stage rank order so an early stop still covers a prefix;
+  texts are cut to max_chars so batches pad to similar lengths
+- Per-query time budget: the cost per pair is tracked (moving average)
+  and N shrinks so that the expected reranking time fits the budget;
+  scoring also stops early if a batch overruns
+- Candidates beyond the reranked prefix keep their first-stage order
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+try:
+    from sentence_transformers import CrossEncoder
+    HAS_CROSS_ENCODER = True
+except ImportError:
+    HAS_CROSS_ENCODER = False
+
+
+@dataclass
+class RerankOutcome:
+    """Reranked candidate order and cost."""
+    order: List[Tuple[int, Optional[float]]]  # (candidate index, score or None if not reranked)
+    reranked: int
+    time_ms: float
+
+
+class CrossEncoderReranker:
+    """
+    Second-stage reranker under a per-query time budget.
+
+    Usage:
+        reranker = CrossEncoderReranker(top_n=50, budget_ms=200)
+        outcome = reranker.rerank(claim, passages)
+    """
+
+    DEFAULT_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        top_n: int = 50,
+        batch_size: int = 16,
+        budget_ms: float = 200.0,
+        max_chars: int = 1000,
+        model: Optional[Any] = None
+    ):
+        """
+        Args:
+            model_name: Cross-encoder checkpoint (loaded on first use)
+            top_n: Maximum number of candidates reranked per query
+            batch_size: Pairs per forward pass
+            budget_ms: Per-query reranking time budget (0 = no budget)
+            max_chars: Candidate text is cut to this length before tokenization
+            model: Preloaded model exposing predict(pairs, batch_size=...)
+        """
+        self.model_name = model_name
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.budget_ms = budget_ms
+        self.max_chars = max_chars
+        self._model = model
+        self._ms_per_pair: Optional[float] = None
+        self.stats = {"queries": 0, "pairs": 0, "budget_cuts": 0, "total_time_ms": 0.0}
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            if not HAS_CROSS_ENCODER:
+                raise ImportError("sentence-transformers is required for cross-encoder reranking")
+            self._model = CrossEncoder(self.model_name)
+        return self._model
+
+    @property
+    def available(self) -> bool:
+        return self._model is not None or HAS_CROSS_ENCODER
+
+    def candidate_budget(self) -> int:
+        """Number of candidates expected to fit the time budget."""
+        if not self.budget_ms or self._ms_per_pair is None:
+            return self.top_n
+        affordable = int(self.budget_ms / self._ms_per_pair)
+        # Whole batches only, at least one
+        affordable = max(self.batch_size, affordable - affordable % self.batch_size)
+        return min(self.top_n, affordable)
+
+    def rerank(
+        self,
+        query: str,
+        texts: List[str],
+        clock: Callable[[], float] = time.perf_counter
+    ) -> RerankOutcome:
+        """
+        Rerank candidate texts (first-stage order) for a query.
+
+        Returns:
+            RerankOutcome whose order lists every candidate index once
+        """
+        start = clock()
+        n = min(len(texts), self.candidate_budget())
+        scores = {}
+        for b in range(0, n, self.batch_size):
+            batch = range(b, min(b + self.batch_size, n))
+            pairs = [(query, texts[i][:self.max_chars]) for i in batch]
+            batch_scores = self.model.predict(pairs, batch_size=self.batch_size)
+            scores.update(zip(batch, (float(s) for s in batch_scores)))
+            elapsed = (clock() - start) * 1000
+            if self.budget_ms and elapsed >= self.budget_ms and b + self.batch_size < n:
+                self.stats["budget_cuts"] += 1
+                break
+        elapsed = (clock() - start) * 1000
+
+        if scores:
+            ms_per_pair = elapsed / len(scores)
+            self._ms_per_pair = ms_per_pair if self._ms_per_pair is None else 0.8 * self._ms_per_pair + 0.2 * ms_per_pair
+        self.stats["queries"] += 1
+        self.stats["pairs"] += len(scores)
+        self.stats["total_time_ms"] += elapsed
+
+        reranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        rest = [(i, None) for i in range(len(texts)) if i not in scores]
+        return RerankOutcome(order=reranked + rest, reranked=len(scores), time_ms=elapsed)
+
+    def get_statistics(self) -> dict:
+        return {
+            "model": self.model_name,
+            "top_n": self.top_n,
+            "budget_ms": self.budget_ms,
+            "current_candidates": self.candidate_budget(),
+            "ms_per_pair": round(self._ms_per_pair, 3) if self._ms_per_pair is not None else None,
+            **self.stats
+        }
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Searcher Pool Module - SysCRED
+===============================
+Bounded pools of Pyserini searchers, preconfigured per similarity model.
+
+A LuceneSearcher carries its similarity as mutable state: calling
+set_bm25()/set_qld() on one shared searcher before every query races
+under the threaded Flask server and funnels all traffic through a
+single object. The pool hands out searchers configured once when they
+are created, at most max_searchers per model; a request checks one out
+and returns it, so the threads the server spawns per request reuse the
+same few searchers instead of each opening its own.
+
+Batch evaluation goes through Pyserini's native batch_search, which
+runs the queries on a Java thread pool.
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    from pyserini.search.lucene import LuceneSearcher
+    HAS_PYSERINI = True
+except ImportError:
+    HAS_PYSERINI = False
+
+
+DEFAULT_MAX_SEARCHERS = 8
+
+
+class SearcherPool:
+    """
+    Checkout/return pool of LuceneSearcher instances per model.
+
+    Usage:
+        pool = SearcherPool("/path/to/lucene/index", k1=0.9, b=0.4)
+        with pool.checkout('bm25') as searcher:
+            hits = searcher.search("oil prices", k=10)
+        batch = pool.batch_search(['oil prices', 'airbus'], ['51', '52'], k=100, model='bm25', threads=8)
+    """
+
+    def __init__(
+        self,
+        index_path: str,
+        k1: float = 0.9,
+        b: float = 0.4,
+        factory: Optional[Callable[[str], Any]] = None,
+        max_searchers: int = DEFAULT_MAX_SEARCHERS
+    ):
+        """
+        Args:
+            index_path: Lucene index directory
+            k1, b: BM25 parameters of the 'bm25' searchers
+            factory: index_path -> searcher (default: LuceneSearcher)
+            max_searchers: Searchers per model; further checkouts wait
+                for one to be returned
+        """
+        if factory is None and not HAS_PYSERINI:
+            raise ImportError("pyserini is required for the Lucene searcher pool")
+        self.index_path = index_path
+        self.k1 = k1
+        self.b = b
+        self.factory = factory or LuceneSearcher
+        self.max_searchers = max(1, max_searchers)
+        self._idle: Dict[str, queue.Queue] = {}
+        self._created: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"searchers_created": 0, "batches": 0, "batch_queries": 0}
+
+    def _configure(self, searcher: Any, model: str):
+        """Set the similarity once, at creation time."""
+        if model == 'bm25':
+            searcher.set_bm25(k1=self.k1, b=self.b)
+        elif model == 'qld':
+            searcher.set_qld()
+        else:
+            searcher.set_bm25()
+
+    def _acquire(self, model: str) -> Any:
+        with self._lock:
+            idle = self._idle.setdefault(model, queue.Queue())
+            try:
+                return idle.get_nowait()
+            except queue.Empty:
+                pass
+            create = self._created.get(model, 0) < self.max_searchers
+            if create:
+                self._created[model] = self._created.get(model, 0) + 1
+                self.stats["searchers_created"] += 1
+        if not create:
+            return idle.get()
+        try:
+            searcher = self.factory(self.index_path)
+            self._configure(searcher, model)
+        except Exception:
+            with self._lock:
+                self._created[model] -= 1
+                self.stats["searchers_created"] -= 1
+            raise
+        return searcher
+
+    @contextmanager
+    def checkout(self, model: str = 'bm25') -> Iterator[Any]:
+        """Borrow a searcher configured for a similarity model."""
+        searcher = self._acquire(model)
+        try:
+            yield searcher
+        finally:
+            self._idle[model].put(searcher)
+
+    def close(self):
+        """Close the idle searchers."""
+        with self._lock:
+            for model, idle in self._idle.items():
+                while True:
+                    try:
+                        searcher = idle.get_nowait()
+                    except queue.Empty:
+                        break
+                    self._created[model] -= 1
+                    if hasattr(searcher, 'close'):
+                        searcher.close()
+
+    def batch_search(
+        self,
+        queries: List[str],
+        qids: List[str],
+        k: int = 100,
+        model: str = 'bm25',
+        threads: int = 4
+    ) -> Dict[str, List[Any]]:
+        """
+        Native multi-threaded batch search.
+
+        Returns:
+            {qid: hits}
+        """
+        if not queries:
+            return {}
+        with self.checkout(model) as searcher:
+            results = searcher.batch_search(queries, qids, k=k, threads=threads)
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["batch_queries"] += len(queries)
+        return results
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            idle = sum(q.qsize() for q in self._idle.values())
+        return {"index_path": self.index_path, "k1": self.k1, "b": self.b,
+                "max_searchers": self.max_searchers, "idle_searchers": idle, **self.stats}
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite Triple Store Module - SysCRED
+=====================================
+Disk-backed rdflib Store for the data graph (bounded memory).
+
+rdflib's default Memory store keeps every triple, in three nested-dict
+indexes, in the RAM of every worker. This store keeps them in an
+SQLite file instead:
+
+- terms(id, kind, value, datatype, lang): each RDF term stored once
+- triples(s, p, o) of term ids, clustered on SPO with POS and OSP
+  indexes: every triple pattern is an index range scan
+- Memory use is the SQLite page cache plus a bounded term cache,
+  whatever the number of triples
+
+rdflib's Graph API, SPARQL engine and ReadOnlyGraphAggregate run on top
+of it unchanged. Writes are grouped in one transaction until commit();
+one writing process per file (WAL mode: readers do not block it).
+
+(c) Dominique S. Loyer - PhD Thesis Prototype
+"""
+
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from syscred.graph_snapshot import KIND_URI, KIND_LITERAL, KIND_BNODE
+
+try:
+    from rdflib import Literal, URIRef, BNode
+    from rdflib.store import Store, VALID_STORE, NO_STORE
+    HAS_RDFLIB = True
+except ImportError:
+    HAS_RDFLIB = False
+    Store = object
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    kind INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    datatype TEXT NOT NULL DEFAULT '',
+    lang TEXT NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS terms_key ON terms(value, kind, datatype, lang);
+
+CREATE TABLE IF NOT EXISTS triples (
+    s INTEGER NOT NULL,
+    p INTEGER NOT NULL,
+    o INTEGER NOT NULL,
+    PRIMARY KEY (s, p, o)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS triples_pos ON triples(p, o, s);
+CREATE INDEX IF NOT EXISTS triples_osp ON triples(o, s, p);
+
+CREATE TABLE IF NOT EXISTS namespaces (
+    prefix TEXT PRIMARY KEY,
+    uri TEXT NOT NULL
+);
+"""
+
+INSERT_BATCH = 10000
+
+
+class SQLiteTripleStore(Store):
+    """
+    rdflib Store on an SQLite file (one graph, not context-aware).
+
+    Usage:
+        graph = Graph(store=SQLiteTripleStore("ontology/sysCRED_data.ttl.sqlite3"))
+        graph.add((s, p, o))
+        graph.commit()
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = True
+    graph_aware = False
+
+    def __init__(
+        self,
+        configuration: Optional[str] = None,
+        identifier: Optional[Any] = None,
+        cache_mb: int = 64,
+        term_cache_size: int = 100_000
+    ):
+        """
+        Args:
+            configuration: Path of the SQLite file (opened if given)
+            identifier: Store identifier (unused)
+            cache_mb: SQLite page cache size
+            term_cache_size: Decoded terms kept in memory (cleared when full)
+        """
+        if not HAS_RDFLIB:
+            raise ImportError("SQLiteTripleStore requires rdflib")
+        self.identifier = identifier
+        self.path: Optional[str] = None
+        self.cache_mb = cache_mb
+        self.term_cache_size = term_cache_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count = 0
+        self._ids: Dict[Any, int] = {}
+        self._terms: Dict[int, Any] = {}
+        self._namespace: Dict[str, URIRef] = {}
+        self._prefix: Dict[URIRef, str] = {}
+        super().__init__(configuration)
+
+    # --- Lifecycle ---
+
+    def open(self, configuration: str, create: bool = True) -> Optional[int]:
+        if self._conn is not None:
+            return VALID_STORE
+        if configuration != ":memory:":
+            if not create and not os.path.exists(configuration):
+                return NO_STORE
+            os.makedirs(os.path.dirname(os.path.abspath(configuration)), exist_ok=True)
+        self.path = configuration
+        self._conn = sqlite3.connect(configuration, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA cache_size={-int(self.cache_mb * 1024)}")
+        self._conn.executescript(SCHEMA)
+        self._load_state()
+        return VALID_STORE
+
+    def _load_state(self):
+        self._ids.clear()
+        self._terms.clear()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+        self._namespace = {prefix: URIRef(uri) for prefix, uri in self._conn.execute("SELECT prefix, uri FROM namespaces")}
+        self._prefix = {namespace: prefix for prefix, namespace in self._namespace.items()}
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        # Term ids created in the transaction are gone: reload everything
+        self._conn.rollback()
+        self._load_state()
+
+    def close(self, commit_pending_transaction: bool = False):
+        if self._conn is None:
+            return
+        if commit_pending_transaction:
+            self._conn.commit()
+        self._conn.close()
+        self._conn = None
+
+    def destroy(self, configuration: str):
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(configuration + suffix):
+                os.remove(configuration + suffix)
+
+    # --- Terms ---
+
+    @staticmethod
+    def _key(term) -> Tuple[str, int, str, str]:
+        if isinstance(term, Literal):
+            return str(term), KIND_LITERAL, str(term.datatype or ''), term.language or ''
+        if isinstance(term, URIRef):
+            return str(term), KIND_URI, '', ''
+        if isinstance(term, BNode):
+            return str(term), KIND_BNODE, '', ''
+        raise ValueError(f"unsupported term type {type(term).__name__}")
+
+    def _cache(self, term, term_id: int):
+        if len(self._ids) >= self.term_cache_size:
+            self._ids.clear()
+            self._terms.clear()
+        self._ids[term] = term_id
+        self._terms[term_id] = term
+
+    def _term_id(self, term, create: bool = False) -> Optional[int]:
+        """Id of a term; None if unknown (or unsupported) and not `create`."""
+        term_id = self._ids.get(term)
+        if term_id is not None:
+            return term_id
+        try:
+            key = self._key(term)
+        except ValueError:
+            if create:
+                raise
+            return None
+        row = self._conn.execute(
+            "SELECT id FROM terms WHERE value = ? AND kind = ? AND datatype = ? AND lang = ?", key
+        ).fetchone()
+        if row is not None:
+            term_id = row[0]
+        elif create:
+            term_id = self._conn.execute(
+                "INSERT INTO terms (value, kind, datatype, lang) VALUES (?, ?, ?, ?)", key
+            ).lastrowid
+        else:
+            return None
+        self._cache(term, term_id)
+        return term_id
+
+    def _term(self, term_id: int, kind: int, value: str, datatype: str, lang: str):
+        term = self._terms.get(term_id)
+        if term is None:
+            if kind == KIND_URI:
+                term = URIRef(value)
+            elif kind == KIND_LITERAL:
+                term = Literal(value, datatype=URIRef(datatype) if datatype else None, lang=lang or None)
+            else:
+                term = BNode(value)
+            self._cache(term, term_id)
+        return term
+
+    def _conditions(self, triple_pattern) -> Optional[Tuple[List[str], List[int]]]:
+        """SQL conditions of a triple pattern; None if a bound term is unknown."""
+        conditions, params = [], []
+        for column, term in zip("spo", triple_pattern):
+            if term is None:
+                continue
+            term_id = self._term_id(term)
+            if term_id is None:
+                return None
+            conditions.append(f"t.{column} = ?")
+            params.append(term_id)
+        return conditions, params
+
+    # --- Triples ---
+
+    def add(self, triple, context, quoted: bool = False):
+        Store.add(self, triple, context, quoted)  # TripleAddedEvent
+        ids = tuple(self._term_id(term, create=True) for term in triple)
+        self._count += self._conn.execute("INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", ids).rowcount
+
+    def addN(self, quads: Iterable):
+        batch = []
+        for s, p, o, context in quads:
+            Store.add(self, (s, p, o), context, False)
+            batch.append((self._term_id(s, create=True), self._term_id(p, create=True), self._term_id(o, create=True)))
+            if len(batch) >= INSERT_BATCH:
+                self._insert(batch)
+                batch = []
+        self._insert(batch)
+
+    def _insert(self, rows: List[Tuple[int, int, int]]):
+        before = self._conn.total_changes
+        self._conn.executemany("INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", rows)
+        self._count += self._conn.total_changes - before
+
+    def remove(self, triple_pattern, context=None):
+        # Terms are kept: ids stay stable and are reused on re-insertion
+        conditions = self._conditions(triple_pattern)
+        if conditions is None:
+            return
+        where, params = conditions
+        sql = "DELETE FROM triples AS t" + (" WHERE " + " AND ".join(where) if where else "")
+        self._count -= self._conn.execute(sql, params).rowcount
+
+    def triples(self, triple_pattern, context=None) -> Iterator:
+        conditions = self._conditions(triple_pattern)
+        if conditions is None:
+            return
+        where, params = conditions
+        columns, joins, unbound = ["t.s", "t.p", "t.o"], [], []
+        for column, term in zip("spo", triple_pattern):
+            if term is None:
+                columns += [f"{column}t.kind", f"{column}t.value", f"{column}t.datatype", f"{column}t.lang"]
+                joins.append(f"JOIN terms {column}t ON {column}t.id = t.{column}")
+                unbound.append(column)
+        sql = f"SELECT {', '.join(columns)} FROM triples t {' '.join(joins)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        pattern = dict(zip("spo", triple_pattern))
+        for row in self._conn.execute(sql, params):
+            terms = dict(pattern)
+            for i, column in enumerate(unbound):
+                terms[column] = self._term(row["spo".index(column)], *row[3 + 4 * i:7 + 4 * i])
+            yield (terms["s"], terms["p"], terms["o"]), iter(())
+
+    def __len__(self, context=None) -> int:
+        return self._count
+
+    def contexts(self, triple=None) -> Iterator:
+        return iter(())
+
+    # --- Namespaces (same binding rules as rdflib's Memory store) ---
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True):
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if bound_prefix is None and bound_namespace is not None:
+            bound_prefix = self._prefix.get(bound_namespace)
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            self._prefix[bound_namespace if bound_namespace is not None else namespace] = (
+                bound_prefix if bound_prefix is not None else prefix)
+            self._namespace[bound_prefix if bound_prefix is not None else prefix] = (
+                bound_namespace if bound_namespace is not None else namespace)
+        self._conn.execute("DELETE FROM namespaces")
+        self._conn.executemany(
+            "INSERT INTO namespaces (prefix, uri) VALUES (?, ?)",
+            [(p, str(n)) for p, n in self._namespace.items()]
+        )
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        return self._prefix.get(namespace)
+
+    def namespaces(self) -> Iterator[Tuple[str, URIRef]]:
+        yield from list(self._namespace.items())
+
+    # --- Statistics ---
+
+    def get_statistics(self) -> Dict[str, Any]:
+        size = 0
+        if self.path and self.path != ":memory:":
+            size = sum(os.path.getsize(self.path + s) for s in ("", "-wal") if os.path.exists(self.path + s))
+        return {
+            "path": self.path,
+            "triples": self._count,
+            "terms": self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0] if self._conn else 0,
+            "size_bytes": size,
+            "cached_terms": len(self._ids),
+        }
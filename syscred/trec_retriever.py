@@ -11,7 +11,17 @@ Features:
 - BM25, TF-IDF, QLD scoring
 - Pyserini/Lucene integration (optional)
 - Evidence retrieval for fact-checking
-- PRF (Pseudo-Relevance Feedback) query expansion
+- PRF (Pseudo-Relevance Feedback) query expansion, RM3 on stored term vectors
+- Query performance prediction to skip PRF passes unlikely to help
+- Dense (MiniLM) and hybrid BM25 + dense retrieval (reciprocal rank fusion)
+- Budgeted cross-encoder reranking of the top candidates
+- Segmented inverted index with live document ingestion
+- Fielded BM25F over title and body (same postings pass as BM25)
+- Optional positional index: "quoted phrase" queries and proximity boost
+- Publication date filtering (date_from/date_to) inside postings traversal
+- Passage mode: overlapping passages, MaxP ranking, query-biased snippets
+- Block-compressed document store (mmap + hot-document LRU) for large corpora
+- LRU/TTL query result cache, invalidated when the index changes
 
 Based on: TREC_AP88-90_5juin2025.py
 (c) Dominique S. Loyer - PhD Thesis Prototype
@@ -19,13 +29,25 @@ Citation Key: loyerEvaluationModelesRecherche2025
 """
 
 import os
+import re
 import json
 import time
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+import dataclasses
+from typing import Dict, Iterable, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from pathlib import Path
+from collections import Counter, OrderedDict
 
 from syscred.ir_engine import IREngine, SearchResult, SearchResponse
+from syscred.inverted_index import SegmentedIndex, IndexSnapshot, doc_date, parse_date_bound
+from syscred.qpp import QueryPerformancePredictor
+from syscred.dense_index import DenseIndex
+from syscred.embedding_store import EmbeddingStore
+from syscred.reranker import CrossEncoderReranker
+from syscred.passage_index import PassageIndex
+from syscred.doc_store import DocumentStore, iter_jsonl_documents
+from syscred.query_cache import QueryCache
 
 
 @dataclass
@@ -44,7 +66,7 @@ class Evidence:
     metadata: Dict[str, Any] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "doc_id": self.doc_id,
             "text": self.text[:500] + "..." if len(self.text) > 500 else self.text,
             "score": round(self.score, 4),
@@ -52,6 +74,10 @@ class Evidence:
             "source": self.source,
             "model": self.retrieval_model
         }
+        if self.metadata.get("passage_id"):
+            data["passage_id"] = self.metadata["passage_id"]
+            data["offsets"] = self.metadata["offsets"]
+        return data
 
 
 @dataclass
@@ -63,6 +89,10 @@ class RetrievalResult:
     search_time_ms: float
     model_used: str
     expanded_query: Optional[str] = None
+    stage_times_ms: Dict[str, float] = field(default_factory=dict)
+    reranked_count: int = 0
+    rerank_time_ms: float = 0.0
+    cached: bool = False
 
 
 class TRECRetriever:
@@ -82,19 +112,51 @@ class TRECRetriever:
     # Retrieval configuration
     DEFAULT_K = 10
     DEFAULT_MODEL = "bm25"
+    DENSE_MODELS = ("dense", "hybrid")
+    PHRASE_PATTERN = re.compile(r'"([^"]+)"')
     
     # BM25 parameters (optimized on AP88-90)
     BM25_K1 = 0.9
     BM25_B = 0.4
     
+    # Live documents (fetched pages) kept before the oldest is evicted
+    DEFAULT_MAX_LIVE_DOCS = 1000
+    
     def __init__(
         self,
         index_path: Optional[str] = None,
         corpus_path: Optional[str] = None,
+        doc_store_path: Optional[str] = None,
+        doc_cache_size: int = DocumentStore.DEFAULT_CACHE_SIZE,
         use_stemming: bool = True,
+        tokenizer: str = 'nltk',
         enable_prf: bool = True,
         prf_top_docs: int = 3,
-        prf_expansion_terms: int = 10
+        prf_expansion_terms: int = 10,
+        prf_original_weight: float = 0.5,
+        prf_max_df_ratio: float = 0.1,
+        prf_predictor: Optional[QueryPerformancePredictor] = None,
+        dense_index: Optional[DenseIndex] = None,
+        encoder: Optional[Any] = None,
+        embedding_store: Optional[EmbeddingStore] = None,
+        reranker: Optional[CrossEncoderReranker] = None,
+        enable_rerank: bool = True,
+        hybrid_depth: int = 100,
+        rrf_k: int = 60,
+        passage_mode: bool = False,
+        passage_size: int = PassageIndex.DEFAULT_SIZE,
+        passage_stride: int = PassageIndex.DEFAULT_STRIDE,
+        query_cache_size: int = 1024,
+        query_cache_ttl: float = 300.0,
+        search_threads: int = 4,
+        field_weights: Optional[Dict[str, float]] = None,
+        field_b: Optional[Dict[str, float]] = None,
+        positions: bool = False,
+        proximity_weight: float = 0.0,
+        proximity_window: int = 8,
+        segment_buffer_docs: int = SegmentedIndex.DEFAULT_BUFFER_DOCS,
+        merge_factor: int = SegmentedIndex.DEFAULT_MERGE_FACTOR,
+        max_live_docs: int = DEFAULT_MAX_LIVE_DOCS
     ):
         """
         Initialize the TREC retriever.
@@ -102,58 +164,382 @@ class TRECRetriever:
         Args:
             index_path: Path to Lucene/Pyserini index (optional)
             corpus_path: Path to JSONL corpus for in-memory search
+            doc_store_path: Keep corpus documents in a compressed document
+                store at this path (built from corpus_path on first use)
+                instead of an in-memory dict
+            doc_cache_size: Hot documents kept decoded by the store (LRU)
             use_stemming: Whether to apply Porter stemming
+            tokenizer: 'nltk' or 'regex' (faster analyzer, see IREngine)
             enable_prf: Enable Pseudo-Relevance Feedback
             prf_top_docs: Number of top docs for PRF
             prf_expansion_terms: Number of expansion terms from PRF
+            prf_original_weight: RM3 weight of the original query (λ)
+            prf_max_df_ratio: RM3 skips expansion terms found in more than this
+                fraction of the collection (long postings, no discrimination)
+            prf_predictor: QPP policy gating the PRF pass (None: always expand)
+            dense_index: Corpus embeddings for model='dense'/'hybrid'
+            encoder: Query encoder of the dense index (SBERT MiniLM)
+            embedding_store: Doc-id-keyed evidence embeddings (support scoring)
+            reranker: Budgeted cross-encoder second stage (optional)
+            enable_rerank: Rerank by default when a reranker is set
+            hybrid_depth: Results taken from each list before fusion
+            rrf_k: Reciprocal rank fusion constant
+            passage_mode: Also index overlapping passages; documents are ranked
+                by their best plain-BM25 passage and evidence text is that
+                passage (field_weights, phrases and proximity do not apply)
+            passage_size: Passage length in words
+            passage_stride: Words between passage starts
+            query_cache_size: Retrieval results kept in the query cache (0 = off)
+            query_cache_ttl: Seconds a cached result stays valid (0 = until
+                the index changes)
+            search_threads: Lucene threads of batch_retrieve's batch_search
+            field_weights: BM25F field weights of the in-memory index, e.g.
+                {'text': 1.0, 'title': 2.0} (None = plain BM25 over the text)
+            field_b: Per-field BM25F length normalization (default: BM25_B)
+            positions: Store term positions in the in-memory index; "quoted"
+                parts of a claim then become required exact phrases
+            proximity_weight: Weight of the term proximity boost (needs positions)
+            proximity_window: Largest term distance rewarded by the boost
+            segment_buffer_docs: Live documents buffered before a segment flush
+            merge_factor: Number of index segments that triggers a merge
+            max_live_docs: Live documents (add_document) kept in memory; the
+                oldest is evicted from the indexes beyond this (0 = no limit)
         """
         self.index_path = index_path
         self.corpus_path = corpus_path
+        self.doc_store_path = doc_store_path
+        self.doc_cache_size = doc_cache_size
         self.enable_prf = enable_prf
         self.prf_top_docs = prf_top_docs
         self.prf_expansion_terms = prf_expansion_terms
+        self.prf_original_weight = prf_original_weight
+        self.prf_max_df_ratio = prf_max_df_ratio
+        self.prf_predictor = prf_predictor
+        self.dense_index = dense_index
+        self.encoder = encoder
+        self.embedding_store = embedding_store
+        self.reranker = reranker
+        self.enable_rerank = enable_rerank
+        self.hybrid_depth = hybrid_depth
+        self.rrf_k = rrf_k
+        self.search_threads = search_threads
+        self.field_weights = field_weights
+        self.field_b = field_b
+        self.proximity_weight = proximity_weight
+        self.proximity_window = proximity_window
+        self.max_live_docs = max_live_docs
+        
+        # Live documents, oldest first: never written to the corpus or
+        # its document store, so they are not reloaded as corpus
+        self._live: 'OrderedDict[str, Dict[str, str]]' = OrderedDict()
+        self._live_vectors: Dict[str, Any] = {}  # served instead of the (persistent) embedding store
+        self._live_lock = threading.Lock()
         
         # Initialize IR engine
         self.ir_engine = IREngine(
             index_path=index_path,
-            use_stemming=use_stemming
+            use_stemming=use_stemming,
+            tokenizer=tokenizer
         )
         
-        # In-memory corpus (for lightweight mode)
-        self.corpus: Dict[str, Dict[str, str]] = {}
-        if corpus_path and os.path.exists(corpus_path):
+        # Inverted index over the in-memory corpus
+        self.index = SegmentedIndex(
+            k1=self.BM25_K1,
+            b=self.BM25_B,
+            max_buffer_docs=segment_buffer_docs,
+            merge_factor=merge_factor,
+            positions=positions
+        )
+        self.passage_index = PassageIndex(
+            self.ir_engine.analyze,
+            size=passage_size,
+            stride=passage_stride,
+            k1=self.BM25_K1,
+            b=self.BM25_B,
+            max_buffer_docs=segment_buffer_docs,
+            merge_factor=merge_factor
+        ) if passage_mode else None
+        if passage_mode:
+            ignored = [
+                name for name, value in (
+                    ('field_weights', field_weights), ('positions', positions),
+                    ('proximity_weight', proximity_weight)
+                ) if value
+            ]
+            if ignored:
+                print(f"[TRECRetriever] Passage mode ranks passages with plain BM25: {', '.join(ignored)} ignored")
+        
+        # Results of repeated queries (keyed on the index generation)
+        self.query_cache = QueryCache(query_cache_size, query_cache_ttl) if query_cache_size > 0 else None
+        
+        # In-memory corpus (for lightweight mode), or a compressed document store
+        self._corpus: Dict[str, Dict[str, str]] = {}
+        if (corpus_path and os.path.exists(corpus_path)) or DocumentStore.exists(doc_store_path):
             self._load_corpus(corpus_path)
         
         # Statistics
         self.stats = {
             "queries_processed": 0,
             "total_search_time_ms": 0,
-            "avg_results_per_query": 0
+            "avg_results_per_query": 0,
+            "prf_passes": 0,
+            "prf_skipped": 0
         }
         
         print(f"[TRECRetriever] Initialized with index={index_path}, stemming={use_stemming}")
     
-    def _load_corpus(self, corpus_path: str):
-        """Load JSONL corpus into memory for lightweight search."""
-        print(f"[TRECRetriever] Loading corpus from {corpus_path}...")
+    @property
+    def corpus(self) -> Dict[str, Dict[str, str]]:
+        """Corpus: doc_id -> {'text': ..., 'title': ...} (dict or DocumentStore)."""
+        return self._corpus
+    
+    @corpus.setter
+    def corpus(self, corpus: Dict[str, Dict[str, str]]):
+        """Replace the corpus and rebuild the index in one segment."""
+        self._corpus = corpus
+        self._live.clear()
+        self._live_vectors.clear()
+        self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """Index every corpus document (bulk load, no live segments)."""
+        analyze = self.ir_engine.analyze
+        self.index.bulk_load(
+            (doc_id, analyze(doc.get('text', '')), analyze(doc.get('title', '')))
+            for doc_id, doc in self._corpus.items()
+        )
+        self._rebuild_passages()
+    
+    def load_prebuilt(
+        self,
+        corpus: Dict[str, Dict[str, str]],
+        term_vectors: Iterable[Tuple]
+    ):
+        """
+        Replace the corpus with documents analyzed elsewhere (parallel
+        converter): the index is built from their (doc_id, {term: tf}
+        [, title {term: tf}]) vectors.
+        
+        The vectors must come from the same analyzer settings as
+        ir_engine (stemming, tokenizer, stopwords).
+        """
+        self._corpus = corpus
+        self._live.clear()
+        self._live_vectors.clear()
+        self.index.bulk_load_vectors(term_vectors)
+        self._rebuild_passages()
+    
+    def _rebuild_passages(self):
+        if self.passage_index is not None:
+            self.passage_index.bulk_load(
+                (doc_id, doc.get('text', '')) for doc_id, doc in self._corpus.items()
+            )
+    
+    def _load_corpus(self, corpus_path: Optional[str]):
+        """Load JSONL corpus into memory, or into / from the document store."""
         try:
-            with open(corpus_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    doc = json.loads(line.strip())
-                    self.corpus[doc['id']] = {
-                        'text': doc.get('contents', doc.get('text', '')),
-                        'title': doc.get('title', '')
-                    }
+            if self.doc_store_path:
+                if corpus_path and os.path.exists(corpus_path):
+                    # Rebuilt when corpus_path is not the corpus the store was built from
+                    print(f"[TRECRetriever] Opening document store {self.doc_store_path} for {corpus_path}...")
+                    corpus = DocumentStore.open_or_build(
+                        self.doc_store_path, corpus_path, cache_size=self.doc_cache_size
+                    )
+                else:
+                    print(f"[TRECRetriever] Opening document store {self.doc_store_path}...")
+                    corpus = DocumentStore.open(self.doc_store_path, cache_size=self.doc_cache_size)
+            else:
+                print(f"[TRECRetriever] Loading corpus from {corpus_path}...")
+                corpus = dict(iter_jsonl_documents(corpus_path))
+            self.corpus = corpus
             print(f"[TRECRetriever] Loaded {len(self.corpus)} documents")
         except Exception as e:
             print(f"[TRECRetriever] Failed to load corpus: {e}")
     
+    @property
+    def has_dense_index(self) -> bool:
+        return self.dense_index is not None and self.encoder is not None
+    
+    def attach_dense_index(self, dense_index: DenseIndex, encoder: Any):
+        """Enable model='dense'/'hybrid' with a prebuilt index and its encoder."""
+        self.dense_index = dense_index
+        self.encoder = encoder
+        if self.query_cache is not None:
+            self.query_cache.clear()
+    
+    def build_dense_index(
+        self,
+        encoder: Any,
+        path: Optional[str] = None,
+        dtype: str = 'float16',
+        nlist: int = 0,
+        embedding_store: Optional[EmbeddingStore] = None
+    ) -> DenseIndex:
+        """
+        Embed the corpus (title + text) and attach the resulting dense index.
+        
+        Args:
+            encoder: SentenceTransformer-style encoder (coherence_model)
+            path: Directory to save the index to (optional)
+            dtype: 'float16' or 'int8' storage
+            nlist: IVF lists (0 = exact search)
+            embedding_store: Also fill this store with the same vectors
+        """
+        doc_ids = list(self._corpus)
+        texts = self.document_texts(doc_ids)
+        vectors = DenseIndex.encode_texts(encoder, [texts[d] for d in doc_ids])
+        dense_index = DenseIndex.from_vectors(doc_ids, vectors, dtype=dtype, nlist=nlist)
+        if path:
+            dense_index.save(path)
+        self.attach_dense_index(dense_index, encoder)
+        if embedding_store is not None:
+            embedding_store.put(doc_ids, vectors)
+            self.attach_embedding_store(embedding_store, encoder)
+        return dense_index
+    
+    def build_embedding_store(self, encoder: Any, embedding_store: EmbeddingStore) -> EmbeddingStore:
+        """Fill a store with the embeddings of corpus documents it lacks."""
+        missing = [doc_id for doc_id in self._corpus if doc_id not in embedding_store]
+        if missing:
+            texts = self.document_texts(missing)
+            embedding_store.put(missing, DenseIndex.encode_texts(encoder, [texts[d] for d in missing]))
+        self.attach_embedding_store(embedding_store, encoder)
+        return embedding_store
+    
+    def attach_embedding_store(self, embedding_store: EmbeddingStore, encoder: Any):
+        """Use a doc-id-keyed embedding store (encoder: lazy fills, live documents)."""
+        self.embedding_store = embedding_store
+        self.encoder = encoder
+    
+    def document_texts(self, doc_ids: List[str]) -> Dict[str, str]:
+        """Text embedded for each document: 'title. text' (passage ids: the passage)."""
+        texts = {}
+        for doc_id in doc_ids:
+            doc = self.get_document(doc_id)
+            if doc is None:
+                if self.passage_index is not None and PassageIndex.SEPARATOR in doc_id:
+                    passage = self._get_passage_text(doc_id)
+                    if passage is not None:
+                        texts[doc_id] = passage
+                continue
+            texts[doc_id] = f"{doc.get('title', '')}. {doc.get('text', '')}".strip('. ')
+        return texts
+    
+    def evidence_embeddings(self, doc_ids: List[str]) -> Tuple[List[str], Any]:
+        """
+        Stored embeddings of retrieved documents (see EmbeddingStore.gather).
+        
+        In lazy mode, missing vectors are encoded and written back. Live
+        documents are served from memory and never written to the store.
+        
+        Returns:
+            (doc ids that have a vector, float32 matrix), or ([], None)
+            without an embedding store
+        """
+        if self.embedding_store is None:
+            return [], None
+        live = {doc_id: self._live_vectors[doc_id] for doc_id in doc_ids if doc_id in self._live_vectors}
+        texts = None
+        if self.embedding_store.lazy:
+            texts = self.document_texts([doc_id for doc_id in doc_ids if doc_id not in live])
+        return self.embedding_store.gather(doc_ids, texts, self.encoder, overrides=live)
+    
+    def add_document(
+        self,
+        doc_id: str,
+        text: str,
+        title: str = "",
+        source: str = ""
+    ):
+        """
+        Add a live document (fetched page, wire article, ...).
+        
+        The document goes to the index write buffer and is searchable
+        immediately; re-adding an existing doc_id replaces it. Live
+        documents stay out of the corpus (and its document store): beyond
+        max_live_docs the oldest is removed from the indexes, a corpus
+        document of the same id being indexed again.
+        """
+        entry = {'text': text, 'title': title}
+        if source:
+            entry['source'] = source
+        vector = None
+        if self.encoder is not None and (self.dense_index is not None or self.embedding_store is not None):
+            vector = self.encoder.encode(f"{title}. {text}".strip('. '))
+        analyze = self.ir_engine.analyze
+        with self._live_lock:
+            self._live[doc_id] = entry
+            self._live.move_to_end(doc_id)
+            self.index.add_document(doc_id, analyze(text), analyze(title))
+            if self.passage_index is not None:
+                self.passage_index.add_document(doc_id, text)
+            if vector is not None:
+                if self.dense_index is not None:
+                    self.dense_index.add(doc_id, vector)
+                if self.embedding_store is not None:
+                    self._live_vectors[doc_id] = vector
+            while self.max_live_docs > 0 and len(self._live) > self.max_live_docs:
+                self._evict_live(self._live.popitem(last=False)[0])
+    
+    def _evict_live(self, doc_id: str):
+        """Remove an evicted live document from the indexes (caller holds _live_lock)."""
+        self._live_vectors.pop(doc_id, None)
+        doc = self._corpus.get(doc_id)
+        if doc is None:
+            self.index.delete_document(doc_id)
+            if self.passage_index is not None:
+                self.passage_index.delete_document(doc_id)
+        else:
+            analyze = self.ir_engine.analyze
+            self.index.add_document(doc_id, analyze(doc.get('text', '')), analyze(doc.get('title', '')))
+            if self.passage_index is not None:
+                self.passage_index.add_document(doc_id, doc.get('text', ''))
+        if self.dense_index is not None:
+            if doc is None or self.encoder is None:
+                self.dense_index.remove(doc_id)
+            else:
+                # The live vector may already be folded over the corpus row
+                text = f"{doc.get('title', '')}. {doc.get('text', '')}".strip('. ')
+                self.dense_index.add(doc_id, self.encoder.encode(text))
+    
+    def get_document(self, doc_id: str) -> Optional[Dict[str, str]]:
+        """Live or corpus document, None if unknown."""
+        doc = self._live.get(doc_id)
+        return doc if doc is not None else self._corpus.get(doc_id)
+    
+    def add_documents(self, documents: List[Dict[str, str]]) -> int:
+        """
+        Add several live documents.
+        
+        Args:
+            documents: Dicts with 'id', 'contents' (or 'text') and optional 'title'/'source'
+            
+        Returns:
+            Number of documents added
+        """
+        count = 0
+        for doc in documents:
+            doc_id = doc.get('id')
+            if not doc_id:
+                continue
+            self.add_document(
+                doc_id,
+                doc.get('contents', doc.get('text', '')),
+                title=doc.get('title', ''),
+                source=doc.get('source', '')
+            )
+            count += 1
+        return count
+    
     def retrieve_evidence(
         self,
         claim: str,
         k: int = None,
         model: str = None,
-        use_prf: bool = None
+        use_prf: bool = None,
+        use_rerank: bool = None,
+        date_from: Any = None,
+        date_to: Any = None
     ) -> RetrievalResult:
         """
         Retrieve evidence documents for a given claim.
@@ -163,51 +549,121 @@ class TRECRetriever:
         Args:
             claim: The claim or statement to verify
             k: Number of evidence documents to retrieve
-            model: Retrieval model ('bm25', 'qld', 'tfidf')
+            model: Retrieval model ('bm25', 'qld', 'tfidf', 'dense', 'hybrid')
             use_prf: Override PRF setting for this query
+            use_rerank: Override the cross-encoder reranking setting
+            date_from, date_to: Publication date window ('YYYY-MM-DD', date or
+                YYYYMMDD int), inclusive. Only dated documents (TREC ids such
+                as AP880101-0001) match. The in-memory index skips to the
+                window inside each postings list; Lucene and dense results
+                are filtered afterwards
             
         Returns:
             RetrievalResult with list of Evidence objects
         """
         start_time = time.time()
+        stage_times: Dict[str, float] = {}
         
         k = k or self.DEFAULT_K
         model = model or self.DEFAULT_MODEL
         use_prf = use_prf if use_prf is not None else self.enable_prf
+        use_rerank = self.reranker is not None and (use_rerank if use_rerank is not None else self.enable_rerank)
+        date_range = self._date_range(date_from, date_to)
+        # Reranking needs a deeper candidate list
+        first_k = max(k, self.reranker.top_n) if use_rerank else k
+        if model in self.DENSE_MODELS and not self.has_dense_index:
+            print(f"[TRECRetriever] No dense index, '{model}' falls back to bm25")
+            model = self.DEFAULT_MODEL
         
-        # Preprocess the claim
-        processed_claim = self.ir_engine.preprocess(claim)
+        # Query cache: same processed query and settings on the same index
+        stage_start = time.perf_counter()
+        query_terms = self.ir_engine.analyze(claim)
+        stage_times['analyze'] = (time.perf_counter() - stage_start) * 1000
+        cache_key = None
+        if self.query_cache is not None:
+            self.query_cache.set_generation(self.index.generation)
+            cache_key = self._cache_key(claim, query_terms, k, model, use_prf, use_rerank, date_range)
+            cached = self.query_cache.get(cache_key)
+            if cached is not None:
+                return self._cached_result(cached, start_time)
         
-        # Try Pyserini first, fall back to in-memory
-        if self.ir_engine.searcher:
-            response = self._search_pyserini(processed_claim, model, k)
+        expanded_query = None
+        if model == 'dense':
+            response = self._search_dense(claim, first_k, stage_times, date_range)
         else:
-            response = self._search_in_memory(processed_claim, k)
+            # Hybrid fuses deeper lexical and dense lists
+            depth = max(first_k, self.hybrid_depth) if model == 'hybrid' else first_k
+            lexical_model = self.DEFAULT_MODEL if model == 'hybrid' else model
+            response, expanded_query = self._search_lexical(
+                claim, depth, lexical_model, use_prf, stage_times, query_terms, date_range
+            )
+            if model == 'hybrid':
+                dense_response = self._search_dense(claim, depth, stage_times, date_range)
+                stage_start = time.perf_counter()
+                response = self._fuse_rrf([response, dense_response], first_k)
+                stage_times['fusion'] = (time.perf_counter() - stage_start) * 1000
         
-        # Apply PRF if enabled
-        expanded_query = None
-        if use_prf and len(response.results) >= self.prf_top_docs:
-            expanded_query = self._apply_prf(claim, response.results[:self.prf_top_docs])
-            if expanded_query != claim:
-                # Re-search with expanded query
-                processed_expanded = self.ir_engine.preprocess(expanded_query)
-                if self.ir_engine.searcher:
-                    response = self._search_pyserini(processed_expanded, model, k)
-                else:
-                    response = self._search_in_memory(processed_expanded, k)
+        return self._finish_retrieval(
+            claim, query_terms, response, k, model, use_rerank,
+            expanded_query, stage_times, start_time, cache_key
+        )
+    
+    def _finish_retrieval(
+        self,
+        claim: str,
+        query_terms: List[str],
+        response: SearchResponse,
+        k: int,
+        model: str,
+        use_rerank: bool,
+        expanded_query: Optional[str],
+        stage_times: Dict[str, float],
+        start_time: float,
+        cache_key: Optional[tuple]
+    ) -> RetrievalResult:
+        """Rerank, fetch evidence texts, record statistics and cache the result."""
+        reranked = 0
+        rerank_time = 0.0
+        if use_rerank and response.results:
+            response, reranked, rerank_time = self._rerank(claim, response)
+            stage_times['rerank'] = rerank_time
+        results = response.results[:k]
         
         # Convert to Evidence objects
+        stage_start = time.perf_counter()
         evidences = []
-        for result in response.results:
+        query_weights = None
+        for result in results:
             doc_text = self._get_document_text(result.doc_id)
+            metadata = {}
+            if self.passage_index is not None and result.doc_id in self.passage_index:
+                passage_id = result.passage_id
+                if passage_id is None:
+                    # Dense / fused / reranked-in result: pick its best passage
+                    if query_weights is None:
+                        query_weights = Counter(query_terms)
+                    n, _ = self.passage_index.best_passage(result.doc_id, query_weights)
+                    passage_id = PassageIndex.passage_id(result.doc_id, n)
+                _, n = PassageIndex.parse_passage_id(passage_id)
+                metadata = {
+                    'passage_id': passage_id,
+                    'offsets': self.passage_index.span(result.doc_id, n),
+                    'doc_length': len(doc_text)
+                }
+                doc_text = self.passage_index.snippet(result.doc_id, n, doc_text)
+            source = (self.get_document(result.doc_id) or {}).get('source')
+            if not source:
+                source = "TREC-AP88-90" if "AP" in result.doc_id else "Unknown"
             evidences.append(Evidence(
                 doc_id=result.doc_id,
                 text=doc_text,
                 score=result.score,
                 rank=result.rank,
-                source="TREC-AP88-90" if "AP" in result.doc_id else "Unknown",
-                retrieval_model=model
+                source=source,
+                retrieval_model=model,
+                metadata=metadata
             ))
+        stage_times['fetch'] = (time.perf_counter() - stage_start) * 1000
         
         search_time = (time.time() - start_time) * 1000
         
@@ -215,13 +671,231 @@ class TRECRetriever:
         self.stats["queries_processed"] += 1
         self.stats["total_search_time_ms"] += search_time
         
-        return RetrievalResult(
+        result = RetrievalResult(
             query=claim,
             evidences=evidences,
             total_retrieved=len(evidences),
             search_time_ms=search_time,
             model_used=model,
-            expanded_query=expanded_query
+            expanded_query=expanded_query,
+            stage_times_ms={name: round(ms, 3) for name, ms in stage_times.items()},
+            reranked_count=reranked,
+            rerank_time_ms=rerank_time
+        )
+        if cache_key is not None:
+            self.query_cache.put(cache_key, dataclasses.replace(result, evidences=self._copy_evidences(result.evidences)))
+        return result
+    
+    def _cache_key(
+        self,
+        claim: str,
+        query_terms: List[str],
+        k: int,
+        model: str,
+        use_prf: bool,
+        use_rerank: bool,
+        date_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+    ) -> tuple:
+        """Everything that changes the ranking (the generation is checked by the cache)."""
+        # The dense encoder sees the raw claim, lexical models the processed one
+        query = ' '.join(claim.split()) if model in self.DENSE_MODELS else ' '.join(query_terms)
+        prf = (
+            self.prf_top_docs, self.prf_expansion_terms, self.prf_original_weight,
+            self.prf_max_df_ratio, self.prf_predictor is not None
+        ) if use_prf else None
+        return (query, model, k, prf, use_rerank, self._phrases(claim), date_range)
+    
+    @staticmethod
+    def _date_range(date_from: Any, date_to: Any) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        """(from, to) as YYYYMMDD ints, or None when unrestricted."""
+        date_range = (parse_date_bound(date_from), parse_date_bound(date_to))
+        return None if date_range == (None, None) else date_range
+    
+    @staticmethod
+    def _filter_dates(
+        response: SearchResponse,
+        date_range: Optional[Tuple[Optional[int], Optional[int]]]
+    ) -> SearchResponse:
+        """Post-filter for the Lucene and dense paths (no date-sorted postings there)."""
+        if date_range is None:
+            return response
+        date_from, date_to = max(date_range[0] or 1, 1), date_range[1]
+        kept = [
+            r for r in response.results
+            if doc_date(r.doc_id) >= date_from and (date_to is None or doc_date(r.doc_id) <= date_to)
+        ]
+        for i, r in enumerate(kept):
+            r.rank = i + 1
+        return dataclasses.replace(response, results=kept, total_hits=len(kept))
+    
+    def _phrases(self, claim: str) -> Tuple[Tuple[str, ...], ...]:
+        """Analyzed "quoted" phrases of a claim (positional index only)."""
+        if not self.index.positions or '"' not in claim:
+            return ()
+        phrases = (tuple(self.ir_engine.analyze(match)) for match in self.PHRASE_PATTERN.findall(claim))
+        return tuple(phrase for phrase in phrases if phrase)
+    
+    @staticmethod
+    def _copy_evidences(evidences: List[Evidence]) -> List[Evidence]:
+        """Evidences a caller may mutate without touching the cached ones."""
+        return [dataclasses.replace(e, metadata=dict(e.metadata)) for e in evidences]
+    
+    def _cached_result(self, cached: RetrievalResult, start_time: float) -> RetrievalResult:
+        """Copy of a cached result with this call's timing."""
+        search_time = (time.time() - start_time) * 1000
+        self.stats["queries_processed"] += 1
+        self.stats["total_search_time_ms"] += search_time
+        return dataclasses.replace(
+            cached,
+            evidences=self._copy_evidences(cached.evidences),
+            search_time_ms=search_time,
+            stage_times_ms={'cache': round(search_time, 3)},
+            cached=True
+        )
+    
+    def _search_lexical(
+        self,
+        claim: str,
+        k: int,
+        model: str,
+        use_prf: bool,
+        stage_times: Dict[str, float],
+        query_terms: Optional[List[str]] = None,
+        date_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+    ) -> Tuple[SearchResponse, Optional[str]]:
+        """First lexical pass plus optional PRF; returns (response, expanded query)."""
+        # Preprocess the claim
+        if query_terms is None:
+            query_terms = self.ir_engine.analyze(claim)
+        processed_claim = ' '.join(query_terms)
+        phrases = self._phrases(claim)
+        
+        # Try Pyserini first, fall back to in-memory
+        stage_start = time.perf_counter()
+        snapshot = None
+        if self.ir_engine.searcher:
+            response = self._filter_dates(self._search_pyserini(processed_claim, model, k), date_range)
+        else:
+            snapshot = self.index.snapshot()
+            response = self._search_in_memory(
+                processed_claim, k, snapshot=snapshot, phrases=phrases, date_range=date_range
+            )
+        stage_times[model] = (time.perf_counter() - stage_start) * 1000
+        
+        # Apply PRF if enabled
+        expanded_query = None
+        stage_start = time.perf_counter()
+        if use_prf and len(response.results) >= self.prf_top_docs:
+            # Query performance prediction: skip passes unlikely to help
+            use_prf = self._prf_predicted_useful(query_terms, response, snapshot)
+            self.stats["prf_passes" if use_prf else "prf_skipped"] += 1
+        else:
+            use_prf = False
+        if use_prf:
+            if snapshot is not None:
+                # RM3 from stored term vectors, weighted second pass on postings
+                weights = self._rm3_weights(query_terms, response.results[:self.prf_top_docs], snapshot)
+                if set(weights) != set(query_terms):
+                    expanded_query = self._format_weighted_query(weights)
+                    response = self._search_in_memory(
+                        processed_claim, k, query_weights=weights, snapshot=snapshot,
+                        phrases=phrases, date_range=date_range
+                    )
+            else:
+                expanded_query = self._apply_prf(claim, response.results[:self.prf_top_docs])
+                if expanded_query != claim:
+                    # Re-search with expanded query
+                    processed_expanded = self.ir_engine.preprocess(expanded_query)
+                    response = self._filter_dates(self._search_pyserini(processed_expanded, model, k), date_range)
+            stage_times['prf'] = (time.perf_counter() - stage_start) * 1000
+        
+        return response, expanded_query
+    
+    def _search_dense(
+        self,
+        claim: str,
+        k: int,
+        stage_times: Dict[str, float],
+        date_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+    ) -> SearchResponse:
+        """Encode the claim and search the dense index."""
+        stage_start = time.perf_counter()
+        query_vector = self.encoder.encode(claim)
+        stage_times['encode'] = (time.perf_counter() - stage_start) * 1000
+        
+        stage_start = time.perf_counter()
+        hits = self.dense_index.search(query_vector, k)
+        elapsed = (time.perf_counter() - stage_start) * 1000
+        stage_times['dense'] = elapsed
+        
+        return self._filter_dates(SearchResponse(
+            query_id="Q1",
+            query_text=claim,
+            results=[
+                SearchResult(doc_id=doc_id, score=score, rank=i+1)
+                for i, (doc_id, score) in enumerate(hits)
+            ],
+            model="dense",
+            total_hits=len(hits),
+            search_time_ms=elapsed
+        ), date_range)
+    
+    def _rerank(self, claim: str, response: SearchResponse) -> Tuple[SearchResponse, int, float]:
+        """Cross-encoder reranking of the first-stage candidates (budgeted)."""
+        candidates = response.results[:self.reranker.candidate_budget()]
+        texts = [
+            (self._get_passage_text(r.passage_id) if r.passage_id else None) or self._get_document_text(r.doc_id)
+            for r in candidates
+        ]
+        try:
+            outcome = self.reranker.rerank(claim, texts)
+        except Exception as e:
+            print(f"[TRECRetriever] Reranking disabled: {e}")
+            self.reranker = None
+            return response, 0, 0.0
+        
+        reordered = [
+            SearchResult(
+                doc_id=candidates[i].doc_id,
+                score=score if score is not None else candidates[i].score,
+                rank=rank + 1,
+                passage_id=candidates[i].passage_id
+            )
+            for rank, (i, score) in enumerate(outcome.order)
+        ]
+        reordered.extend(
+            SearchResult(doc_id=r.doc_id, score=r.score, rank=len(reordered) + j + 1, passage_id=r.passage_id)
+            for j, r in enumerate(response.results[len(candidates):])
+        )
+        return SearchResponse(
+            query_id=response.query_id,
+            query_text=response.query_text,
+            results=reordered,
+            model=f"{response.model}+rerank",
+            total_hits=len(reordered),
+            search_time_ms=response.search_time_ms + outcome.time_ms
+        ), outcome.reranked, outcome.time_ms
+    
+    def _fuse_rrf(self, responses: List[SearchResponse], k: int) -> SearchResponse:
+        """Reciprocal rank fusion: score(d) = Σ 1 / (rrf_k + rank)."""
+        fused: Dict[str, float] = {}
+        passages: Dict[str, str] = {}
+        for response in responses:
+            for result in response.results:
+                fused[result.doc_id] = fused.get(result.doc_id, 0.0) + 1.0 / (self.rrf_k + result.rank)
+                if result.passage_id and result.doc_id not in passages:
+                    passages[result.doc_id] = result.passage_id
+        ranked = sorted(fused.items(), key=lambda x: x[1], reverse=True)[:k]
+        return SearchResponse(
+            query_id="Q1",
+            query_text=responses[0].query_text if responses else "",
+            results=[
+                SearchResult(doc_id=doc_id, score=score, rank=i+1, passage_id=passages.get(doc_id))
+                for i, (doc_id, score) in enumerate(ranked)
+            ],
+            model="hybrid",
+            total_hits=len(ranked),
+            search_time_ms=sum(r.search_time_ms for r in responses)
         )
     
     def _search_pyserini(self, query: str, model: str, k: int) -> SearchResponse:
@@ -232,67 +906,61 @@ class TRECRetriever:
             k=k
         )
     
-    def _search_in_memory(self, query: str, k: int) -> SearchResponse:
+    def _search_in_memory(
+        self,
+        query: str,
+        k: int,
+        query_weights: Optional[Dict[str, float]] = None,
+        snapshot: Optional[IndexSnapshot] = None,
+        phrases: Tuple[Tuple[str, ...], ...] = (),
+        date_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+    ) -> SearchResponse:
         """
-        Lightweight in-memory BM25 search.
+        Lightweight in-memory BM25 search over the segmented index.
+        
+        Used when Pyserini is not available. In passage mode documents
+        are ranked by their best passage (MaxP).
         
-        Used when Pyserini is not available.
+        Args:
+            query: Preprocessed query (space-separated terms)
+            k: Number of results
+            query_weights: {term: weight} overriding the query terms (RM3)
+            snapshot: Document index snapshot (default: current; not used
+                for scoring in passage mode)
+            phrases: Required exact phrases (positional index)
+            date_range: (from, to) YYYYMMDD publication date bounds
         """
         start_time = time.time()
         
-        if not self.corpus:
-            return SearchResponse(
-                query_id="Q1",
-                query_text=query,
-                results=[],
-                model="bm25_memory",
-                total_hits=0,
-                search_time_ms=0
-            )
-        
-        query_terms = query.split()
-        
-        # Calculate document frequencies
-        doc_freq = {}
-        for term in query_terms:
-            doc_freq[term] = sum(
-                1 for doc in self.corpus.values() 
-                if term in self.ir_engine.preprocess(doc['text'])
-            )
-        
-        # Calculate average document length
-        total_length = sum(
-            len(self.ir_engine.preprocess(doc['text']).split())
-            for doc in self.corpus.values()
-        )
-        avg_doc_length = total_length / len(self.corpus) if self.corpus else 1
-        
-        # Score all documents
-        scores = []
-        for doc_id, doc in self.corpus.items():
-            doc_text = self.ir_engine.preprocess(doc['text'])
-            doc_terms = doc_text.split()
-            
-            score = self.ir_engine.calculate_bm25_score(
-                query_terms=query_terms,
-                doc_terms=doc_terms,
-                doc_length=len(doc_terms),
-                avg_doc_length=avg_doc_length,
-                doc_freq=doc_freq,
-                corpus_size=len(self.corpus)
-            )
-            
-            if score > 0:
-                scores.append((doc_id, score))
-        
-        # Sort and take top k
-        scores.sort(key=lambda x: x[1], reverse=True)
-        top_k = scores[:k]
-        
-        results = [
-            SearchResult(doc_id=doc_id, score=score, rank=i+1)
-            for i, (doc_id, score) in enumerate(top_k)
-        ]
+        if query_weights is None:
+            query_weights = Counter(query.split())
+        if self.passage_index is not None:
+            hits = self.passage_index.search(query_weights, k, date_range=date_range)
+            results = [
+                SearchResult(doc_id=doc_id, score=score, rank=i+1, passage_id=PassageIndex.passage_id(doc_id, n))
+                for i, (doc_id, score, n) in enumerate(hits)
+            ]
+        else:
+            snapshot = snapshot or self.index.snapshot()
+            if self.index.positions and (phrases or self.proximity_weight > 0):
+                scores = snapshot.search_positional(
+                    query_weights, k, self.index.k1, self.index.b,
+                    phrases=phrases,
+                    proximity_terms=list(dict.fromkeys(query.split())),
+                    proximity_weight=self.proximity_weight,
+                    proximity_window=self.proximity_window,
+                    field_weights=self.field_weights,
+                    field_b=self.field_b,
+                    date_range=date_range
+                )
+            else:
+                scores = snapshot.search_bm25(
+                    query_weights, k, self.index.k1, self.index.b, self.field_weights, self.field_b, date_range
+                )
+            results = [
+                SearchResult(doc_id=doc_id, score=score, rank=i+1)
+                for i, (doc_id, score) in enumerate(scores)
+            ]
         
         return SearchResponse(
             query_id="Q1",
@@ -303,6 +971,51 @@ class TRECRetriever:
             search_time_ms=(time.time() - start_time) * 1000
         )
     
+    def _prf_predicted_useful(
+        self,
+        query_terms: List[str],
+        response: SearchResponse,
+        snapshot: Optional[IndexSnapshot]
+    ) -> bool:
+        """Ask the QPP policy whether the PRF pass is worth running."""
+        if self.prf_predictor is None:
+            return True
+        scores = [r.score for r in response.results[:self.DEFAULT_K]]
+        relevance_model = None
+        if snapshot is not None:
+            relevance_model = self.ir_engine.relevance_model([
+                (snapshot.term_vector(r.doc_id), r.score)
+                for r in response.results[:self.prf_top_docs]
+            ])
+        prediction = self.prf_predictor.predict(query_terms, snapshot, scores, relevance_model)
+        return self.prf_predictor.should_expand(prediction)
+    
+    def _rm3_weights(
+        self,
+        query_terms: List[str],
+        top_results: List[SearchResult],
+        snapshot: IndexSnapshot
+    ) -> Dict[str, float]:
+        """RM3 query weights from the stored term vectors of the top documents."""
+        feedback_docs = [
+            (snapshot.term_vector(r.doc_id), r.score)
+            for r in top_results
+        ]
+        max_df = self.prf_max_df_ratio * snapshot.num_docs
+        return self.ir_engine.rm3_expansion(
+            query_terms=query_terms,
+            feedback_docs=feedback_docs,
+            num_expansion_terms=self.prf_expansion_terms,
+            original_query_weight=self.prf_original_weight,
+            term_filter=lambda term: snapshot.doc_freq(term) <= max_df
+        )
+    
+    @staticmethod
+    def _format_weighted_query(weights: Dict[str, float]) -> str:
+        """Readable weighted query (Lucene boost syntax)."""
+        ranked = sorted(weights.items(), key=lambda x: x[1], reverse=True)
+        return ' '.join(f"{term}^{weight:.4f}" for term, weight in ranked)
+    
     def _apply_prf(self, original_query: str, top_results: List[SearchResult]) -> str:
         """Apply Pseudo-Relevance Feedback."""
         top_docs_texts = [
@@ -318,8 +1031,9 @@ class TRECRetriever:
     
     def _get_document_text(self, doc_id: str) -> str:
         """Get document text from corpus or index."""
-        if doc_id in self.corpus:
-            return self.corpus[doc_id]['text']
+        doc = self.get_document(doc_id)
+        if doc is not None:
+            return doc['text']
         
         # Try Pyserini doc lookup
         if self.ir_engine.searcher:
@@ -332,23 +1046,115 @@ class TRECRetriever:
         
         return f"[Document {doc_id} text not available]"
     
+    def _get_passage_text(self, passage_id: str) -> Optional[str]:
+        """Text of a passage ("<doc_id>#<n>"), None if unknown."""
+        doc_id, n = PassageIndex.parse_passage_id(passage_id)
+        doc = self.get_document(doc_id)
+        if doc is None or self.passage_index.span(doc_id, n) is None:
+            return None
+        return self.passage_index.snippet(doc_id, n, doc.get('text', ''))
+    
     def batch_retrieve(
         self,
         claims: List[str],
         k: int = None,
-        model: str = None
+        model: str = None,
+        threads: int = None,
+        date_from: Any = None,
+        date_to: Any = None
     ) -> List[RetrievalResult]:
         """
         Retrieve evidence for multiple claims.
         
-        Useful for benchmark evaluation.
+        Useful for benchmark evaluation. With a Lucene index, lexical
+        models use Pyserini's multi-threaded batch_search.
+        
+        Args:
+            threads: Lucene search threads (default: search_threads)
+            date_from, date_to: Publication date window (see retrieve_evidence)
         """
         results = []
+        k = k or self.DEFAULT_K
+        model = model or self.DEFAULT_MODEL
+        dated = self._date_range(date_from, date_to) is not None
+        if (self.ir_engine.searcher_pool is not None and model in ('bm25', 'qld', 'tfidf')
+                and len(claims) > 1 and not dated):
+            return self._batch_retrieve_pyserini(claims, k, model, threads or self.search_threads)
         for claim in claims:
-            result = self.retrieve_evidence(claim, k=k, model=model)
+            result = self.retrieve_evidence(claim, k=k, model=model, date_from=date_from, date_to=date_to)
             results.append(result)
         return results
     
+    def _batch_retrieve_pyserini(
+        self,
+        claims: List[str],
+        k: int,
+        model: str,
+        threads: int
+    ) -> List[RetrievalResult]:
+        """
+        batch_retrieve over a Lucene index: one native multi-threaded
+        batch_search for the first pass, a second one for the claims
+        that get a PRF pass, then per-claim reranking and fetching.
+        """
+        start_time = time.time()
+        use_prf = self.enable_prf
+        use_rerank = self.reranker is not None and self.enable_rerank
+        first_k = max(k, self.reranker.top_n) if use_rerank else k
+        
+        results: List[Optional[RetrievalResult]] = [None] * len(claims)
+        pending: Dict[str, Tuple[str, List[str], Optional[tuple]]] = {}
+        for i, claim in enumerate(claims):
+            query_terms = self.ir_engine.analyze(claim)
+            cache_key = None
+            if self.query_cache is not None:
+                self.query_cache.set_generation(self.index.generation)
+                cache_key = self._cache_key(claim, query_terms, k, model, use_prf, use_rerank)
+                cached = self.query_cache.get(cache_key)
+                if cached is not None:
+                    results[i] = self._cached_result(cached, start_time)
+                    continue
+            pending[str(i)] = (claim, query_terms, cache_key)
+        if not pending:
+            return results
+        
+        stage_start = time.perf_counter()
+        responses = self.ir_engine.batch_search_pyserini(
+            {qid: claim for qid, (claim, _, _) in pending.items()}, model, first_k, threads
+        )
+        first_pass_ms = (time.perf_counter() - stage_start) * 1000 / len(pending)
+        
+        # PRF: expanded queries of the claims the QPP policy lets through
+        expanded: Dict[str, str] = {}
+        prf_ms = 0.0
+        if use_prf:
+            stage_start = time.perf_counter()
+            for qid, (claim, query_terms, _) in pending.items():
+                response = responses[qid]
+                if len(response.results) < self.prf_top_docs:
+                    continue
+                useful = self._prf_predicted_useful(query_terms, response, None)
+                self.stats["prf_passes" if useful else "prf_skipped"] += 1
+                if useful:
+                    expanded_query = self._apply_prf(claim, response.results[:self.prf_top_docs])
+                    if expanded_query != claim:
+                        expanded[qid] = expanded_query
+            if expanded:
+                responses.update(self.ir_engine.batch_search_pyserini(expanded, model, first_k, threads))
+            prf_ms = (time.perf_counter() - stage_start) * 1000 / len(pending)
+        
+        for qid, (claim, query_terms, cache_key) in pending.items():
+            stage_times = {model: first_pass_ms}
+            if prf_ms:
+                stage_times['prf'] = prf_ms
+            # Each claim is charged its share of the batched passes
+            claim_start = time.time() - (first_pass_ms + prf_ms) / 1000
+            results[int(qid)] = self._finish_retrieval(
+                claim, query_terms, responses[qid], k, model, use_rerank,
+                expanded.get(qid), stage_times, claim_start, cache_key
+            )
+        return results
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get retrieval statistics."""
         avg_time = 0
@@ -360,7 +1166,19 @@ class TRECRetriever:
             "total_search_time_ms": round(self.stats["total_search_time_ms"], 2),
             "avg_search_time_ms": round(avg_time, 2),
             "corpus_size": len(self.corpus),
-            "has_pyserini_index": self.ir_engine.searcher is not None
+            "live_docs": len(self._live),
+            "has_pyserini_index": self.ir_engine.searcher is not None,
+            "searcher_pool": self.ir_engine.searcher_pool.get_statistics() if self.ir_engine.searcher_pool is not None else None,
+            "prf_passes": self.stats["prf_passes"],
+            "prf_skipped": self.stats["prf_skipped"],
+            "index": self.index.get_statistics(),
+            "field_weights": self.field_weights,
+            "passage_index": self.passage_index.get_statistics() if self.passage_index is not None else None,
+            "doc_store": self._corpus.get_statistics() if isinstance(self._corpus, DocumentStore) else None,
+            "query_cache": self.query_cache.get_statistics() if self.query_cache is not None else None,
+            "dense_index": self.dense_index.get_statistics() if self.dense_index is not None else None,
+            "embedding_store": self.embedding_store.get_statistics() if self.embedding_store is not None else None,
+            "reranker": self.reranker.get_statistics() if self.reranker is not None else None
         }
 
 
@@ -376,21 +1194,63 @@ def create_retriever_for_syscred(
     """
     index_path = None
     corpus_path = None
+    doc_store_path = None
     
     if config:
         index_path = getattr(config, 'TREC_INDEX_PATH', None)
         corpus_path = getattr(config, 'TREC_CORPUS_PATH', None)
+        doc_store_path = getattr(config, 'TREC_DOC_STORE_PATH', None)
     
     # Try default paths
     default_corpus = Path(__file__).parent.parent / "benchmarks" / "ap_corpus.jsonl"
     if default_corpus.exists():
         corpus_path = str(default_corpus)
     
+    segment_kwargs = {}
+    if config:
+        segment_kwargs = {
+            'tokenizer': getattr(config, 'TREC_TOKENIZER', 'nltk'),
+            'segment_buffer_docs': getattr(config, 'TREC_SEGMENT_BUFFER_DOCS', SegmentedIndex.DEFAULT_BUFFER_DOCS),
+            'merge_factor': getattr(config, 'TREC_MERGE_FACTOR', SegmentedIndex.DEFAULT_MERGE_FACTOR),
+            'prf_original_weight': getattr(config, 'PRF_ORIGINAL_WEIGHT', 0.5),
+            'prf_max_df_ratio': getattr(config, 'PRF_MAX_DF_RATIO', 0.1),
+            'hybrid_depth': getattr(config, 'TREC_HYBRID_DEPTH', 100),
+            'rrf_k': getattr(config, 'TREC_RRF_K', 60),
+            'doc_cache_size': getattr(config, 'TREC_DOC_STORE_CACHE', DocumentStore.DEFAULT_CACHE_SIZE),
+            'query_cache_size': getattr(config, 'TREC_QUERY_CACHE_SIZE', 1024),
+            'query_cache_ttl': getattr(config, 'TREC_QUERY_CACHE_TTL', 300.0),
+            'search_threads': getattr(config, 'TREC_SEARCH_THREADS', 4),
+            'field_weights': getattr(config, 'TREC_FIELD_WEIGHTS', None),
+            'positions': getattr(config, 'TREC_POSITIONS', False),
+            'proximity_weight': getattr(config, 'TREC_PROXIMITY_WEIGHT', 0.0),
+            'proximity_window': getattr(config, 'TREC_PROXIMITY_WINDOW', 8),
+            'passage_mode': getattr(config, 'TREC_PASSAGE_MODE', False),
+            'passage_size': getattr(config, 'TREC_PASSAGE_SIZE', PassageIndex.DEFAULT_SIZE),
+            'passage_stride': getattr(config, 'TREC_PASSAGE_STRIDE', PassageIndex.DEFAULT_STRIDE)
+        }
+        if getattr(config, 'ENABLE_RERANK', False):
+            segment_kwargs['reranker'] = CrossEncoderReranker(
+                model_name=config.RERANK_MODEL,
+                top_n=config.RERANK_TOP_N,
+                batch_size=config.RERANK_BATCH_SIZE,
+                budget_ms=config.RERANK_BUDGET_MS,
+                max_chars=config.RERANK_MAX_CHARS
+            )
+        if getattr(config, 'PRF_QPP_ENABLED', False):
+            segment_kwargs['prf_predictor'] = QueryPerformancePredictor(
+                min_max_idf=config.QPP_MIN_MAX_IDF,
+                max_idf_ratio=config.QPP_MAX_IDF_RATIO,
+                min_clarity=config.QPP_MIN_CLARITY,
+                max_dispersion=config.QPP_MAX_DISPERSION
+            )
+    
     return TRECRetriever(
         index_path=index_path,
         corpus_path=corpus_path,
+        doc_store_path=doc_store_path,
         use_stemming=True,
-        enable_prf=True
+        enable_prf=True,
+        **segment_kwargs
     )
 
 
@@ -40,6 +40,10 @@ try:
     from syscred.seo_analyzer import SEOAnalyzer
     from syscred.graph_rag import GraphRAG
     from syscred.trec_retriever import TRECRetriever, Evidence, RetrievalResult
+    from syscred.qpp import QueryPerformancePredictor
+    from syscred.dense_index import DenseIndex
+    from syscred.embedding_store import EmbeddingStore
+    from syscred.reranker import CrossEncoderReranker
     from syscred import config
 except ImportError:
     from api_clients import ExternalAPIClients, WebContent, ExternalData
@@ -47,6 +51,10 @@ except ImportError:
     from seo_analyzer import SEOAnalyzer
     from graph_rag import GraphRAG
     from trec_retriever import TRECRetriever, Evidence, RetrievalResult
+    from qpp import QueryPerformancePredictor
+    from dense_index import DenseIndex
+    from embedding_store import EmbeddingStore
+    from reranker import CrossEncoderReranker
     import config
 
 # [NER + E-E-A-T] Imports optionnels - n'interferent pas avec les imports principaux
@@ -103,9 +111,20 @@ class CredibilityVerificationSystem:
             try:
                 self.ontology_manager = OntologyManager(
                     base_ontology_path=ontology_base_path,
-                    data_path=ontology_data_path
+                    data_path=ontology_data_path,
+                    history_size=config.Config.ONTOLOGY_HISTORY_SIZE,
+                    journal=config.Config.ONTOLOGY_JOURNAL,
+                    journal_sync_every=config.Config.ONTOLOGY_JOURNAL_SYNC_EVERY,
+                    journal_compact_bytes=config.Config.ONTOLOGY_JOURNAL_COMPACT_BYTES,
+                    snapshot_dir=config.Config.ONTOLOGY_SNAPSHOT_DIR or None,
+                    store=config.Config.ONTOLOGY_STORE,
+                    store_path=config.Config.ONTOLOGY_STORE_PATH or None,
+                    background_writes=config.Config.ONTOLOGY_BACKGROUND_WRITES
                 )
-                self.graph_rag = GraphRAG(self.ontology_manager) # [NEW] Init GraphRAG
+                self.graph_rag = GraphRAG(
+                    self.ontology_manager,
+                    similarity_threshold=config.Config.CLAIM_SIMILARITY_THRESHOLD
+                ) # [NEW] Init GraphRAG
                 print("[SysCRED] Ontology manager & GraphRAG initialized")
             except Exception as e:
                 print(f"[SysCRED] Ontology manager disabled: {e}")
@@ -119,10 +138,43 @@ class CredibilityVerificationSystem:
             self.trec_retriever = TRECRetriever(
                 index_path=config.Config.TREC_INDEX_PATH,
                 corpus_path=config.Config.TREC_CORPUS_PATH,
+                doc_store_path=config.Config.TREC_DOC_STORE_PATH,
+                doc_cache_size=config.Config.TREC_DOC_STORE_CACHE,
+                query_cache_size=config.Config.TREC_QUERY_CACHE_SIZE,
+                query_cache_ttl=config.Config.TREC_QUERY_CACHE_TTL,
+                search_threads=config.Config.TREC_SEARCH_THREADS,
+                field_weights=config.Config.TREC_FIELD_WEIGHTS,
+                positions=config.Config.TREC_POSITIONS,
+                proximity_weight=config.Config.TREC_PROXIMITY_WEIGHT,
+                proximity_window=config.Config.TREC_PROXIMITY_WINDOW,
                 use_stemming=True,
+                tokenizer=config.Config.TREC_TOKENIZER,
                 enable_prf=config.Config.ENABLE_PRF,
                 prf_top_docs=config.Config.PRF_TOP_DOCS,
-                prf_expansion_terms=config.Config.PRF_EXPANSION_TERMS
+                prf_expansion_terms=config.Config.PRF_EXPANSION_TERMS,
+                prf_original_weight=config.Config.PRF_ORIGINAL_WEIGHT,
+                prf_max_df_ratio=config.Config.PRF_MAX_DF_RATIO,
+                prf_predictor=QueryPerformancePredictor(
+                    min_max_idf=config.Config.QPP_MIN_MAX_IDF,
+                    max_idf_ratio=config.Config.QPP_MAX_IDF_RATIO,
+                    min_clarity=config.Config.QPP_MIN_CLARITY,
+                    max_dispersion=config.Config.QPP_MAX_DISPERSION
+                ) if config.Config.PRF_QPP_ENABLED else None,
+                reranker=CrossEncoderReranker(
+                    model_name=config.Config.RERANK_MODEL,
+                    top_n=config.Config.RERANK_TOP_N,
+                    batch_size=config.Config.RERANK_BATCH_SIZE,
+                    budget_ms=config.Config.RERANK_BUDGET_MS,
+                    max_chars=config.Config.RERANK_MAX_CHARS
+                ) if config.Config.ENABLE_RERANK else None,
+                hybrid_depth=config.Config.TREC_HYBRID_DEPTH,
+                rrf_k=config.Config.TREC_RRF_K,
+                passage_mode=config.Config.TREC_PASSAGE_MODE,
+                passage_size=config.Config.TREC_PASSAGE_SIZE,
+                passage_stride=config.Config.TREC_PASSAGE_STRIDE,
+                segment_buffer_docs=config.Config.TREC_SEGMENT_BUFFER_DOCS,
+                merge_factor=config.Config.TREC_MERGE_FACTOR,
+                max_live_docs=config.Config.TREC_LIVE_MAX_DOCS
             )
             print("[SysCRED] TREC Retriever initialized for evidence gathering")
         except Exception as e:
@@ -138,6 +190,13 @@ class CredibilityVerificationSystem:
         
         if load_ml_models and HAS_ML:
             self._load_ml_models()
+            self._attach_dense_index()
+            if self.ontology_manager and self.coherence_model:
+                # Semantic similar-claim search for GraphRAG
+                self.ontology_manager.attach_claim_encoder(
+                    self.coherence_model,
+                    first_pass=config.Config.CLAIM_EMBEDDINGS_FIRST_PASS
+                )
         
         # Weights for score calculation (configurable)
         # Weights for score calculation (Loaded from Config)
@@ -211,6 +270,51 @@ class CredibilityVerificationSystem:
         except Exception as e:
             print(f"[SysCRED] ✗ LIME explainer failed: {e}")
     
+    def _attach_dense_index(self):
+        """
+        Load (or build once) the dense evidence index and the evidence
+        embedding store, both encoded with the MiniLM coherence model.
+        """
+        if not self.trec_retriever or not self.coherence_model:
+            return
+        store = None
+        store_path = config.Config.EMBEDDING_STORE_PATH
+        if store_path:
+            try:
+                store = EmbeddingStore.open(store_path, lazy=config.Config.EMBEDDING_STORE_LAZY)
+                self.trec_retriever.attach_embedding_store(store, self.coherence_model)
+            except Exception as e:
+                print(f"[SysCRED] ✗ Evidence embedding store failed: {e}")
+        
+        path = config.Config.TREC_DENSE_INDEX_PATH
+        try:
+            if path and DenseIndex.exists(path):
+                dense_index = DenseIndex.load(path, nprobe=config.Config.TREC_DENSE_NPROBE)
+                self.trec_retriever.attach_dense_index(dense_index, self.coherence_model)
+            elif path and self.trec_retriever.corpus:
+                # One encoding pass fills the dense index and the store
+                dense_index = self.trec_retriever.build_dense_index(
+                    self.coherence_model,
+                    path=path,
+                    dtype=config.Config.TREC_DENSE_DTYPE,
+                    nlist=config.Config.TREC_DENSE_NLIST,
+                    embedding_store=store if store is not None and not len(store) else None
+                )
+            else:
+                dense_index = None
+            if dense_index is not None:
+                print(f"[SysCRED] ✓ Dense evidence index ready ({len(dense_index.doc_ids)} docs)")
+        except Exception as e:
+            print(f"[SysCRED] ✗ Dense evidence index failed: {e}")
+        
+        try:
+            if store is not None and not store.lazy and self.trec_retriever.corpus:
+                self.trec_retriever.build_embedding_store(self.coherence_model, store)
+            if store is not None:
+                print(f"[SysCRED] ✓ Evidence embedding store ready ({len(store)} docs)")
+        except Exception as e:
+            print(f"[SysCRED] ✗ Evidence embedding store failed: {e}")
+    
     def is_url(self, text: str) -> bool:
         """Check if a string is a valid URL."""
         try:
@@ -562,7 +666,9 @@ class CredibilityVerificationSystem:
         self,
         claim: str,
         k: int = 10,
-        model: str = "bm25"
+        model: str = "bm25",
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve evidence documents for a given claim using TREC methodology.
@@ -573,7 +679,8 @@ class CredibilityVerificationSystem:
         Args:
             claim: The claim or statement to verify
             k: Number of evidence documents to retrieve
-            model: Retrieval model ('bm25', 'qld', 'tfidf')
+            model: Retrieval model ('bm25', 'qld', 'tfidf', 'dense', 'hybrid')
+            date_from, date_to: Publication date window ('YYYY-MM-DD', inclusive)
             
         Returns:
             List of evidence dictionaries with doc_id, text, score, rank
@@ -585,7 +692,9 @@ class CredibilityVerificationSystem:
             result = self.trec_retriever.retrieve_evidence(
                 claim=claim,
                 k=k,
-                model=model
+                model=model,
+                date_from=date_from,
+                date_to=date_to
             )
             
             # Convert Evidence objects to dictionaries
@@ -610,7 +719,9 @@ class CredibilityVerificationSystem:
     def verify_with_evidence(
         self,
         claim: str,
-        k: int = 5
+        k: int = 5,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Complete fact-checking pipeline with evidence retrieval.
@@ -624,6 +735,7 @@ class CredibilityVerificationSystem:
         Args:
             claim: The claim to verify
             k: Number of evidence documents
+            date_from, date_to: Restrict evidence to a publication window
             
         Returns:
             Verification result with evidence, analysis, and score
@@ -638,7 +750,7 @@ class CredibilityVerificationSystem:
         }
         
         # 1. Retrieve evidence
-        evidences = self.retrieve_evidence(claim, k=k)
+        evidences = self.retrieve_evidence(claim, k=k, date_from=date_from, date_to=date_to)
         result['evidences'] = evidences
         
         # 2. NLP analysis of claim
@@ -651,8 +763,16 @@ class CredibilityVerificationSystem:
             if self.coherence_model:
                 try:
                     claim_embedding = self.coherence_model.encode(claim)
-                    evidence_texts = [e.get('text', '') for e in evidences]
-                    evidence_embeddings = self.coherence_model.encode(evidence_texts)
+                    # Stored document (or passage) vectors; only the claim is encoded
+                    doc_ids = [e.get('passage_id') or e.get('doc_id') for e in evidences]
+                    stored_ids, stored = self.trec_retriever.evidence_embeddings(doc_ids)
+                    vectors = dict(zip(stored_ids, stored)) if stored_ids else {}
+                    missing = [(d, e) for d, e in zip(doc_ids, evidences) if d not in vectors]
+                    if missing:
+                        # No store, or not lazy: encode the (truncated) evidence text
+                        encoded = self.coherence_model.encode([e.get('text', '') for _, e in missing])
+                        vectors.update(zip([d for d, _ in missing], encoded))
+                    evidence_embeddings = np.vstack([vectors[d] for d in doc_ids])
                     
                     from sentence_transformers import util
                     similarities = util.pytorch_cos_sim(claim_embedding, evidence_embeddings)[0]
@@ -687,6 +807,22 @@ class CredibilityVerificationSystem:
         
         return result
     
+    def _ingest_web_content(self, web_content: WebContent):
+        """Add a fetched page to the evidence index (live segment)."""
+        if not self.trec_retriever or not config.Config.TREC_LIVE_INGEST:
+            return
+        if not web_content.text_content:
+            return
+        try:
+            self.trec_retriever.add_document(
+                doc_id=web_content.url,
+                text=web_content.text_content,
+                title=web_content.title or "",
+                source=urlparse(web_content.url).netloc or "web"
+            )
+        except Exception as e:
+            print(f"[SysCRED] Evidence ingestion error: {e}")
+    
     # --- End TREC Evidence Methods ---
 
     def generate_report(
@@ -899,6 +1035,7 @@ class CredibilityVerificationSystem:
             if web_content.success:
                 text_to_analyze = web_content.text_content
                 print(f"[SysCRED] ✓ Content fetched: {len(text_to_analyze)} chars")
+                self._ingest_web_content(web_content)
             else:
                 print(f"[SysCRED] ⚠ Fetch failed: {web_content.error}")
                 print("[SysCRED] Proceeding with Domain/Metadata analysis only.")
@@ -952,13 +1089,12 @@ class CredibilityVerificationSystem:
                 # Extract meaningful keywords (filter out short words)
                 keywords = [w for w in cleaned_text.split()[:10] if len(w) > 4]
             
-            # Get text context for display
-            context = self.graph_rag.get_context(domain, keywords=keywords)
-            graph_context = context.get('full_text', '')
-            similar_uris = context.get('similar_uris', [])
-            
-            # Get numerical score for integration into scoring
-            graph_context_data = self.graph_rag.compute_context_score(domain, keywords=keywords)
+            # Text context for display and numerical score for scoring,
+            # from one set of graph lookups
+            context = self.graph_rag.analyze(domain, keywords=keywords, claim=cleaned_text)
+            graph_context = context['full_text']
+            similar_uris = list(context['similar_uris'])
+            graph_context_data = dict(context['context_score'])
             
             # Add to rule_results for use in calculate_overall_score
             rule_results['graph_context_data'] = graph_context_data
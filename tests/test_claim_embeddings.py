@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour la recherche sémantique de revendications similaires
+
+Auteur: Dominique S. Loyer
+"""
+
+import numpy as np
+import pytest
+
+from syscred.claim_embeddings import ClaimEmbeddingIndex
+from syscred.graph_rag import GraphRAG
+from syscred.ontology_manager import OntologyManager
+
+
+class ConceptEncoder:
+    """Encodeur déterministe: les mots d'un même concept (FR/EN) partagent une dimension."""
+
+    dim = 64
+    CONCEPTS = {
+        "vaccin": 0, "vaccine": 0, "puce": 1, "microchip": 1, "contient": 2, "contains": 2,
+        "banque": 3, "bank": 3, "taux": 4, "rates": 4, "climat": 5, "climate": 5,
+    }
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        rows = []
+        for text in texts:
+            vector = np.zeros(self.dim, dtype=np.float32)
+            for word in text.lower().split():
+                vector[self.CONCEPTS.get(word, 8 + sum(map(ord, word)) % (self.dim - 8))] += 1.0
+            rows.append(vector)
+        return np.vstack(rows)
+
+
+class VectorEncoder:
+    """Encodeur qui renvoie des vecteurs fixés par texte (tests du premier passage)."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def encode(self, texts):
+        return np.vstack([self.vectors[int(text)] for text in texts])
+
+
+CLAIMS = {
+    "r1": "le vaccin contient une puce",
+    "r2": "la banque relève ses taux",
+    "r3": "le climat change vite",
+}
+
+
+@pytest.fixture
+def index():
+    index = ClaimEmbeddingIndex(ConceptEncoder())
+    index.add_many(list(CLAIMS), list(CLAIMS.values()))
+    return index
+
+
+class TestClaimEmbeddingIndex:
+    """Tests de l'index d'embeddings de revendications"""
+
+    def test_paraphrase_found(self, index):
+        hits = index.search("vaccine contains microchip", k=3)
+        assert hits[0][0] == "r1"
+        assert hits == sorted(hits, key=lambda hit: -hit[1])
+        assert index.search("vaccine contains microchip", k=3, min_score=0.5) == hits[:1]
+
+    def test_duplicates_and_empty_skipped(self, index):
+        assert not index.add("r1", "autre texte")
+        assert not index.add("r4", "")
+        assert index.add_many(["r4", "r4"], ["bank rates", "bank rates"]) == 1
+        assert len(index) == 4
+        assert index.search("bank rates", k=1)[0][0] in {"r2", "r4"}
+
+    def test_persisted_and_appended(self, tmp_path):
+        encoder = ConceptEncoder()
+        path = str(tmp_path / "claims")
+        index = ClaimEmbeddingIndex.open(path, encoder)
+        index.add_many(list(CLAIMS), list(CLAIMS.values()))
+        reopened = ClaimEmbeddingIndex.open(path, encoder)
+        assert reopened.reports == list(CLAIMS)
+        assert reopened.add("r4", "climate vaccine")
+        again = ClaimEmbeddingIndex.open(path, encoder)
+        assert again.reports == list(CLAIMS) + ["r4"]
+        query = "vaccine contains microchip"
+        assert again.search(query, k=2)[0][0] == index.search(query, k=2)[0][0] == "r1"
+
+    @pytest.mark.parametrize("first_pass", ["int8", "binary"])
+    def test_first_pass_keeps_nearest(self, first_pass):
+        rng = np.random.default_rng(5)
+        vectors = rng.standard_normal((3000, 48)).astype(np.float32)
+        exact = ClaimEmbeddingIndex(VectorEncoder(vectors), first_pass='none', block_rows=512)
+        quantized = ClaimEmbeddingIndex(
+            VectorEncoder(vectors), first_pass=first_pass,
+            first_pass_min_rows=0, first_pass_depth=100, block_rows=512
+        )
+        reports = [f"r{i}" for i in range(len(vectors))]
+        for index in (exact, quantized):
+            index.add_many(reports, [str(i) for i in range(len(vectors))], batch_size=700)
+        for i in (0, 1234, 2999):
+            query = vectors[i] + 0.1 * rng.standard_normal(48).astype(np.float32)
+            assert quantized.search(query, k=1)[0][0] == exact.search(query, k=1)[0][0] == f"r{i}"
+        assert quantized.get_statistics()["bytes"] > exact.get_statistics()["bytes"]
+
+
+class TestGraphRAGSemantic:
+    """Tests de GraphRAG avec les embeddings de revendications"""
+
+    def test_backfill_and_semantic_match(self):
+        om = OntologyManager()
+        om.add_evaluation_triplets({'scoreCredibilite': 0.1, 'informationEntree': CLAIMS["r1"]})
+        om.add_evaluation_triplets({'scoreCredibilite': 0.9, 'informationEntree': CLAIMS["r2"]})
+        rag = GraphRAG(om, similarity_threshold=0.5)
+        # No shared keyword: only the embeddings can find it
+        assert rag.compute_context_score("", ["vaccine", "microchip"])['similar_count'] == 0
+
+        assert om.attach_claim_encoder(ConceptEncoder())
+        assert len(om.claim_embeddings) == 2
+        result = rag.compute_context_score("", ["vaccine", "microchip"], claim="vaccine contains microchip")
+        assert result['similar_count'] == 1
+        assert result['pattern_score'] == pytest.approx(0.1)
+
+        om.add_evaluation_triplets({'scoreCredibilite': 0.3, 'informationEntree': "le climat change"})
+        context = rag.get_context("", [], claim="climate change")
+        assert len(context['similar_uris']) == 1
+        assert len(om.claim_embeddings) == 3
+
+    def test_persisted_next_to_data_graph(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path)
+        om.add_evaluation_triplets({'scoreCredibilite': 0.1, 'informationEntree': CLAIMS["r1"]})
+        om.save_data()
+        encoder = ConceptEncoder()
+        OntologyManager(data_path=data_path).attach_claim_encoder(encoder)
+        calls = encoder.calls
+        reloaded = OntologyManager(data_path=data_path)
+        reloaded.attach_claim_encoder(encoder)
+        assert encoder.calls == calls  # nothing re-encoded
+        assert len(reloaded.claim_embeddings) == 1
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'index de revendications (inverse + MinHash-LSH)
+
+Auteur: Dominique S. Loyer
+"""
+
+import pytest
+
+from syscred import claim_index
+from syscred.claim_index import ClaimIndex, claim_terms
+
+
+CLAIMS = {
+    "r1": "Le vaccin contient une puce électronique selon une rumeur virale",
+    "r2": "Climate change is caused by human greenhouse gas emissions",
+    "r3": "La banque centrale relève ses taux directeurs face à l'inflation",
+    "r4": "Le vaccin contient une puce électronique 5G selon une rumeur",
+}
+
+
+@pytest.fixture
+def index():
+    index = ClaimIndex()
+    for report, text in CLAIMS.items():
+        index.add(report, text)
+    return index
+
+
+class TestClaimIndex:
+    """Tests de la recherche de revendications similaires"""
+
+    def test_claim_terms(self):
+        assert claim_terms("Le VACCIN, la puce (5G) et l'électricité") == {"vaccin", "puce", "électricité"}
+        assert claim_terms(None) == set()
+
+    def test_ranked_by_jaccard(self, index):
+        hits = index.search("Climate change caused by human emissions", k=3)
+        assert hits[0][0] == "r2"
+        assert all(report != "r3" for report, _ in hits)
+        assert hits == sorted(hits, key=lambda hit: -hit[1])
+
+    def test_near_duplicate_first(self, index):
+        hits = index.search(CLAIMS["r1"], k=2)
+        assert hits[0] == ("r1", 1.0)
+        assert hits[1][0] == "r4"
+
+    def test_keywords_and_recency(self, index):
+        # Same terms in r1 and r4 for this query: the most recent claim wins ties
+        hits = index.search(["vaccin", "puce"], k=2)
+        assert {report for report, _ in hits} == {"r1", "r4"}
+        assert index.search(["inexistant"]) == []
+
+    def test_duplicate_report_ignored(self, index):
+        assert not index.add("r1", "autre texte complet")
+        assert not index.add("r5", "le la de")  # no terms
+        assert len(index) == 4
+
+    def test_candidates_bounded(self):
+        index = ClaimIndex(max_candidates=10)
+        for i in range(100):
+            index.add(f"r{i}", f"frequent term claim number{chr(97 + i % 26)}")
+        hits = index.search(["frequent"], k=100)
+        assert len(hits) <= 10 + index.bands  # bounded postings + LSH buckets
+        assert "r99" in {report for report, _ in hits}
+
+    def test_band_merge(self, monkeypatch):
+        monkeypatch.setattr(claim_index._BandTable, "MIN_MERGE", 4)
+        index = ClaimIndex()
+        for i in range(50):
+            index.add(f"r{i}", f"rumeur {i} alpha{chr(97 + i % 26)} beta{chr(97 + i % 7)}")
+        assert all(len(table.keys) > 0 for table in index._tables)
+        for i in (0, 17, 49):
+            text = f"rumeur {i} alpha{chr(97 + i % 26)} beta{chr(97 + i % 7)}"
+            assert index.search(text, k=1)[0][0] == f"r{i}"
+
+    def test_pure_python_matches_numpy(self, index, monkeypatch):
+        if not claim_index.HAS_NUMPY:
+            pytest.skip("numpy not installed")
+        terms = claim_terms(CLAIMS["r3"])
+        signature = index.signature(terms)
+        hits = index.search(CLAIMS["r3"], k=4)
+        monkeypatch.setattr(claim_index, "HAS_NUMPY", False)
+        assert index.signature(terms) == signature
+        assert index.search(CLAIMS["r3"], k=4) == hits
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le convertisseur TREC parallèle
+
+Auteur: Dominique S. Loyer
+"""
+
+import gzip
+import json
+
+from syscred.convert_trec import convert_trec_parallel, convert_trec_to_jsonl, extract_ap_documents
+from syscred.doc_store import iter_jsonl_documents
+from syscred.trec_retriever import TRECRetriever
+
+TEXTS = [
+    "Oil prices rose sharply in Europe",
+    "The election campaign ended today",
+    "Opec ministers discussed oil exports",
+    "Airbus delivered new aircraft",
+]
+
+
+def write_ap_files(directory, files=2, docs_per_file=2):
+    """Fichiers gz au format AP (<DOC>, <DOCNO>, <TEXT>)."""
+    directory.mkdir()
+    n = 0
+    for f in range(files):
+        parts = []
+        for _ in range(docs_per_file):
+            text = TEXTS[n % len(TEXTS)]
+            parts.append(f"<DOC>\n<DOCNO> AP88{n:04d} </DOCNO>\n<TEXT>\n{text}\nsecond line\n</TEXT>\n</DOC>\n")
+            n += 1
+        with gzip.open(directory / f"ap88{f:02d}.gz", 'wt', encoding='latin-1') as out:
+            out.write(''.join(parts))
+    return directory
+
+
+def read_ids(path):
+    return [doc_id for doc_id, _ in iter_jsonl_documents(str(path))]
+
+
+class TestConvertTrec:
+    """Tests de la conversion en pool de processus"""
+
+    def test_parallel_matches_serial(self, tmp_path):
+        trec_dir = write_ap_files(tmp_path / "trec", files=3)
+        serial = tmp_path / "serial.jsonl"
+        parallel = tmp_path / "parallel.jsonl"
+        convert_trec_to_jsonl(str(trec_dir), str(serial))
+        stats = convert_trec_parallel(str(trec_dir), str(parallel), workers=2)
+
+        assert stats["documents"] == 6
+        assert stats["files"] == 3
+        assert stats["docs_per_sec"] > 0
+        serial_docs = [json.loads(line) for line in serial.read_text(encoding='utf-8').splitlines()]
+        parallel_docs = [json.loads(line) for line in parallel.read_text(encoding='utf-8').splitlines()]
+        assert parallel_docs == serial_docs
+        assert serial_docs[0]['contents'] == "Oil prices rose sharply in Europe second line"
+
+    def test_shards_one_per_file(self, tmp_path):
+        trec_dir = write_ap_files(tmp_path / "trec", files=2)
+        shard_dir = tmp_path / "shards"
+        convert_trec_parallel(str(trec_dir), str(shard_dir), workers=2, shards=True)
+
+        assert sorted(p.name for p in shard_dir.iterdir()) == ["ap8800.jsonl", "ap8801.jsonl"]
+        # The shard directory reads as one corpus, in file order
+        assert read_ids(shard_dir) == ["AP880000", "AP880001", "AP880002", "AP880003"]
+        assert len(list(iter_jsonl_documents(str(shard_dir), limit=3))) == 3
+
+    def test_direct_index_build(self, tmp_path):
+        trec_dir = write_ap_files(tmp_path / "trec", files=2)
+        retriever = TRECRetriever(tokenizer='regex', enable_prf=False)
+        stats = convert_trec_parallel(str(trec_dir), str(tmp_path / "out.jsonl"), workers=2, retriever=retriever)
+
+        assert "index_seconds" in stats
+        assert len(retriever.corpus) == 4
+        assert retriever.index.get_statistics()["documents"] == 4
+
+        # Same index as analyzing the corpus in the parent process
+        reference = TRECRetriever(tokenizer='regex', enable_prf=False)
+        reference.corpus = dict(retriever.corpus)
+        query = {term: 1.0 for term in reference.ir_engine.analyze("oil exports")}
+        assert retriever.index.snapshot().search_bm25(query, 4) == reference.index.snapshot().search_bm25(query, 4)
+        assert retriever.retrieve_evidence("oil exports", k=1).evidences[0].doc_id == "AP880002"
+
+    def test_extract_still_returns_list(self, tmp_path):
+        trec_dir = write_ap_files(tmp_path / "trec", files=1)
+        docs = extract_ap_documents(str(trec_dir / "ap8800.gz"))
+        assert [d['id'] for d in docs] == ["AP880000", "AP880001"]
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'index dense, la recherche hybride et le magasin d'embeddings
+
+Auteur: Dominique S. Loyer
+"""
+
+import numpy as np
+import pytest
+
+from syscred.dense_index import DenseIndex
+from syscred.embedding_store import EmbeddingStore
+from syscred.trec_retriever import TRECRetriever
+
+
+class HashingEncoder:
+    """Encodeur déterministe (sac de mots haché) à la place de MiniLM."""
+
+    dim = 64
+
+    def encode(self, texts):
+        single = isinstance(texts, str)
+        rows = []
+        for text in ([texts] if single else texts):
+            vector = np.zeros(self.dim, dtype=np.float32)
+            for word in text.lower().split():
+                vector[sum(map(ord, word)) % self.dim] += 1.0
+            rows.append(vector)
+        return rows[0] if single else np.vstack(rows)
+
+
+def random_vectors(n, dim=32, seed=3):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+class TestDenseIndex:
+    """Tests de l'index dense"""
+
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_blocked_search_matches_exact(self, dtype):
+        vectors = random_vectors(500)
+        doc_ids = [f"d{i}" for i in range(500)]
+        index = DenseIndex.from_vectors(doc_ids, vectors, dtype=dtype, block_rows=64)
+        normalized = DenseIndex.normalize(vectors)
+        query = vectors[42]
+        expected = [doc_ids[i] for i in np.argsort(-(normalized @ normalized[42]))[:5]]
+        hits = index.search(query, k=5)
+        assert hits[0][0] == "d42"
+        assert len(set(d for d, _ in hits) & set(expected)) >= 4
+
+    def test_ivf_and_mmap_roundtrip(self, tmp_path):
+        vectors = random_vectors(400)
+        doc_ids = [f"d{i}" for i in range(400)]
+        index = DenseIndex.from_vectors(doc_ids, vectors, nlist=8, nprobe=8)
+        index.save(str(tmp_path))
+        loaded = DenseIndex.load(str(tmp_path), nprobe=8)
+        assert isinstance(loaded.embeddings, np.memmap)
+        assert loaded.search(vectors[7], k=1)[0][0] == "d7"
+
+    def test_live_add_replaces(self):
+        vectors = random_vectors(50)
+        index = DenseIndex.from_vectors([f"d{i}" for i in range(50)], vectors)
+        index.add("d3", vectors[10])
+        index.add("new", vectors[20] * 5)
+        hits = [d for d, _ in index.search(vectors[20], k=2)]
+        assert set(hits) == {"d20", "new"}
+        assert "d3" in [d for d, _ in index.search(vectors[10], k=2)]
+        index.compact()
+        assert index.get_statistics()["pending_docs"] == 0
+        assert index.search(vectors[3], k=1)[0][0] != "d3"
+
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_pending_folded_into_ivf_lists(self, dtype):
+        vectors = random_vectors(300)
+        doc_ids = [f"d{i}" for i in range(200)]
+        index = DenseIndex.from_vectors(doc_ids, vectors[:200], dtype=dtype, nlist=4, nprobe=4, max_pending=16)
+        index.add("d5", vectors[250])  # replaces a stored row
+        for i in range(200, 214):
+            index.add(f"d{i}", vectors[i])
+        assert index.remove("d203")
+        assert index.get_statistics()["pending_docs"] == 14
+        assert index.search(vectors[213], k=1)[0][0] == "d213"
+
+        for i in range(214, 220):
+            index.add(f"d{i}", vectors[i])
+        stats = index.get_statistics()
+        assert stats["pending_docs"] == 4 and stats["num_docs"] == 215 and stats["ivf_lists"] == 4
+        assert len(set(index.doc_ids)) == 215 and "d203" not in index.doc_ids
+        assert index.offsets[-1] == 215
+        for i in (5, 211, 219):
+            assert index.search(vectors[250 if i == 5 else i], k=1)[0][0] == f"d{i}"
+
+    def test_hidden_rows_do_not_crowd_out_a_block(self):
+        query = random_vectors(1, seed=9)[0]
+        vectors = random_vectors(100)
+        vectors[:10] = query + 0.01 * vectors[:10]  # first block: the 10 best rows
+        index = DenseIndex.from_vectors([f"d{i}" for i in range(100)], vectors, block_rows=10)
+        for i in range(5):
+            index.add(f"d{i}", -query)  # replaced by far-away vectors
+        assert index.remove("d5")
+        hits = [d for d, _ in index.search(query, k=4)]
+        assert hits and set(hits) == {"d6", "d7", "d8", "d9"}
+
+
+class TestHybridRetrieval:
+    """Tests des modèles 'dense' et 'hybrid' de TRECRetriever"""
+
+    def test_dense_and_hybrid(self):
+        retriever = TRECRetriever(use_stemming=False, tokenizer='regex', enable_prf=False)
+        retriever.corpus = {
+            "D1": {"text": "vaccines reduce hospital admissions", "title": ""},
+            "D2": {"text": "oil prices rose sharply", "title": ""},
+            "D3": {"text": "the election results were contested", "title": ""},
+        }
+        result = retriever.retrieve_evidence("vaccines hospital", k=2, model="dense")
+        assert result.model_used == "bm25"
+
+        retriever.build_dense_index(HashingEncoder())
+        result = retriever.retrieve_evidence("vaccines hospital", k=2, model="dense")
+        assert result.evidences[0].doc_id == "D1"
+        assert {"encode", "dense", "fetch"} <= set(result.stage_times_ms)
+
+        retriever.add_document("D4", "oil exports and prices", source="wire")
+        result = retriever.retrieve_evidence("oil prices", k=2, model="hybrid")
+        assert {e.doc_id for e in result.evidences} == {"D2", "D4"}
+        assert {"bm25", "dense", "fusion"} <= set(result.stage_times_ms)
+
+    def test_evicted_after_compaction(self):
+        retriever = TRECRetriever(use_stemming=False, tokenizer='regex', enable_prf=False, max_live_docs=2)
+        retriever.corpus = {
+            "D1": {"text": "vaccines reduce hospital admissions", "title": ""},
+            "D2": {"text": "oil prices rose sharply", "title": ""},
+        }
+        retriever.build_dense_index(HashingEncoder())
+        retriever.dense_index.max_pending = 2
+        retriever.add_document("D2", "tidal turbines")  # replaces a corpus document
+        retriever.add_document("http://a.example/1", "solar panels")
+        retriever.add_document("http://a.example/2", "wind farms")
+        retriever.add_document("http://a.example/3", "geothermal wells")
+        assert retriever.dense_index.get_statistics()["pending_docs"] < 2
+
+        hits = {d for d, _ in retriever.dense_index.search(HashingEncoder().encode("solar panels"), k=10)}
+        assert "http://a.example/1" not in hits
+        result = retriever.retrieve_evidence("oil prices", k=1, model="dense")
+        assert result.evidences[0].doc_id == "D2" and "oil" in result.evidences[0].text
+
+
+class TestEmbeddingStore:
+    """Tests du magasin d'embeddings par doc_id"""
+
+    def test_persist_and_mmap(self, tmp_path):
+        store = EmbeddingStore.open(str(tmp_path))
+        vectors = random_vectors(3)
+        store.put(["a", "b", "c"], vectors)
+        reopened = EmbeddingStore.open(str(tmp_path))
+        assert isinstance(reopened._vectors, np.memmap)
+        ids, matrix = reopened.gather(["c", "x", "a"])
+        assert ids == ["c", "a"]
+        assert np.allclose(matrix[0], vectors[2], atol=1e-2)
+
+    def test_lazy_fill_writes_back(self, tmp_path):
+        encoder = HashingEncoder()
+        store = EmbeddingStore.open(str(tmp_path), lazy=True)
+        ids, matrix = store.gather(["d1"], {"d1": "oil prices"}, encoder)
+        assert ids == ["d1"] and matrix.shape == (1, encoder.dim)
+        assert store.get_statistics()["computed"] == 1
+        assert "d1" in EmbeddingStore.open(str(tmp_path))
+
+    def test_orphan_rows_truncated(self, tmp_path):
+        store = EmbeddingStore.open(str(tmp_path))
+        store.put(["a"], random_vectors(1))
+        with open(tmp_path / "vectors.bin", "ab") as f:
+            f.write(b"\0" * 10)
+        store = EmbeddingStore.open(str(tmp_path))
+        store.put(["b"], random_vectors(1, seed=4))
+        ids, matrix = EmbeddingStore.open(str(tmp_path)).gather(["a", "b"])
+        assert ids == ["a", "b"]
+        assert np.allclose(matrix[1], random_vectors(1, seed=4)[0], atol=1e-2)
+
+    def test_retriever_evidence_embeddings(self, tmp_path):
+        encoder = HashingEncoder()
+        retriever = TRECRetriever(use_stemming=False, tokenizer='regex', enable_prf=False)
+        retriever.corpus = {"D1": {"text": "vaccines reduce admissions", "title": "Health"}}
+        store = EmbeddingStore.open(str(tmp_path))
+        retriever.build_dense_index(encoder, embedding_store=store)
+        retriever.add_document("D2", "oil prices")
+        ids, matrix = retriever.evidence_embeddings(["D2", "D1"])
+        assert ids == ["D2", "D1"]
+        assert np.allclose(matrix[1], encoder.encode("Health. vaccines reduce admissions"), atol=1e-2)
+
+    def test_live_documents_not_persisted(self, tmp_path):
+        encoder = HashingEncoder()
+        retriever = TRECRetriever(use_stemming=False, tokenizer='regex', enable_prf=False, max_live_docs=2)
+        retriever.corpus = {"D1": {"text": "vaccines reduce admissions", "title": "Health"}}
+        store = EmbeddingStore.open(str(tmp_path), lazy=True)
+        retriever.build_dense_index(encoder, embedding_store=store)
+        size = (tmp_path / "vectors.bin").stat().st_size
+        for i in range(6):
+            retriever.add_document(f"http://a.example/{i}", f"oil prices {i}")
+            retriever.add_document(f"http://a.example/{i}", f"oil prices {i} update")
+            retriever.evidence_embeddings([f"http://a.example/{i}", "D1"])
+        assert len(store) == 1 and (tmp_path / "vectors.bin").stat().st_size == size
+
+        ids, matrix = retriever.evidence_embeddings(["http://a.example/5", "http://a.example/0", "D1"])
+        assert ids == ["http://a.example/5", "D1"]
+        assert np.allclose(matrix[0], encoder.encode("oil prices 5 update"))
+        assert len(EmbeddingStore.open(str(tmp_path))) == 1
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le magasin de documents compressé
+
+Auteur: Dominique S. Loyer
+"""
+
+import json
+import os
+import threading
+
+from syscred.doc_store import DocumentStore, corpus_signature, iter_jsonl_documents
+from syscred.trec_retriever import TRECRetriever
+
+
+def tag(i):
+    """Mot indexable propre à un document (chiffres -> lettres)."""
+    return "tag" + ''.join(chr(97 + int(c)) for c in str(i))
+
+
+def documents(n):
+    return [
+        (f"AP880101-{i:04d}", {'text': f"document {tag(i)} about oil prices " * 20, 'title': f"Title {i}"})
+        for i in range(n)
+    ]
+
+
+class TestDocumentStore:
+    """Tests du stockage par blocs"""
+
+    def test_build_and_random_access(self, tmp_path):
+        store = DocumentStore.build(str(tmp_path / "store"), documents(200), block_size=4096)
+        assert len(store) == 200
+        assert store.get_statistics()["blocks"] > 1
+        assert store["AP880101-0123"]["title"] == "Title 123"
+        assert store.get("missing") is None
+        assert "AP880101-0007" in store
+
+    def test_hot_lru(self, tmp_path):
+        store = DocumentStore.build(str(tmp_path / "store"), documents(50), block_size=4096, cache_size=2)
+        for doc_id in ("AP880101-0001", "AP880101-0001", "AP880101-0002", "AP880101-0003"):
+            store[doc_id]
+        stats = store.get_statistics()
+        assert stats["cache_hits"] == 1
+        assert stats["cache_misses"] == 3
+        assert stats["cached_docs"] == 2
+
+    def test_blocks_decoded_outside_the_lock(self, tmp_path, monkeypatch):
+        store = DocumentStore.build(str(tmp_path / "store"), documents(50), block_size=4096)
+        decompress, unlocked = store._decompress, []
+
+        def probe(data):
+            # Another thread must be able to take the lock meanwhile
+            def try_lock():
+                if store._lock.acquire(blocking=False):
+                    store._lock.release()
+                    unlocked.append(True)
+
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            return decompress(data)
+
+        monkeypatch.setattr(store, "_decompress", probe)
+        assert store["AP880101-0010"]["title"] == "Title 10"
+        assert unlocked == [True]
+        assert store["AP880101-0010"]["title"] == "Title 10"  # cached
+        assert store.get_statistics()["cache_hits"] == 1
+
+    def test_reopen_append_and_replace(self, tmp_path):
+        path = str(tmp_path / "store")
+        DocumentStore.build(path, documents(20), block_size=4096).close()
+
+        store = DocumentStore.open(path)
+        store["web-1"] = {'text': "live page", 'title': "Live"}
+        store["AP880101-0003"] = {'text': "replaced", 'title': "New"}
+        assert store["web-1"]["text"] == "live page"  # buffered
+        store.close()
+
+        reopened = DocumentStore.open(path)
+        assert len(reopened) == 21
+        assert reopened["AP880101-0003"]["text"] == "replaced"
+        streamed = dict(reopened.items())
+        assert len(streamed) == 21
+        assert streamed["AP880101-0003"]["title"] == "New"
+
+    def test_torn_append_is_dropped(self, tmp_path):
+        path = str(tmp_path / "store")
+        DocumentStore.build(path, documents(10), block_size=4096).close()
+        with open(os.path.join(path, 'ids.txt'), 'a', encoding='utf-8') as f:
+            f.write("orphan-id\n")
+
+        store = DocumentStore.open(path)
+        assert len(store) == 10
+        assert "orphan-id" not in store
+        store["web-2"] = {'text': "after crash", 'title': ""}
+        store.close()
+        assert DocumentStore.open(path)["web-2"]["text"] == "after crash"
+
+
+class TestRetrieverDocumentStore:
+    """Tests du TRECRetriever adossé au magasin de documents"""
+
+    def test_corpus_path_builds_store(self, tmp_path):
+        corpus_path = tmp_path / "corpus.jsonl"
+        with open(corpus_path, 'w', encoding='utf-8') as f:
+            for doc_id, doc in documents(30):
+                f.write(json.dumps({'id': doc_id, 'contents': doc['text'], 'title': doc['title']}) + "\n")
+        assert len(list(iter_jsonl_documents(str(corpus_path), limit=5))) == 5
+
+        store_path = str(tmp_path / "store")
+        retriever = TRECRetriever(
+            corpus_path=str(corpus_path), doc_store_path=store_path,
+            tokenizer='regex', enable_prf=False
+        )
+        assert isinstance(retriever.corpus, DocumentStore)
+        result = retriever.retrieve_evidence(tag(17), k=3)
+        assert result.evidences[0].doc_id == "AP880101-0017"
+        assert "oil prices" in result.evidences[0].text
+        # Live documents are not written to the store
+        retriever.add_document("https://example.org/live", "live page " * 2000)
+        assert "https://example.org/live" not in retriever.corpus
+        retriever.corpus.flush()
+
+        # Second start opens the existing store
+        reopened = TRECRetriever(doc_store_path=store_path, tokenizer='regex', enable_prf=False)
+        assert len(reopened.corpus) == 30
+        assert reopened.get_statistics()["doc_store"]["documents"] == 30
+
+    def test_store_rebuilt_when_corpus_changes(self, tmp_path):
+        def write_corpus(path, docs):
+            with open(path, 'w', encoding='utf-8') as f:
+                for doc_id, doc in docs:
+                    f.write(json.dumps({'id': doc_id, 'contents': doc['text'], 'title': doc['title']}) + "\n")
+
+        corpus_a, corpus_b = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+        write_corpus(corpus_a, documents(10))
+        write_corpus(corpus_b, documents(30)[20:])
+        store_path = str(tmp_path / "store")
+
+        def retriever(corpus_path):
+            return TRECRetriever(corpus_path=str(corpus_path), doc_store_path=store_path,
+                                 tokenizer='regex', enable_prf=False)
+
+        assert len(retriever(corpus_a).corpus) == 10
+        assert retriever(corpus_a).corpus.source == corpus_signature(str(corpus_a))
+        switched = retriever(corpus_b)
+        assert sorted(switched.corpus)[0] == "AP880101-0020"
+        assert switched.retrieve_evidence(tag(3), k=3).evidences == []
+
+        # Same file, other limit; then the file itself changes
+        limited = DocumentStore.open_or_build(store_path, str(corpus_b), limit=4)
+        assert len(limited) == 4 and limited.source['limit'] == 4
+        write_corpus(corpus_b, documents(5))
+        rebuilt = DocumentStore.open_or_build(store_path, str(corpus_b), limit=4)
+        assert len(rebuilt) == 4 and "AP880101-0000" in rebuilt
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le cache de snapshots binaires des fichiers TTL
+
+Auteur: Dominique S. Loyer
+"""
+
+import os
+
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from syscred.graph_snapshot import GraphSnapshotCache, file_hash
+from syscred.ontology_manager import OntologyManager
+
+ONTOLOGY_DIR = os.path.join(os.path.dirname(__file__), '..', 'ontology')
+BASE_ONTOLOGY = os.path.join(ONTOLOGY_DIR, 'sysCRED_onto26avrtil.ttl')
+
+TURTLE = '''@prefix cred: <https://syscred.uqam.ca/ontology#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+cred:Info_1 cred:informationContent """Citation "entre guillemets"
+sur deux lignes"""^^xsd:string ;
+    cred:label "vaccin"@fr, "vaccine"@en ;
+    cred:score "0.50"^^xsd:float ;
+    cred:source [ cred:name "anonyme" ] .
+'''
+
+
+def load(cache, path):
+    graph = Graph()
+    hit = cache.parse(graph, path)
+    return graph, hit
+
+
+class TestGraphSnapshotCache:
+    """Tests du cache de snapshots (clé = hash du fichier source)"""
+
+    def test_snapshot_matches_parse(self, tmp_path):
+        source = tmp_path / "data.ttl"
+        source.write_text(TURTLE, encoding='utf-8')
+        cache = GraphSnapshotCache(str(tmp_path / "cache"))
+        parsed, hit = load(cache, str(source))
+        assert not hit
+        loaded, hit = load(cache, str(source))
+        assert hit and cache.stats == {"hits": 1, "misses": 1}
+        assert set(loaded) == set(parsed)  # same blank node ids as when saved
+        assert isomorphic(loaded, Graph().parse(str(source), format='turtle'))
+        assert ("cred", "https://syscred.uqam.ca/ontology#") in {(p, str(n)) for p, n in loaded.namespaces()}
+
+    def test_edited_file_misses(self, tmp_path):
+        source = tmp_path / "data.ttl"
+        source.write_text(TURTLE, encoding='utf-8')
+        cache = GraphSnapshotCache(str(tmp_path / "cache"))
+        load(cache, str(source))
+        source.write_text(TURTLE + 'cred:Info_2 cred:score "0.1"^^xsd:float .\n', encoding='utf-8')
+        graph, hit = load(cache, str(source))
+        assert not hit and len(graph) == 7
+        # Only the snapshot of the current contents is kept
+        assert os.listdir(cache.directory) == [os.path.basename(cache.path_for(str(source), file_hash(str(source))))]
+
+    def test_corrupt_snapshot_falls_back(self, tmp_path):
+        cache = GraphSnapshotCache(str(tmp_path / "cache"))
+        parsed, _ = load(cache, BASE_ONTOLOGY)
+        with open(cache.path_for(BASE_ONTOLOGY, file_hash(BASE_ONTOLOGY)), 'wb') as f:
+            f.write(b"not a zip file")
+        graph, hit = load(cache, BASE_ONTOLOGY)
+        assert not hit and isomorphic(graph, parsed)
+        assert load(cache, BASE_ONTOLOGY)[1]  # rewritten
+
+    def test_ontology_manager_fast_start(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path)
+        om.add_evaluation_triplets({'scoreCredibilite': 0.8, 'informationEntree': "https://www.lemonde.fr/a"})
+        om.save_data()
+        snapshot_dir = str(tmp_path / "cache")
+        OntologyManager(BASE_ONTOLOGY, data_path, snapshot_dir=snapshot_dir)
+        reloaded = OntologyManager(BASE_ONTOLOGY, data_path, snapshot_dir=snapshot_dir)
+        assert reloaded.snapshots.stats == {"hits": 2, "misses": 0}
+        assert set(reloaded.data_graph) == set(om.data_graph)
+        assert reloaded.domain_history.recent("lemonde.fr") == om.domain_history.recent("lemonde.fr")
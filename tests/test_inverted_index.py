@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'index inversé segmenté (SegmentedIndex)
+
+Auteur: Dominique S. Loyer
+"""
+
+import pytest
+from syscred.ir_engine import IREngine
+from syscred.inverted_index import (
+    IndexSegment, SegmentedIndex, encode_positions, decode_positions, doc_date, parse_date_bound
+)
+from syscred.trec_retriever import TRECRetriever
+
+
+DOCS = {
+    "AP880101-0001": "climate change caused by human activities burning fossil fuels",
+    "AP880101-0002": "temperature risen over the past century greenhouse gas emissions",
+    "AP880102-0001": "sea levels could rise if warming trends continue",
+    "AP890215-0001": "presidential election campaign economic policies healthcare",
+    "AP890216-0001": "stock markets rose after the federal reserve economic indicators",
+    "AP880201-0001": "renewable energy solar wind cheaper than fossil fuels",
+}
+
+
+def naive_bm25(docs, query_terms, engine):
+    """Score every document with IREngine.calculate_bm25_score."""
+    tokens = {d: t.split() for d, t in docs.items()}
+    avgdl = sum(len(t) for t in tokens.values()) / len(tokens)
+    df = {q: sum(1 for t in tokens.values() if q in t) for q in query_terms}
+    scores = {
+        d: engine.calculate_bm25_score(query_terms, t, len(t), avgdl, df, len(tokens))
+        for d, t in tokens.items()
+    }
+    return {d: s for d, s in scores.items() if s > 0}
+
+
+class TestSegmentedIndex:
+    """Tests de l'index segmenté"""
+
+    def test_segments_match_single_pass_bm25(self):
+        """Les scores ne dépendent pas du découpage en segments"""
+        index = SegmentedIndex(max_buffer_docs=2, merge_factor=100)
+        for doc_id, text in DOCS.items():
+            index.add_document(doc_id, text.split())
+        assert index.get_statistics()["segments"] == 3
+
+        query = ["fossil", "fuels", "economic"]
+        expected = naive_bm25(DOCS, query, IREngine(use_stemming=False))
+        results = dict(index.search(query, k=10))
+
+        assert set(results) == set(expected)
+        for doc_id, score in expected.items():
+            assert results[doc_id] == pytest.approx(score)
+
+    def test_merge_keeps_results(self):
+        """La fusion de segments ne change pas les résultats"""
+        index = SegmentedIndex(max_buffer_docs=1, merge_factor=3, background_merge=False)
+        for doc_id, text in DOCS.items():
+            index.add_document(doc_id, text.split())
+        stats = index.get_statistics()
+        assert stats["merges"] >= 1
+        assert stats["segments"] < len(DOCS)
+        assert len(index) == len(DOCS)
+
+        query = ["climate", "warming", "sea"]
+        expected = naive_bm25(DOCS, query, IREngine(use_stemming=False))
+        assert dict(index.search(query)) == pytest.approx(expected)
+
+    def test_background_merge(self):
+        """Les fusions en arrière-plan se terminent"""
+        index = SegmentedIndex(max_buffer_docs=1, merge_factor=2)
+        for doc_id, text in DOCS.items():
+            index.add_document(doc_id, text.split())
+        assert index.wait_for_merges()
+        assert index.get_statistics()["segments"] < 2
+        assert len(index.search(["fossil"])) == 2
+        index.close()
+
+    def test_bulk_load_during_merge(self, monkeypatch):
+        """Une fusion en cours ne ramène pas les documents d'avant un rechargement"""
+        index = SegmentedIndex(max_buffer_docs=1, merge_factor=100, background_merge=False)
+        for doc_id, text in DOCS.items():
+            index.add_document(doc_id, text.split())
+        build = IndexSegment.build.__func__
+        reloaded = []
+
+        def build_then_reload(cls, documents, with_positions=False):
+            segment = build(cls, documents, with_positions)
+            if not reloaded:
+                reloaded.append(True)
+                index.bulk_load([("AP900101-0001", ["tidal", "energy"])])
+            return segment
+
+        monkeypatch.setattr(IndexSegment, "build", classmethod(build_then_reload))
+        with index._write_lock:
+            index._merge_once(release_lock=True)
+        assert len(index) == 1 and index.get_statistics()["segments"] == 1
+        assert index.search(["fossil"]) == []
+        assert index.stats["merges"] == 0
+
+    def test_replace_and_delete(self):
+        """Remplacer un document met à jour les statistiques globales"""
+        index = SegmentedIndex(max_buffer_docs=2, background_merge=False)
+        for doc_id, text in DOCS.items():
+            index.add_document(doc_id, text.split())
+        index.add_document("AP880101-0001", ["solar", "panels"])
+        assert index.snapshot().num_docs == len(DOCS)
+        assert index.snapshot().doc_freq("fossil") == 1
+        assert [d for d, _ in index.search(["solar"])][0] == "AP880101-0001"
+
+        assert index.delete_document("AP880201-0001")
+        assert index.search(["fossil"]) == []
+        assert not index.delete_document("missing")
+
+
+class TestBM25F:
+    """Tests du BM25F titre/corps"""
+
+    TITLES = {
+        "AP880101-0001": "fossil fuels climate change",
+        "AP880201-0001": "solar power",
+        "AP890215-0001": "election campaign",
+    }
+
+    def build(self, **kwargs):
+        index = SegmentedIndex(background_merge=False, **kwargs)
+        for doc_id, text in DOCS.items():
+            index.add_document(doc_id, text.split(), self.TITLES.get(doc_id, "").split())
+        return index
+
+    def test_without_title_weight_equals_bm25(self):
+        index = self.build(max_buffer_docs=2, merge_factor=100)
+        query = ["fossil", "fuels", "economic"]
+        expected = naive_bm25(DOCS, query, IREngine(use_stemming=False))
+        assert dict(index.search(query, k=10)) == pytest.approx(expected)
+        fielded = dict(index.search(query, k=10, field_weights={'text': 1.0, 'title': 0.0}))
+        assert fielded == pytest.approx(expected)
+
+    def test_title_only_terms_do_not_change_bm25(self):
+        """Sans poids de titre, les df ne comptent que le corps"""
+        titles = {"AP890216-0001": "fossil fuels economic outlook", "AP880102-0001": "fossil warming"}
+        query = ["fossil", "economic", "warming"]
+        for kwargs in ({}, {"max_buffer_docs": 2, "merge_factor": 2}):
+            plain = SegmentedIndex(background_merge=False, **kwargs)
+            titled = SegmentedIndex(background_merge=False, **kwargs)
+            for doc_id, text in DOCS.items():
+                plain.add_document(doc_id, text.split())
+                titled.add_document(doc_id, text.split(), titles.get(doc_id, "").split())
+            assert titled.snapshot().doc_freq("fossil") == 4
+            assert titled.snapshot().doc_freq("fossil", body_only=True) == 2
+            assert dict(titled.search(query)) == pytest.approx(dict(plain.search(query)))
+
+            for index in (plain, titled):
+                index.delete_document("AP880101-0001")
+            assert titled.snapshot().doc_freq("fossil", body_only=True) == 1
+            assert dict(titled.search(query)) == pytest.approx(dict(plain.search(query)))
+
+    def test_title_tf_saturated_before_seal(self):
+        """Un document a le même score avant et après le scellement"""
+        index = SegmentedIndex(background_merge=False)
+        index.add_document("AP880101-0001", ["solar"], ["solar"] * 300)
+        index.add_document("AP880102-0001", ["wind"], ["solar"])
+        weights = {'title': 1.0}
+        buffered = dict(index.search(["solar"], field_weights=weights))
+        index.flush()
+        assert dict(index.search(["solar"], field_weights=weights)) == pytest.approx(buffered)
+
+    def test_title_weight_boosts_title_matches(self):
+        index = self.build()
+        # "fossil fuels" is in the body of two documents, the title of one
+        plain = [d for d, _ in index.search(["fossil", "fuels"])]
+        assert plain[0] == "AP880201-0001"
+        fielded = index.search(["fossil", "fuels"], field_weights={'text': 1.0, 'title': 3.0})
+        assert fielded[0][0] == "AP880101-0001"
+        # A title-only term has a posting with a body frequency of 0
+        assert index.search(["power"]) == []
+        assert index.search(["power"], field_weights={'title': 1.0})[0][0] == "AP880201-0001"
+
+    def test_fields_survive_flush_merge_and_delete(self):
+        buffered = self.build()
+        merged = self.build(max_buffer_docs=1, merge_factor=2)
+        assert merged.get_statistics()["merges"] >= 1
+        weights = {'text': 1.0, 'title': 2.0}
+        query = ["election", "power", "fossil"]
+        assert dict(merged.search(query, field_weights=weights)) == pytest.approx(
+            dict(buffered.search(query, field_weights=weights)))
+
+        for index in (buffered, merged):
+            index.delete_document("AP880201-0001")
+            assert index.snapshot().doc_freq("power") == 0
+            assert index.search(["power"], field_weights=weights) == []
+
+
+class TestPositions:
+    """Tests de l'index positionnel (phrases et proximité)"""
+
+    PHRASE_DOCS = {
+        "AP880301-0001": "the federal reserve raised interest rates",
+        "AP880301-0002": "federal officials said the reserve bank of india",
+        "AP880301-0003": "reserve federal funds for the economy",
+        "AP880301-0004": "interest rates and the federal budget reserve",
+    }
+
+    def build(self, **kwargs):
+        index = SegmentedIndex(background_merge=False, positions=True, **kwargs)
+        for doc_id, text in self.PHRASE_DOCS.items():
+            index.add_document(doc_id, text.split())
+        return index
+
+    def test_varint_round_trip(self):
+        positions = [0, 1, 5, 127, 128, 300, 70000]
+        data = bytearray()
+        encode_positions(positions, data)
+        assert decode_positions(data, 0, len(data)) == positions
+        assert len(data) < 4 * len(positions)
+
+    @pytest.mark.parametrize("buffer_docs", [100, 1])
+    def test_exact_phrase(self, buffer_docs):
+        """Phrase exacte, dans le tampon comme après scellement et fusion"""
+        index = self.build(max_buffer_docs=buffer_docs, merge_factor=2)
+        snapshot = index.snapshot()
+        query = {"federal": 1, "reserve": 1}
+        hits = snapshot.search_positional(query, k=10, phrases=[["federal", "reserve"]])
+        assert [d for d, _ in hits] == ["AP880301-0001"]
+        # All four documents contain both words
+        assert len(snapshot.search_bm25(query, k=10)) == 4
+        assert snapshot.search_positional(query, k=10, phrases=[["reserve", "bank", "of", "india"]])[0][0] == "AP880301-0002"
+        assert snapshot.search_positional(query, k=10, phrases=[["federal", "bank"]]) == []
+
+    def test_proximity_boost(self):
+        index = self.build()
+        snapshot = index.snapshot()
+        query = {"interest": 1, "rates": 1, "federal": 1, "reserve": 1}
+        boosted = snapshot.search_positional(
+            query, k=4, proximity_terms=["federal", "reserve", "interest", "rates"], proximity_weight=1.0
+        )
+        assert boosted[0][0] == "AP880301-0001"
+        plain = dict(snapshot.search_bm25(query, k=4))
+        assert all(score >= plain[doc_id] for doc_id, score in boosted)
+        # No weight: same as plain BM25
+        assert snapshot.search_positional(query, k=4) == snapshot.search_bm25(query, k=4)
+
+    def test_positions_survive_delete_and_size(self):
+        index = self.build(max_buffer_docs=2, merge_factor=2)
+        index.delete_document("AP880301-0001")
+        index.flush()
+        hits = index.snapshot().search_positional({"federal": 1}, phrases=[["federal", "reserve"]])
+        assert hits == []
+        sizes = index.size_bytes()
+        assert sizes["positions"] > 0
+        assert SegmentedIndex().size_bytes()["positions"] == 0
+
+    def test_retriever_quoted_phrase(self):
+        retriever = TRECRetriever(tokenizer='regex', use_stemming=False, enable_prf=False, positions=True)
+        retriever.corpus = {d: {"text": t, "title": ""} for d, t in self.PHRASE_DOCS.items()}
+        unquoted = retriever.retrieve_evidence("federal reserve", k=10)
+        assert len(unquoted.evidences) == 4
+        quoted = retriever.retrieve_evidence('"Federal Reserve" rates', k=10)
+        assert [e.doc_id for e in quoted.evidences] == ["AP880301-0001"]
+        assert not quoted.cached
+
+
+class TestDateRange:
+    """Tests du filtrage par date de publication"""
+
+    def build(self, **kwargs):
+        index = SegmentedIndex(background_merge=False, **kwargs)
+        for doc_id, text in DOCS.items():
+            index.add_document(doc_id, text.split())
+        index.add_document("https://example.org/fuel", ["fossil", "fuels", "prices"])
+        return index
+
+    def test_doc_date(self):
+        assert doc_date("AP880101-0001") == 19880101
+        assert doc_date("WSJ870320-0045") == 19870320
+        assert doc_date("AP880101-0001#3") == 19880101
+        assert doc_date("https://example.org/x") == 0
+        assert parse_date_bound("1988-02-01") == 19880201
+        assert parse_date_bound(None) is None
+        with pytest.raises(ValueError):
+            parse_date_bound("February 1988")
+
+    @pytest.mark.parametrize("buffer_docs", [1000, 2])
+    def test_range_matches_post_filter(self, buffer_docs):
+        """Le saut par plage de documents égale le post-filtrage du classement complet"""
+        index = self.build(max_buffer_docs=buffer_docs, merge_factor=100)
+        snapshot = index.snapshot()
+        query = {"fossil": 1, "fuels": 1, "economic": 1, "climate": 1}
+        full = snapshot.search_bm25(query, k=100)
+        for date_range in [(19880101, 19880131), (19880201, None), (None, 19881231), (19890101, 19891231)]:
+            lo, hi = max(date_range[0] or 1, 1), date_range[1] or 99999999
+            expected = [(d, s) for d, s in full if lo <= doc_date(d) <= hi]
+            assert snapshot.search_bm25(query, k=100, date_range=date_range) == expected
+
+    def test_sealed_segment_sorted_by_date(self):
+        index = self.build(max_buffer_docs=100)
+        index.flush()
+        segment = index.snapshot().segments[0]
+        assert list(segment.doc_dates) == sorted(segment.doc_dates)
+        assert segment.doc_ids[0] == "https://example.org/fuel"  # undated first
+        assert segment.docnum_range((19890101, None)) == (len(DOCS) - 1, len(DOCS) + 1)
+
+    def test_retriever_date_window(self):
+        retriever = TRECRetriever(tokenizer='regex', enable_prf=False)
+        retriever.corpus = {d: {"text": t, "title": ""} for d, t in DOCS.items()}
+        everything = retriever.retrieve_evidence("fossil fuels economic", k=10)
+        assert {e.doc_id for e in everything.evidences} >= {"AP880101-0001", "AP890215-0001"}
+        window = retriever.retrieve_evidence("fossil fuels economic", k=10, date_from="1989-01-01", date_to="1989-12-31")
+        assert {e.doc_id for e in window.evidences} == {"AP890215-0001", "AP890216-0001"}
+        assert not window.cached
+        with pytest.raises(ValueError):
+            retriever.retrieve_evidence("fossil", date_from="1989")
+
+
+class TestRetrieverLiveIngestion:
+    """Tests d'ingestion de documents dans TRECRetriever"""
+
+    def test_added_document_is_searchable(self):
+        retriever = TRECRetriever(use_stemming=True, enable_prf=False)
+        retriever.corpus = {d: {"text": t, "title": ""} for d, t in DOCS.items()}
+        retriever.add_document(
+            "https://example.org/vaccine", "Vaccines undergo clinical trials",
+            title="Vaccine safety", source="example.org"
+        )
+
+        result = retriever.retrieve_evidence("vaccine clinical trials", k=3)
+        assert result.evidences[0].doc_id == "https://example.org/vaccine"
+        assert result.evidences[0].source == "example.org"
+        assert retriever.get_statistics()["index"]["buffered_docs"] == 1
+
+    def test_live_documents_are_capped(self):
+        retriever = TRECRetriever(use_stemming=False, tokenizer='regex', enable_prf=False, max_live_docs=2)
+        retriever.corpus = {d: {"text": t, "title": ""} for d, t in DOCS.items()}
+        retriever.add_document("AP880201-0001", "tidal turbines")  # replaces a corpus document
+        retriever.add_document("web-1", "tidal energy")
+        retriever.add_document("web-2", "tidal barrage")
+        stats = retriever.get_statistics()
+        assert stats["live_docs"] == 2 and stats["corpus_size"] == len(DOCS)
+
+        # The oldest live document was evicted: the corpus version is back
+        assert {e.doc_id for e in retriever.retrieve_evidence("tidal", k=5).evidences} == {"web-1", "web-2"}
+        assert retriever.retrieve_evidence("solar wind", k=1).evidences[0].doc_id == "AP880201-0001"
+        assert retriever.get_document("web-2")["text"] == "tidal barrage"
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le moteur IR (IREngine, TextAnalyzer)
+
+Auteur: Dominique S. Loyer
+"""
+
+from syscred.ir_engine import IREngine, TextAnalyzer
+
+
+class TestTextAnalyzer:
+    """Tests du pipeline d'analyse"""
+
+    def test_stopwords_and_non_alpha_removed(self):
+        analyzer = TextAnalyzer(stopwords={'the', 'of'}, tokenizer='regex')
+        assert analyzer.analyze("The price of oil, 1988") == ['price', 'oil']
+        assert analyzer("The price of oil") == "price oil"
+        assert analyzer.analyze(None) == []
+
+    def test_stems_are_memoized(self):
+        class CountingStemmer:
+            calls = 0
+
+            def stem(self, word):
+                CountingStemmer.calls += 1
+                return word[:5]
+
+        analyzer = TextAnalyzer(stopwords=set(), stemmer=CountingStemmer(), tokenizer='regex')
+        terms = analyzer.analyze("retrieval retrieval retrieval systems")
+        assert terms == ['retri', 'retri', 'retri', 'syste']
+        assert CountingStemmer.calls == 2
+        assert analyzer.cache_info().hits == 2
+
+    def test_engine_preprocess_uses_analyzer(self):
+        engine = IREngine(use_stemming=False, tokenizer='regex')
+        assert engine.preprocess("Information Retrieval") == "information retrieval"
+        assert engine.analyze("Information Retrieval") == ["information", "retrieval"]
+
+
+class TestRM3:
+    """Tests de l'expansion RM3"""
+
+    def test_weights_interpolate_query_and_feedback(self):
+        engine = IREngine(use_stemming=False, tokenizer='regex')
+        feedback = [({'oil': 2, 'opec': 2}, 3.0), ({'oil': 1, 'crude': 3}, 1.0)]
+        weights = engine.rm3_expansion(['oil'], feedback, num_expansion_terms=2, original_query_weight=0.5)
+        assert abs(sum(weights.values()) - 1.0) < 1e-9
+        assert weights['oil'] > weights['opec'] > 0
+        assert 'crude' not in weights
+
+    def test_term_filter_skips_candidates(self):
+        engine = IREngine(use_stemming=False, tokenizer='regex')
+        feedback = [({'oil': 1, 'said': 5, 'opec': 1}, 1.0)]
+        weights = engine.rm3_expansion(['oil'], feedback, num_expansion_terms=1,
+                                       term_filter=lambda term: term != 'said')
+        assert set(weights) == {'oil'}
+        weights = engine.rm3_expansion(['oil'], feedback, num_expansion_terms=2,
+                                       term_filter=lambda term: term != 'said')
+        assert set(weights) == {'oil', 'opec'}
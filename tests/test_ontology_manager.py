@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'OntologyManager et le GraphRAG
+
+Auteur: Dominique S. Loyer
+"""
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDF, XSD
+
+from syscred.ontology_manager import OntologyManager
+from syscred.graph_rag import GraphRAG
+from syscred.domain_history import DomainHistoryIndex, registrable_domain
+
+
+def sample_report(url="https://www.lemonde.fr/article", score=0.8):
+    return {
+        'scoreCredibilite': score,
+        'informationEntree': url,
+        'resumeAnalyse': "Analyse de test",
+    }
+
+
+def add_history(graph, ns, name, url, score, timestamp):
+    """Ajoute une évaluation (info, requête, rapport) directement dans un graphe."""
+    info, request, report = ns[f"Info_{name}"], ns[f"Request_{name}"], ns[f"Report_{name}"]
+    graph.add((info, ns.informationURL, Literal(url)))
+    graph.add((info, ns.informationContent, Literal(f"claim about {url}")))
+    graph.add((request, ns.concernsInformation, info))
+    graph.add((report, RDF.type, ns.RapportEvaluation))
+    graph.add((report, ns.isReportOf, request))
+    graph.add((report, ns.credibilityScoreValue, Literal(score, datatype=XSD.float)))
+    graph.add((report, ns.assignsCredibilityLevel, ns.Niveau_Haut))
+    graph.add((report, ns.completionTimestamp, Literal(timestamp, datatype=XSD.dateTime)))
+
+
+class TestUnionGraph:
+    """Tests de la vue d'union base + données (sans copie)"""
+
+    def test_union_tracks_both_graphs(self):
+        om = OntologyManager()
+        om.base_graph.add((om.cred.Niveau_Haut, RDF.type, om.cred.NiveauCredibilite))
+        om.add_evaluation_triplets(sample_report())
+        assert len(om.union_graph) == len(om.base_graph) + len(om.data_graph)
+        assert (om.cred.Niveau_Haut, RDF.type, om.cred.NiveauCredibilite) in om.union_graph
+
+    def test_query_source_history_sees_new_evaluations(self):
+        om = OntologyManager()
+        om.add_evaluation_triplets(sample_report(score=0.9))
+        om.add_evaluation_triplets(sample_report("https://example.org/other", 0.2))
+        records = om.query_source_history("lemonde.fr")
+        assert len(records) == 1
+        assert records[0].score == 0.9
+        assert records[0].level == "Niveau_Haut"
+
+    def test_export_with_base(self, tmp_path):
+        om = OntologyManager()
+        om.base_graph.add((om.cred.Niveau_Haut, RDF.type, om.cred.NiveauCredibilite))
+        om.add_evaluation_triplets(sample_report())
+        path = tmp_path / "export.ttl"
+        assert om.export_to_ttl(str(path), include_base=True)
+        exported = Graph().parse(str(path), format='turtle')
+        assert len(exported) == len(om.base_graph) + len(om.data_graph)
+        assert "@prefix cred:" in path.read_text(encoding='utf-8')
+
+
+class TestGraphRAG:
+    """Tests des requêtes GraphRAG sur la vue d'union"""
+
+    def test_history_spans_base_and_data(self):
+        om = OntologyManager()
+        add_history(om.base_graph, om.cred, "old", "https://www.bbc.com/a", 0.6, "2024-01-01T00:00:00")
+        add_history(om.data_graph, om.cred, "new", "https://news.bbc.com/b", 0.8, "2025-01-01T00:00:00")
+        om.rebuild_domain_index()
+        rag = GraphRAG(om)
+        data = rag._get_source_history_data("bbc.com")
+        assert data['count'] == 2
+        assert abs(data['avg_score'] - 0.7) < 1e-6
+        assert data['last_verdict'] == "Niveau_Haut"
+        assert "Analyzed 2 times" in rag._get_source_history("bbc.com")
+
+    def test_similar_claims(self):
+        om = OntologyManager()
+        add_history(om.data_graph, om.cred, "new", "https://www.bbc.com/b", 0.8, "2025-01-01T00:00:00")
+        om.rebuild_claim_index()
+        result = GraphRAG(om)._find_similar_claims(["claim"])
+        assert result['uris'] == [str(om.cred["Report_new"])]
+        assert abs(result['scores'][0] - 0.8) < 1e-6
+
+    def test_similar_claims_maintained_on_write(self):
+        om = OntologyManager()
+        om.add_evaluation_triplets(sample_report("Le vaccin contient une puce électronique", 0.1))
+        om.add_evaluation_triplets(sample_report("La banque centrale relève ses taux", 0.9))
+        result = GraphRAG(om)._find_similar_claims(["vaccin", "puce", "électronique"])
+        assert len(result['uris']) == 1
+        assert "vaccin" in result['text'] and "Niveau_Bas" in result['text']
+
+    def test_single_pass_context(self, monkeypatch):
+        om = OntologyManager()
+        om.add_evaluation_triplets(sample_report("https://www.lemonde.fr/vaccin-puce", 0.8))
+        om.add_evaluation_triplets(sample_report("Le vaccin contient une puce électronique", 0.2))
+        rag = GraphRAG(om)
+        searches = []
+        search = om.claim_index.search
+        monkeypatch.setattr(om.claim_index, "search", lambda *a, **kw: searches.append(a) or search(*a, **kw))
+
+        keywords = ["vaccin", "puce"]
+        result = rag.analyze("lemonde.fr", keywords)
+        assert rag.get_context("lemonde.fr", keywords)["full_text"] == result["full_text"]
+        assert rag.compute_context_score("lemonde.fr", keywords) == result["context_score"]
+        assert len(searches) == 1  # memoized for the request
+        assert result["context_score"]["has_history"] and result["context_score"]["similar_count"] == 2
+        assert "Graph Memory for 'lemonde.fr'" in result["full_text"]
+
+        om.add_evaluation_triplets(sample_report("Une puce dans le vaccin, encore", 0.4))
+        assert rag.compute_context_score("lemonde.fr", keywords)["similar_count"] == 3
+        assert len(searches) == 2  # new evaluation: recomputed
+
+    def test_memo_follows_write_generation(self):
+        """Une réécriture de même taille invalide le mémo ; l'appelant reçoit une copie."""
+        om = OntologyManager()
+        report = om.add_evaluation_triplets(sample_report("https://www.lemonde.fr/a", 0.8))
+        rag = GraphRAG(om)
+        result = rag.analyze("lemonde.fr")
+        result["similar_uris"].append("urn:edited")
+        result["context_score"]["history_score"] = -1.0
+        again = rag.analyze("lemonde.fr")
+        assert again["similar_uris"] == [] and again["context_score"]["history_score"] > 0.5
+
+        size = len(om.data_graph)
+        om.data_graph.set((URIRef(report), om.cred.credibilityScoreValue, Literal(0.1, datatype=XSD.float)))
+        om.rebuild_domain_index()
+        assert len(om.data_graph) == size
+        assert rag.analyze("lemonde.fr")["context_score"]["history_score"] < 0.5
+
+
+class TestPreparedQueries:
+    """Tests des requêtes préparées (paramètres liés, jamais interpolés)"""
+
+    INJECTIONS = [
+        '") } #',
+        'bbc.com")) } UNION { ?report ?p ?score } #',
+        "bbc.com\" || true) . } #",
+    ]
+
+    def test_domain_cannot_change_query(self):
+        om = OntologyManager()
+        om.add_evaluation_triplets(sample_report())
+        for domain in self.INJECTIONS:
+            assert om.query_source_history(domain) == []
+
+    def test_keywords_matched_literally(self):
+        om = OntologyManager()
+        add_history(om.data_graph, om.cred, "new", "https://www.bbc.com/b", 0.8, "2025-01-01T00:00:00")
+        om.rebuild_claim_index()
+        rag = GraphRAG(om)
+        assert rag._find_similar_claims([".*.*"])['uris'] == []
+        assert rag._find_similar_claims(["(unbalanced", 'x" ) } #'])['uris'] == []
+        assert rag._find_similar_claims(["claim.*"])['uris'] == [str(om.cred["Report_new"])]
+
+    def test_statistics_count_evaluations(self):
+        om = OntologyManager()
+        om.add_evaluation_triplets(sample_report())
+        om.add_evaluation_triplets(sample_report("https://www.bbc.com/b"))
+        # ?count must be read by name: row.count is tuple.count
+        assert om.get_statistics()['total_evaluations'] == 2
+
+    def test_graph_json_binds_report(self):
+        om = OntologyManager()
+        report = {
+            **sample_report(),
+            'reglesAppliquees': {'source_analysis': {'reputation': 'High'}},
+        }
+        report_uri = om.add_evaluation_triplets(report)
+        graph = om.get_graph_json()
+        assert graph['nodes'][0]['id'] == report_uri
+        assert any(link['source'] == report_uri for link in graph['links'])
+
+
+class TestDomainHistory:
+    """Tests de l'index secondaire domaine -> évaluations récentes"""
+
+    def test_registrable_domain(self):
+        assert registrable_domain("https://www.lemonde.fr/article?id=1") == "lemonde.fr"
+        assert registrable_domain("news.bbc.co.uk") == "bbc.co.uk"
+        assert registrable_domain("https://www.quebec.gouv.qc.ca/x") == "quebec.gouv.qc.ca"
+        assert registrable_domain("http://127.0.0.1:5000/api") == "127.0.0.1"
+        assert registrable_domain("") == ""
+
+    def test_ring_buffer_keeps_most_recent(self):
+        index = DomainHistoryIndex(size=3)
+        for day in [5, 1, 4, 2, 3]:
+            index.add("https://lemonde.fr/a", f"2026-01-0{day}T00:00:00", day / 10, "Niveau_Moyen", f"r{day}")
+        assert [e.report for e in index.recent("www.lemonde.fr")] == ["r5", "r4", "r3"]
+        assert [e.report for e in index.recent("lemonde.fr", 1)] == ["r5"]
+
+    def test_maintained_on_write_matches_graph(self):
+        om = OntologyManager(history_size=4)
+        for i, score in enumerate([0.9, 0.3, 0.6, 0.8, 0.5]):
+            om.add_evaluation_triplets(sample_report(f"https://www.lemonde.fr/{i}", score))
+        om.add_evaluation_triplets(sample_report("plain text claim", 0.1))
+        maintained = {d: om.domain_history.recent(d) for d in om.domain_history.domains()}
+        om.rebuild_domain_index()
+        rebuilt = {d: om.domain_history.recent(d) for d in om.domain_history.domains()}
+        assert maintained == rebuilt
+        assert [e.score for e in rebuilt["lemonde.fr"]] == [0.5, 0.8, 0.6, 0.3]
+        data = GraphRAG(om)._get_source_history_data("lemonde.fr")
+        assert data['count'] == 4 and data['last_verdict'] == "Niveau_Moyen"
+
+    def test_persisted_with_data_graph(self, tmp_path, monkeypatch):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path)
+        om.add_evaluation_triplets(sample_report())
+        assert om.save_data()
+        assert (tmp_path / "data.ttl.domains.json").exists()
+
+        rebuilds = []
+        monkeypatch.setattr(DomainHistoryIndex, "rebuild", lambda *args: rebuilds.append(args))
+        reloaded = OntologyManager(data_path=data_path)
+        assert rebuilds == []
+        assert reloaded.domain_history.recent("lemonde.fr") == om.domain_history.recent("lemonde.fr")
+
+    def test_stale_file_is_rebuilt(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path)
+        om.add_evaluation_triplets(sample_report())
+        om.save_data()
+        om.add_evaluation_triplets(sample_report(score=0.2))
+        om.export_to_ttl(data_path)  # graph written without the index
+        reloaded = OntologyManager(data_path=data_path)
+        assert len(reloaded.domain_history.recent("lemonde.fr")) == 2
+
+
+class TestJournal:
+    """Tests du journal N-Triples en ajout seul (sauvegarde, relecture, compaction)"""
+
+    def test_save_appends_and_replays(self, tmp_path, monkeypatch):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path, journal=True)
+        om.add_evaluation_triplets(sample_report())
+        om.add_evaluation_triplets({
+            'scoreCredibilite': 0.3,
+            'informationEntree': 'Citation "entre guillemets"\nsur deux lignes é',
+            'resumeAnalyse': "Résumé\tavec tabulation",
+        })
+        assert om.save_data()
+        size = om.journal.size()
+        om.add_evaluation_triplets(sample_report(score=0.2))
+        assert om.save_data()
+        assert om.journal.size() > size  # appended, TTL never rewritten
+        assert not (tmp_path / "data.ttl").exists()
+
+        rebuilds = []
+        monkeypatch.setattr(DomainHistoryIndex, "rebuild", lambda *args: rebuilds.append(args))
+        reloaded = OntologyManager(data_path=data_path, journal=True)
+        assert set(reloaded.data_graph) == set(om.data_graph)
+        assert rebuilds == []  # persisted index matches snapshot + journal
+        assert reloaded.domain_history.recent("lemonde.fr") == om.domain_history.recent("lemonde.fr")
+
+    def test_torn_batch_ignored(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path, journal=True)
+        om.add_evaluation_triplets(sample_report())
+        om.save_data()
+        om.close()
+        committed = len(om.data_graph)
+        with open(om.journal_path, 'ab') as f:
+            f.write(b'<urn:a> <urn:b> "coup')  # crash in the middle of a batch
+        reloaded = OntologyManager(data_path=data_path, journal=True)
+        assert len(reloaded.data_graph) == committed
+        assert open(om.journal_path, 'rb').read().endswith(b"# commit 1\n")
+
+    def test_background_compaction(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path, journal=True, journal_compact_bytes=1)
+        om.add_evaluation_triplets(sample_report())
+        om.save_data()  # journal over the threshold: compacted in the background
+        om.close()
+        assert (tmp_path / "data.ttl").exists()
+        assert om.journal.size() == 0
+        om.add_evaluation_triplets(sample_report("https://example.org/x", 0.1))
+        om.journal_compact_bytes = 10 ** 9
+        om.save_data()
+        reloaded = OntologyManager(data_path=data_path, journal=True)
+        assert set(reloaded.data_graph) == set(om.data_graph)
+        assert len(Graph().parse(data_path, format='turtle')) < len(om.data_graph)
+
+    def test_compaction_counts_its_snapshot(self, tmp_path, monkeypatch):
+        """Un ajout entre le vidage du journal et la copie reste couvert."""
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path, journal=True)
+        om.add_evaluation_triplets(sample_report())
+        flush = om._flush_journal
+
+        def flush_then_add():
+            flushed = flush()
+            om.add_evaluation_triplets(sample_report("https://example.org/late", 0.4))
+            return flushed
+
+        monkeypatch.setattr(om, "_flush_journal", flush_then_add)
+        assert om.compact_journal(wait=True)
+        monkeypatch.undo()
+        assert om._journal_covers_graph
+        om.save_data()
+        reloaded = OntologyManager(data_path=data_path, journal=True)
+        assert set(reloaded.data_graph) == set(om.data_graph)
+
+    def test_removal_forces_snapshot(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path, journal=True)
+        om.add_evaluation_triplets(sample_report())
+        om.save_data()
+        om.data_graph.remove((None, om.cred.reportSummary, None))
+        om.save_data()
+        reloaded = OntologyManager(data_path=data_path, journal=True)
+        assert set(reloaded.data_graph) == set(om.data_graph)
+        assert not list(reloaded.data_graph.triples((None, om.cred.reportSummary, None)))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'écrivain unique de l'ontologie (file d'écritures,
+verrou lecteurs-rédacteur)
+
+Auteur: Dominique S. Loyer
+"""
+
+import threading
+import time
+
+from rdflib.namespace import RDF
+
+from syscred.graph_rag import GraphRAG
+from syscred.ontology_manager import OntologyManager
+from syscred.ontology_writer import OntologyWriter, ReadWriteLock
+
+
+def report_count(om):
+    return len(set(om.data_graph.subjects(RDF.type, om.cred.RapportEvaluation)))
+
+
+class TestReadWriteLock:
+    """Tests du verrou lecteurs-rédacteur"""
+
+    def test_readers_share_writer_excludes(self):
+        lock = ReadWriteLock()
+        both_reading = threading.Barrier(2, timeout=5)
+        events = []
+
+        def reader():
+            with lock.read():
+                both_reading.wait()  # would time out if readers excluded each other
+                time.sleep(0.05)
+                events.append("read")
+
+        def writer():
+            time.sleep(0.01)
+            with lock.write():
+                events.append("write")
+
+        threads = [threading.Thread(target=f) for f in (reader, reader, writer)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        assert events == ["read", "read", "write"]
+
+    def test_nested_read_with_waiting_writer(self):
+        lock = ReadWriteLock()
+        written = threading.Event()
+
+        def writer():
+            with lock.write():
+                written.set()
+
+        with lock.read():
+            thread = threading.Thread(target=writer)
+            thread.start()
+            time.sleep(0.05)  # the writer is now waiting
+            with lock.read():  # reentrant: no deadlock
+                assert not written.is_set()
+        thread.join(5)
+        assert written.is_set()
+
+
+class TestOntologyWriter:
+    """Tests de la file d'écritures"""
+
+    def test_batches_in_order_and_coalesces_saves(self):
+        applied, saves = [], []
+        unblock = threading.Event()
+
+        def apply(items):
+            unblock.wait(5)
+            applied.extend(items)
+
+        writer = OntologyWriter(apply, lambda: saves.append(len(applied)))
+        start = time.perf_counter()
+        for i in range(50):
+            assert writer.submit(i)
+            assert writer.request_save()
+        # Request threads never wait for the writer
+        assert time.perf_counter() - start < 1.0
+        unblock.set()
+        assert writer.flush(5)
+        assert applied == list(range(50))
+        assert writer.stats["batches"] < 50 and len(saves) < 50 and saves[-1] == 50
+        writer.close()
+        assert not writer.submit(50)
+
+    def test_errors_do_not_stop_writer(self):
+        applied = []
+
+        def apply(items):
+            if items == ["bad"]:
+                raise ValueError("bad item")
+            applied.extend(items)
+
+        writer = OntologyWriter(apply, lambda: None)
+        writer.submit("bad")
+        writer.flush(5)
+        writer.submit("good")
+        writer.close()
+        assert applied == ["good"] and writer.stats["errors"] == 1
+
+
+class TestBackgroundWrites:
+    """Tests de l'OntologyManager avec écrivain en arrière-plan"""
+
+    def test_concurrent_requests(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path, journal=True, background_writes=True)
+        rag = GraphRAG(om)
+        uris, errors = [], []
+        done = threading.Event()
+
+        def request(worker):
+            try:
+                for i in range(25):
+                    uris.append(om.add_evaluation_triplets({
+                        'scoreCredibilite': 0.5,
+                        'informationEntree': f"https://www.lemonde.fr/{worker}/{i}",
+                        'resumeAnalyse': "concurrent evaluation",
+                    }))
+                    om.save_data()
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                while not done.is_set():
+                    om.get_statistics()
+                    om.query_source_history("lemonde.fr")
+                    rag.analyze("lemonde.fr", ["concurrent", "evaluation"])
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        writers = [threading.Thread(target=request, args=(w,)) for w in range(4)]
+        for t in readers + writers:
+            t.start()
+        for t in writers:
+            t.join(30)
+        assert om.flush(30)
+        done.set()
+        for t in readers:
+            t.join(30)
+
+        assert not errors
+        assert len(set(uris)) == 100
+        assert report_count(om) == 100
+        assert len(om.domain_history.recent("lemonde.fr")) == 10
+        om.close()
+
+        reopened = OntologyManager(data_path=data_path, journal=True)
+        assert set(reopened.data_graph) == set(om.data_graph)
+
+    def test_close_applies_queued_writes(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path, background_writes=True)
+        om.add_evaluation_triplets({'scoreCredibilite': 0.8, 'informationEntree': "https://www.bbc.co.uk/a"})
+        om.save_data()
+        om.close()
+        assert report_count(om) == 1
+        assert len(OntologyManager(data_path=data_path).data_graph) == len(om.data_graph)
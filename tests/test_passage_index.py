@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'index de passages et les extraits orientés requête
+
+Auteur: Dominique S. Loyer
+"""
+
+from collections import Counter
+
+import pytest
+
+from syscred.ir_engine import IREngine
+from syscred.passage_index import PassageIndex
+from syscred.trec_retriever import TRECRetriever
+
+
+def long_document(topic: str, position: int, length: int = 300) -> str:
+    """Document de remplissage avec le sujet inséré autour d'une position."""
+    words = [f"filler{i % 7}" for i in range(length)]
+    words[position:position + len(topic.split())] = topic.split()
+    return ' '.join(words)
+
+
+@pytest.fixture
+def analyzer():
+    return IREngine(use_stemming=True, tokenizer='regex').analyze
+
+
+class TestPassageIndex:
+    """Tests du découpage et de la recherche par passages"""
+
+    def test_split_overlapping_windows(self, analyzer):
+        passages = PassageIndex(analyzer, size=4, stride=2)
+        text = "a b c d e f g"
+        spans = passages.split(text)
+        assert [text[s:e] for s, e in spans] == ["a b c d", "c d e f", "e f g"]
+        assert passages.split("") == []
+
+    def test_invalid_stride(self, analyzer):
+        with pytest.raises(ValueError):
+            PassageIndex(analyzer, size=10, stride=20)
+
+    def test_parse_passage_id_with_hash_in_doc_id(self):
+        passage_id = PassageIndex.passage_id("https://example.com/a#top", 3)
+        assert PassageIndex.parse_passage_id(passage_id) == ("https://example.com/a#top", 3)
+
+    def test_maxp_search_returns_best_passage(self, analyzer):
+        texts = {
+            "D1": long_document("oil prices surged", 250),
+            "D2": long_document("election campaign", 10),
+        }
+        passages = PassageIndex(analyzer, size=50, stride=25)
+        passages.bulk_load(texts.items())
+
+        hits = passages.search(Counter(analyzer("oil prices")), k=5)
+        assert [doc_id for doc_id, _, _ in hits] == ["D1"]
+        doc_id, _, n = hits[0]
+        assert "oil prices surged" in passages.snippet(doc_id, n, texts[doc_id])
+
+    def test_best_passage_and_live_updates(self, analyzer):
+        passages = PassageIndex(analyzer, size=50, stride=25)
+        passages.bulk_load([("D1", long_document("satellite launch", 5))])
+        passages.add_document("D1", long_document("satellite launch", 200))
+        n, score = passages.best_passage("D1", Counter(analyzer("satellite launch")))
+        start, end = passages.span("D1", n)
+        assert score > 0
+        assert "satellite launch" in long_document("satellite launch", 200)[start:end]
+        assert len(passages.search(Counter(analyzer("satellite")), k=10)) == 1
+
+        assert passages.delete_document("D1")
+        assert passages.search(Counter(analyzer("satellite")), k=10) == []
+
+
+class TestRetrieverPassageMode:
+    """Tests du mode passages du TRECRetriever"""
+
+    def make_retriever(self):
+        retriever = TRECRetriever(
+            tokenizer='regex', enable_prf=False, passage_mode=True,
+            passage_size=40, passage_stride=20
+        )
+        retriever.corpus = {
+            "AP1": {"text": long_document("airbus subsidies europe", 220), "title": "Airbus"},
+            "AP2": {"text": long_document("junk bonds takeover", 30), "title": "Buyout"},
+        }
+        return retriever
+
+    def test_evidence_text_is_best_passage(self):
+        retriever = self.make_retriever()
+        result = retriever.retrieve_evidence("airbus subsidies", k=2)
+        evidence = result.evidences[0]
+        full_text = retriever.corpus["AP1"]["text"]
+
+        assert evidence.doc_id == "AP1"
+        assert "airbus subsidies europe" in evidence.text
+        assert len(evidence.text) < len(full_text) / 3
+        start, end = evidence.metadata["offsets"]
+        assert full_text[start:end] == evidence.text
+        data = evidence.to_dict()
+        assert data["passage_id"] == evidence.metadata["passage_id"]
+
+    def test_live_document_and_passage_texts(self):
+        retriever = self.make_retriever()
+        retriever.add_document("https://example.com/x", long_document("satellite orbit", 100), title="Space")
+        evidence = retriever.retrieve_evidence("satellite orbit", k=1).evidences[0]
+        assert evidence.doc_id == "https://example.com/x"
+
+        passage_id = evidence.metadata["passage_id"]
+        assert retriever.document_texts([passage_id]) == {passage_id: evidence.text}
+        assert retriever.get_statistics()["passage_index"]["documents"] == 3
+
+    def test_unsupported_options_reported(self, capsys):
+        TRECRetriever(tokenizer='regex', enable_prf=False, passage_mode=True,
+                      field_weights={'text': 1.0, 'title': 2.0}, positions=True)
+        assert "field_weights, positions ignored" in capsys.readouterr().out
+        TRECRetriever(tokenizer='regex', enable_prf=False, passage_mode=True)
+        assert "ignored" not in capsys.readouterr().out
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour la prédiction de performance des requêtes (QPP)
+
+Auteur: Dominique S. Loyer
+"""
+
+from syscred.inverted_index import SegmentedIndex
+from syscred.qpp import QueryPerformancePredictor, QueryPrediction
+from syscred.trec_retriever import TRECRetriever
+
+
+def build_snapshot():
+    index = SegmentedIndex(background_merge=False)
+    docs = [("d%d" % i, ["said", "report", "oil" if i % 5 == 0 else "market"]) for i in range(20)]
+    index.bulk_load(docs)
+    return index.snapshot()
+
+
+class TestQueryPerformancePredictor:
+    """Tests des prédicteurs et de la politique PRF"""
+
+    def test_idf_statistics(self):
+        snapshot = build_snapshot()
+        max_idf, avg_idf = QueryPerformancePredictor.idf_statistics(["oil", "said"], snapshot)
+        assert max_idf == snapshot.idf("oil", body_only=True)
+        assert avg_idf < max_idf
+        assert QueryPerformancePredictor.idf_statistics(["unknown"], snapshot) == (0.0, 0.0)
+
+    def test_title_terms_do_not_count(self):
+        index = SegmentedIndex(background_merge=False)
+        index.bulk_load([("d%d" % i, ["market", "report"], ["headline"]) for i in range(10)]
+                        + [("d10", ["headline", "oil"], [])])
+        snapshot = index.snapshot()
+        max_idf, _ = QueryPerformancePredictor.idf_statistics(["headline"], snapshot)
+        assert max_idf == snapshot.idf("oil", body_only=True)
+        predictor = QueryPerformancePredictor()
+        assert predictor.clarity({"headline": 1.0}, snapshot) == predictor.clarity({"oil": 1.0}, snapshot)
+
+    def test_dispersion_and_clarity(self):
+        predictor = QueryPerformancePredictor()
+        assert predictor.score_dispersion([2.0, 2.0, 2.0]) == 0.0
+        assert predictor.score_dispersion([4.0, 1.0]) > 0.5
+        snapshot = build_snapshot()
+        assert predictor.clarity({"oil": 1.0}, snapshot) > predictor.clarity({"said": 1.0}, snapshot)
+
+    def test_policy(self):
+        predictor = QueryPerformancePredictor(min_max_idf=1.5, max_idf_ratio=0.9,
+                                              min_clarity=2.0, max_dispersion=0.25)
+        assert predictor.should_expand(QueryPrediction(max_idf=3.0, avg_idf=1.5, clarity=4.0, score_dispersion=0.1))
+        assert not predictor.should_expand(QueryPrediction(max_idf=1.0, avg_idf=0.5))
+        assert not predictor.should_expand(QueryPrediction(max_idf=3.0, avg_idf=3.0))
+        assert not predictor.should_expand(QueryPrediction(max_idf=3.0, avg_idf=1.5, clarity=1.0))
+        assert not predictor.should_expand(QueryPrediction(max_idf=3.0, avg_idf=1.5, score_dispersion=0.6))
+
+    def test_retriever_counts_skipped_passes(self):
+        retriever = TRECRetriever(use_stemming=False, tokenizer='regex',
+                                  prf_predictor=QueryPerformancePredictor())
+        retriever.corpus = {"d%d" % i: {"text": "market report %d" % i, "title": ""} for i in range(10)}
+        result = retriever.retrieve_evidence("market report", k=5)
+        assert result.expanded_query is None
+        stats = retriever.get_statistics()
+        assert stats["prf_skipped"] == 1 and stats["prf_passes"] == 0
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le cache de requêtes du TRECRetriever
+
+Auteur: Dominique S. Loyer
+"""
+
+from syscred.query_cache import QueryCache
+from syscred.trec_retriever import TRECRetriever
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryCache:
+    """Tests du cache LRU/TTL"""
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2, ttl_seconds=0)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)  # evicts b, the least recently used
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = QueryCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.put("q", "result")
+        clock.now = 4.0
+        assert cache.get("q") == "result"
+        clock.now = 10.0
+        assert cache.get("q") is None
+        assert cache.stats["expirations"] == 1
+
+    def test_generation_change_invalidates(self):
+        cache = QueryCache()
+        cache.set_generation(1)
+        cache.put("q", "old")
+        cache.set_generation(1)
+        assert cache.get("q") == "old"
+        cache.set_generation(2)
+        assert cache.get("q") is None
+        assert len(cache) == 0
+
+
+class TestRetrieverQueryCache:
+    """Tests du cache dans retrieve_evidence"""
+
+    def make_retriever(self, **kwargs):
+        retriever = TRECRetriever(tokenizer='regex', enable_prf=False, **kwargs)
+        retriever.corpus = {
+            "AP1": {"text": "Oil prices rose sharply in Europe", "title": "Oil"},
+            "AP2": {"text": "The election campaign ended today", "title": "Vote"},
+        }
+        return retriever
+
+    def test_same_processed_query_hits(self):
+        retriever = self.make_retriever()
+        first = retriever.retrieve_evidence("Oil prices rose", k=2)
+        second = retriever.retrieve_evidence("oil   PRICES rose!", k=2)
+        assert not first.cached
+        assert second.cached
+        assert [e.doc_id for e in second.evidences] == [e.doc_id for e in first.evidences]
+
+        stats = retriever.get_statistics()["query_cache"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert retriever.get_statistics()["queries_processed"] == 2
+
+    def test_cached_evidences_are_copies(self):
+        retriever = self.make_retriever()
+        first = retriever.retrieve_evidence("oil prices", k=2)
+        first.evidences[0].text = "edited"
+        first.evidences[0].metadata["flag"] = True
+        second = retriever.retrieve_evidence("oil prices", k=2)
+        second.evidences[0].score = -1.0
+        third = retriever.retrieve_evidence("oil prices", k=2)
+        assert third.cached
+        assert third.evidences[0].text == "Oil prices rose sharply in Europe"
+        assert third.evidences[0].score > 0 and "flag" not in third.evidences[0].metadata
+
+    def test_settings_are_part_of_the_key(self):
+        retriever = self.make_retriever()
+        retriever.retrieve_evidence("oil prices", k=2)
+        assert not retriever.retrieve_evidence("oil prices", k=1).cached
+        assert not retriever.retrieve_evidence("oil prices", k=2, use_prf=True).cached
+        assert not retriever.retrieve_evidence("oil prices", k=2, model='qld').cached
+
+    def test_index_change_invalidates(self):
+        retriever = self.make_retriever()
+        retriever.retrieve_evidence("oil prices", k=5)
+        retriever.add_document("web-1", "Oil prices fell after the OPEC meeting")
+        result = retriever.retrieve_evidence("oil prices", k=5)
+        assert not result.cached
+        assert "web-1" in [e.doc_id for e in result.evidences]
+
+    def test_cache_disabled(self):
+        retriever = self.make_retriever(query_cache_size=0)
+        retriever.retrieve_evidence("oil prices", k=2)
+        assert not retriever.retrieve_evidence("oil prices", k=2).cached
+        assert retriever.get_statistics()["query_cache"] is None
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le reranking cross-encoder budgété
+
+Auteur: Dominique S. Loyer
+"""
+
+from syscred.reranker import CrossEncoderReranker
+from syscred.trec_retriever import TRECRetriever
+
+
+class OverlapModel:
+    """Cross-encoder factice : recouvrement de mots, coût simulé par paire."""
+
+    def __init__(self, clock=None, ms_per_pair=0.0):
+        self.clock = clock
+        self.ms_per_pair = ms_per_pair
+        self.pairs = 0
+
+    def predict(self, pairs, batch_size=16):
+        self.pairs += len(pairs)
+        if self.clock is not None:
+            self.clock.now += self.ms_per_pair * len(pairs) / 1000
+        return [len(set(q.lower().split()) & set(t.lower().split())) for q, t in pairs]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCrossEncoderReranker:
+    """Tests du reranker"""
+
+    def test_reorders_prefix_and_keeps_tail(self):
+        reranker = CrossEncoderReranker(top_n=2, batch_size=2, budget_ms=0, model=OverlapModel())
+        outcome = reranker.rerank("oil prices", ["weather", "oil prices rose", "oil"])
+        assert outcome.reranked == 2
+        assert [i for i, _ in outcome.order] == [1, 0, 2]
+        assert outcome.order[-1][1] is None
+
+    def test_budget_shrinks_candidates(self):
+        clock = FakeClock()
+        model = OverlapModel(clock, ms_per_pair=10.0)
+        reranker = CrossEncoderReranker(top_n=40, batch_size=4, budget_ms=100, model=model)
+        texts = ["text %d" % i for i in range(40)]
+
+        first = reranker.rerank("query", texts, clock=clock)
+        assert first.reranked == 12  # stops after the batch that crosses 100 ms
+        assert reranker.stats["budget_cuts"] == 1
+        assert reranker.candidate_budget() == 8
+
+        second = reranker.rerank("query", texts, clock=clock)
+        assert second.reranked == 8
+
+
+class TestRetrieverReranking:
+    """Tests de l'intégration dans TRECRetriever"""
+
+    def test_result_reports_reranking(self):
+        reranker = CrossEncoderReranker(top_n=10, budget_ms=0, model=OverlapModel())
+        retriever = TRECRetriever(use_stemming=False, tokenizer='regex', enable_prf=False, reranker=reranker)
+        retriever.corpus = {
+            "D1": {"text": "vaccine vaccine vaccine trials", "title": ""},
+            "D2": {"text": "vaccine safety clinical trials reviewed", "title": ""},
+            "D3": {"text": "oil prices", "title": ""},
+        }
+        result = retriever.retrieve_evidence("vaccine safety clinical trials", k=2)
+        assert result.evidences[0].doc_id == "D2"
+        assert len(result.evidences) == 2
+        assert result.reranked_count == 2
+        assert "rerank" in result.stage_times_ms
+
+        result = retriever.retrieve_evidence("vaccine safety", k=2, use_rerank=False)
+        assert result.reranked_count == 0
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le pool de searchers Pyserini et la recherche par lots
+
+Auteur: Dominique S. Loyer
+"""
+
+import threading
+from collections import namedtuple
+
+from syscred.searcher_pool import SearcherPool
+from syscred.trec_retriever import TRECRetriever
+
+Hit = namedtuple('Hit', ['docid', 'score'])
+
+DOCS = {
+    "AP1": "oil price rose europ",
+    "AP2": "elect campaign vote",
+    "AP3": "oil export opec",
+}
+
+
+class FakeRaw:
+    def __init__(self, text):
+        self.text = text
+
+    def raw(self):
+        return self.text
+
+
+class FakeSearcher:
+    """LuceneSearcher factice : recouvrement de termes, similarité mémorisée."""
+
+    instances = []
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.similarity = None
+        self.batch_calls = 0
+        FakeSearcher.instances.append(self)
+
+    def set_bm25(self, k1=0.9, b=0.4):
+        self.similarity = ('bm25', k1, b)
+
+    def set_qld(self):
+        self.similarity = ('qld',)
+
+    def search(self, query, k=10):
+        terms = set(query.split())
+        scored = [(len(terms & set(text.split())), doc_id) for doc_id, text in DOCS.items()]
+        return [Hit(doc_id, float(score)) for score, doc_id in sorted(scored, reverse=True) if score][:k]
+
+    def batch_search(self, queries, qids, k=10, threads=1):
+        self.batch_calls += 1
+        return {qid: self.search(query, k) for query, qid in zip(queries, qids)}
+
+    def doc(self, docid):
+        return FakeRaw(DOCS[docid])
+
+
+class TestSearcherPool:
+    """Tests du pool borné par modèle"""
+
+    def test_preconfigured_searchers_are_reused(self):
+        pool = SearcherPool("index", k1=1.2, b=0.75, factory=FakeSearcher)
+        with pool.checkout('bm25') as bm25:
+            assert bm25.similarity == ('bm25', 1.2, 0.75)
+            with pool.checkout('bm25') as second:
+                assert second is not bm25
+        with pool.checkout('bm25') as again:
+            assert again in (bm25, second)
+        with pool.checkout('qld') as qld:
+            assert qld.similarity == ('qld',)
+        assert pool.stats["searchers_created"] == 3
+
+    def test_short_lived_threads_share_searchers(self):
+        """Un thread par requête (serveur Flask) ne crée pas un searcher par thread."""
+        pool = SearcherPool("index", factory=FakeSearcher, max_searchers=2)
+        barrier = threading.Barrier(4)
+        hits = []
+
+        def request():
+            barrier.wait()
+            with pool.checkout('bm25') as searcher:
+                hits.append(searcher.search("oil", k=1))
+
+        for _ in range(5):
+            threads = [threading.Thread(target=request) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert len(hits) == 20
+        created = pool.stats["searchers_created"]
+        assert 1 <= created <= 2
+        assert pool.get_statistics()["idle_searchers"] == created
+
+    def test_batch_search(self):
+        pool = SearcherPool("index", factory=FakeSearcher)
+        hits = pool.batch_search(["oil", "vote"], ["q1", "q2"], k=5)
+        assert [h.docid for h in hits["q2"]] == ["AP2"]
+        assert pool.stats["batch_queries"] == 2
+
+
+class TestRetrieverBatch:
+    """Tests de batch_retrieve avec index Lucene"""
+
+    def make_retriever(self):
+        retriever = TRECRetriever(tokenizer='regex', enable_prf=False)
+        retriever.ir_engine.searcher = FakeSearcher("index")
+        retriever.ir_engine.searcher_pool = SearcherPool("index", factory=FakeSearcher)
+        return retriever
+
+    def test_batch_retrieve_uses_native_batch_search(self):
+        retriever = self.make_retriever()
+        results = retriever.batch_retrieve(["oil prices", "election vote", "opec exports"], k=2)
+        assert [r.evidences[0].doc_id for r in results] == ["AP1", "AP2", "AP3"]
+        assert results[0].evidences[0].text == DOCS["AP1"]
+        with retriever.ir_engine.searcher_pool.checkout('bm25') as batch_searcher:
+            assert batch_searcher.batch_calls == 1
+
+        # Same claims again: served by the query cache, no new batch
+        again = retriever.batch_retrieve(["oil prices", "election vote"], k=2)
+        assert all(r.cached for r in again)
+        assert batch_searcher.batch_calls == 1
+
+    def test_single_query_uses_pooled_searcher(self):
+        retriever = self.make_retriever()
+        result = retriever.retrieve_evidence("oil prices", k=2, model='qld')
+        assert result.evidences[0].doc_id == "AP1"
+        with retriever.ir_engine.searcher_pool.checkout('qld') as searcher:
+            assert searcher.similarity == ('qld',)
+        assert retriever.ir_engine.searcher_pool.stats["searchers_created"] == 1
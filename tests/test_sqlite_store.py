@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le store SQLite du graphe de données
+
+Auteur: Dominique S. Loyer
+"""
+
+import os
+import random
+
+from rdflib import Graph, Literal, URIRef, BNode
+from rdflib.namespace import XSD
+
+from syscred.graph_rag import GraphRAG
+from syscred.ontology_manager import OntologyManager
+from syscred.sqlite_store import SQLiteTripleStore
+
+ONTOLOGY_DIR = os.path.join(os.path.dirname(__file__), '..', 'ontology')
+BASE_ONTOLOGY = os.path.join(ONTOLOGY_DIR, 'sysCRED_onto26avrtil.ttl')
+DATA = os.path.join(ONTOLOGY_DIR, 'sysCRED_data.ttl')
+
+CRED = "https://syscred.uqam.ca/ontology#"
+
+
+def evaluations(om, n):
+    rng = random.Random(3)
+    for i in range(n):
+        om.add_evaluation_triplets({
+            'scoreCredibilite': round(rng.random(), 2),
+            'informationEntree': f"https://www.{rng.choice(['lemonde.fr', 'bbc.co.uk'])}/article/{i}",
+            'resumeAnalyse': f"synthetic evaluation {i}",
+        })
+
+
+class TestSQLiteTripleStore:
+    """Tests du store (motifs de triplets, persistance)"""
+
+    def test_patterns_match_memory(self, tmp_path):
+        memory = Graph().parse(DATA, format='turtle')
+        graph = Graph(store=SQLiteTripleStore(str(tmp_path / "data.sqlite3")))
+        graph += memory
+        assert len(graph) == len(memory) and set(graph) == set(memory)
+        for s, p, o in random.Random(1).sample(list(memory), 20):
+            for pattern in [(s, None, None), (None, p, None), (None, None, o), (s, p, None),
+                            (None, p, o), (s, None, o), (s, p, o)]:
+                assert set(graph.triples(pattern)) == set(memory.triples(pattern))
+        assert list(graph.triples((URIRef(CRED + "unknown"), None, None))) == []
+        query = f"SELECT (COUNT(?r) AS ?n) WHERE {{ ?r a <{CRED}RapportEvaluation> }}"
+        assert list(graph.query(query)) == list(memory.query(query))
+
+    def test_persistence(self, tmp_path):
+        path = str(tmp_path / "data.sqlite3")
+        graph = Graph(store=SQLiteTripleStore(path))
+        graph.bind("cred", CRED)
+        node = URIRef(CRED + "Info_1")
+        triples = {
+            (node, URIRef(CRED + "label"), Literal("vaccin", lang="fr")),
+            (node, URIRef(CRED + "score"), Literal("0.50", datatype=XSD.float)),
+            (node, URIRef(CRED + "content"), Literal('Citation "entre guillemets"\nsur deux lignes')),
+            (node, URIRef(CRED + "source"), BNode("b0")),
+        }
+        for triple in triples:
+            graph.add(triple)
+        graph.add(next(iter(triples)))  # duplicate
+        graph.commit()
+        graph.add((node, URIRef(CRED + "draft"), Literal(1)))
+        graph.close()  # uncommitted triple is discarded
+
+        reopened = Graph(store=SQLiteTripleStore(path))
+        assert len(reopened) == 4 and set(reopened) == triples
+        assert reopened.store.namespace("cred") == URIRef(CRED)
+        reopened.remove((node, URIRef(CRED + "label"), None))
+        assert len(reopened) == 3
+        reopened.rollback()
+        assert len(reopened) == 4
+
+
+class TestOntologyManagerSQLite:
+    """Tests de l'OntologyManager sur le store SQLite"""
+
+    def test_same_results_as_memory(self, tmp_path):
+        memory = OntologyManager(BASE_ONTOLOGY)
+        disk = OntologyManager(BASE_ONTOLOGY, store='sqlite', store_path=str(tmp_path / "data.sqlite3"))
+        evaluations(memory, 30)
+        evaluations(disk, 30)
+        assert disk.get_statistics() == memory.get_statistics()
+        assert len(disk.query_source_history("lemonde.fr")) == len(memory.query_source_history("lemonde.fr"))
+        assert len(disk.get_graph_json()['links']) == len(memory.get_graph_json()['links'])
+        context = GraphRAG(disk).analyze("bbc.co.uk", ["synthetic", "evaluation"])
+        assert context == GraphRAG(memory).analyze("bbc.co.uk", ["synthetic", "evaluation"])
+
+    def test_import_then_reopen(self, tmp_path):
+        data_path = str(tmp_path / "data.ttl")
+        om = OntologyManager(data_path=data_path, journal=True)
+        evaluations(om, 5)
+        om.save_data()
+        om.compact_journal(wait=True)
+        evaluations(om, 3)  # in the journal only
+        om.save_data()
+        om.close()
+
+        imported = OntologyManager(data_path=data_path, store='sqlite')
+        assert imported.journal is None and os.path.exists(data_path + ".sqlite3")
+        assert set(imported.data_graph) == set(om.data_graph)
+        evaluations(imported, 1)
+        assert imported.save_data()
+        count = len(imported.data_graph)
+        imported.close()
+
+        os.remove(data_path)  # the store no longer needs the TTL file
+        reopened = OntologyManager(data_path=data_path, store='sqlite')
+        assert len(reopened.data_graph) == count
+        assert reopened.domain_history.recent("lemonde.fr") == imported.domain_history.recent("lemonde.fr")